@@ -12,6 +12,7 @@ if TYPE_CHECKING:
     from sushi_lang.semantics.typesys import Type
     from sushi_lang.semantics.passes.collect import FunctionTable, PerkImplementationTable, ConstantTable
 
+from sushi_lang.internals import timing
 from sushi_lang.semantics.ast import ConstDef, ExtendDef
 from sushi_lang.semantics.units import Unit
 from sushi_lang.semantics.passes.collect import StructTable, EnumTable
@@ -44,7 +45,8 @@ def _run_linker(cmd: List[str], cc: str) -> None:
     """
     from sushi_lang.internals.diagnostics import SushiError
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    with timing.phase("link"):
+        result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode == 0:
         return
 
@@ -124,6 +126,12 @@ class LLVMCodegen:
         self.entry_block: Optional[ir.Block] = None
         self.entry_branch: Optional[ir.Instruction] = None
         self.in_extension_method: bool = False  # Track if compiling extension method
+        # HashMap bucket layout, "linear" or "swiss" (`--hashmap-layout`); see
+        # backend/generics/hashmap/swiss.py.
+        self.hashmap_layout: str = "linear"
+        # stdout buffering C `main` installs, "auto", "line" or "full"
+        # (`--stdout-buffering`); see backend/runtime/output.py.
+        self.stdout_buffering: str = "auto"
 
         # Loop context tracking for break/continue statements. Each entry is
         # (continue-target block, break-target block, loop-body scope index); the scope
@@ -318,13 +326,14 @@ class LLVMCodegen:
 
     def build_module_multi_unit(self, units: list[Unit]) -> ir.Module:
         """Generate LLVM IR for multiple compilation units and return the module."""
-        for unit in units:
-            if unit.ast is not None:
-                self.stdlib.extract_stdlib_units(unit.ast)
+        with timing.phase("emit-ir"):
+            for unit in units:
+                if unit.ast is not None:
+                    self.stdlib.extract_stdlib_units(unit.ast)
 
-        self.runtime.declare_externs()
-        self.declare_user_externs()
-        self._emit_multi_unit_program(units)
+            self.runtime.declare_externs()
+            self.declare_user_externs()
+            self._emit_multi_unit_program(units)
         return self.module
 
     def compile_multi_unit(
@@ -340,8 +349,14 @@ class LLVMCodegen:
         monomorphized_extensions: list['ExtendDef'] = None,
         library_linker: 'LibraryResolver' = None,
         library_registry: Optional[LibraryRegistry] = None,
+        lto: bool = False,
+        keep_ir: bool = False,
     ) -> Path:
-        """Complete multi-unit compilation pipeline from multiple ASTs to native executable."""
+        """Complete multi-unit compilation pipeline from multiple ASTs to native executable.
+
+        The module is already the whole program; `lto` internalizes it before optimizing.
+        `keep_ir` leaves the optimized module in `self.module` (for `--write-ll`).
+        """
         self.main_expects_args = main_expects_args
 
         self.monomorphized_extensions = monomorphized_extensions or []
@@ -352,13 +367,7 @@ class LLVMCodegen:
 
         mod_ir: ir.Module = self.build_module_multi_unit(units)
 
-        if debug:
-            print(";; Multi-unit IR (pre-opt)")
-            ir_text = str(mod_ir)
-            for i, line in enumerate(ir_text.splitlines(), 1):
-                print(f"{i:4} {line}")
-
-        llmod = llvm.parse_assembly(str(mod_ir))
+        llmod = _parse_module(mod_ir, ";; Multi-unit IR (pre-opt)" if debug else None)
 
         library_paths = set()
         stdlib_units = set()
@@ -386,10 +395,10 @@ class LLVMCodegen:
             for lib_path in library_paths:
                 try:
                     slib_path = library_linker.resolve_library(lib_path)
-                    metadata, bitcode = LibraryFormat.read(slib_path)
+                    metadata = LibraryFormat.load_metadata(slib_path)
                     library_linker.loaded_libraries[metadata["library_name"]] = metadata
 
-                    lib_mod = llvm.parse_bitcode(bitcode)
+                    lib_mod = llvm.parse_bitcode(LibraryFormat.read_bitcode(slib_path))
                     two_phase.add_library_module(lib_mod, metadata["library_name"])
                 except LibraryError:
                     raise
@@ -403,15 +412,20 @@ class LLVMCodegen:
                         stdlib_mod = llvm.parse_bitcode(f.read())
                         two_phase.add_stdlib_module(stdlib_mod, stdlib_path)
 
-            llmod = two_phase.link()
+            with timing.phase("link-bitcode"):
+                llmod = two_phase.link()
 
         else:
-            for unit in units:
-                if unit.ast is not None:
-                    self.stdlib.link_stdlib_modules(llmod, unit.ast)
+            with timing.phase("link-bitcode"):
+                for unit in units:
+                    if unit.ast is not None:
+                        self.stdlib.link_stdlib_modules(llmod, unit.ast)
 
         self.optimizer.ensure_target(llmod)
 
+        if lto:
+            _internalize_for_lto(llmod)
+
         if verify:
             self.optimizer.verify(llmod, "pre-optimization")
 
@@ -421,7 +435,7 @@ class LLVMCodegen:
         if verify:
             self.optimizer.verify(llmod, "post-optimization")
 
-        self.module = llvm.parse_assembly(str(llmod))
+        self.module = llmod if keep_ir else None
 
         out_path = out or Path("a.out")
         return self._link_executable(llmod, out_path, cc, debug, keep_object=keep_object)
@@ -434,8 +448,12 @@ class LLVMCodegen:
         verify: bool = True,
         monomorphized_extensions: list['ExtendDef'] = None,
         exported_private_functions: set[str] = frozenset(),
+        keep_ir: bool = False,
     ) -> bytes:
-        """Compile units to LLVM bitcode without linking to executable."""
+        """Compile units to LLVM bitcode without linking to executable.
+
+        `keep_ir` leaves the optimized module in `self.module` (for `--write-ll`).
+        """
         self.monomorphized_extensions = monomorphized_extensions or []
 
         self.is_library_mode = True
@@ -454,17 +472,12 @@ class LLVMCodegen:
             if fn is not None and isinstance(fn, ir.Function) and not fn.is_declaration:
                 fn.linkage = "external"
 
-        if debug:
-            print(";; Library IR (pre-opt)")
-            ir_text = str(mod_ir)
-            for i, line in enumerate(ir_text.splitlines(), 1):
-                print(f"{i:4} {line}")
-
-        llmod = llvm.parse_assembly(str(mod_ir))
+        llmod = _parse_module(mod_ir, ";; Library IR (pre-opt)" if debug else None)
 
-        for unit in units:
-            if unit.ast is not None:
-                self.stdlib.link_stdlib_modules(llmod, unit.ast)
+        with timing.phase("link-bitcode"):
+            for unit in units:
+                if unit.ast is not None:
+                    self.stdlib.link_stdlib_modules(llmod, unit.ast)
 
         self.optimizer.ensure_target(llmod)
 
@@ -477,7 +490,7 @@ class LLVMCodegen:
         if verify:
             self.optimizer.verify(llmod, "post-optimization")
 
-        self.module = llvm.parse_assembly(str(llmod))
+        self.module = llmod if keep_ir else None
 
         return llmod.as_bitcode()
 
@@ -496,7 +509,7 @@ class LLVMCodegen:
         if tm is None:
             tm = self.optimizer.ensure_target(llmod)
 
-        obj_bytes = tm.emit_object(llmod)
+        obj_bytes = _emit_object(tm, llmod)
 
         obj_path = out.with_suffix(".o")
         obj_path.write_bytes(obj_bytes)
@@ -645,8 +658,9 @@ class LLVMCodegen:
     def compile_single_unit_to_object(self, target_unit: Unit, all_units: list[Unit],
                                       opt: str = "mem2reg", verify: bool = True) -> bytes:
         """Compile a single unit to an object file (bytes)."""
-        mod_ir = self.build_module_single_unit(target_unit, all_units)
-        llmod = llvm.parse_assembly(str(mod_ir))
+        with timing.phase("emit-ir"):
+            mod_ir = self.build_module_single_unit(target_unit, all_units)
+        llmod = _parse_module(mod_ir)
 
         tm = self.optimizer.ensure_target(llmod)
 
@@ -659,7 +673,66 @@ class LLVMCodegen:
         if verify:
             self.optimizer.verify(llmod, f"post-optimization ({target_unit.name})")
 
-        return tm.emit_object(llmod)
+        return _emit_object(tm, llmod)
+
+    def compile_single_unit_to_bitcode(self, target_unit: Unit, all_units: list[Unit],
+                                       verify: bool = True) -> bytes:
+        """Compile a single unit to unoptimized bitcode, the per-unit half of `--lto`."""
+        with timing.phase("emit-ir"):
+            mod_ir = self.build_module_single_unit(target_unit, all_units)
+        llmod = _parse_module(mod_ir)
+
+        self.optimizer.ensure_target(llmod)
+
+        if verify:
+            self.optimizer.verify(llmod, f"pre-optimization ({target_unit.name})")
+
+        return llmod.as_bitcode()
+
+    def compile_lto_object(self, unit_bitcode: list[bytes], stdlib_units: list[str],
+                           library_paths: list[str], library_linker=None,
+                           opt: str = "mem2reg", verify: bool = True) -> bytes:
+        """Merge unit, stdlib and library bitcode into one module and optimize it whole.
+
+        Everything but `main` is internalized first: with the whole program in one
+        module, the optimizer may inline across units and drop what nothing reaches.
+        """
+        llmod = None
+        for bitcode in unit_bitcode:
+            mod = llvm.parse_bitcode(bitcode)
+            if llmod is None:
+                llmod = mod
+            else:
+                llmod.link_in(mod)
+
+        if llmod is None:
+            raise RuntimeError("LTO needs at least one compilation unit")
+
+        for stdlib_unit in stdlib_units:
+            for bc_path in self.stdlib._resolve_stdlib_unit(stdlib_unit):
+                with open(bc_path, 'rb') as f:
+                    llmod.link_in(llvm.parse_bitcode(f.read()))
+
+        if library_paths:
+            from sushi_lang.backend.library_format import LibraryFormat
+            for lib_path in library_paths:
+                bitcode = LibraryFormat.read_bitcode(library_linker.resolve_library(lib_path))
+                llmod.link_in(llvm.parse_bitcode(bitcode))
+
+        tm = self.optimizer.ensure_target(llmod)
+
+        _internalize_for_lto(llmod)
+
+        if verify:
+            self.optimizer.verify(llmod, "pre-optimization (lto)")
+
+        if opt != "none":
+            self.optimizer.optimize(llmod, opt)
+
+        if verify:
+            self.optimizer.verify(llmod, "post-optimization (lto)")
+
+        return _emit_object(tm, llmod)
 
     def compile_stdlib_to_object(self, stdlib_unit: str, opt: str = "mem2reg") -> bytes:
         """Compile stdlib bitcode files to a single object file."""
@@ -683,7 +756,7 @@ class LLVMCodegen:
         if opt != "none":
             self.optimizer.optimize(llmod, opt)
 
-        return tm.emit_object(llmod)
+        return _emit_object(tm, llmod)
 
     def compile_library_to_object(self, lib_path: str, library_linker,
                                   opt: str = "mem2reg") -> bytes:
@@ -691,15 +764,14 @@ class LLVMCodegen:
         from sushi_lang.backend.library_format import LibraryFormat
 
         slib_path = library_linker.resolve_library(lib_path)
-        _, bitcode = LibraryFormat.read(slib_path)
-        llmod = llvm.parse_bitcode(bitcode)
+        llmod = llvm.parse_bitcode(LibraryFormat.read_bitcode(slib_path))
 
         tm = self.optimizer.ensure_target(llmod)
 
         if opt != "none":
             self.optimizer.optimize(llmod, opt)
 
-        return tm.emit_object(llmod)
+        return _emit_object(tm, llmod)
 
     def link_object_files(self, obj_paths: list[Path], out: Path, cc: str = "cc",
                           debug: bool = False) -> Path:
@@ -1018,6 +1090,85 @@ def _set_weak_odr_on_perk_impls(module: ir.Module, units: list[Unit]) -> None:
                     fn.linkage = "weak_odr"
 
 
+def _hoist_static_allocas(mod_ir: ir.Module) -> int:
+    """Move every fixed-size `alloca` into its function's entry block. Returns how many moved.
+
+    Many emitters allocate a scratch slot where they need it: the `??` payload, an enum
+    temporary, a destructor's loop counter. Outside the entry block LLVM treats an `alloca`
+    as dynamic, so one inside a loop grows the frame on every iteration and a few hundred
+    thousand iterations overflow the stack. Its contents are undefined on each execution,
+    so one slot per function is the same program. Moved to the front, in order; a counted
+    `alloca` (a runtime-sized buffer) stays put.
+    """
+    moved = 0
+    for fn in mod_ir.functions:
+        if fn.is_declaration or len(fn.blocks) < 2:
+            continue
+        entry = fn.blocks[0]
+        hoisted = []
+        for block in fn.blocks[1:]:
+            keep = []
+            for instr in block.instructions:
+                if isinstance(instr, ir.AllocaInstr) and not instr.operands:
+                    instr.parent = entry
+                    hoisted.append(instr)
+                else:
+                    keep.append(instr)
+            if len(keep) != len(block.instructions):
+                block.instructions[:] = keep
+        if hoisted:
+            entry.instructions[:0] = hoisted
+            moved += len(hoisted)
+    return moved
+
+
+def _parse_module(mod_ir: ir.Module, dump_banner: Optional[str] = None) -> llvm.ModuleRef:
+    """Hand an `ir.Module` to LLVM. The IR is printed to text exactly once.
+
+    llvmlite's only bridge from `ir` to `binding` is the textual IR, and for a large
+    program that text is megabytes: the `--dump-ll` listing reuses it rather than
+    printing the module a second time.
+    """
+    hoisted = _hoist_static_allocas(mod_ir)
+    if timing.enabled():
+        timing.count("hoisted_allocas", hoisted)
+        defined = [fn for fn in mod_ir.functions if not fn.is_declaration]
+        timing.count("ir_functions", len(defined))
+        timing.count("ir_instructions", sum(len(block.instructions)
+                                            for fn in defined for block in fn.blocks))
+    with timing.phase("print-ir"):
+        ir_text = str(mod_ir)
+    if dump_banner is not None:
+        print(dump_banner)
+        for i, line in enumerate(ir_text.splitlines(), 1):
+            print(f"{i:4} {line}")
+    with timing.phase("parse-assembly"):
+        return llvm.parse_assembly(ir_text)
+
+
+def _emit_object(tm: llvm.TargetMachine, llmod: llvm.ModuleRef) -> bytes:
+    """Run LLVM's code generator over `llmod`: the object file, as bytes."""
+    with timing.phase("emit-object"):
+        return tm.emit_object(llmod)
+
+
+# Symbols an LTO executable must keep external: the C entry point.
+_LTO_EXPORTED_SYMBOLS = frozenset({"main"})
+
+
+def _internalize_for_lto(llmod: llvm.ModuleRef) -> None:
+    """Give every definition but the exported ones internal linkage.
+
+    LLVM's own intrinsic globals (`llvm.global_ctors`, ...) keep their linkage.
+    """
+    for value in (*llmod.functions, *llmod.global_variables):
+        if value.is_declaration or value.name in _LTO_EXPORTED_SYMBOLS:
+            continue
+        if value.name.startswith("llvm."):
+            continue
+        value.linkage = llvm.Linkage.internal
+
+
 def _set_linkonce_odr_on_inline_runtime(module: ir.Module) -> None:
     """Set linkonce_odr linkage on inline-defined runtime functions."""
     for name in _INLINE_RUNTIME_FUNCTIONS:
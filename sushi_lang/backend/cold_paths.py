@@ -0,0 +1,63 @@
+"""Out-of-line cold paths: the rarely taken half of a hot container operation, emitted once.
+
+`List.push`/`insert` reallocating and `HashMap.insert` resizing run a few dozen times over
+a program's life, yet each call site used to carry the whole sequence inline. Here it
+becomes one `cold noinline` function per monomorphized container type, so a call site
+keeps only its compare and a branch weighted towards the fast path.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+import llvmlite.ir as ir
+
+if TYPE_CHECKING:
+    from sushi_lang.backend.codegen_llvm import LLVMCodegen
+
+
+# `!prof branch_weights` for (taken, not taken) on a branch into a cold path: the weights
+# clang gives `__builtin_expect(cond, 0)`.
+UNLIKELY_WEIGHTS = (1, 2000)
+
+
+def emit_unlikely_branch(builder: ir.IRBuilder, cond: ir.Value,
+                         cold_block: ir.Block, hot_block: ir.Block) -> None:
+    """Branch to `cold_block` when `cond` holds, telling LLVM that it almost never does."""
+    branch = builder.cbranch(cond, cold_block, hot_block)
+    branch.set_weights(list(UNLIKELY_WEIGHTS))
+
+
+def get_or_emit_cold_function(codegen: 'LLVMCodegen', symbol: str, fn_ty: ir.FunctionType,
+                              emit_body: Callable[[ir.Function], None]) -> ir.Function:
+    """Get (or lazily emit) the `cold noinline` function `symbol` in the current module.
+
+    `emit_body(fn)` runs with the builder positioned in `fn` and must end the body with a
+    `ret`. Like `lifecycle.get_or_emit_lifecycle_func`, the body is emitted mid-emission of
+    another function, so the ambient builder and function are swapped and restored. The
+    entry block and its alloca builder are swapped too: a body that reaches for
+    `memory.entry_alloca` must get a slot in `fn`, not in the caller.
+    """
+    existing = codegen.module.globals.get(symbol)
+    if isinstance(existing, ir.Function):
+        return existing
+
+    fn = ir.Function(codegen.module, fn_ty, name=symbol)
+    fn.linkage = "linkonce_odr"
+    fn.attributes.add("cold")
+    fn.attributes.add("noinline")
+
+    entry = fn.append_basic_block(name="entry")
+    start = fn.append_basic_block(name="start")
+    alloca_builder = ir.IRBuilder(entry)
+
+    saved = (codegen.builder, codegen.func, codegen.entry_block,
+             codegen.alloca_builder, codegen.entry_branch)
+    codegen.builder, codegen.func = ir.IRBuilder(start), fn
+    codegen.entry_block, codegen.alloca_builder = entry, alloca_builder
+    codegen.entry_branch = alloca_builder.branch(start)
+    try:
+        emit_body(fn)
+    finally:
+        (codegen.builder, codegen.func, codegen.entry_block,
+         codegen.alloca_builder, codegen.entry_branch) = saved
+    return fn
@@ -84,8 +84,8 @@ from sushi_lang.backend.constants.error_codes import (
 )
 
 from sushi_lang.backend.constants.hash_constants import (
-    FNV1A_OFFSET_BASIS,
-    FNV1A_PRIME,
+    HASH_SECRET,
+    HASH_SEED,
 )
 
 __all__ = [
@@ -157,6 +157,6 @@ __all__ = [
     'MAYBE_NONE_TAG',
     'RE_ARRAY_INDEX_OUT_OF_BOUNDS',
     'RE_MEMORY_ALLOCATION_FAILURE',
-    'FNV1A_OFFSET_BASIS',
-    'FNV1A_PRIME',
+    'HASH_SECRET',
+    'HASH_SEED',
 ]
@@ -1,10 +1,20 @@
 """Hash algorithm constants."""
 
 # ============================================================================
-# FNV-1a Hash Algorithm Constants
+# wyhash-style Hash Constants
 # ============================================================================
-# 64-bit FNV-1a hash constants for consistent hashing across all types
-# Algorithm: hash = (hash XOR byte) * FNV_PRIME
+# The four 64-bit secrets of wyhash's default key. Every hash mixes with
+#   mix(a, b) = lo64(a * b) XOR hi64(a * b)   (full 128-bit product)
+# which folds both halves of the product back into one well-distributed word.
 
-FNV1A_OFFSET_BASIS = 14695981039346656037  # 0xcbf29ce484222325 (64-bit)
-FNV1A_PRIME = 1099511628211                # 0x100000001b3 (64-bit)
+HASH_SECRET = (
+    0x2d358dccaa6c78a5,
+    0x8bb84b93962eacc9,
+    0x4b33a62ed433d4a3,
+    0x4d5a2da51de1aa47,
+)
+
+# The state every hash starts from: mix(HASH_SECRET[0], HASH_SECRET[1]), i.e. what
+# wyhash's seed becomes for seed 0. Never HASH_SECRET[0] itself: combining into that
+# state would cancel the secret and zero the product.
+HASH_SEED = 0xca813bf4c7abf0a9
@@ -120,14 +120,26 @@ def emit_string_destructor_from_value(
     fat: ir.Value
 ) -> None:
     """Owned-bit-guarded free given the SSA fat value directly (`if owned: free(data)`) (#145).
+
+    A `file.mmap()` view carries STRING_OWNED_MAPPED and is munmapped rather than freed.
     """
+    from sushi_lang.sushi_stdlib.src.type_definitions import STRING_OWNED_MAPPED
+    from sushi_lang.sushi_stdlib.src._platform.posix.files import declare_munmap
+
     builder = codegen.builder
     owned = builder.extract_value(fat, 2, name="string_owned")
     is_owned = builder.icmp_unsigned("!=", owned, ir.Constant(owned.type, 0))
     with builder.if_then(is_owned):
         data_ptr = builder.extract_value(fat, 0, name="string_data")
-        free_fn = codegen.get_free_func()
-        builder.call(free_fn, [data_ptr])
+        is_mapped = builder.icmp_unsigned(
+            "==", owned, ir.Constant(owned.type, STRING_OWNED_MAPPED), name="string_mapped")
+        with builder.if_else(is_mapped) as (then_unmap, otherwise_free):
+            with then_unmap:
+                size = builder.extract_value(fat, 1, name="string_size")
+                builder.call(declare_munmap(codegen.module),
+                             [data_ptr, builder.zext(size, ir.IntType(64))])
+            with otherwise_free:
+                builder.call(codegen.get_free_func(), [data_ptr])
 
 
 def _emit_dynamic_array_destructor(
@@ -1,7 +1,7 @@
 """Main call dispatcher for function and method calls."""
 from __future__ import annotations
 import itertools
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from llvmlite import ir
 from sushi_lang.semantics.ast import Call, MethodCall, DotCall, Name
@@ -33,8 +33,8 @@ def emit_function_call(codegen: 'LLVMCodegen', expr: Call, to_i1: bool) -> ir.Va
 
     fn_value = _try_function_value_local(codegen, callee)
     if fn_value is not None:
-        fat_value, fn_type = fn_value
-        return _emit_indirect_call(codegen, expr, fat_value, fn_type, to_i1)
+        fat_value, fn_type, known = fn_value
+        return _emit_indirect_call(codegen, expr, fat_value, fn_type, to_i1, known)
 
     if callee in codegen.struct_table.by_name:
         from sushi_lang.backend.expressions import structs
@@ -112,7 +112,11 @@ def emit_fn_field_call(codegen: 'LLVMCodegen', expr: DotCall, fn_type, to_i1: bo
 
 
 def _try_function_value_local(codegen: 'LLVMCodegen', name: str):
-    """If `name` is a function-valued local, return `(fat_value, FunctionType)`, else None."""
+    """If `name` is a function-valued local, return `(fat_value, FunctionType, known)`, else None.
+
+    `known` is the lifted lambda the local's `let` bound when the lift pass proved it is
+    only ever called (`Let.known_callee`), else None.
+    """
     from sushi_lang.semantics.typesys import FunctionType
     slot = codegen.memory.try_find_local_slot(name)
     if slot is None:
@@ -121,12 +125,12 @@ def _try_function_value_local(codegen: 'LLVMCodegen', name: str):
     if not isinstance(sem_ty, FunctionType):
         return None
     fat_value = codegen.builder.load(slot, name=f"{name}_fnval")
-    return fat_value, sem_ty
+    return fat_value, sem_ty, codegen.memory.known_callee(slot)
 
 
 def _emit_indirect_call(codegen: 'LLVMCodegen', expr: Call, fat_value: 'ir.Value',
-                        fn_type, to_i1: bool) -> ir.Value:
-    """Emit an indirect call through a function value (fat pointer)."""
+                        fn_type, to_i1: bool, known: Optional[str] = None) -> ir.Value:
+    """Emit a call through a function value (fat pointer), directly when `known` names its function."""
     from sushi_lang.backend.runtime import closures
     from sushi_lang.semantics.param_modes import CalleeKind, effective_modes
     args = [codegen.expressions.emit_expr(a) for a in expr.args]
@@ -135,6 +139,9 @@ def _emit_indirect_call(codegen: 'LLVMCodegen', expr: Call, fat_value: 'ir.Value
     settle_call_arguments(
         codegen, list(expr.args), args, list(fn_type.param_types),
         effective_modes(fn_type.modes, CalleeKind.INDIRECT))
+    target = codegen.funcs.get(known) if known is not None else None
+    if target is not None:
+        return closures.emit_known_call(codegen, target, fat_value, fn_type, args, to_i1)
     return closures.emit_indirect_call(codegen, fat_value, fn_type, args, to_i1)
 
 
@@ -170,6 +177,7 @@ def settle_call_arguments(codegen: 'LLVMCodegen', arg_exprs: list, args: list,
     """THE call-argument seam: give every argument exactly one owner, in place."""
     from sushi_lang.backend.destructors import needs_cleanup
     from sushi_lang.backend.expressions.memory import expression_is_temporary
+    from sushi_lang.backend.runtime.closures import env_on_stack
 
     for i, mode in enumerate(modes):
         if i >= len(args) or i >= len(arg_exprs):
@@ -182,7 +190,9 @@ def settle_call_arguments(codegen: 'LLVMCodegen', arg_exprs: list, args: list,
             args[i] = consume(codegen, arg_expr, args[i], resolved,
                               ConsumingUse.CALL_ARG)
         elif (resolved is not None and needs_cleanup(resolved)
-                and expression_is_temporary(codegen, arg_expr)):
+                and expression_is_temporary(codegen, arg_expr)
+                and not env_on_stack(codegen, arg_expr)):
+            # A stack environment is the caller's frame: there is nothing to free.
             _park_argument_temp(codegen, args[i], resolved)
 
 
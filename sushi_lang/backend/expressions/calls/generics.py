@@ -104,10 +104,10 @@ def try_emit_hashmap_method(codegen: 'LLVMCodegen', expr: Union[MethodCall, DotC
             and receiver_semantic_type.name.startswith("HashMap<")):
         return None
 
-    # `HashMap.new()` is a static call: its receiver is the type name, not a value.
-    # Every other method mutates or probes the table and wants a POINTER; a receiver
-    # with no address (a call result) falls back to the value.
-    if method == "new":
+    # `HashMap.new()` / `HashMap.with_capacity()` are static calls: the receiver is the
+    # type name, not a value. Every other method mutates or probes the table and wants a
+    # POINTER; a receiver with no address (a call result) falls back to the value.
+    if method in ("new", "with_capacity"):
         receiver_value = None
     else:
         receiver_value = emit_receiver_as_pointer(
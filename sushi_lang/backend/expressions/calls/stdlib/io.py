@@ -70,6 +70,10 @@ def emit_stdlib_stdio_call(
             stdlib_func = declare_stdlib_function(codegen.module, func_name, i32, [array_struct_ty])
             return codegen.builder.call(stdlib_func, [arg_value], name=f"{stream_name}_write_bytes_result")
 
+        elif method == "flush":
+            stdlib_func = declare_stdlib_function(codegen.module, func_name, i32, [])
+            return codegen.builder.call(stdlib_func, [], name=f"{stream_name}_flush_result")
+
     raise_internal_error("CE0028", method=method)
 
 
@@ -91,7 +95,7 @@ def emit_stdlib_file_call(
 
     from sushi_lang.backend.functions import declare_stdlib_function
 
-    if method in ("read", "readln", "readch"):
+    if method in ("read", "mmap", "readln", "readch"):
         string_struct_ty = ir.LiteralStructType([i8_ptr, i32, ir.IntType(8)])  # {data, size, owned} (#145)
         stdlib_func = declare_stdlib_function(codegen.module, func_name, string_struct_ty, [i8_ptr])
         result = codegen.builder.call(stdlib_func, [file_ptr], name=f"file_{method}_result")
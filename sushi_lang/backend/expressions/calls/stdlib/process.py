@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from llvmlite import ir
-from sushi_lang.backend.constants import INT32_BIT_WIDTH
+from sushi_lang.backend.constants import INT8_BIT_WIDTH, INT32_BIT_WIDTH
 from sushi_lang.internals.errors import raise_internal_error
 from sushi_lang.semantics.typesys import BuiltinType
 from sushi_lang.backend.utils import require_builder
@@ -41,35 +41,83 @@ def emit_process_function(codegen: 'LLVMCodegen', expr, func_name: str, to_i1: b
 
         return codegen.utils.as_i1(result) if to_i1 else result
 
-    elif func_name == "run":
+    elif func_name in ("run", "run_input", "spawn"):
         # run(string cmd, ...string args) -> Result<ProcessOutput, ProcessError>
+        # run_input(string cmd, string input, ...string args) -> the same, `input` fed to stdin
+        # spawn(string cmd, ...string args) -> Result<ChildProcess, ProcessError>
         # Variadic: the trailing string arguments are collected (or a single `arr...`
         # bloomed) into the argv string[], via the same machinery as user variadics.
-        if len(expr.args) < 1:
-            raise_internal_error("CE0023", method="run", expected=1, got=len(expr.args))
+        fixed = 2 if func_name == "run_input" else 1
+        if len(expr.args) < fixed:
+            raise_internal_error("CE0023", method=func_name, expected=fixed, got=len(expr.args))
 
         from sushi_lang.backend.expressions.calls.variadic import build_variadic_array
         from sushi_lang.semantics.typesys import DynamicArrayType
 
-        cmd_value = codegen.expressions.emit_expr(expr.args[0])   # string {i8*,i32}
-        if isinstance(cmd_value.type, ir.PointerType):
-            cmd_value = codegen.builder.load(cmd_value, name="run_cmd_val")
+        string_values = []
+        for arg in expr.args[:fixed]:
+            value = codegen.expressions.emit_expr(arg)   # string {i8*,i32}
+            if isinstance(value.type, ir.PointerType):
+                value = codegen.builder.load(value, name=f"{func_name}_string_val")
+            string_values.append(value)
 
         args_value = build_variadic_array(
-            codegen, expr.args[1:], DynamicArrayType(BuiltinType.STRING), "run",
+            codegen, expr.args[fixed:], DynamicArrayType(BuiltinType.STRING), func_name,
             callee_owns=False)
 
-        # Build Result<ProcessOutput, ProcessError> from the shared aligned-layout helper
-        # so the returned type matches both the .bc and the caller's variable type
-        # ({i32, [5 x i64]} -- aligned ProcessOutput size, 40 bytes -> K=5).
-        from sushi_lang.sushi_stdlib.src.type_definitions import get_process_output_result_type
-        result_type = get_process_output_result_type()
+        # Build the Result from the shared aligned-layout helpers so the returned type
+        # matches both the .bc and the caller's variable type ({i32, [5 x i64]} for
+        # ProcessOutput, 40 bytes -> K=5; {i32, [2 x i64]} for ChildProcess).
+        from sushi_lang.sushi_stdlib.src.type_definitions import (
+            get_child_process_result_type, get_process_output_result_type,
+        )
+        if func_name == "spawn":
+            result_type = get_child_process_result_type()
+        else:
+            result_type = get_process_output_result_type()
         argv_type = ir.LiteralStructType([i32, i32, string_type.as_pointer()])
 
         stdlib_func = declare_stdlib_function(
-            codegen.module, stdlib_func_name, result_type, [string_type, argv_type]
+            codegen.module, stdlib_func_name, result_type, [string_type] * fixed + [argv_type]
+        )
+        result = codegen.builder.call(stdlib_func, string_values + [args_value],
+                                      name=f"{func_name}_result")
+
+        return codegen.utils.as_i1(result) if to_i1 else result
+
+    elif func_name in ("next_line", "send", "close_stdin", "wait"):
+        # Each takes the ChildProcess spawn() returned; only its `id` crosses into the
+        # stdlib, which finds the child's pipes and buffers by it.
+        fixed = 2 if func_name == "send" else 1
+        if len(expr.args) != fixed:
+            raise_internal_error("CE0023", method=func_name, expected=fixed, got=len(expr.args))
+
+        child = codegen.expressions.emit_expr(expr.args[0])
+        if isinstance(child.type, ir.PointerType):
+            child = codegen.builder.load(child, name=f"{func_name}_child")
+        i64 = ir.IntType(64)
+        call_args = [codegen.builder.extract_value(child, 1, name=f"{func_name}_child_id")]
+        param_types = [i64]
+        if func_name == "send":
+            data = codegen.expressions.emit_expr(expr.args[1])   # string {i8*,i32}
+            if isinstance(data.type, ir.PointerType):
+                data = codegen.builder.load(data, name="send_string_val")
+            call_args.append(data)
+            param_types.append(string_type)
+
+        from sushi_lang.sushi_stdlib.src.type_definitions import (
+            get_maybe_type, get_process_output_result_type,
         )
-        result = codegen.builder.call(stdlib_func, [cmd_value, args_value], name="run_result")
+        if func_name == "next_line":
+            return_type = get_maybe_type(string_type)             # Maybe<string>: {i32, [2 x i64]}
+        elif func_name == "wait":
+            return_type = get_process_output_result_type()
+        else:
+            return_type = ir.IntType(INT8_BIT_WIDTH)              # bool
+
+        stdlib_func = declare_stdlib_function(codegen.module, stdlib_func_name, return_type,
+                                              param_types)
+        result = codegen.builder.call(stdlib_func, call_args, name=f"{func_name}_result")
 
         return codegen.utils.as_i1(result) if to_i1 else result
 
@@ -24,7 +24,16 @@ def emit_time_function(codegen: 'LLVMCodegen', expr, func_name: str, to_i1: bool
 
     from sushi_lang.backend.functions import declare_stdlib_function
 
-    # All time functions return i32 (0 on success, remaining microseconds if interrupted)
+    # The clocks return a bare i64 of nanoseconds
+    if func_name in ["now_ns", "monotonic_ns", "cpu_time_ns"]:
+        if len(expr.args) != 0:
+            raise_internal_error("CE0023", method=func_name, expected=0, got=len(expr.args))
+
+        stdlib_func = declare_stdlib_function(codegen.module, stdlib_func_name, i64, [])
+        result = codegen.builder.call(stdlib_func, [], name=f"{func_name}_result")
+        return codegen.utils.as_i1(result) if to_i1 else result
+
+    # The sleep functions return i32 (0 on success, remaining microseconds if interrupted)
     # But they're wrapped in Result<i32> at the semantic level
     # The actual LLVM functions return bare i32
 
@@ -112,7 +112,7 @@ def _stdlib_call_return_enum(codegen: 'LLVMCodegen', func_name: str) -> Optional
     from sushi_lang.backend.generics.result_builder import intern_result
 
     enums = codegen.enum_table.by_name
-    if func_name == 'getenv':
+    if func_name in ('getenv', 'next_line'):
         return enums.get('Maybe<string>')
 
     result_specs = {
@@ -132,11 +132,13 @@ def _stdlib_call_return_enum(codegen: 'LLVMCodegen', func_name: str) -> Optional
     }
     spec = result_specs.get(func_name)
     if spec is None:
-        if func_name == 'run':
-            out_struct = codegen.struct_table.by_name.get('ProcessOutput')
+        ok_struct_name = {'run': 'ProcessOutput', 'run_input': 'ProcessOutput',
+                          'wait': 'ProcessOutput', 'spawn': 'ChildProcess'}.get(func_name)
+        if ok_struct_name is not None:
+            ok_struct = codegen.struct_table.by_name.get(ok_struct_name)
             err_enum = enums.get('ProcessError')
-            if out_struct is not None and err_enum is not None:
-                return intern_result(codegen, out_struct, err_enum)
+            if ok_struct is not None and err_enum is not None:
+                return intern_result(codegen, ok_struct, err_enum)
         return None
     ok_type, err_name = spec
     err_enum = enums.get(err_name)
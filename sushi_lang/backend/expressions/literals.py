@@ -65,50 +65,48 @@ def emit_string_literal(codegen: 'LLVMCodegen', expr: StringLit) -> ir.Value:
 
 
 def emit_interpolated_string(codegen: 'LLVMCodegen', expr: InterpolatedString) -> ir.Value:
-    """Emit LLVM IR for interpolated string by concatenating string parts and expression values.
+    """Emit LLVM IR for interpolated string by formatting every part into one buffer.
     """
+    from sushi_lang.backend.runtime.formatting import FormatPiece
+
     if not expr.parts:
         return codegen.runtime.strings.emit_string_literal("")
 
     if len(expr.parts) == 1 and isinstance(expr.parts[0], str):
         return codegen.runtime.strings.emit_string_literal(expr.parts[0])
 
-    # Build list of (value, is_fresh) to concatenate. `is_fresh` marks a heap temporary this
-    # interpolation OWNS and may free after it is consumed (a to-string / concat buffer);
-    # a literal (owned=0) or an existing string variable (a BORROW aliasing another owner)
-    # is NOT fresh and must never be freed here (#145).
-    string_values = []
-    fresh_flags = []
+    # Build the pieces to write, and the FRESH string temporaries among them. A fresh
+    # value is a heap temporary this interpolation OWNS and frees once its bytes are
+    # copied; a literal (owned=0) or an existing string variable (a BORROW aliasing
+    # another owner) must never be freed here (#145).
+    pieces = []
+    fresh_values = []
 
     for part in expr.parts:
         if isinstance(part, str):
-            string_values.append(codegen.runtime.strings.emit_string_literal(part))
-            fresh_flags.append(False)
+            pieces.append(FormatPiece("string", codegen.runtime.strings.emit_string_literal(part)))
         else:
             expr_value = codegen.expressions.emit_expr(part)
 
             if codegen.types.is_string_type(expr_value.type):
                 # A string part with a live owner is a BORROW -- never free it here. A
                 # TEMPORARY part is owned by nobody: inside a print-arg frame the frame
-                # frees it after output, outside one the concat loop does.
+                # frees it after output, outside one this function does.
                 from sushi_lang.backend.expressions.memory import expression_is_temporary
                 if expression_is_temporary(codegen, part):
                     if codegen._string_temp_stack:
                         codegen.register_string_value_temp(expr_value)
-                        fresh_flags.append(False)
                     else:
-                        fresh_flags.append(True)
-                else:
-                    fresh_flags.append(False)
-                string_values.append(expr_value)
+                        fresh_values.append(expr_value)
+                pieces.append(FormatPiece("string", expr_value))
             else:
                 llvm_type = expr_value.type
 
                 if isinstance(llvm_type, ir.IntType):
                     width = llvm_type.width
                     if width == 1:
-                        string_values.append(codegen.runtime.formatting.emit_bool_to_string(expr_value))
-                        fresh_flags.append(True)
+                        pieces.append(FormatPiece(
+                            "string", codegen.runtime.formatting.emit_bool_to_string(expr_value)))
                     elif width in [8, 16, 32, 64]:
                         from sushi_lang.semantics.typesys import BuiltinType
                         from sushi_lang.backend.expressions.type_utils import (
@@ -119,8 +117,8 @@ def emit_interpolated_string(codegen: 'LLVMCodegen', expr: InterpolatedString) -
                         # its 1/0 rendering.
                         inferred = getattr(part, 'inferred_return_type', None)
                         if inferred == BuiltinType.BOOL:
-                            string_values.append(codegen.runtime.formatting.emit_bool_to_string(expr_value))
-                            fresh_flags.append(True)
+                            pieces.append(FormatPiece(
+                                "string", codegen.runtime.formatting.emit_bool_to_string(expr_value)))
                             continue
 
                         # Signedness from the part's semantic type - the same source the
@@ -128,37 +126,25 @@ def emit_interpolated_string(codegen: 'LLVMCodegen', expr: InterpolatedString) -
                         # to its own reconstruction.
                         part_type = infer_expr_semantic_type(codegen, part)
                         is_signed = not is_unsigned_type(part_type)
-                        string_values.append(codegen.runtime.formatting.emit_integer_to_string(expr_value, is_signed=is_signed, bit_width=width))
-                        fresh_flags.append(True)
+                        pieces.append(FormatPiece("int", expr_value, is_signed))
                     else:
                         raise_internal_error("CE0022", type=f"i{width}")
                 elif isinstance(llvm_type, (ir.FloatType, ir.DoubleType)):
-                    is_double = isinstance(llvm_type, ir.DoubleType)
-                    string_values.append(codegen.runtime.formatting.emit_float_to_string(expr_value, is_double=is_double))
-                    fresh_flags.append(True)
+                    pieces.append(FormatPiece("float", expr_value))
                 else:
                     raise_internal_error("CE0022", type=str(llvm_type))
 
-    if len(string_values) == 1:
-        return string_values[0]
+    if len(pieces) == 1 and pieces[0].kind == "string":
+        return pieces[0].value
+
+    # One size pass and one allocation for the whole chain; numbers are formatted straight
+    # into the result instead of through their own heap buffers.
+    result = codegen.runtime.formatting.emit_interpolation(pieces)
 
-    # Each consumed FRESH intermediate is freed once the concat has copied its bytes
-    # (#145); a literal or borrowed part is never freed, and the result goes to its new
-    # owner unfreed. Skipped inside a print argument, where the #141 registry already
-    # frees them.
+    # Each fresh temporary is freed once its bytes are copied (#145); the result goes to
+    # its new owner unfreed. Inside a print argument the #141 registry frees them instead.
     from sushi_lang.backend.destructors import emit_string_destructor_from_value
-    free_intermediates = not codegen._string_temp_stack
-
-    result = string_values[0]
-    result_fresh = fresh_flags[0]
-    for string_value, sv_fresh in zip(string_values[1:], fresh_flags[1:], strict=True):
-        new_result = codegen.runtime.strings.emit_string_concat(result, string_value)
-        if free_intermediates:
-            if result_fresh:
-                emit_string_destructor_from_value(codegen, result)
-            if sv_fresh:
-                emit_string_destructor_from_value(codegen, string_value)
-        result = new_result
-        result_fresh = True  # a concat output is always a fresh heap buffer
+    for value in fresh_values:
+        emit_string_destructor_from_value(codegen, value)
 
     return result
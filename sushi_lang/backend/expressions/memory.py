@@ -491,7 +491,7 @@ def _clone_hashmap_value(codegen: 'LLVMCodegen', value: ir.Value, value_type: St
     """Deep-copy a HashMap<K, V>: fresh bucket buffer, deep-cloned owning keys/values."""
     from sushi_lang.semantics.generics.hashmap import extract_key_value_types
     from sushi_lang.backend.generics.hashmap.types import get_entry_type, ENTRY_OCCUPIED
-    from sushi_lang.backend.generics.hashmap.utils import emit_entry_state_check
+    from sushi_lang.backend.generics.hashmap.utils import emit_bucket_bytes, emit_entry_state_check
     from sushi_lang.backend.generics.container_walk import emit_container_walk
     from sushi_lang.backend.constants import ENTRY_KEY_INDICES, ENTRY_VALUE_INDICES
 
@@ -508,10 +508,9 @@ def _clone_hashmap_value(codegen: 'LLVMCodegen', value: ir.Value, value_type: St
 
     is_not_null = b.icmp_unsigned("!=", data, ir.Constant(data.type, None))
     with b.if_then(is_not_null):
-        entry_size_i64 = b.zext(get_element_size_constant(codegen, entry_llvm),
-                                ir.IntType(INT64_BIT_WIDTH))
-        cap_i64 = b.zext(capacity, ir.IntType(INT64_BIT_WIDTH))
-        total_bytes = b.mul(cap_i64, entry_size_i64)
+        # The whole buffer: the cached hashes (and, under the swiss layout, the control
+        # bytes) follow the entries and are copied as they are.
+        total_bytes = emit_bucket_bytes(codegen, entry_llvm, capacity)
         new_raw = emit_malloc(codegen, codegen.builder, total_bytes)
         new_data = codegen.builder.bitcast(new_raw, ir.PointerType(entry_llvm),
                                            name="hm_new_data")
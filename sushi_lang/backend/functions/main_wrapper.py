@@ -6,6 +6,7 @@ from llvmlite import ir
 from sushi_lang.semantics.ast import FuncDef
 from sushi_lang.semantics.typesys import Type as Ty
 from sushi_lang.backend import enum_utils
+from sushi_lang.backend.runtime.output import emit_stdout_setup
 from sushi_lang.internals.errors import raise_internal_error
 
 if TYPE_CHECKING:
@@ -54,6 +55,7 @@ class MainFunctionWrapper:
         user_main = create_user_main_fn(fn)
 
         begin_function_fn(c_main)
+        emit_stdout_setup(self.codegen)
 
         argc = c_main.args[0]  # int argc
         argv = c_main.args[1]  # char** argv
@@ -127,6 +129,7 @@ class MainFunctionWrapper:
         user_main = create_user_main_fn(fn)
 
         begin_function_fn(c_main)
+        emit_stdout_setup(self.codegen)
 
         user_main_args = []
         for param in fn.params:
@@ -22,7 +22,10 @@ def emit_container_walk(
     null_guard: bool = False,
     prefix: str = "walk",
 ) -> None:
-    """Walk `data_ptr[0..count)`, calling `on_element` for each element."""
+    """Walk `data_ptr[0..count)`, calling `on_element` for each element.
+
+    The index has `count`'s type: i32 for arrays and lists, i64 for a HashMap's slots.
+    """
     builder = codegen.builder
 
     if null_guard:
@@ -44,11 +47,11 @@ def _emit_walk(
     prefix: str,
 ) -> None:
     builder = codegen.builder
-    i32 = codegen.types.i32
-    zero = ir.Constant(i32, 0)
-    one = ir.Constant(i32, 1)
+    index_type = count.type
+    zero = ir.Constant(index_type, 0)
+    one = ir.Constant(index_type, 1)
 
-    index_slot = builder.alloca(i32, name=f"{prefix}_i")
+    index_slot = builder.alloca(index_type, name=f"{prefix}_i")
     builder.store(zero, index_slot)
 
     cond_bb = builder.append_basic_block(name=f"{prefix}_cond")
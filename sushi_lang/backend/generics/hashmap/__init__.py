@@ -11,6 +11,7 @@ from sushi_lang.semantics.generics.hashmap import (
 
 from .methods import (
     emit_hashmap_new,
+    emit_hashmap_with_capacity,
     emit_hashmap_len,
     emit_hashmap_is_empty,
     emit_hashmap_tombstone_count,
@@ -18,6 +19,7 @@ from .methods import (
     emit_hashmap_contains_key,
     emit_hashmap_insert,
     emit_hashmap_remove,
+    emit_hashmap_reserve,
     emit_hashmap_rehash,
     emit_hashmap_free,
     emit_hashmap_destroy,
@@ -47,6 +49,8 @@ def emit_hashmap_method(
 
     if method == "new":
         result = emit_hashmap_new(codegen, receiver_type)
+    elif method == "with_capacity":
+        result = emit_hashmap_with_capacity(codegen, expr, receiver_type)
     elif method == "insert":
         result = emit_hashmap_insert(codegen, expr, receiver_value, receiver_type)
     elif method == "get":
@@ -55,6 +59,8 @@ def emit_hashmap_method(
         result = emit_hashmap_contains_key(codegen, expr, receiver_value, receiver_type)
     elif method == "remove":
         result = emit_hashmap_remove(codegen, expr, receiver_value, receiver_type)
+    elif method == "reserve":
+        result = emit_hashmap_reserve(codegen, expr, receiver_value, receiver_type)
     elif method == "rehash":
         result = emit_hashmap_rehash(codegen, receiver_value, receiver_type)
     elif method == "free":
@@ -95,10 +101,12 @@ __all__ = [
     'validate_hashmap_method_with_validator',
     'emit_hashmap_method',
     'emit_hashmap_new',
+    'emit_hashmap_with_capacity',
     'emit_hashmap_insert',
     'emit_hashmap_get',
     'emit_hashmap_contains_key',
     'emit_hashmap_remove',
+    'emit_hashmap_reserve',
     'emit_hashmap_len',
     'emit_hashmap_is_empty',
     'emit_hashmap_tombstone_count',
@@ -2,6 +2,7 @@
 
 from .core import (
     emit_hashmap_new,
+    emit_hashmap_with_capacity,
     emit_hashmap_len,
     emit_hashmap_is_empty,
     emit_hashmap_tombstone_count,
@@ -11,6 +12,7 @@ from .core import (
 from .mutations import (
     emit_hashmap_insert,
     emit_hashmap_remove,
+    emit_hashmap_reserve,
     emit_hashmap_rehash,
     emit_hashmap_free,
     emit_hashmap_destroy
@@ -20,6 +22,7 @@ from .iterators import emit_hashmap_keys, emit_hashmap_values, emit_hashmap_entr
 
 __all__ = [
     'emit_hashmap_new',
+    'emit_hashmap_with_capacity',
     'emit_hashmap_len',
     'emit_hashmap_is_empty',
     'emit_hashmap_tombstone_count',
@@ -27,6 +30,7 @@ __all__ = [
     'emit_hashmap_contains_key',
     'emit_hashmap_insert',
     'emit_hashmap_remove',
+    'emit_hashmap_reserve',
     'emit_hashmap_rehash',
     'emit_hashmap_free',
     'emit_hashmap_destroy',
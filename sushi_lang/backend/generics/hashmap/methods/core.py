@@ -4,7 +4,7 @@ from typing import Any
 from sushi_lang.semantics.ast import MethodCall, Name
 from sushi_lang.semantics.typesys import StructType, BuiltinType
 import llvmlite.ir as ir
-from ..types import get_entry_type
+from ..types import get_entry_type, MIN_CAPACITY
 from sushi_lang.backend.constants import (
     HASHMAP_BUCKETS_INDICES,
     HASHMAP_SIZE_INDICES,
@@ -15,44 +15,61 @@ from sushi_lang.backend.constants import (
     ENTRY_VALUE_INDICES,
 )
 from sushi_lang.semantics.generics.hashmap import extract_key_value_types
-from ..utils import emit_key_equality_check, emit_init_buckets_empty
-from ..probe import emit_probe_loop, ProbeSlot
+from ..utils import (
+    emit_key_equality_check,
+    emit_alloc_buckets,
+    emit_capacity_for,
+    emit_entry_count_arg,
+)
+from ..probe import emit_key_probe, ProbeSlot
 from sushi_lang.internals.errors import raise_internal_error
-from sushi_lang.backend.memory.heap import emit_malloc
-from sushi_lang.backend.expressions.memory import get_element_size_constant
 
 
 def emit_hashmap_new(codegen: Any, hashmap_type: StructType) -> ir.Value:
     """Emit HashMap<K, V>.new() -> HashMap<K, V>"""
+    capacity = ir.Constant(codegen.types.i64, MIN_CAPACITY)
+    return _emit_empty_hashmap(codegen, hashmap_type, capacity)
+
+
+def emit_hashmap_with_capacity(codegen: Any, expr: MethodCall, hashmap_type: StructType) -> ir.Value:
+    """Emit HashMap<K, V>.with_capacity(n) -> HashMap<K, V>
+
+    Sized so the first `n` inserts never resize: bulk-loading a map from `new()` would
+    rehash every entry loaded so far at each doubling.
+    """
+    if len(expr.args) != 1:
+        raise_internal_error("CE0023", method="with_capacity", expected=1, got=len(expr.args))
+
+    entries = emit_entry_count_arg(codegen, expr.args[0])
+    capacity = emit_capacity_for(codegen, entries)
+    return _emit_empty_hashmap(codegen, hashmap_type, capacity)
+
+
+def _emit_empty_hashmap(codegen: Any, hashmap_type: StructType, capacity: ir.Value) -> ir.Value:
+    """An empty HashMap<K, V> value over a fresh bucket buffer of `capacity` slots."""
     key_type, value_type = extract_key_value_types(hashmap_type, codegen)
 
     entry_type = get_entry_type(codegen, key_type, value_type)
     hashmap_llvm_type = codegen.types.ll_type(hashmap_type)
 
-    initial_capacity = 16
-    capacity_const = ir.Constant(codegen.types.i32, initial_capacity)
+    bucket_ptr = emit_alloc_buckets(codegen, entry_type, capacity)
 
-    entry_size = get_element_size_constant(codegen, entry_type)
-    total_bytes = codegen.builder.mul(entry_size, capacity_const, name="bucket_bytes")
-
-    total_bytes_i64 = codegen.builder.zext(total_bytes, ir.IntType(64), name="total_bytes_i64")
-    bucket_ptr_i8 = emit_malloc(codegen, codegen.builder, total_bytes_i64)
-    bucket_ptr = codegen.builder.bitcast(bucket_ptr_i8, ir.PointerType(entry_type), name="buckets_ptr")
-
-    zero_i32 = ir.Constant(codegen.types.i32, 0)
-    emit_init_buckets_empty(codegen, bucket_ptr, capacity_const)
+    zero_i64 = ir.Constant(codegen.types.i64, 0)
 
+    # The buckets array's own len/cap are i32 and read by nothing; the i64 `capacity`
+    # field is the one the methods use. Saturate rather than wrap past 2^31 - 1.
+    buckets_cap = _emit_saturate_i32(codegen, capacity, "buckets_cap_i32")
     buckets_array_type = ir.LiteralStructType([codegen.types.i32, codegen.types.i32, ir.PointerType(entry_type)])
     buckets_array = ir.Constant(buckets_array_type, ir.Undefined)
-    buckets_array = codegen.builder.insert_value(buckets_array, capacity_const, 0, name="buckets_len")
-    buckets_array = codegen.builder.insert_value(buckets_array, capacity_const, 1, name="buckets_cap")
+    buckets_array = codegen.builder.insert_value(buckets_array, buckets_cap, 0, name="buckets_len")
+    buckets_array = codegen.builder.insert_value(buckets_array, buckets_cap, 1, name="buckets_cap")
     buckets_array = codegen.builder.insert_value(buckets_array, bucket_ptr, 2, name="buckets_data")
 
     result = ir.Constant(hashmap_llvm_type, ir.Undefined)
     result = codegen.builder.insert_value(result, buckets_array, 0, name="hm_buckets")
-    result = codegen.builder.insert_value(result, zero_i32, 1, name="hm_size")
-    result = codegen.builder.insert_value(result, capacity_const, 2, name="hm_capacity")
-    result = codegen.builder.insert_value(result, zero_i32, 3, name="hm_tombstones")
+    result = codegen.builder.insert_value(result, zero_i64, 1, name="hm_size")
+    result = codegen.builder.insert_value(result, capacity, 2, name="hm_capacity")
+    result = codegen.builder.insert_value(result, zero_i64, 3, name="hm_tombstones")
 
     return result
 
@@ -61,21 +78,35 @@ def emit_hashmap_len(codegen: Any, hashmap_value: ir.Value) -> ir.Value:
     """Emit HashMap<K, V>.len() -> i32"""
     builder = codegen.builder
     size_ptr = builder.gep(hashmap_value, HASHMAP_SIZE_INDICES, name="size_ptr")
-    return builder.load(size_ptr, name="hashmap_size")
+    size = builder.load(size_ptr, name="hashmap_size")
+    return _emit_saturate_i32(codegen, size, "hashmap_len")
 
 
 def emit_hashmap_is_empty(codegen: Any, hashmap_value: ir.Value) -> ir.Value:
     """Emit HashMap<K, V>.is_empty() -> bool"""
-    size = emit_hashmap_len(codegen, hashmap_value)
-    zero = ir.Constant(codegen.types.i32, 0)
-    return codegen.builder.icmp_signed("==", size, zero, name="is_empty")
+    builder = codegen.builder
+    size_ptr = builder.gep(hashmap_value, HASHMAP_SIZE_INDICES, name="size_ptr")
+    size = builder.load(size_ptr, name="hashmap_size")
+    zero = ir.Constant(codegen.types.i64, 0)
+    return builder.icmp_signed("==", size, zero, name="is_empty")
 
 
 def emit_hashmap_tombstone_count(codegen: Any, hashmap_value: ir.Value) -> ir.Value:
     """Emit HashMap<K, V>.tombstone_count() -> i32"""
     builder = codegen.builder
     tombstones_ptr = builder.gep(hashmap_value, HASHMAP_TOMBSTONES_INDICES, name="tombstones_ptr")
-    return builder.load(tombstones_ptr, name="hashmap_tombstones")
+    tombstones = builder.load(tombstones_ptr, name="hashmap_tombstones")
+    return _emit_saturate_i32(codegen, tombstones, "hashmap_tombstone_count")
+
+
+def _emit_saturate_i32(codegen: Any, count: ir.Value, name: str) -> ir.Value:
+    """An i64 count as the i32 `len()` returns, pinned at i32 max past 2^31 - 1."""
+    builder = codegen.builder
+    i32_max = 2**31 - 1
+    too_big = builder.icmp_signed(">", count, ir.Constant(codegen.types.i64, i32_max),
+                                  name=f"{name}_saturates")
+    clamped = builder.select(too_big, ir.Constant(codegen.types.i64, i32_max), count)
+    return builder.trunc(clamped, codegen.types.i32, name=name)
 
 
 def emit_hashmap_get(
@@ -119,7 +150,6 @@ def emit_hashmap_get(
     )
 
     hash_value = hash_method.llvm_emitter(codegen, fake_call, key_value, codegen.types.ll_type(key_type), False)
-    hash_i32 = builder.trunc(hash_value, codegen.types.i32, name="hash_i32")
 
     found_bb = builder.append_basic_block(name="get_found")
     not_found_bb = builder.append_basic_block(name="get_not_found")
@@ -140,8 +170,8 @@ def emit_hashmap_get(
         keys_equal = emit_key_equality_check(codegen, key_type, key_value, entry_key)
         builder.cbranch(keys_equal, found_bb, slot.continue_bb)
 
-    emit_probe_loop(
-        codegen, buckets_data, capacity, hash_i32,
+    emit_key_probe(
+        codegen, buckets_data, capacity, hash_value,
         on_occupied=on_occupied, on_empty=on_empty,
         exhausted_bb=not_found_bb, prefix="get_probe",
     )
@@ -178,7 +208,7 @@ def emit_hashmap_get(
     maybe_some = builder.insert_value(maybe_some, some_tag, 0, name="maybe_some_tag")
 
     data_array_type = maybe_llvm_type.elements[1]  # [N x i8]
-    data_ptr = builder.alloca(data_array_type, name="some_data_alloc")
+    data_ptr = codegen.memory.entry_alloca(data_array_type, "some_data_alloc")
     value_ptr = builder.bitcast(data_ptr, ir.PointerType(value_llvm), name="value_ptr")
     builder.store(entry_value, value_ptr)
     data_value = builder.load(data_ptr, name="some_data")
@@ -245,7 +275,6 @@ def emit_hashmap_contains_key(
     )
 
     hash_value = hash_method.llvm_emitter(codegen, fake_call, key_value, codegen.types.ll_type(key_type), False)
-    hash_i32 = builder.trunc(hash_value, codegen.types.i32, name="hash_i32")
 
     found_bb = builder.append_basic_block(name="contains_found")
     not_found_bb = builder.append_basic_block(name="contains_not_found")
@@ -260,8 +289,8 @@ def emit_hashmap_contains_key(
         keys_equal = emit_key_equality_check(codegen, key_type, key_value, entry_key)
         builder.cbranch(keys_equal, found_bb, slot.continue_bb)
 
-    emit_probe_loop(
-        codegen, buckets_data, capacity, hash_i32,
+    emit_key_probe(
+        codegen, buckets_data, capacity, hash_value,
         on_occupied=on_occupied, on_empty=on_empty,
         exhausted_bb=not_found_bb, prefix="contains_probe",
     )
@@ -39,15 +39,15 @@ def emit_hashmap_debug(
     emit_printf_string(codegen, builder, header_str)
 
     emit_printf_string(codegen, builder, "  size: ")
-    emit_printf_i32(codegen, builder, size)
+    emit_printf_i64(codegen, builder, size)
     emit_printf_string(codegen, builder, "\n")
 
     emit_printf_string(codegen, builder, "  capacity: ")
-    emit_printf_i32(codegen, builder, capacity)
+    emit_printf_i64(codegen, builder, capacity)
     emit_printf_string(codegen, builder, "\n")
 
     emit_printf_string(codegen, builder, "  tombstones: ")
-    emit_printf_i32(codegen, builder, tombstones)
+    emit_printf_i64(codegen, builder, tombstones)
     emit_printf_string(codegen, builder, "\n")
 
     def print_entry(entry_ptr: ir.Value, index: ir.Value) -> None:
@@ -74,13 +74,13 @@ def emit_hashmap_debug(
 
         builder.position_at_end(empty_bb)
         emit_printf_string(codegen, builder, "  [")
-        emit_printf_i32(codegen, builder, index)
+        emit_printf_i64(codegen, builder, index)
         emit_printf_string(codegen, builder, "] Empty\n")
         builder.branch(join_bb)
 
         builder.position_at_end(occupied_bb)
         emit_printf_string(codegen, builder, "  [")
-        emit_printf_i32(codegen, builder, index)
+        emit_printf_i64(codegen, builder, index)
         emit_printf_string(codegen, builder, "] Occupied: ")
 
         key_ptr = builder.gep(entry_ptr, ENTRY_KEY_INDICES, name="key_ptr")
@@ -98,7 +98,7 @@ def emit_hashmap_debug(
 
         builder.position_at_end(tombstone_bb)
         emit_printf_string(codegen, builder, "  [")
-        emit_printf_i32(codegen, builder, index)
+        emit_printf_i64(codegen, builder, index)
         emit_printf_string(codegen, builder, "] Tombstone\n")
         builder.branch(join_bb)
 
@@ -155,6 +155,28 @@ def emit_printf_i32(codegen: Any, builder: Any, value: ir.Value) -> None:
     builder.call(printf_fn, [str_ptr, value])
 
 
+def emit_printf_i64(codegen: Any, builder: Any, value: ir.Value) -> None:
+    """Helper to print an i64 (a count or a slot index) using printf."""
+    fmt_str = "%lld"
+    str_bytes = (fmt_str + '\0').encode('utf-8')
+    str_type = ir.ArrayType(ir.IntType(8), len(str_bytes))
+
+    global_name = ".fmt_i64_debug"
+    try:
+        str_const = codegen.builder.module.get_global(global_name)
+    except KeyError:
+        str_const = ir.GlobalVariable(codegen.builder.module, str_type, name=global_name)
+        str_const.linkage = 'internal'
+        str_const.global_constant = True
+        str_const.initializer = ir.Constant(str_type, bytearray(str_bytes))
+
+    zero = ZERO_I32
+    str_ptr = builder.gep(str_const, [zero, zero], name="fmt_ptr")
+
+    printf_fn = codegen.runtime.libc_stdio.printf
+    builder.call(printf_fn, [str_ptr, value])
+
+
 def emit_debug_print_value(codegen: Any, builder: Any, value: ir.Value, value_type: Type) -> None:
     """Helper to print a value for debug output."""
 
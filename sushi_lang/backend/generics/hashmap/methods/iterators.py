@@ -12,6 +12,9 @@ from sushi_lang.internals.errors import raise_internal_error
 if TYPE_CHECKING:
     pass
 
+# The largest table an iterator can walk: the low 29 bits of its length field.
+ITERATOR_MAX_SLOTS = 0x1FFFFFFF
+
 
 def emit_hashmap_keys(
     codegen: Any,
@@ -25,12 +28,12 @@ def emit_hashmap_keys(
 
     key_type, value_type = extract_key_value_types(hashmap_type, codegen)
 
-    # `{Entry<K, V>[] buckets, i32 size, i32 capacity, i32 tombstones}`.
+    # `{Entry<K, V>[] buckets, i64 size, i64 capacity, i64 tombstones}`.
 
     buckets_ptr = gep_utils.gep_struct_field(codegen, hashmap_value, 0, "buckets_ptr")
 
     capacity_ptr = gep_utils.gep_struct_field(codegen, hashmap_value, 2, "capacity_ptr")
-    capacity = codegen.builder.load(capacity_ptr, name="capacity")
+    capacity = _iterator_capacity(codegen, codegen.builder.load(capacity_ptr, name="capacity"))
 
     buckets_data_ptr = gep_utils.gep_struct_field(codegen, buckets_ptr, 2, "buckets_data_ptr")
     buckets_data = codegen.builder.load(buckets_data_ptr, name="buckets_data")
@@ -47,7 +50,7 @@ def emit_hashmap_keys(
 
     # Set capacity with HashMap keys marker
     # We encode: capacity | 0x80000000 (bit 31 = HashMap flag, bit 30 = 0 for keys)
-    # This allows up to 2^31-1 capacity while preserving the marker
+    # The foreach loop masks the length with 0x1FFFFFFF, so up to 2^29 slots are walked
     capacity_ptr_out = gep_utils.gep_struct_field(codegen, iterator_slot, 1, "capacity_ptr")
     hashmap_flag = ir.Constant(codegen.types.i32, 0x80000000)  # Bit 31 set = HashMap iterator
     marked_capacity = codegen.builder.or_(capacity, hashmap_flag, name="hashmap_keys_capacity")
@@ -75,7 +78,7 @@ def emit_hashmap_values(
 
     buckets_ptr = gep_utils.gep_struct_field(codegen, hashmap_value, 0, "buckets_ptr")
     capacity_ptr = gep_utils.gep_struct_field(codegen, hashmap_value, 2, "capacity_ptr")
-    capacity = codegen.builder.load(capacity_ptr, name="capacity")
+    capacity = _iterator_capacity(codegen, codegen.builder.load(capacity_ptr, name="capacity"))
 
     buckets_data_ptr = gep_utils.gep_struct_field(codegen, buckets_ptr, 2, "buckets_data_ptr")
     buckets_data = codegen.builder.load(buckets_data_ptr, name="buckets_data")
@@ -119,7 +122,7 @@ def emit_hashmap_entries(
 
     buckets_ptr = gep_utils.gep_struct_field(codegen, hashmap_value, 0, "buckets_ptr")
     capacity_ptr = gep_utils.gep_struct_field(codegen, hashmap_value, 2, "capacity_ptr")
-    capacity = codegen.builder.load(capacity_ptr, name="capacity")
+    capacity = _iterator_capacity(codegen, codegen.builder.load(capacity_ptr, name="capacity"))
 
     buckets_data_ptr = gep_utils.gep_struct_field(codegen, buckets_ptr, 2, "buckets_data_ptr")
     buckets_data = codegen.builder.load(buckets_data_ptr, name="buckets_data")
@@ -147,3 +150,27 @@ def emit_hashmap_entries(
     codegen.builder.store(buckets_as_entries, buckets_ptr_out)
 
     return codegen.builder.load(iterator_slot, name="entries_iterator")
+
+
+def _iterator_capacity(codegen: Any, capacity: ir.Value) -> ir.Value:
+    """The map's i64 capacity as the iterator's i32 length field.
+
+    The length's top three bits carry the HashMap marker, so an iterator walks at most
+    2^29 slots. A larger map traps RE2025 here rather than being walked in part; the
+    map itself is not limited to that.
+    """
+    from sushi_lang.backend.cold_paths import emit_unlikely_branch
+
+    builder = codegen.builder
+    too_big_bb = builder.append_basic_block(name="hashmap_iter_too_big")
+    ok_bb = builder.append_basic_block(name="hashmap_iter_fits")
+    too_big = builder.icmp_unsigned(">", capacity, ir.Constant(capacity.type, ITERATOR_MAX_SLOTS),
+                                    name="hashmap_iter_capacity_too_big")
+    emit_unlikely_branch(builder, too_big, too_big_bb, ok_bb)
+
+    builder.position_at_end(too_big_bb)
+    codegen.runtime.errors.emit_runtime_error("RE2025")
+    builder.unreachable()
+
+    builder.position_at_end(ok_bb)
+    return builder.trunc(capacity, codegen.types.i32, name="capacity_i32")
@@ -4,7 +4,15 @@ from typing import Any
 from sushi_lang.semantics.ast import MethodCall, Name
 from sushi_lang.semantics.typesys import StructType, BuiltinType
 import llvmlite.ir as ir
-from ..types import get_entry_type, get_hashmap_field_ptrs, ENTRY_OCCUPIED, ENTRY_TOMBSTONE
+from ..types import (
+    get_entry_type,
+    get_hashmap_field_ptrs,
+    ENTRY_OCCUPIED,
+    ENTRY_TOMBSTONE,
+    MIN_CAPACITY,
+    LOAD_FACTOR_NUM,
+    LOAD_FACTOR_DEN,
+)
 from sushi_lang.backend.constants import (
     HASHMAP_CAPACITY_INDICES,
     ENTRY_KEY_INDICES,
@@ -12,16 +20,20 @@ from sushi_lang.backend.constants import (
     ENTRY_STATE_INDICES,
 )
 from sushi_lang.semantics.generics.hashmap import extract_key_value_types
-from ..probe import emit_probe_loop, ProbeSlot
+from ..probe import emit_probe_loop, emit_key_probe, ProbeSlot
 from ..utils import (
     emit_key_equality_check,
     emit_insert_entry,
     emit_destroy_all_entries,
-    emit_init_buckets_empty,
+    emit_alloc_buckets,
+    emit_capacity_for,
+    emit_entry_count_arg,
+    emit_size_overflow_trap,
+    get_hashes_ptr,
 )
+from .. import swiss
+from sushi_lang.backend.cold_paths import emit_unlikely_branch, get_or_emit_cold_function
 from sushi_lang.internals.errors import raise_internal_error
-from sushi_lang.backend.memory.heap import emit_malloc
-from sushi_lang.backend.expressions.memory import get_element_size_constant
 
 
 def emit_hashmap_insert(
@@ -40,7 +52,8 @@ def emit_hashmap_insert(
     entry_type = get_entry_type(codegen, key_type, value_type)
     key_llvm = codegen.types.ll_type(key_type)
 
-    one_i32 = ir.Constant(codegen.types.i32, 1)
+    i64 = codegen.types.i64
+    one_i64 = ir.Constant(i64, 1)
 
     if len(expr.args) != 2:
         raise_internal_error("CE0023", method="insert", expected=2, got=len(expr.args))
@@ -75,18 +88,19 @@ def emit_hashmap_insert(
     # If load factor > 0.75, resize to next power-of-two capacity
     # We use integer arithmetic: (size + tombstones) * 4 > capacity * 3
     size_plus_tombstones = builder.add(size, tombstones, name="size_plus_tombstones")
-    lhs = builder.mul(size_plus_tombstones, ir.Constant(codegen.types.i32, 4), name="lhs")
-    rhs = builder.mul(capacity, ir.Constant(codegen.types.i32, 3), name="rhs")
+    lhs = builder.mul(size_plus_tombstones, ir.Constant(i64, LOAD_FACTOR_DEN), name="lhs")
+    rhs = builder.mul(capacity, ir.Constant(i64, LOAD_FACTOR_NUM), name="rhs")
     should_resize = builder.icmp_unsigned(">", lhs, rhs, name="should_resize")
 
+    # The rehash loop lives once per map type, out of line; the insert only calls it.
+    grow_fn = _get_or_emit_hashmap_grow(codegen, hashmap_value, hashmap_type)
+
     resize_bb = builder.append_basic_block(name="resize_hashmap")
     continue_insert_bb = builder.append_basic_block(name="continue_insert")
-    builder.cbranch(should_resize, resize_bb, continue_insert_bb)
+    emit_unlikely_branch(builder, should_resize, resize_bb, continue_insert_bb)
 
     builder.position_at_end(resize_bb)
-    new_capacity = builder.shl(capacity, ir.Constant(codegen.types.i32, 1), name="new_capacity")
-
-    emit_hashmap_resize_to_capacity(codegen, hashmap_value, hashmap_type, new_capacity)
+    builder.call(grow_fn, [hashmap_value])
     builder.branch(continue_insert_bb)
 
     builder.position_at_end(continue_insert_bb)
@@ -107,15 +121,18 @@ def emit_hashmap_insert(
 
     hash_value = hash_method.llvm_emitter(codegen, fake_call, key_value, key_llvm, False)
 
-    hash_i32 = builder.trunc(hash_value, codegen.types.i32, name="hash_i32")
+    if swiss.is_swiss(codegen):
+        _emit_swiss_insert(codegen, fields, buckets_data, capacity, hash_value,
+                           key_type, key_value, value_value, entry_type)
+        return ir.Constant(codegen.types.i32, 0)
 
     insert_done_bb = builder.append_basic_block(name="insert_done")
 
     # Loop-carried across probe steps: the first tombstone this chain passed, or
     # -1. The key may still be live further along the chain, so a tombstone cannot
     # end the probe -- but if the chain runs out, that slot is where the key goes.
-    first_tombstone_idx = builder.alloca(codegen.types.i32, name="first_tombstone_idx")
-    no_tombstone = ir.Constant(codegen.types.i32, -1)
+    first_tombstone_idx = codegen.memory.entry_alloca(i64, "first_tombstone_idx")
+    no_tombstone = ir.Constant(i64, -1)
     builder.store(no_tombstone, first_tombstone_idx)
 
     def on_occupied(slot: ProbeSlot) -> None:
@@ -153,13 +170,15 @@ def emit_hashmap_insert(
         builder.position_at_end(use_tombstone_bb)
         tombstone_entry_ptr = builder.gep(buckets_data, [first_tombstone], name="tombstone_entry_ptr")
         emit_insert_entry(codegen, tombstone_entry_ptr, key_value, value_value, entry_type)
-        builder.store(builder.add(size, one_i32, name="new_size"), size_ptr)
-        builder.store(builder.sub(tombstones, one_i32, name="new_tombstones"), tombstones_ptr)
+        builder.store(hash_value, builder.gep(hashes, [first_tombstone], name="hash_slot"))
+        builder.store(builder.add(size, one_i64, name="new_size"), size_ptr)
+        builder.store(builder.sub(tombstones, one_i64, name="new_tombstones"), tombstones_ptr)
         builder.branch(insert_done_bb)
 
         builder.position_at_end(use_empty_bb)
         emit_insert_entry(codegen, slot.entry_ptr, key_value, value_value, entry_type)
-        builder.store(builder.add(size, one_i32, name="new_size"), size_ptr)
+        builder.store(hash_value, builder.gep(hashes, [slot.index], name="hash_slot"))
+        builder.store(builder.add(size, one_i64, name="new_size"), size_ptr)
         builder.branch(insert_done_bb)
 
     # A live map always resizes below a 0.75 load factor, so there is always an
@@ -168,8 +187,9 @@ def emit_hashmap_insert(
     # -1 and GEPs off the null pointer. Trap instead of corrupting memory.
     no_slot_bb = builder.append_basic_block(name="insert_no_slot")
 
+    hashes = get_hashes_ptr(codegen, buckets_data, capacity)
     emit_probe_loop(
-        codegen, buckets_data, capacity, hash_i32,
+        codegen, buckets_data, capacity, hash_value,
         on_occupied=on_occupied, on_empty=on_empty, on_tombstone=on_tombstone,
         exhausted_bb=no_slot_bb, prefix="probe",
     )
@@ -183,6 +203,80 @@ def emit_hashmap_insert(
     return ir.Constant(codegen.types.i32, 0)
 
 
+def _emit_swiss_insert(
+    codegen: Any,
+    fields: Any,
+    buckets_data: ir.Value,
+    capacity: ir.Value,
+    hash_value: ir.Value,
+    key_type: Any,
+    key_value: ir.Value,
+    value_value: ir.Value,
+    entry_type: ir.Type,
+) -> None:
+    """The swiss-layout tail of `insert`: update the key's entry, or claim a free slot.
+
+    A lookup has to run to the first EMPTY byte before the key is known to be absent,
+    so a tombstone passed on the way is found again by a second, cheap control-byte
+    scan rather than tracked through the probe.
+    """
+    builder = codegen.builder
+    i64 = codegen.types.i64
+    one_i64 = ir.Constant(i64, 1)
+
+    insert_done_bb = builder.append_basic_block(name="insert_done")
+    insert_new_bb = builder.append_basic_block(name="insert_new")
+    # Same guard as the linear layout: only a DESTROYED map (capacity 0) gets here.
+    no_slot_bb = builder.append_basic_block(name="insert_no_slot")
+
+    def on_occupied(slot: ProbeSlot) -> None:
+        entry_key_ptr = builder.gep(slot.entry_ptr, ENTRY_KEY_INDICES, name="entry_key_ptr")
+        entry_key = builder.load(entry_key_ptr, name="entry_key")
+        keys_equal = emit_key_equality_check(codegen, key_type, key_value, entry_key)
+
+        update_value_bb = builder.append_basic_block(name="update_value")
+        builder.cbranch(keys_equal, update_value_bb, slot.continue_bb)
+
+        builder.position_at_end(update_value_bb)
+        entry_value_ptr = builder.gep(slot.entry_ptr, ENTRY_VALUE_INDICES, name="entry_value_ptr")
+        builder.store(value_value, entry_value_ptr)
+        builder.branch(insert_done_bb)
+
+    def on_empty(slot: ProbeSlot) -> None:
+        builder.branch(insert_new_bb)
+
+    emit_key_probe(
+        codegen, buckets_data, capacity, hash_value,
+        on_occupied=on_occupied, on_empty=on_empty,
+        exhausted_bb=no_slot_bb, prefix="probe",
+    )
+
+    builder.position_at_end(insert_new_bb)
+    index = swiss.emit_find_free_slot(codegen, buckets_data, capacity, hash_value, no_slot_bb)
+    ctrl = swiss.get_ctrl_ptr(codegen, buckets_data, capacity)
+    old_ctrl = builder.load(builder.gep(ctrl, [index]), name="old_ctrl")
+    was_deleted = builder.icmp_signed("==", old_ctrl, ir.Constant(codegen.types.i8, swiss.CTRL_DELETED),
+                                      name="was_deleted")
+    tombstones = builder.load(fields.tombstones, name="tombstones_current")
+    builder.store(builder.sub(tombstones, builder.zext(was_deleted, i64), name="new_tombstones"),
+                  fields.tombstones)
+    size = builder.load(fields.size, name="size_current")
+    builder.store(builder.add(size, one_i64, name="new_size"), fields.size)
+
+    swiss.emit_set_ctrl(codegen, ctrl, capacity, index, swiss.emit_hash_tag(codegen, hash_value))
+    hashes = get_hashes_ptr(codegen, buckets_data, capacity)
+    builder.store(hash_value, builder.gep(hashes, [index], name="hash_slot"))
+    entry_ptr = builder.gep(buckets_data, [index], name="new_entry_ptr")
+    emit_insert_entry(codegen, entry_ptr, key_value, value_value, entry_type)
+    builder.branch(insert_done_bb)
+
+    builder.position_at_end(no_slot_bb)
+    codegen.runtime.errors.emit_runtime_error("RE2022")
+    builder.unreachable()
+
+    builder.position_at_end(insert_done_bb)
+
+
 def emit_hashmap_remove(
     codegen: Any,
     expr: MethodCall,
@@ -199,7 +293,7 @@ def emit_hashmap_remove(
 
     value_llvm = codegen.types.ll_type(value_type)
 
-    one_i32 = ir.Constant(codegen.types.i32, 1)
+    one_i64 = ir.Constant(codegen.types.i64, 1)
 
     if len(expr.args) != 1:
         raise_internal_error("CE0023", method="remove", expected=1, got=len(expr.args))
@@ -229,7 +323,6 @@ def emit_hashmap_remove(
     )
 
     hash_value = hash_method.llvm_emitter(codegen, fake_call, key_value, codegen.types.ll_type(key_type), False)
-    hash_i32 = builder.trunc(hash_value, codegen.types.i32, name="hash_i32")
 
     found_bb = builder.append_basic_block(name="remove_found")
     not_found_bb = builder.append_basic_block(name="remove_not_found")
@@ -248,10 +341,11 @@ def emit_hashmap_remove(
         keys_equal = emit_key_equality_check(codegen, key_type, key_value, entry_key)
         matched["entry_ptr"] = slot.entry_ptr
         matched["entry_key_ptr"] = entry_key_ptr
+        matched["index"] = slot.index
         builder.cbranch(keys_equal, found_bb, slot.continue_bb)
 
-    emit_probe_loop(
-        codegen, buckets_data, capacity, hash_i32,
+    emit_key_probe(
+        codegen, buckets_data, capacity, hash_value,
         on_occupied=on_occupied, on_empty=on_empty,
         exhausted_bb=not_found_bb, prefix="remove_probe",
     )
@@ -271,10 +365,14 @@ def emit_hashmap_remove(
     emit_value_destructor(codegen, entry_key_ptr, key_type)
 
     builder.store(ir.Constant(codegen.types.i8, ENTRY_TOMBSTONE), state_ptr)
+    if swiss.is_swiss(codegen):
+        ctrl = swiss.get_ctrl_ptr(codegen, buckets_data, capacity)
+        swiss.emit_set_ctrl(codegen, ctrl, capacity, matched["index"],
+                            ir.Constant(codegen.types.i8, swiss.CTRL_DELETED))
 
-    new_size = builder.sub(size, one_i32, name="new_size")
+    new_size = builder.sub(size, one_i64, name="new_size")
     builder.store(new_size, size_ptr)
-    new_tombstones = builder.add(tombstones, one_i32, name="new_tombstones")
+    new_tombstones = builder.add(tombstones, one_i64, name="new_tombstones")
     builder.store(new_tombstones, tombstones_ptr)
 
     if isinstance(value_type, BuiltinType):
@@ -298,7 +396,7 @@ def emit_hashmap_remove(
     maybe_some = builder.insert_value(maybe_some, some_tag, 0, name="maybe_some_tag")
 
     data_array_type = maybe_llvm_type.elements[1]  # [N x i8]
-    data_ptr = builder.alloca(data_array_type, name="some_data_alloc")
+    data_ptr = codegen.memory.entry_alloca(data_array_type, "some_data_alloc")
     value_ptr = builder.bitcast(data_ptr, ir.PointerType(value_llvm), name="value_ptr")
     builder.store(entry_value, value_ptr)
     data_value = builder.load(data_ptr, name="some_data")
@@ -323,50 +421,62 @@ def emit_hashmap_remove(
     return result_phi
 
 
+def _get_or_emit_hashmap_grow(
+    codegen: Any,
+    hashmap_value: ir.Value,
+    hashmap_type: StructType
+) -> ir.Function:
+    """`void __sushi_hashmap_grow_<HashMap<K, V>>(HashMap<K, V>* map)`: double the capacity."""
+    from sushi_lang.backend.lifecycle import lifecycle_symbol
+
+    def emit_body(fn: ir.Function) -> None:
+        map_ptr = fn.args[0]
+        capacity = codegen.builder.load(get_hashmap_field_ptrs(codegen, map_ptr).capacity,
+                                        name="capacity")
+        new_capacity = codegen.builder.shl(capacity, ir.Constant(codegen.types.i64, 1),
+                                           name="new_capacity")
+        emit_hashmap_resize_to_capacity(codegen, map_ptr, hashmap_type, new_capacity)
+        codegen.builder.ret_void()
+
+    fn_ty = ir.FunctionType(ir.VoidType(), [hashmap_value.type])
+    return get_or_emit_cold_function(
+        codegen, lifecycle_symbol("__sushi_hashmap_grow_", hashmap_type), fn_ty, emit_body)
+
+
 def emit_hashmap_resize_to_capacity(
     codegen: Any,
     hashmap_value: ir.Value,
     hashmap_type: StructType,
     new_capacity: ir.Value
 ) -> None:
-    """Internal helper: resize HashMap to a specific capacity."""
-    from sushi_lang.semantics.ast import MethodCall, Name
-    import sushi_lang.backend.types.primitives.hashing  # noqa: F401
+    """Internal helper: resize HashMap to a specific capacity.
 
+    Every entry is re-placed by its cached hash; no key is hashed again.
+    """
     builder = codegen.builder
 
     key_type, value_type = extract_key_value_types(hashmap_type, codegen)
 
     entry_type = get_entry_type(codegen, key_type, value_type)
 
-    zero_i32 = ir.Constant(codegen.types.i32, 0)
-    one_i32 = ir.Constant(codegen.types.i32, 1)
+    i64 = codegen.types.i64
+    zero_i64 = ir.Constant(i64, 0)
+    one_i64 = ir.Constant(i64, 1)
 
     fields = get_hashmap_field_ptrs(codegen, hashmap_value)
-    size_ptr, capacity_ptr = fields.size, fields.capacity
+    capacity_ptr = fields.capacity
     tombstones_ptr, buckets_data_ptr = fields.tombstones, fields.buckets_data
 
-    builder.load(size_ptr, name="size")
     old_capacity = builder.load(capacity_ptr, name="old_capacity")
 
     old_buckets_data = builder.load(buckets_data_ptr, name="old_buckets_data")
+    old_hashes = get_hashes_ptr(codegen, old_buckets_data, old_capacity)
 
-    entry_size = get_element_size_constant(codegen, entry_type)
-    total_bytes = builder.mul(entry_size, new_capacity, name="bucket_bytes")
+    new_bucket_ptr = emit_alloc_buckets(codegen, entry_type, new_capacity)
+    new_hashes = get_hashes_ptr(codegen, new_bucket_ptr, new_capacity)
 
-    total_bytes_i64 = builder.zext(total_bytes, ir.IntType(64), name="total_bytes_i64")
-    new_bucket_ptr_i8 = emit_malloc(codegen, builder, total_bytes_i64)
-    new_bucket_ptr = builder.bitcast(new_bucket_ptr_i8, ir.PointerType(entry_type), name="new_buckets_ptr")
-
-    emit_init_buckets_empty(codegen, new_bucket_ptr, new_capacity)
-
-    from ..types import get_key_hash_method
-    hash_method = get_key_hash_method(codegen, key_type)
-    if hash_method is None:
-        raise_internal_error("CE0053", type=key_type)
-
-    old_i = builder.alloca(codegen.types.i32, name="old_i")
-    builder.store(zero_i32, old_i)
+    old_i = codegen.memory.entry_alloca(i64, "old_i")
+    builder.store(zero_i64, old_i)
 
     rehash_loop_cond_bb = builder.append_basic_block(name="rehash_loop_cond")
     rehash_loop_body_bb = builder.append_basic_block(name="rehash_loop_body")
@@ -400,34 +510,24 @@ def emit_hashmap_resize_to_capacity(
     old_key = builder.load(old_key_ptr, name="old_key")
     old_value_ptr = builder.gep(old_entry_ptr, ENTRY_VALUE_INDICES, name="old_value_ptr")
     old_value = builder.load(old_value_ptr, name="old_value")
-
-    fake_call = MethodCall(
-        receiver=Name(id="key", loc=(0, 0)),
-        method="hash",
-        args=[],
-        loc=(0, 0)
-    )
-    hash_value = hash_method.llvm_emitter(codegen, fake_call, old_key, codegen.types.ll_type(key_type), False)
-    hash_i32 = builder.trunc(hash_value, codegen.types.i32, name="hash_i32")
-
-    # Linear probe for an empty slot in the NEW buckets. A rehash never collides
-    # with an equal key (the old table had none) and the new table has no
-    # tombstones, so only the empty case does anything -- and it exits into the
-    # enclosing rehash loop's continue block rather than out of the function.
-    def on_empty(slot: ProbeSlot) -> None:
-        emit_insert_entry(codegen, slot.entry_ptr, old_key, old_value, entry_type)
-        builder.branch(rehash_skip_bb)
-
-    def keep_probing(slot: ProbeSlot) -> None:
-        pass
+    # Cached on insert: re-placing an entry never calls `.hash()`.
+    old_hash = builder.load(builder.gep(old_hashes, [old_i_val]), name="old_hash")
 
     rehash_no_slot_bb = builder.append_basic_block(name="rehash_no_slot")
 
-    emit_probe_loop(
-        codegen, new_bucket_ptr, new_capacity, hash_i32,
-        on_occupied=keep_probing, on_empty=on_empty,
-        exhausted_bb=rehash_no_slot_bb, prefix="rehash_probe",
-    )
+    if swiss.is_swiss(codegen):
+        new_index = swiss.emit_find_free_slot(codegen, new_bucket_ptr, new_capacity, old_hash,
+                                              rehash_no_slot_bb, prefix="rehash_free")
+        new_ctrl = swiss.get_ctrl_ptr(codegen, new_bucket_ptr, new_capacity)
+        swiss.emit_set_ctrl(codegen, new_ctrl, new_capacity, new_index,
+                            swiss.emit_hash_tag(codegen, old_hash))
+        builder.store(old_hash, builder.gep(new_hashes, [new_index]))
+        new_entry_ptr = builder.gep(new_bucket_ptr, [new_index], name="new_entry_ptr")
+        emit_insert_entry(codegen, new_entry_ptr, old_key, old_value, entry_type)
+        builder.branch(rehash_skip_bb)
+    else:
+        _emit_linear_reinsert(codegen, new_bucket_ptr, new_capacity, new_hashes, old_hash,
+                              old_key, old_value, entry_type, rehash_skip_bb, rehash_no_slot_bb)
 
     # The new table is freshly allocated and strictly larger than the live entry
     # count, so it always has room. Unreachable in a correct compiler; guarded so a
@@ -437,7 +537,7 @@ def emit_hashmap_resize_to_capacity(
     builder.unreachable()
 
     builder.position_at_end(rehash_skip_bb)
-    old_i_next = builder.add(old_i_val, one_i32, name="old_i_next")
+    old_i_next = builder.add(old_i_val, one_i64, name="old_i_next")
     builder.store(old_i_next, old_i)
     builder.branch(rehash_loop_cond_bb)
 
@@ -447,7 +547,7 @@ def emit_hashmap_resize_to_capacity(
 
     builder.store(new_capacity, capacity_ptr)
 
-    builder.store(zero_i32, tombstones_ptr)
+    builder.store(zero_i64, tombstones_ptr)
 
     # Free old buckets to prevent memory leak
     old_buckets_void_ptr = builder.bitcast(old_buckets_data, ir.PointerType(codegen.types.i8), name="old_buckets_void_ptr")
@@ -455,6 +555,72 @@ def emit_hashmap_resize_to_capacity(
     builder.call(free_func, [old_buckets_void_ptr])
 
 
+def _emit_linear_reinsert(
+    codegen: Any,
+    new_bucket_ptr: ir.Value,
+    new_capacity: ir.Value,
+    new_hashes: ir.Value,
+    hash_value: ir.Value,
+    old_key: ir.Value,
+    old_value: ir.Value,
+    entry_type: ir.Type,
+    rehash_skip_bb: ir.Block,
+    rehash_no_slot_bb: ir.Block,
+) -> None:
+    """Re-place one entry in the new linear-layout buckets during a resize."""
+    builder = codegen.builder
+
+    # Linear probe for an empty slot in the NEW buckets. A rehash never collides
+    # with an equal key (the old table had none) and the new table has no
+    # tombstones, so only the empty case does anything -- and it exits into the
+    # enclosing rehash loop's continue block rather than out of the function.
+    def on_empty(slot: ProbeSlot) -> None:
+        emit_insert_entry(codegen, slot.entry_ptr, old_key, old_value, entry_type)
+        builder.store(hash_value, builder.gep(new_hashes, [slot.index]))
+        builder.branch(rehash_skip_bb)
+
+    def keep_probing(slot: ProbeSlot) -> None:
+        pass
+
+    emit_probe_loop(
+        codegen, new_bucket_ptr, new_capacity, hash_value,
+        on_occupied=keep_probing, on_empty=on_empty,
+        exhausted_bb=rehash_no_slot_bb, prefix="rehash_probe",
+    )
+
+
+def emit_hashmap_reserve(
+    codegen: Any,
+    expr: MethodCall,
+    hashmap_value: ir.Value,
+    hashmap_type: StructType
+) -> ir.Value:
+    """Emit HashMap<K, V>.reserve(n) -> ~
+
+    Grows the table, once, so `n` more entries fit without a resize. A map that
+    already has the room is left alone.
+    """
+    builder = codegen.builder
+
+    if len(expr.args) != 1:
+        raise_internal_error("CE0023", method="reserve", expected=1, got=len(expr.args))
+
+    additional = emit_entry_count_arg(codegen, expr.args[0])
+
+    fields = get_hashmap_field_ptrs(codegen, hashmap_value)
+    size = builder.load(fields.size, name="size")
+    capacity = builder.load(fields.capacity, name="capacity")
+
+    total = builder.sadd_with_overflow(size, additional, name="entries_wanted_checked")
+    emit_size_overflow_trap(codegen, builder.extract_value(total, 1), "reserve")
+    wanted = emit_capacity_for(codegen, builder.extract_value(total, 0, name="entries_wanted"))
+    must_grow = builder.icmp_unsigned(">", wanted, capacity, name="must_grow")
+    with builder.if_then(must_grow):
+        emit_hashmap_resize_to_capacity(codegen, hashmap_value, hashmap_type, wanted)
+
+    return ir.Constant(codegen.types.i32, 0)
+
+
 def emit_hashmap_rehash(
     codegen: Any,
     hashmap_value: ir.Value,
@@ -483,8 +649,8 @@ def emit_hashmap_free(
 
     entry_type = get_entry_type(codegen, key_type, value_type)
 
-    zero_i32 = ir.Constant(codegen.types.i32, 0)
-    initial_capacity = ir.Constant(codegen.types.i32, 16)
+    zero_i64 = ir.Constant(codegen.types.i64, 0)
+    initial_capacity = ir.Constant(codegen.types.i64, MIN_CAPACITY)
 
     fields = get_hashmap_field_ptrs(codegen, hashmap_value)
     size_ptr, capacity_ptr = fields.size, fields.capacity
@@ -500,18 +666,11 @@ def emit_hashmap_free(
     free_func = codegen.get_free_func()
     builder.call(free_func, [old_buckets_void_ptr])
 
-    entry_size = get_element_size_constant(codegen, entry_type)
-    total_bytes = builder.mul(entry_size, initial_capacity, name="bucket_bytes")
-
-    total_bytes_i64 = builder.zext(total_bytes, ir.IntType(64), name="total_bytes_i64")
-    new_bucket_ptr_i8 = emit_malloc(codegen, builder, total_bytes_i64)
-    new_bucket_ptr = builder.bitcast(new_bucket_ptr_i8, ir.PointerType(entry_type), name="new_buckets_ptr")
-
-    emit_init_buckets_empty(codegen, new_bucket_ptr, initial_capacity)
+    new_bucket_ptr = emit_alloc_buckets(codegen, entry_type, initial_capacity)
 
-    builder.store(zero_i32, size_ptr)
+    builder.store(zero_i64, size_ptr)
     builder.store(initial_capacity, capacity_ptr)
-    builder.store(zero_i32, tombstones_ptr)
+    builder.store(zero_i64, tombstones_ptr)
     builder.store(new_bucket_ptr, buckets_data_ptr)
 
     return ir.Constant(codegen.types.i32, 0)
@@ -529,7 +688,7 @@ def emit_hashmap_destroy(
 
     entry_type = get_entry_type(codegen, key_type, value_type)
 
-    zero_i32 = ir.Constant(codegen.types.i32, 0)
+    zero_i64 = ir.Constant(codegen.types.i64, 0)
 
     fields = get_hashmap_field_ptrs(codegen, hashmap_value)
     size_ptr, capacity_ptr = fields.size, fields.capacity
@@ -550,9 +709,9 @@ def emit_hashmap_destroy(
         free_func = codegen.get_free_func()
         builder.call(free_func, [old_buckets_void_ptr])
 
-    builder.store(zero_i32, size_ptr)
-    builder.store(zero_i32, capacity_ptr)
-    builder.store(zero_i32, tombstones_ptr)
+    builder.store(zero_i64, size_ptr)
+    builder.store(zero_i64, capacity_ptr)
+    builder.store(zero_i64, tombstones_ptr)
     builder.store(null_entry_ptr, buckets_data_ptr)
 
     return ir.Constant(codegen.types.i32, 0)
@@ -11,7 +11,7 @@ from .types import ENTRY_EMPTY, ENTRY_OCCUPIED
 class ProbeSlot(NamedTuple):
     """The slot a probe step landed on."""
     entry_ptr: ir.Value   # Entry<K, V>* for this slot
-    index: ir.Value       # i32 bucket index
+    index: ir.Value       # i64 bucket index
     continue_bb: ir.Block  # branch here to probe the next slot
 
 
@@ -22,7 +22,7 @@ def emit_probe_loop(
     codegen: Any,
     buckets_data: ir.Value,
     capacity: ir.Value,
-    hash_i32: ir.Value,
+    hash_u64: ir.Value,
     *,
     on_occupied: SlotFn,
     on_empty: SlotFn,
@@ -30,14 +30,16 @@ def emit_probe_loop(
     exhausted_bb: Optional[ir.Block] = None,
     prefix: str = "probe",
 ) -> None:
-    """Linear-probe the buckets from `hash_i32`, dispatching on each slot's state."""
+    """Linear-probe the buckets from `hash_u64`, dispatching on each slot's state."""
     builder = codegen.builder
-    i32 = codegen.types.i32
+    i64 = capacity.type
     i8 = codegen.types.i8
-    one = ir.Constant(i32, 1)
+    one = ir.Constant(i64, 1)
 
-    probe_offset = builder.alloca(i32, name=f"{prefix}_offset")
-    builder.store(ir.Constant(i32, 0), probe_offset)
+    # In the entry block: a probe usually sits in the caller's loop, and an alloca in
+    # the loop body grows the stack on every iteration.
+    probe_offset = codegen.memory.entry_alloca(i64, f"{prefix}_offset")
+    builder.store(ir.Constant(i64, 0), probe_offset)
 
     loop_bb = builder.append_basic_block(name=f"{prefix}_loop")
     empty_bb = builder.append_basic_block(name=f"{prefix}_empty")
@@ -57,8 +59,8 @@ def emit_probe_loop(
         builder.position_at_end(within_bb)
 
     # index = (hash + offset) & (capacity - 1) -- an AND, not a modulo, which is
-    # only correct because every capacity in the growth table is a power of two.
-    hash_plus_offset = builder.add(hash_i32, offset, name="hash_plus_offset")
+    # only correct because every capacity is a power of two.
+    hash_plus_offset = builder.add(hash_u64, offset, name="hash_plus_offset")
     capacity_minus_1 = builder.sub(capacity, one, name="capacity_minus_1")
     index = builder.and_(hash_plus_offset, capacity_minus_1, name="index")
 
@@ -95,6 +97,39 @@ def emit_probe_loop(
     builder.branch(loop_bb)
 
 
+def emit_key_probe(
+    codegen: Any,
+    buckets_data: ir.Value,
+    capacity: ir.Value,
+    hash_u64: ir.Value,
+    *,
+    on_occupied: SlotFn,
+    on_empty: SlotFn,
+    exhausted_bb: Optional[ir.Block] = None,
+    prefix: str = "probe",
+) -> None:
+    """Probe for a key in the build's HashMap layout.
+
+    `on_occupied` sees the live slots that may hold the key -- every one under the
+    linear layout, only those whose control-byte tag matches under the swiss layout -- and
+    `on_empty` the slot that ends the chain. Tombstones are skipped.
+    """
+    from . import swiss
+
+    if swiss.is_swiss(codegen):
+        swiss.emit_group_probe(
+            codegen, buckets_data, capacity, hash_u64,
+            on_candidate=on_occupied, on_empty=on_empty,
+            exhausted_bb=exhausted_bb, prefix=prefix,
+        )
+        return
+    emit_probe_loop(
+        codegen, buckets_data, capacity, hash_u64,
+        on_occupied=on_occupied, on_empty=on_empty,
+        exhausted_bb=exhausted_bb, prefix=prefix,
+    )
+
+
 def _probe_on(builder: ir.IRBuilder, continue_bb: ir.Block) -> None:
     """Probe the next slot, unless the handler already left the loop."""
     if builder.block.terminator is None:
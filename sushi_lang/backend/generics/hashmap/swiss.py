@@ -0,0 +1,270 @@
+"""The SwissTable bucket layout for HashMap<K, V> (`--hashmap-layout swiss`).
+
+The HashMap struct and its `Entry<K, V>` array are the same in both layouts, so
+everything that walks the entries by their state byte (destroy, clone, foreach,
+keys/values/entries, debug) is layout-agnostic. What the swiss layout adds lives in
+the SAME allocation, after the entries and their cached hashes (see
+`utils.get_hashes_ptr`):
+
+    [Entry<K, V> x cap][u64 hash x cap][i8 ctrl x (cap + GROUP_WIDTH)]
+
+`ctrl[i]` is EMPTY, DELETED, or -- for an occupied slot -- the top 7 bits of the
+key's hash. A probe compares a whole group of 16 control bytes against the tag at
+once and runs the key-equality check only on a tag match (1 in 128 for a stranger),
+so a lookup touches the small control array and the one entry it wants. The last
+GROUP_WIDTH control bytes mirror the first, so a group load never wraps.
+"""
+
+from typing import Any, Callable, Optional
+
+import llvmlite.ir as ir
+
+from .probe import ProbeSlot, SlotFn
+from .utils import get_hashes_ptr
+
+
+GROUP_WIDTH = 16      # control bytes compared per probe step (one SSE2 register)
+CTRL_EMPTY = -128     # 0x80: never used; ends a probe
+CTRL_DELETED = -2     # 0xFE: removed; a probe continues past it
+TAG_SHIFT = 57        # the tag is the hash's top 7 bits; the slot index uses the low bits
+
+
+def is_swiss(codegen: Any) -> bool:
+    """True when this build emits HashMaps in the swiss layout."""
+    return getattr(codegen, "hashmap_layout", "linear") == "swiss"
+
+
+def emit_ctrl_bytes(codegen: Any, capacity: ir.Value) -> ir.Value:
+    """i64 byte size of the control-byte array, the mirrored tail included."""
+    return codegen.builder.add(capacity, ir.Constant(capacity.type, GROUP_WIDTH),
+                               name="swiss_ctrl_bytes")
+
+
+def get_ctrl_ptr(codegen: Any, buckets_data: ir.Value, capacity: ir.Value) -> ir.Value:
+    """The i8 control-byte array, right after the cached hashes."""
+    builder = codegen.builder
+    hashes = get_hashes_ptr(codegen, buckets_data, capacity)
+    past_hashes = builder.gep(hashes, [capacity], name="swiss_past_hashes")
+    return builder.bitcast(past_hashes, ir.PointerType(codegen.types.i8), name="swiss_ctrl")
+
+
+def emit_init_ctrl_empty(codegen: Any, buckets_data: ir.Value, capacity: ir.Value) -> None:
+    """Mark every control byte (the mirrored tail included) EMPTY."""
+    builder = codegen.builder
+    i8_ptr = ir.PointerType(codegen.types.i8)
+    i64 = ir.IntType(64)
+    memset = codegen.module.declare_intrinsic("llvm.memset", [i8_ptr, i64])
+    ctrl = get_ctrl_ptr(codegen, buckets_data, capacity)
+    builder.call(memset, [ctrl, ir.Constant(codegen.types.i8, CTRL_EMPTY),
+                          emit_ctrl_bytes(codegen, capacity), ir.Constant(ir.IntType(1), 0)])
+
+
+def emit_hash_tag(codegen: Any, hash_u64: ir.Value) -> ir.Value:
+    """The i8 control byte of an occupied slot: the hash's top 7 bits, always >= 0."""
+    builder = codegen.builder
+    top = builder.lshr(hash_u64, ir.Constant(hash_u64.type, TAG_SHIFT), name="swiss_tag_bits")
+    return builder.trunc(top, codegen.types.i8, name="swiss_tag")
+
+
+def emit_set_ctrl(codegen: Any, ctrl: ir.Value, capacity: ir.Value, index: ir.Value,
+                  value: ir.Value) -> None:
+    """ctrl[index] = value, and the mirrored byte when `index` is in the first group."""
+    builder = codegen.builder
+    i64 = capacity.type
+    builder.store(value, builder.gep(ctrl, [index], name="swiss_ctrl_slot"))
+    # ((index - GROUP_WIDTH) & mask) + GROUP_WIDTH is `index` itself outside the first
+    # group, so the second store is unconditional rather than a branch.
+    mask = builder.sub(capacity, ir.Constant(i64, 1), name="swiss_mask")
+    back = builder.sub(index, ir.Constant(i64, GROUP_WIDTH), name="swiss_mirror_back")
+    mirror = builder.add(builder.and_(back, mask), ir.Constant(i64, GROUP_WIDTH),
+                         name="swiss_mirror_index")
+    builder.store(value, builder.gep(ctrl, [mirror], name="swiss_ctrl_mirror"))
+
+
+def emit_group_probe(
+    codegen: Any,
+    buckets_data: ir.Value,
+    capacity: ir.Value,
+    hash_u64: ir.Value,
+    *,
+    on_candidate: SlotFn,
+    on_empty: SlotFn,
+    exhausted_bb: Optional[ir.Block] = None,
+    prefix: str = "swiss",
+) -> None:
+    """Probe group by group for `hash_u64`, the swiss counterpart of `emit_probe_loop`.
+
+    `on_candidate` runs for each slot whose control byte matches the hash's tag, in
+    probe order; it decides on key equality and branches to the slot's `continue_bb`
+    to keep going. The cached hash is not consulted: it lives in another cache line,
+    and reading it cost more than the 1-in-128 key comparisons it saves.
+
+    `on_empty` runs once a group with an EMPTY byte is exhausted without a match, with
+    that group's first empty slot.
+    """
+    builder = codegen.builder
+    tag = emit_hash_tag(codegen, hash_u64)
+
+    def probe_group(group: ir.Value, pos: ir.Value, next_group_bb: ir.Block,
+                    mask: ir.Value) -> None:
+        i32 = codegen.types.i32
+        bits_slot = codegen.memory.entry_alloca(i32, f"{prefix}_bits")
+        builder.store(_group_mask(codegen, group, "==", tag), bits_slot)
+        empty_bits = _group_mask(codegen, group, "==", ir.Constant(codegen.types.i8, CTRL_EMPTY))
+
+        bits_bb = builder.append_basic_block(name=f"{prefix}_bits")
+        bit_bb = builder.append_basic_block(name=f"{prefix}_bit")
+        group_done_bb = builder.append_basic_block(name=f"{prefix}_group_done")
+        empty_bb = builder.append_basic_block(name=f"{prefix}_empty")
+        builder.branch(bits_bb)
+
+        builder.position_at_end(bits_bb)
+        bits = builder.load(bits_slot, name=f"{prefix}_bits_val")
+        none_left = builder.icmp_unsigned("==", bits, ir.Constant(i32, 0), name=f"{prefix}_no_bits")
+        builder.cbranch(none_left, group_done_bb, bit_bb)
+
+        builder.position_at_end(bit_bb)
+        bit = _lowest_bit(codegen, bits)
+        rest = builder.and_(bits, builder.sub(bits, ir.Constant(i32, 1)), name=f"{prefix}_bits_rest")
+        builder.store(rest, bits_slot)
+        index = builder.and_(builder.add(pos, bit), mask, name=f"{prefix}_index")
+        entry_ptr = builder.gep(buckets_data, [index], name=f"{prefix}_entry_ptr")
+        on_candidate(ProbeSlot(entry_ptr=entry_ptr, index=index, continue_bb=bits_bb))
+        _probe_on(builder, bits_bb)
+
+        builder.position_at_end(group_done_bb)
+        has_empty = builder.icmp_unsigned("!=", empty_bits, ir.Constant(i32, 0),
+                                          name=f"{prefix}_has_empty")
+        builder.cbranch(has_empty, empty_bb, next_group_bb)
+
+        builder.position_at_end(empty_bb)
+        empty_index = builder.and_(builder.add(pos, _lowest_bit(codegen, empty_bits)), mask,
+                                   name=f"{prefix}_empty_index")
+        empty_entry = builder.gep(buckets_data, [empty_index], name=f"{prefix}_empty_entry")
+        on_empty(ProbeSlot(entry_ptr=empty_entry, index=empty_index, continue_bb=next_group_bb))
+        _probe_on(builder, next_group_bb)
+
+    _emit_group_walk(codegen, buckets_data, capacity, hash_u64, probe_group,
+                     exhausted_bb=exhausted_bb, prefix=prefix)
+
+
+def emit_find_free_slot(
+    codegen: Any,
+    buckets_data: ir.Value,
+    capacity: ir.Value,
+    hash_u64: ir.Value,
+    exhausted_bb: ir.Block,
+    prefix: str = "swiss_free",
+) -> ir.Value:
+    """The i64 index of the first EMPTY or DELETED slot on `hash_u64`'s probe sequence."""
+    builder = codegen.builder
+    found_bb = builder.append_basic_block(name=f"{prefix}_found")
+    found: dict[str, ir.Value] = {}
+
+    def probe_group(group: ir.Value, pos: ir.Value, next_group_bb: ir.Block,
+                    mask: ir.Value) -> None:
+        i32 = codegen.types.i32
+        # EMPTY and DELETED are the only negative control bytes; a tag is 0..127.
+        free_bits = _group_mask(codegen, group, "<", ir.Constant(codegen.types.i8, 0))
+        has_free = builder.icmp_unsigned("!=", free_bits, ir.Constant(i32, 0),
+                                         name=f"{prefix}_has_free")
+        take_bb = builder.append_basic_block(name=f"{prefix}_take")
+        builder.cbranch(has_free, take_bb, next_group_bb)
+
+        builder.position_at_end(take_bb)
+        bit = _lowest_bit(codegen, free_bits)
+        found["index"] = builder.and_(builder.add(pos, bit), mask, name=f"{prefix}_index")
+        builder.branch(found_bb)
+
+    _emit_group_walk(codegen, buckets_data, capacity, hash_u64, probe_group,
+                     exhausted_bb=exhausted_bb, prefix=prefix)
+
+    builder.position_at_end(found_bb)
+    return found["index"]
+
+
+GroupFn = Callable[[ir.Value, ir.Value, ir.Block, ir.Value], None]
+
+
+def _emit_group_walk(
+    codegen: Any,
+    buckets_data: ir.Value,
+    capacity: ir.Value,
+    hash_u64: ir.Value,
+    probe_group: GroupFn,
+    *,
+    exhausted_bb: Optional[ir.Block],
+    prefix: str,
+) -> None:
+    """Visit the groups of `hash_u64`'s probe sequence, handing each to `probe_group`.
+
+    Triangular probing -- the stride grows by one group per step -- visits every group
+    of a power-of-two table exactly once in `capacity / GROUP_WIDTH` steps, so a walk
+    past `capacity` bytes of stride has seen them all.
+    """
+    builder = codegen.builder
+    i64 = capacity.type
+    ctrl = get_ctrl_ptr(codegen, buckets_data, capacity)
+    mask = builder.sub(capacity, ir.Constant(i64, 1), name=f"{prefix}_mask")
+
+    pos_slot = codegen.memory.entry_alloca(i64, f"{prefix}_pos")
+    stride_slot = codegen.memory.entry_alloca(i64, f"{prefix}_stride")
+    start = builder.and_(hash_u64, mask, name=f"{prefix}_start")
+    builder.store(start, pos_slot)
+    builder.store(ir.Constant(i64, 0), stride_slot)
+
+    loop_bb = builder.append_basic_block(name=f"{prefix}_group")
+    next_group_bb = builder.append_basic_block(name=f"{prefix}_next_group")
+    builder.branch(loop_bb)
+
+    builder.position_at_end(loop_bb)
+    if exhausted_bb is not None:
+        within_bb = builder.append_basic_block(name=f"{prefix}_within_limit")
+        stride = builder.load(stride_slot, name=f"{prefix}_stride_val")
+        limit_reached = builder.icmp_signed(">=", stride, capacity, name=f"{prefix}_limit_reached")
+        builder.cbranch(limit_reached, exhausted_bb, within_bb)
+        builder.position_at_end(within_bb)
+
+    pos = builder.load(pos_slot, name=f"{prefix}_pos_val")
+    group_ptr = builder.bitcast(builder.gep(ctrl, [pos]),
+                                ir.PointerType(ir.VectorType(codegen.types.i8, GROUP_WIDTH)),
+                                name=f"{prefix}_group_ptr")
+    group = builder.load(group_ptr, name=f"{prefix}_ctrl_group", align=1)
+    probe_group(group, pos, next_group_bb, mask)
+
+    builder.position_at_end(next_group_bb)
+    stride = builder.add(builder.load(stride_slot), ir.Constant(i64, GROUP_WIDTH),
+                         name=f"{prefix}_stride_next")
+    builder.store(stride, stride_slot)
+    pos = builder.load(pos_slot, name=f"{prefix}_pos_cur")
+    builder.store(builder.and_(builder.add(pos, stride), mask, name=f"{prefix}_pos_next"),
+                  pos_slot)
+    builder.branch(loop_bb)
+
+
+def _group_mask(codegen: Any, group: ir.Value, op: str, byte: ir.Value) -> ir.Value:
+    """An i32 bitmask of the group's control bytes that compare `op` against `byte`."""
+    builder = codegen.builder
+    vec_ty = group.type
+    if isinstance(byte, ir.Constant):
+        splat = ir.Constant(vec_ty, [byte.constant] * GROUP_WIDTH)
+    else:
+        one = builder.insert_element(ir.Constant(vec_ty, ir.Undefined), byte,
+                                     ir.Constant(codegen.types.i32, 0))
+        zeros = ir.Constant(ir.VectorType(codegen.types.i32, GROUP_WIDTH), [0] * GROUP_WIDTH)
+        splat = builder.shuffle_vector(one, ir.Constant(vec_ty, ir.Undefined), zeros)
+    matches = builder.icmp_signed(op, group, splat)
+    bits = builder.bitcast(matches, ir.IntType(GROUP_WIDTH))
+    return builder.zext(bits, codegen.types.i32)
+
+
+def _lowest_bit(codegen: Any, bits: ir.Value) -> ir.Value:
+    """The position of the lowest set bit of a nonzero group mask, as an i64 offset."""
+    builder = codegen.builder
+    bit = builder.cttz(bits, ir.Constant(ir.IntType(1), 1))
+    return builder.zext(bit, ir.IntType(64))
+
+
+def _probe_on(builder: ir.IRBuilder, continue_bb: ir.Block) -> None:
+    if builder.block.terminator is None:
+        builder.branch(continue_bb)
@@ -18,25 +18,17 @@ ENTRY_OCCUPIED = 1   # Slot contains valid key-value pair
 ENTRY_TOMBSTONE = 2  # Slot was deleted (marks probe chain)
 
 
-# Power-of-two capacities for HashMap (fast bitwise AND indexing)
-# With strong hash functions (FxHash, FNV-1a), power-of-two provides:
-# - 3-10x faster indexing (AND vs modulo)
-# - Excellent distribution (hash quality matters, not capacity)
-# - Simpler implementation
-POWER_OF_TWO_CAPACITIES = [
-    16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192,
-    16384, 32768, 65536, 131072, 262144, 524288, 1048576,
-    2097152, 4194304, 8388608, 16777216
-]
-
-
-def get_next_capacity(current: int) -> int:
-    """Get the next power-of-two capacity >= 2 * current."""
-    target = current * 2
-    for capacity in POWER_OF_TWO_CAPACITIES:
-        if capacity >= target:
-            return capacity
-    return target
+# Every capacity is a power of two, so a slot index is `hash & (capacity - 1)` -- an
+# AND, not a modulo. With strong hash functions (FxHash for integers, the wyhash-style
+# string hash) the distribution does not suffer for it. `new()` starts at MIN_CAPACITY
+# and each resize doubles; the size, capacity and tombstone counts are i64, so a map is
+# not capped at 2^31 slots.
+MIN_CAPACITY = 16
+
+# The load factor, as a ratio: an insert resizes once (size + tombstones) * 4 exceeds
+# capacity * 3, i.e. at 0.75.
+LOAD_FACTOR_NUM = 3
+LOAD_FACTOR_DEN = 4
 
 
 def get_entry_type(codegen: Any, key_type: Type, value_type: Type) -> ir.Type:
@@ -60,9 +52,9 @@ def get_hashmap_llvm_type(codegen: Any, key_type: Type, value_type: Type) -> ir.
 
     return ir.LiteralStructType([
         buckets_type,         # Entry<K, V>[] buckets
-        codegen.types.i32,    # i32 size
-        codegen.types.i32,    # i32 capacity
-        codegen.types.i32,    # i32 tombstones
+        codegen.types.i64,    # i64 size
+        codegen.types.i64,    # i64 capacity
+        codegen.types.i64,    # i64 tombstones
     ])
 
 
@@ -93,12 +93,12 @@ def emit_enum_equality(codegen: Any, enum_type: EnumType, enum1: ir.Value, enum2
     # on the (equal) tag and unpack each data-carrying variant's fields with their
     # real semantic types, then compare field-by-field.
     i1_ty = ir.IntType(1)
-    data_eq_slot = builder.alloca(i1_ty, name="enum_data_eq")
+    data_eq_slot = codegen.memory.entry_alloca(i1_ty, "enum_data_eq")
     builder.store(TRUE_I1, data_eq_slot)
 
     enum_llvm_type = codegen.types.get_enum_type(enum_type)
-    enum1_ptr = builder.alloca(enum_llvm_type, name="enum1_tmp")
-    enum2_ptr = builder.alloca(enum_llvm_type, name="enum2_tmp")
+    enum1_ptr = codegen.memory.entry_alloca(enum_llvm_type, "enum1_tmp")
+    enum2_ptr = codegen.memory.entry_alloca(enum_llvm_type, "enum2_tmp")
     builder.store(enum1, enum1_ptr)
     builder.store(enum2, enum2_ptr)
     data1_ptr = enum_utils.get_data_ptr(codegen, enum1_ptr, name="enum1_data")
@@ -154,15 +154,15 @@ def emit_fixed_array_equality(codegen: Any, array_type: ArrayType, arr1: ir.Valu
     size = array_type.size
 
     arr1_llvm_type = codegen.types.ll_type(array_type)
-    arr1_ptr = builder.alloca(arr1_llvm_type, name="arr1_ptr")
+    arr1_ptr = codegen.memory.entry_alloca(arr1_llvm_type, "arr1_ptr")
     builder.store(arr1, arr1_ptr)
-    arr2_ptr = builder.alloca(arr1_llvm_type, name="arr2_ptr")
+    arr2_ptr = codegen.memory.entry_alloca(arr1_llvm_type, "arr2_ptr")
     builder.store(arr2, arr2_ptr)
 
-    result = builder.alloca(codegen.types.i1, name="arrays_equal")
+    result = codegen.memory.entry_alloca(codegen.types.i1, "arrays_equal")
     builder.store(TRUE_I1, result)
 
-    i_ptr = builder.alloca(codegen.types.i32, name="i_ptr")
+    i_ptr = codegen.memory.entry_alloca(codegen.types.i32, "i_ptr")
     builder.store(ZERO_I32, i_ptr)
 
     loop_cond_bb = builder.append_basic_block(name="array_eq_loop_cond")
@@ -215,10 +215,10 @@ def emit_dynamic_array_equality(codegen: Any, array_type: DynamicArrayType, arr1
     data1_ptr = builder.extract_value(arr1, 2, name="data1_ptr")
     data2_ptr = builder.extract_value(arr2, 2, name="data2_ptr")
 
-    result = builder.alloca(codegen.types.i1, name="elements_equal")
+    result = codegen.memory.entry_alloca(codegen.types.i1, "elements_equal")
     builder.store(TRUE_I1, result)
 
-    i_ptr = builder.alloca(codegen.types.i32, name="i_ptr")
+    i_ptr = codegen.memory.entry_alloca(codegen.types.i32, "i_ptr")
     builder.store(ZERO_I32, i_ptr)
 
     loop_cond_bb = builder.append_basic_block(name="dyn_array_loop_cond")
@@ -294,6 +294,122 @@ def emit_destroy_all_entries(
     )
 
 
+def emit_bucket_bytes(codegen: Any, entry_type: ir.Type, capacity: ir.Value) -> ir.Value:
+    """i64 byte size of a bucket buffer of `capacity` slots, in the build's layout.
+
+    Both layouts cache each entry's u64 hash after the entries; the swiss layout adds
+    its control bytes after those. A size past 2^64 traps RE2021: no allocation holds
+    it, and the wrapped product would be a small buffer written out of bounds.
+    """
+    from sushi_lang.backend.expressions.memory import get_element_size_constant
+    from . import swiss
+
+    builder = codegen.builder
+    i64 = ir.IntType(64)
+    entry_size = builder.zext(get_element_size_constant(codegen, entry_type), i64,
+                              name="entry_size_i64")
+    slot_bytes = builder.add(entry_size, ir.Constant(i64, 8), name="slot_bytes")
+    product = builder.umul_with_overflow(capacity, slot_bytes, name="bucket_bytes_checked")
+    total_bytes = builder.extract_value(product, 0, name="bucket_bytes")
+    overflowed = builder.extract_value(product, 1, name="bucket_bytes_overflow")
+    if swiss.is_swiss(codegen):
+        total = builder.uadd_with_overflow(total_bytes, swiss.emit_ctrl_bytes(codegen, capacity),
+                                           name="swiss_bucket_bytes_checked")
+        total_bytes = builder.extract_value(total, 0, name="swiss_bucket_bytes")
+        overflowed = builder.or_(overflowed, builder.extract_value(total, 1))
+    emit_size_overflow_trap(codegen, overflowed, "bucket_bytes")
+    return total_bytes
+
+
+def emit_size_overflow_trap(codegen: Any, overflowed: ir.Value, prefix: str) -> None:
+    """Trap RE2021 where a table size overflowed i64, as `emit_malloc` does for NULL."""
+    from sushi_lang.backend.cold_paths import emit_unlikely_branch
+
+    builder = codegen.builder
+    overflow_bb = builder.append_basic_block(name=f"{prefix}_overflow")
+    ok_bb = builder.append_basic_block(name=f"{prefix}_fits")
+    emit_unlikely_branch(builder, overflowed, overflow_bb, ok_bb)
+
+    builder.position_at_end(overflow_bb)
+    codegen.runtime.errors.emit_runtime_error("RE2021")
+    builder.unreachable()
+
+    builder.position_at_end(ok_bb)
+
+
+def get_hashes_ptr(codegen: Any, buckets_data: ir.Value, capacity: ir.Value) -> ir.Value:
+    """The u64 cached-hash array, right after the entries.
+
+    `hashes[i]` is the hash of the key in slot i, written on insert, so a resize
+    re-places every entry without calling `.hash()` again.
+    """
+    builder = codegen.builder
+    past_entries = builder.gep(buckets_data, [capacity], name="past_entries")
+    return builder.bitcast(past_entries, ir.PointerType(ir.IntType(64)), name="hashes")
+
+
+def emit_capacity_for(codegen: Any, entries: ir.Value) -> ir.Value:
+    """The smallest capacity (i64) that holds `entries` without a resize.
+
+    A power of two, at least MIN_CAPACITY, with `entries` at or under the 0.75 load
+    factor. A negative count asks for nothing and gets MIN_CAPACITY. A count whose
+    table would pass 2^62 slots traps RE2021 rather than wrapping to a small one.
+    """
+    from .types import MIN_CAPACITY, LOAD_FACTOR_NUM, LOAD_FACTOR_DEN
+
+    builder = codegen.builder
+    i64 = ir.IntType(64)
+    is_negative = builder.icmp_signed("<", entries, ir.Constant(i64, 0), name="entries_negative")
+    entries = builder.select(is_negative, ir.Constant(i64, 0), entries, name="entries_clamped")
+    # ceil(entries * DEN / NUM): the slots needed to stay at the load factor.
+    scaled_checked = builder.umul_with_overflow(entries, ir.Constant(i64, LOAD_FACTOR_DEN),
+                                                name="entries_scaled_checked")
+    scaled = builder.extract_value(scaled_checked, 0, name="entries_scaled")
+    needed = builder.udiv(builder.add(scaled, ir.Constant(i64, LOAD_FACTOR_NUM - 1)),
+                          ir.Constant(i64, LOAD_FACTOR_NUM), name="slots_needed")
+    below_min = builder.icmp_unsigned("<", needed, ir.Constant(i64, MIN_CAPACITY),
+                                      name="below_min_capacity")
+    needed = builder.select(below_min, ir.Constant(i64, MIN_CAPACITY), needed,
+                            name="slots_at_least_min")
+    # Round up to a power of two: 1 << (64 - ctlz(needed - 1)). Past 2^62 slots the
+    # shift reaches 64, which LLVM leaves undefined.
+    too_many = builder.or_(builder.extract_value(scaled_checked, 1),
+                           builder.icmp_unsigned(">", needed, ir.Constant(i64, 1 << 62)),
+                           name="capacity_overflow")
+    emit_size_overflow_trap(codegen, too_many, "capacity_for")
+    leading = builder.ctlz(builder.sub(needed, ir.Constant(i64, 1)), ir.Constant(ir.IntType(1), 0))
+    shift = builder.sub(ir.Constant(i64, 64), leading, name="capacity_log2")
+    return builder.shl(ir.Constant(i64, 1), shift, name="capacity_for")
+
+
+def emit_entry_count_arg(codegen: Any, arg: Any) -> ir.Value:
+    """Emit the integer argument of `with_capacity(n)` / `reserve(n)` as an i64."""
+    from sushi_lang.backend.expressions.type_utils import infer_expr_semantic_type, is_unsigned_type
+
+    builder = codegen.builder
+    i64 = ir.IntType(64)
+    value = codegen.expressions.emit_expr(arg)
+    if value.type.width >= 64:
+        return value
+    if is_unsigned_type(infer_expr_semantic_type(codegen, arg)):
+        return builder.zext(value, i64, name="entry_count")
+    return builder.sext(value, i64, name="entry_count")
+
+
+def emit_alloc_buckets(codegen: Any, entry_type: ir.Type, capacity: ir.Value) -> ir.Value:
+    """malloc an empty bucket buffer of `capacity` entries and return it as Entry*."""
+    from sushi_lang.backend.memory.heap import emit_malloc
+    from . import swiss
+
+    builder = codegen.builder
+    raw = emit_malloc(codegen, builder, emit_bucket_bytes(codegen, entry_type, capacity))
+    buckets = builder.bitcast(raw, ir.PointerType(entry_type), name="buckets_ptr")
+    emit_init_buckets_empty(codegen, buckets, capacity)
+    if swiss.is_swiss(codegen):
+        swiss.emit_init_ctrl_empty(codegen, buckets, capacity)
+    return buckets
+
+
 def emit_init_buckets_empty(codegen: Any, buckets_data: ir.Value, capacity: ir.Value) -> None:
     """Mark every bucket EMPTY. Fresh malloc'd storage holds garbage, not zeroes."""
     from sushi_lang.backend.generics.container_walk import emit_container_walk
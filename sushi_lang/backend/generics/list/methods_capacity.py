@@ -1,4 +1,4 @@
-"""List<T> capacity management methods: reserve(), shrink_to_fit()."""
+"""List<T> capacity management methods: reserve(), shrink_to_fit(), and push/insert growth."""
 
 from typing import Any
 from sushi_lang.semantics.typesys import StructType
@@ -7,6 +7,83 @@ import llvmlite.ir as ir
 from .types import get_list_len_ptr, get_list_capacity_ptr, get_list_element_type, get_list_data_ptr
 
 
+def emit_list_grow_if_full(codegen: Any, list_ptr: ir.Value, list_type: StructType,
+                           current_len: ir.Value, current_cap: ir.Value) -> ir.Value:
+    """Make room for one more element; returns the data pointer to write through.
+
+    Only the len-vs-cap compare is inline. Doubling the capacity is a call to the list
+    type's `cold noinline` grow function, behind a branch weighted as unlikely. The call
+    takes the buffer and capacity by value and returns the new pair rather than taking
+    the list's address: a list whose address escapes stays in memory, and a push loop
+    then loads and stores `len` on every iteration.
+    """
+    from sushi_lang.backend.cold_paths import emit_unlikely_branch
+
+    builder = codegen.builder
+    capacity_ptr = get_list_capacity_ptr(builder, list_ptr)
+    data_ptr_ptr = get_list_data_ptr(builder, list_ptr)
+    grow_fn = _get_or_emit_list_grow(codegen, data_ptr_ptr.type.pointee, list_type)
+
+    need_growth = builder.icmp_unsigned(">=", current_len, current_cap, name="need_growth")
+    grow_block = codegen.func.append_basic_block("list_grow")
+    has_room_block = codegen.func.append_basic_block("list_has_room")
+    emit_unlikely_branch(builder, need_growth, grow_block, has_room_block)
+
+    builder.position_at_end(grow_block)
+    data_ptr = builder.load(data_ptr_ptr, name="data_ptr")
+    grown = builder.call(grow_fn, [data_ptr, current_cap], name="grown")
+    builder.store(builder.extract_value(grown, 0, name="new_data_ptr"), data_ptr_ptr)
+    builder.store(builder.extract_value(grown, 1, name="new_cap"), capacity_ptr)
+    builder.branch(has_room_block)
+
+    builder.position_at_end(has_room_block)
+    return builder.load(data_ptr_ptr, name="data_ptr")
+
+
+def _get_or_emit_list_grow(codegen: Any, data_ptr_type: ir.Type, list_type: StructType) -> ir.Function:
+    """`{T*, i32} __sushi_list_grow_<List<T>>(T* data, i32 cap)`: double the capacity (0 -> 1)."""
+    from sushi_lang.backend.cold_paths import get_or_emit_cold_function
+    from sushi_lang.backend.lifecycle import lifecycle_symbol
+
+    i32 = codegen.types.i32
+    fn_ty = ir.FunctionType(ir.LiteralStructType([data_ptr_type, i32]), [data_ptr_type, i32])
+    return get_or_emit_cold_function(
+        codegen, lifecycle_symbol("__sushi_list_grow_", list_type), fn_ty,
+        lambda fn: _emit_list_grow_body(codegen, fn),
+    )
+
+
+def _emit_list_grow_body(codegen: Any, fn: ir.Function) -> None:
+    """The grow function's body: realloc the buffer to twice its capacity."""
+    from sushi_lang.backend.expressions import memory
+
+    data_ptr, current_cap = fn.args
+    element_llvm_type = data_ptr.type.pointee
+
+    zero = ir.Constant(codegen.types.i32, 0)
+    one = ir.Constant(codegen.types.i32, 1)
+    two = ir.Constant(codegen.types.i32, 2)
+
+    cap_is_zero = codegen.builder.icmp_unsigned("==", current_cap, zero)
+    double_cap = codegen.builder.mul(current_cap, two)
+    new_cap = codegen.builder.select(cap_is_zero, one, double_cap, name="new_cap")
+
+    element_size = memory.get_element_size_constant(codegen, element_llvm_type)
+    new_total_size = codegen.builder.mul(new_cap, element_size, name="new_total_size")
+
+    new_data_ptr = memory.emit_realloc_call(codegen, data_ptr, new_total_size)
+    typed_new_data_ptr = codegen.builder.bitcast(
+        new_data_ptr,
+        ir.PointerType(element_llvm_type),
+        name="typed_new_data_ptr"
+    )
+
+    grown = ir.Constant(fn.function_type.return_type, ir.Undefined)
+    grown = codegen.builder.insert_value(grown, typed_new_data_ptr, 0)
+    grown = codegen.builder.insert_value(grown, new_cap, 1)
+    codegen.builder.ret(grown)
+
+
 def emit_list_reserve(codegen: Any, expr: Any, list_ptr: ir.Value, list_type: StructType) -> ir.Value:
     """Emit LLVM IR for list.reserve(additional) - ensure capacity for more elements."""
     from sushi_lang.backend.expressions import memory
@@ -5,61 +5,25 @@ from sushi_lang.semantics.typesys import StructType
 import llvmlite.ir as ir
 
 from .types import get_list_len_ptr, get_list_capacity_ptr, get_list_element_type, extract_element_type, get_list_data_ptr
+from .methods_capacity import emit_list_grow_if_full
 from sushi_lang.backend.constants.llvm_values import FALSE_I1
 
 
 def emit_list_push(codegen: Any, expr: Any, list_ptr: ir.Value, list_type: StructType) -> ir.Value:
     """Emit LLVM IR for list.push(element) - append element with auto-growth."""
-    from sushi_lang.backend.expressions import memory
     from sushi_lang.backend import gep_utils
 
     element_type = extract_element_type(list_type, codegen)
-    list_llvm_type = list_ptr.type.pointee
-    element_llvm_type = get_list_element_type(codegen, list_llvm_type)
 
     list_alloca = list_ptr
 
     len_ptr = get_list_len_ptr(codegen.builder, list_alloca)
     capacity_ptr = get_list_capacity_ptr(codegen.builder, list_alloca)
-    data_ptr_ptr = get_list_data_ptr(codegen.builder, list_alloca)
 
     current_len = codegen.builder.load(len_ptr, name="current_len")
     current_cap = codegen.builder.load(capacity_ptr, name="current_cap")
-    data_ptr = codegen.builder.load(data_ptr_ptr, name="data_ptr")
-
-    zero = ir.Constant(codegen.types.i32, 0)
-    one = ir.Constant(codegen.types.i32, 1)
-    two = ir.Constant(codegen.types.i32, 2)
-
-    need_growth = codegen.builder.icmp_unsigned(">=", current_len, current_cap)
-
-    before_if = codegen.builder.block
-
-    with codegen.builder.if_then(need_growth):
-
-        cap_is_zero = codegen.builder.icmp_unsigned("==", current_cap, zero)
-        double_cap = codegen.builder.mul(current_cap, two)
-        new_cap = codegen.builder.select(cap_is_zero, one, double_cap, name="new_cap")
-
-        element_size = memory.get_element_size_constant(codegen, element_llvm_type)
-        new_total_size = codegen.builder.mul(new_cap, element_size, name="new_total_size")
-
-        new_data_ptr = memory.emit_realloc_call(codegen, data_ptr, new_total_size)
-        typed_new_data_ptr = codegen.builder.bitcast(
-            new_data_ptr,
-            ir.PointerType(element_llvm_type),
-            name="typed_new_data_ptr"
-        )
-
-        codegen.builder.store(new_cap, capacity_ptr)
-        codegen.builder.store(typed_new_data_ptr, data_ptr_ptr)
-        after_if = codegen.builder.block
 
-    phi = codegen.builder.phi(data_ptr.type, name="data_ptr_phi")
-    phi.add_incoming(data_ptr, before_if)
-    if 'after_if' in locals():
-        phi.add_incoming(typed_new_data_ptr, after_if)
-    data_ptr = phi
+    data_ptr = emit_list_grow_if_full(codegen, list_alloca, list_type, current_len, current_cap)
 
     # Evaluate element to push. The list stores it shallowly and frees it on
     # `.destroy()`/scope exit, so this is a consuming use: the seam decides whether the
@@ -72,6 +36,7 @@ def emit_list_push(codegen: Any, expr: Any, list_ptr: ir.Value, list_type: Struc
     element_ptr = gep_utils.gep_array_element(codegen, data_ptr, current_len, "element_ptr")
     codegen.builder.store(element_value, element_ptr)
 
+    one = ir.Constant(codegen.types.i32, 1)
     new_len = codegen.builder.add(current_len, one, name="new_len")
     codegen.builder.store(new_len, len_ptr)
 
@@ -227,11 +192,9 @@ def emit_list_insert(codegen: Any, expr: Any, list_ptr: ir.Value, list_type: Str
 
     len_ptr = get_list_len_ptr(codegen.builder, list_alloca)
     capacity_ptr = get_list_capacity_ptr(codegen.builder, list_alloca)
-    data_ptr_ptr = get_list_data_ptr(codegen.builder, list_alloca)
 
     current_len = codegen.builder.load(len_ptr, name="current_len")
     current_cap = codegen.builder.load(capacity_ptr, name="current_cap")
-    data_ptr = codegen.builder.load(data_ptr_ptr, name="data_ptr")
 
     index_value = codegen.expressions.emit_expr(expr.args[0])
 
@@ -260,37 +223,7 @@ def emit_list_insert(codegen: Any, expr: Any, list_ptr: ir.Value, list_type: Str
 
     codegen.builder.position_at_end(in_bounds_block)
 
-    need_growth = codegen.builder.icmp_unsigned(">=", current_len, current_cap)
-
-    before_growth = codegen.builder.block
-
-    with codegen.builder.if_then(need_growth):
-        one = ir.Constant(codegen.types.i32, 1)
-        two = ir.Constant(codegen.types.i32, 2)
-
-        cap_is_zero = codegen.builder.icmp_unsigned("==", current_cap, zero)
-        double_cap = codegen.builder.mul(current_cap, two)
-        new_cap = codegen.builder.select(cap_is_zero, one, double_cap, name="new_cap")
-
-        element_size = memory.get_element_size_constant(codegen, element_llvm_type)
-        new_total_size = codegen.builder.mul(new_cap, element_size, name="new_total_size")
-
-        new_data_ptr = memory.emit_realloc_call(codegen, data_ptr, new_total_size)
-        typed_new_data_ptr = codegen.builder.bitcast(
-            new_data_ptr,
-            ir.PointerType(element_llvm_type),
-            name="typed_new_data_ptr"
-        )
-
-        codegen.builder.store(new_cap, capacity_ptr)
-        codegen.builder.store(typed_new_data_ptr, data_ptr_ptr)
-        after_growth = codegen.builder.block
-
-    phi = codegen.builder.phi(data_ptr.type, name="data_ptr_phi")
-    phi.add_incoming(data_ptr, before_growth)
-    if 'after_growth' in locals():
-        phi.add_incoming(typed_new_data_ptr, after_growth)
-    data_ptr = phi
+    data_ptr = emit_list_grow_if_full(codegen, list_alloca, list_type, current_len, current_cap)
 
     # Now shift elements from [index, len) one position to the right
     # We need to move (len - index) elements
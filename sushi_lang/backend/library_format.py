@@ -1,6 +1,7 @@
 """Binary library format (.slib) for Sushi libraries."""
 from __future__ import annotations
 
+import os
 import struct
 from pathlib import Path
 from typing import BinaryIO
@@ -47,6 +48,30 @@ def _read_header_and_metadata(f: BinaryIO, path: str) -> dict:
         raise LibraryError("CE3512", path=path, reason=str(e)) from e
 
 
+def _skip_metadata(f: BinaryIO, path: str) -> None:
+    """Validate the header and seek past the metadata without decoding it."""
+    from sushi_lang.backend.library_errors import LibraryError
+
+    magic = _read_bytes(f, 16, path, "metadata")
+    if magic != LibraryFormat.MAGIC:
+        raise LibraryError("CE3508", path=path)
+
+    version = struct.unpack("<I", _read_bytes(f, 28, path, "metadata")[0:4])[0]
+    if version != LibraryFormat.VERSION:
+        raise LibraryError("CE3509", path=path,
+                           version=version, supported=LibraryFormat.VERSION)
+
+    meta_len = struct.unpack("<Q", _read_bytes(f, 8, path, "metadata"))[0]
+    f.seek(meta_len, os.SEEK_CUR)
+
+
+# Decoded metadata of every .slib this process has loaded, keyed by resolved path and
+# stamped with the file's (mtime_ns, size, inode) at the time. A compile reads each
+# library's manifest in the pipeline and again in codegen, and a warm `sushic --server`
+# compiles against the same libraries over and over; each decodes it once.
+_metadata_cache: dict[str, tuple[tuple[int, int, int], dict]] = {}
+
+
 class LibraryFormat:
     """Binary format reader/writer for .slib files."""
 
@@ -103,3 +128,37 @@ class LibraryFormat:
         """Read only metadata from .slib file (for introspection)."""
         with open(library_path, 'rb') as f:
             return _read_header_and_metadata(f, str(library_path))
+
+    @staticmethod
+    def read_bitcode(library_path: Path) -> bytes:
+        """Read only the bitcode from .slib file, skipping the metadata undecoded."""
+        from sushi_lang.backend.library_errors import LibraryError
+
+        path = str(library_path)
+        with open(library_path, 'rb') as f:
+            _skip_metadata(f, path)
+            bc_len = struct.unpack("<Q", _read_bytes(f, 8, path, "bitcode"))[0]
+            bitcode = _read_bytes(f, bc_len, path, "bitcode")
+
+            total_size = f.tell()
+            if total_size > LibraryFormat.MAX_FILE_SIZE:
+                raise LibraryError("CE3513", path=path,
+                                   size=total_size, max_size=LibraryFormat.MAX_FILE_SIZE)
+
+        return bitcode
+
+    @staticmethod
+    def load_metadata(library_path: Path) -> dict:
+        """Metadata of a .slib file, decoded once per process while the file is unchanged.
+
+        The dict is shared by every caller, so it must be treated as read-only.
+        """
+        key = os.path.realpath(library_path)
+        st = os.stat(key)
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = _metadata_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        metadata = LibraryFormat.read_metadata_only(Path(key))
+        _metadata_cache[key] = (stamp, metadata)
+        return metadata
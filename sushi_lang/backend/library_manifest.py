@@ -22,7 +22,7 @@ class LibraryManifestGenerator:
         self.enums = analyzer.enums
 
     def generate(self, units: list['Unit'], output_path: Path, bitcode: bytes,
-                 templates: dict | None = None) -> None:
+                 templates: dict | None = None, hashmap_layout: str = "linear") -> None:
         """Generate .slib library file."""
         from sushi_lang.backend.platform_detect import current_platform_name
         from sushi_lang.internals.version import _get_versions
@@ -39,6 +39,7 @@ class LibraryManifestGenerator:
             "compiled_at": datetime.now(timezone.utc).isoformat(),
             "platform": platform_name,
             "compiler_version": VERSION,
+            "hashmap_layout": hashmap_layout,
             "public_functions": self._extract_public_functions(units),
             "public_constants": self._extract_public_constants(units),
             "structs": self._extract_structs(units),
@@ -334,9 +335,9 @@ class LibraryManifestGenerator:
         }
 
     def _extract_templates(self, units: list['Unit']) -> dict:
-        """Extract instantiable public generic templates (re-parsable source)."""
+        """Extract instantiable public generic templates (source plus its pre-parsed AST)."""
         from sushi_lang.semantics.library_templates import (
-            serialize_generic_function, serialize_generic_struct,
+            TemplateASTEncoder, serialize_generic_function, serialize_generic_struct,
             serialize_generic_enum, serialize_perk, serialize_perk_impl,
             slice_decl_source,
         )
@@ -448,8 +449,17 @@ class LibraryManifestGenerator:
                 seen_impls.add((type_name, impl.perk_name))
                 perk_impls.append(serialize_perk_impl(impl, source))
 
+        # Ship each record's parse alongside its source, so the consumer does not have to
+        # run the parser over every template of every library it links.
+        encoder = TemplateASTEncoder()
+        for records in (generic_functions, generic_structs, generic_enums,
+                        perks, perk_impls, shipped_constants):
+            for record in records:
+                encoder.attach(record)
+
         return {
-            "version": 4,
+            "version": 5,
+            "ast": encoder.section(),
             "generic_functions": generic_functions,
             "generic_structs": generic_structs,
             "generic_enums": generic_enums,
@@ -5,19 +5,36 @@ import typing
 from typing import Optional, Any, Dict
 
 from llvmlite import binding as llvm
+from sushi_lang.internals import timing
 from sushi_lang.internals.errors import raise_internal_error
 if typing.TYPE_CHECKING:
     from sushi_lang.backend.codegen_llvm import LLVMCodegen
 
 
+# What `--opt O1/O2/O3` runs. "sushi" is the hand-assembled function-pass list below;
+# "llvm" is LLVM's own per-module default pipeline, `default<On>`, which adds the
+# inliner, LICM and the loop and SLP vectorizers.
+PIPELINES = ("sushi", "llvm")
+
+# Process-wide: the native target is initialized once and one target machine is built
+# per triple, shared by every codegen -- each unit's, and each compile a `sushic
+# --server` forks from its warm state.
+_llvm_ready = False
+_target_machines: Dict[str, llvm.TargetMachine] = {}
+
+
+def warm_native_target() -> llvm.TargetMachine:
+    """Initialize LLVM and build the host's target machine ahead of the first compile."""
+    return LLVMOptimizer(None).ensure_target()
+
+
 class LLVMOptimizer:
     """Handles LLVM optimization pipeline, verification, and target setup."""
 
     def __init__(self, codegen: 'LLVMCodegen') -> None:
         """Initialize optimizer with reference to main codegen instance."""
         self.codegen = codegen
-        self._llvm_init = False
-        self._tm_cache: Dict[str, llvm.TargetMachine] = {}
+        self.pipeline = "sushi"
 
     def optimize(self, llmod: llvm.ModuleRef, mode: str = "mem2reg") -> None:
         """Apply optimization passes to LLVM module."""
@@ -25,12 +42,15 @@ class LLVMOptimizer:
         if m in ("none", "o0"):
             return
 
-        tm = self._create_target_machine_with_reloc()
+        tm = self.ensure_target()
 
-        if m == "mem2reg":
-            self._apply_mem2reg_optimization(llmod, tm)
-        else:
-            self._apply_standard_optimization(llmod, tm, m)
+        with timing.phase("optimize"):
+            if m == "mem2reg":
+                self._apply_mem2reg_optimization(llmod, tm)
+            elif self.pipeline == "llvm":
+                self._apply_default_pipeline(llmod, tm, m)
+            else:
+                self._apply_standard_optimization(llmod, tm, m)
 
     @staticmethod
     def _apply_mem2reg_optimization(llmod: llvm.ModuleRef, tm: llvm.TargetMachine) -> None:
@@ -70,6 +90,25 @@ class LLVMOptimizer:
 
         mpm.run(llmod, pb)
 
+    @staticmethod
+    def _apply_default_pipeline(llmod: llvm.ModuleRef, tm: llvm.TargetMachine, mode: str) -> None:
+        """Apply LLVM's per-module default O1/O2/O3 pipeline, inliner included.
+
+        The tuning mirrors clang's: the loop and SLP vectorizers and loop interleaving
+        are on from O2, and the inline threshold follows the speed level.
+        """
+        levels = {"o1": 1, "o2": 2, "o3": 3}
+        level = levels.get(mode, 1)
+
+        pto = llvm.PipelineTuningOptions(speed_level=level, size_level=0)
+        pto.loop_vectorization = level >= 2
+        pto.slp_vectorization = level >= 2
+        pto.loop_interleaving = level >= 2
+        pto.loop_unrolling = True
+        pb = llvm.PassBuilder(tm, pto)
+
+        pb.getModulePassManager().run(llmod, pb)
+
     @staticmethod
     def _build_o1_pipeline(fpm: Any, mpm: Any) -> None:
         """Build O1 optimization pipeline with basic optimizations."""
@@ -171,17 +210,20 @@ class LLVMOptimizer:
     def verify(llmod: llvm.ModuleRef, when: str = "unspecified") -> None:
         """Verify LLVM IR correctness and structure."""
         try:
-            llmod.verify()
+            with timing.phase("verify"):
+                llmod.verify()
         except Exception as e:
             raise_internal_error("CE0015", message=f"LLVM IR verification failed ({when}): {e}")
 
     def ensure_llvm(self) -> None:
         """Initialize LLVM native target and assembly printer."""
-        if self._llvm_init:
+        global _llvm_ready
+        if _llvm_ready:
             return
-        llvm.initialize_native_target()
-        llvm.initialize_native_asmprinter()
-        self._llvm_init = True
+        with timing.phase("llvm-init"):
+            llvm.initialize_native_target()
+            llvm.initialize_native_asmprinter()
+        _llvm_ready = True
 
     def _create_target_machine_with_reloc(self, target_triple: str | None = None) -> llvm.TargetMachine:
         """Create target machine with appropriate relocation model for the platform."""
@@ -201,10 +243,10 @@ class LLVMOptimizer:
 
         triple = target_triple or llvm.get_default_triple()
 
-        tm = self._tm_cache.get(triple)
+        tm = _target_machines.get(triple)
         if tm is None:
             tm = self._create_target_machine_with_reloc(triple)
-            self._tm_cache[triple] = tm
+            _target_machines[triple] = tm
 
         if mod is not None:
             mod.triple = triple
@@ -225,7 +267,7 @@ class LLVMOptimizer:
 
     def clear_cache(self) -> None:
         """Clear the target machine cache."""
-        self._tm_cache.clear()
+        _target_machines.clear()
 
     def get_cached_targets(self) -> list[str]:
         """Get list of cached target triples."""
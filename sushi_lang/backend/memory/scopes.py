@@ -53,6 +53,11 @@ class ScopeManager:
         # borrows with a cleared owned bit.
         self._string_cleanup: Dict[str, List[tuple[int, ir.AllocaInstr]]] = {}
 
+        # Function-value slot -> the lifted lambda its `let` bound, for a binding the lift
+        # pass proved is only ever called (`Let.known_callee`). Keyed by SLOT, not name, so
+        # a shadowing binding of the same name is never mistaken for it.
+        self._known_callees: Dict[ir.AllocaInstr, str] = {}
+
     @staticmethod
     def _stack_peek_slot(reg: Dict[str, List], name: str) -> Optional[ir.AllocaInstr]:
         """Return the innermost registered slot for `name` in a stacked cleanup registry."""
@@ -191,6 +196,14 @@ class ScopeManager:
         for scope_list in self._closure_temp_cleanup:
             self._free_closure_temp_list(scope_list)
 
+    def set_known_callee(self, slot: ir.AllocaInstr, function_name: str) -> None:
+        """Record that the function value in `slot` always calls `function_name`."""
+        self._known_callees[slot] = function_name
+
+    def known_callee(self, slot: ir.AllocaInstr) -> Optional[str]:
+        """The function the value in `slot` always calls, or None when it is not known."""
+        return self._known_callees.get(slot)
+
     def try_find_local_slot(self, name: str) -> Optional[ir.AllocaInstr]:
         """Local variable slot for `name`, or None if it is not a local at all."""
         if name in self._locals and self._locals[name]:
@@ -407,6 +420,7 @@ class ScopeManager:
         self._string_cleanup.clear()
         self._cstr_cleanup = []
         self._closure_temp_cleanup = []
+        self._known_callees.clear()
 
         self.codegen.moves.reset()
 
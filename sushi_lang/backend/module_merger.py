@@ -9,6 +9,11 @@ if TYPE_CHECKING:
     from sushi_lang.backend.symbol_table import SymbolInfo
 
 
+# A `!prof` attachment on an instruction (`br ..., !prof !0`). Its `!0` names a node of the
+# module the symbol was printed from, which a merged module does not carry.
+_PROF_ATTACHMENT_RE = re.compile(r', !prof !\d+')
+
+
 class ModuleMerger:
     """Builds a new LLVM module from resolved symbols."""
 
@@ -53,6 +58,7 @@ class ModuleMerger:
                 continue
 
             ir_text = self._strip_type_definitions(symbol.ir_text)
+            ir_text = self._strip_prof_attachments(ir_text)
 
             if symbol.is_declaration:
                 declarations.append(ir_text)
@@ -123,3 +129,11 @@ class ModuleMerger:
             filtered.append(line)
 
         return '\n'.join(filtered)
+
+    def _strip_prof_attachments(self, ir_text: str) -> str:
+        """Drop branch-weight attachments, whose metadata nodes stay in the source module.
+
+        The weights are only a hint: the cold paths they mark call `cold` functions, which
+        LLVM already treats as unlikely.
+        """
+        return _PROF_ATTACHMENT_RE.sub('', ir_text)
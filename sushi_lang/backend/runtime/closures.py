@@ -82,6 +82,17 @@ def env_owns_field(codegen: "LLVMCodegen", field_type) -> bool:
     return type_class_of(field_type, resolver_for(codegen)) is not TypeClass.PLAIN
 
 
+def env_on_stack(codegen: "LLVMCodegen", lam) -> bool:
+    """Does this lambda's environment live in the building function's frame?
+
+    Only a non-escaping lambda's, and only when the environment owns nothing: an owned
+    capture would need the drop thunk, and the drop thunk frees the buffer.
+    """
+    if not getattr(lam, "non_escaping", False) or not lam.captures:
+        return False
+    return not any(env_owns_field(codegen, fty) for _, fty in lam.env_struct.fields)
+
+
 def get_or_create_env_drop(codegen: "LLVMCodegen", env_struct) -> ir.Function:
     """Return (creating once, cached) the type-erased env destructor for a closure."""
     from sushi_lang.backend.destructors import emit_value_destructor
@@ -193,9 +204,15 @@ def emit_lambda(codegen: "LLVMCodegen", lam, to_i1: bool) -> ir.Value:
 
     env_struct = lam.env_struct
     env_ll = codegen.types.ll_type(env_struct)
-    size = codegen.types.get_type_size_bytes(env_struct)
-    raw = emit_malloc(codegen, codegen.builder, ir.Constant(codegen.types.i64, size))
-    env_ptr = codegen.builder.bitcast(raw, ir.PointerType(env_ll), name="closure_env_typed")
+    if env_on_stack(codegen, lam):
+        # An ENTRY-block slot, so a lambda built in a loop reuses one frame slot. Nothing
+        # registers the value for cleanup, so the drop thunk is never called on it; it
+        # stays in the value for a `.clone()`, which copies the environment to the heap.
+        env_ptr = codegen.memory.entry_alloca(env_ll, "closure_env_stack")
+    else:
+        size = codegen.types.get_type_size_bytes(env_struct)
+        raw = emit_malloc(codegen, codegen.builder, ir.Constant(codegen.types.i64, size))
+        env_ptr = codegen.builder.bitcast(raw, ir.PointerType(env_ll), name="closure_env_typed")
 
     i32 = codegen.types.i32
     zero = ir.Constant(i32, 0)
@@ -235,3 +252,25 @@ def emit_indirect_call(
     casted = [codegen.utils.cast_for_param(v, pt) for v, pt in zip(arg_values, param_ll, strict=True)]
     result = codegen.builder.call(callee, [env_ptr] + casted)
     return codegen.utils.as_i1(result) if to_i1 else result
+
+
+def emit_known_call(
+    codegen: "LLVMCodegen",
+    target: ir.Function,
+    fat_value: ir.Value,
+    fn_type: FunctionType,
+    arg_values: List[ir.Value],
+    to_i1: bool,
+) -> ir.Value:
+    """Call a function value whose lifted lambda is known: no call through `fn_ptr`."""
+    callee_ty = _env_prepended_signature(codegen, fn_type)
+    if (target.function_type.return_type != callee_ty.return_type
+            or len(target.args) != len(callee_ty.args)):
+        return emit_indirect_call(codegen, fat_value, fn_type, arg_values, to_i1)
+
+    env_i8 = codegen.builder.extract_value(fat_value, 1)
+    env_ptr = codegen.builder.bitcast(env_i8, target.args[0].type)
+    params = list(target.args)[1:]
+    casted = [codegen.utils.cast_for_param(v, p.type) for v, p in zip(arg_values, params, strict=True)]
+    result = codegen.builder.call(target, [env_ptr] + casted)
+    return codegen.utils.as_i1(result) if to_i1 else result
@@ -28,6 +28,10 @@ class LibCStdio:
         self.fputc: ir.Function
         self.fread: ir.Function
         self.fwrite: ir.Function
+        self.fwrite_unlocked: ir.Function
+        self.fflush: ir.Function
+        self.setvbuf: ir.Function
+        self.isatty: ir.Function
         self.fseek: ir.Function
         self.ftell: ir.Function
         self.rewind: ir.Function
@@ -50,6 +54,10 @@ class LibCStdio:
         self._declare_fputc()
         self._declare_fread()
         self._declare_fwrite()
+        self._declare_fwrite_unlocked()
+        self._declare_fflush()
+        self._declare_setvbuf()
+        self._declare_isatty()
         self._declare_fseek()
         self._declare_ftell()
         self._declare_rewind()
@@ -191,6 +199,59 @@ class LibCStdio:
         else:
             self.fwrite = ir.Function(self.codegen.module, fn_ty, name="fwrite")
 
+    def _declare_fwrite_unlocked(self) -> None:
+        """Declare the lock-free fwrite: fwrite_unlocked on Linux, plain fwrite elsewhere.
+
+        Same signature as fwrite. macOS has no fwrite_unlocked, so there it is fwrite.
+        """
+        if not get_current_platform().is_linux:
+            self.fwrite_unlocked = self.fwrite
+            return
+        existing = self.codegen.module.globals.get("fwrite_unlocked")
+        if isinstance(existing, ir.Function):
+            self.fwrite_unlocked = existing
+        else:
+            self.fwrite_unlocked = ir.Function(self.codegen.module, self.fwrite.function_type,
+                                               name="fwrite_unlocked")
+
+    def _declare_fflush(self) -> None:
+        """Declare fflush: int fflush(FILE* stream)"""
+        file_ptr_ty = self.codegen.i8.as_pointer()
+        fn_ty = ir.FunctionType(
+            self.codegen.i32,
+            [file_ptr_ty]
+        )
+        existing = self.codegen.module.globals.get("fflush")
+        if isinstance(existing, ir.Function):
+            self.fflush = existing
+        else:
+            self.fflush = ir.Function(self.codegen.module, fn_ty, name="fflush")
+
+    def _declare_setvbuf(self) -> None:
+        """Declare setvbuf: int setvbuf(FILE* stream, char* buf, int mode, size_t size)"""
+        file_ptr_ty = self.codegen.i8.as_pointer()
+        fn_ty = ir.FunctionType(
+            self.codegen.i32,
+            [file_ptr_ty, self.codegen.i8.as_pointer(), self.codegen.i32, ir.IntType(INT64_BIT_WIDTH)]
+        )
+        existing = self.codegen.module.globals.get("setvbuf")
+        if isinstance(existing, ir.Function):
+            self.setvbuf = existing
+        else:
+            self.setvbuf = ir.Function(self.codegen.module, fn_ty, name="setvbuf")
+
+    def _declare_isatty(self) -> None:
+        """Declare isatty: int isatty(int fd)"""
+        fn_ty = ir.FunctionType(
+            self.codegen.i32,
+            [self.codegen.i32]
+        )
+        existing = self.codegen.module.globals.get("isatty")
+        if isinstance(existing, ir.Function):
+            self.isatty = existing
+        else:
+            self.isatty = ir.Function(self.codegen.module, fn_ty, name="isatty")
+
     def _declare_fseek(self) -> None:
         """Declare fseek: int fseek(FILE* stream, long offset, int whence)"""
         file_ptr_ty = self.codegen.i8.as_pointer()
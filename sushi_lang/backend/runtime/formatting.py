@@ -5,7 +5,8 @@ import typing
 
 from llvmlite import ir
 
-from sushi_lang.backend.constants.llvm_values import make_i64_const
+from sushi_lang.backend.constants import INT8_BIT_WIDTH, INT32_BIT_WIDTH, INT64_BIT_WIDTH
+from sushi_lang.backend.constants.llvm_values import FALSE_I1, make_i64_const
 from sushi_lang.backend.memory.heap import emit_malloc
 from sushi_lang.backend.runtime.constants import FORMAT_STRINGS
 from sushi_lang.internals.errors import raise_internal_error
@@ -14,6 +15,290 @@ if typing.TYPE_CHECKING:
     from sushi_lang.backend.codegen_llvm import LLVMCodegen
 
 
+_FORMAT_INTEGER_FN_NAME = "sushi_format_integer"
+_FORMAT_FLOAT_FN_NAME = "sushi_format_float"
+_POW10_TABLE_NAME = ".sushi.pow10"
+
+# Upper bound on the bytes "%g" writes for any double ("-1.79769e+308"), plus its NUL.
+FLOAT_FORMAT_RESERVE = 32
+
+
+class FormatPiece(typing.NamedTuple):
+    """One part of an interpolated string, ready to be written into the shared buffer.
+
+    `kind` is "string" (a fat-pointer value), "int" (an iN value, `is_signed` picks the
+    rendering) or "float" (an f32/f64 value rendered with "%g").
+    """
+    kind: str
+    value: ir.Value
+    is_signed: bool = True
+
+
+def integer_format_width(bit_width: int, is_signed: bool) -> int:
+    """Most characters a `bit_width` integer renders to, counting a leading '-'."""
+    if is_signed:
+        return len(str(-(1 << (bit_width - 1))))
+    return len(str((1 << bit_width) - 1))
+
+
+def get_or_emit_format_integer(codegen: "LLVMCodegen") -> ir.Function:
+    """Get or emit the `i32 sushi_format_integer(i8* dst, i64 value, i1 signed)` helper.
+
+    Writes the decimal digits of `value` (with a leading '-' when `signed` and negative)
+    to `dst` without a terminator and returns the byte count.
+    """
+    module = codegen.module
+    existing = module.globals.get(_FORMAT_INTEGER_FN_NAME)
+    if isinstance(existing, ir.Function):
+        return existing
+
+    i1 = ir.IntType(1)
+    i8 = ir.IntType(INT8_BIT_WIDTH)
+    i32 = ir.IntType(INT32_BIT_WIDTH)
+    i64 = ir.IntType(INT64_BIT_WIDTH)
+    i8p = ir.PointerType(i8)
+
+    fn = ir.Function(module, ir.FunctionType(i32, [i8p, i64, i1]), name=_FORMAT_INTEGER_FN_NAME)
+    fn.linkage = "internal"
+    dst, value, signed = fn.args
+    dst.name, value.name, signed.name = "dst", "value", "signed"
+
+    entry = fn.append_basic_block("entry")
+    minus_bb = fn.append_basic_block("minus")
+    digits_bb = fn.append_basic_block("digits")
+    count_bb = fn.append_basic_block("count")
+    write_bb = fn.append_basic_block("write")
+    done_bb = fn.append_basic_block("done")
+    ten = ir.Constant(i64, 10)
+
+    b = ir.IRBuilder(entry)
+    negative = b.and_(signed, b.icmp_signed("<", value, ir.Constant(i64, 0)))
+    b.cbranch(negative, minus_bb, digits_bb)
+
+    # Negating in i64 wraps INT64_MIN onto itself, whose unsigned reading is its magnitude.
+    b.position_at_end(minus_bb)
+    b.store(ir.Constant(i8, ord("-")), dst)
+    minus_mag = b.sub(ir.Constant(i64, 0), value)
+    b.branch(digits_bb)
+
+    b.position_at_end(digits_bb)
+    mag = b.phi(i64, name="mag")
+    mag.add_incoming(value, entry)
+    mag.add_incoming(minus_mag, minus_bb)
+    sign_len = b.phi(i32, name="sign_len")
+    sign_len.add_incoming(ir.Constant(i32, 0), entry)
+    sign_len.add_incoming(ir.Constant(i32, 1), minus_bb)
+    b.branch(count_bb)
+
+    # Count the digits first so they can be written back to front in one pass.
+    b.position_at_end(count_bb)
+    rest = b.phi(i64, name="rest")
+    ndigits = b.phi(i32, name="ndigits")
+    rest.add_incoming(mag, digits_bb)
+    ndigits.add_incoming(ir.Constant(i32, 1), digits_bb)
+    more = b.icmp_unsigned(">=", rest, ten)
+    rest.add_incoming(b.udiv(rest, ten), count_bb)
+    ndigits.add_incoming(b.add(ndigits, ir.Constant(i32, 1)), count_bb)
+    total = b.add(sign_len, ndigits, name="total")
+    b.cbranch(more, count_bb, write_bb)
+
+    b.position_at_end(write_bb)
+    left = b.phi(i64, name="left")
+    at = b.phi(i32, name="at")
+    left.add_incoming(mag, count_bb)
+    at.add_incoming(total, count_bb)
+    next_at = b.sub(at, ir.Constant(i32, 1))
+    digit = b.trunc(b.urem(left, ten), i8)
+    b.store(b.add(digit, ir.Constant(i8, ord("0"))), b.gep(dst, [next_at]))
+    quotient = b.udiv(left, ten)
+    left.add_incoming(quotient, write_bb)
+    at.add_incoming(next_at, write_bb)
+    b.cbranch(b.icmp_unsigned("!=", quotient, ir.Constant(i64, 0)), write_bb, done_bb)
+
+    b.position_at_end(done_bb)
+    b.ret(total)
+    return fn
+
+
+def get_or_emit_format_float(codegen: "LLVMCodegen") -> ir.Function:
+    """Get or emit the `i32 sushi_format_float(i8* dst, double value)` helper.
+
+    Writes exactly what "%g" writes for zeros and for magnitudes in [1e-4, 1e6) -- six
+    significant digits, fixed notation, trailing zeros dropped -- without a terminator,
+    and returns the byte count (at most FLOAT_FORMAT_RESERVE). Returns -1 for every
+    other value (exponent notation, inf, nan); callers fall back to printf there.
+
+    The digits are the value scaled by 10^(5 - exponent) and rounded to an integer. The
+    scale is an exact power of ten and an fma recovers the product's rounding error, so
+    the exponent and the round-half-even decision are taken on the exact binary value,
+    as libc's are.
+    """
+    module = codegen.module
+    existing = module.globals.get(_FORMAT_FLOAT_FN_NAME)
+    if isinstance(existing, ir.Function):
+        return existing
+
+    i1 = ir.IntType(1)
+    i8 = ir.IntType(INT8_BIT_WIDTH)
+    i32 = ir.IntType(INT32_BIT_WIDTH)
+    i64 = ir.IntType(INT64_BIT_WIDTH)
+    f64 = ir.DoubleType()
+    i8p = ir.PointerType(i8)
+    format_integer = get_or_emit_format_integer(codegen)
+    fabs = module.declare_intrinsic("llvm.fabs", [f64])
+    fma = module.declare_intrinsic("llvm.fma", [f64], ir.FunctionType(f64, [f64, f64, f64]))
+
+    fn = ir.Function(module, ir.FunctionType(i32, [i8p, f64]), name=_FORMAT_FLOAT_FN_NAME)
+    fn.linkage = "internal"
+    dst, value = fn.args
+    dst.name, value.name = "dst", "value"
+
+    entry = fn.append_basic_block("entry")
+    zero_bb = fn.append_basic_block("zero")
+    range_bb = fn.append_basic_block("range")
+    scan_bb = fn.append_basic_block("scan")
+    round_bb = fn.append_basic_block("round")
+    strip_bb = fn.append_basic_block("strip")
+    strip_step_bb = fn.append_basic_block("strip_step")
+    emit_bb = fn.append_basic_block("emit")
+    frac_bb = fn.append_basic_block("frac")
+    frac_loop_bb = fn.append_basic_block("frac_loop")
+    done_bb = fn.append_basic_block("done")
+    fallback_bb = fn.append_basic_block("fallback")
+
+    def c32(v: int) -> ir.Constant:
+        return ir.Constant(i32, v)
+
+    def c64(v: int) -> ir.Constant:
+        return ir.Constant(i64, v)
+
+    def cf(v: float) -> ir.Constant:
+        return ir.Constant(f64, v)
+
+    b = ir.IRBuilder(entry)
+    negative = b.icmp_signed("<", b.bitcast(value, i64), c64(0))
+    magnitude = b.call(fabs, [value], name="mag")
+    sign_len = b.zext(negative, i32, name="sign_len")
+    with b.if_then(negative):
+        b.store(ir.Constant(i8, ord("-")), dst)
+    body = b.gep(dst, [sign_len], name="body")
+    b.cbranch(b.fcmp_ordered("==", magnitude, cf(0.0)), zero_bb, range_bb)
+
+    # %g prints a zero as "0" (or "-0").
+    b.position_at_end(zero_bb)
+    b.store(ir.Constant(i8, ord("0")), body)
+    zero_len = b.add(sign_len, c32(1))
+    b.branch(done_bb)
+
+    # Below 1e-5 or from 1e6 up (and inf, nan) %g switches to exponent notation. Values
+    # just below 1e-4 may still round up into fixed notation, so the scan starts lower.
+    b.position_at_end(range_bb)
+    in_range = b.and_(b.fcmp_ordered(">=", magnitude, cf(1e-5)),
+                      b.fcmp_ordered("<", magnitude, cf(1e6)))
+    b.cbranch(in_range, scan_bb, fallback_bb)
+
+    # Find the exponent x: the largest x with mag * 10^(5 - x) >= 1e5, exactly.
+    b.position_at_end(scan_bb)
+    exponent = b.phi(i32, name="x")
+    scale = b.phi(f64, name="scale")
+    exponent.add_incoming(c32(5), range_bb)
+    scale.add_incoming(cf(1.0), range_bb)
+    product = b.fmul(magnitude, scale, name="p")
+    error = b.call(fma, [magnitude, scale, b.fneg(product)], name="err")
+    reached = b.or_(b.fcmp_ordered(">", product, cf(1e5)),
+                    b.and_(b.fcmp_ordered("==", product, cf(1e5)),
+                           b.fcmp_ordered(">=", error, cf(0.0))))
+    exponent.add_incoming(b.sub(exponent, c32(1)), scan_bb)
+    scale.add_incoming(b.fmul(scale, cf(10.0)), scan_bb)
+    b.cbranch(reached, round_bb, scan_bb)
+
+    # Round p + err to an integer, ties to even. p's fraction and its distance from one
+    # half are exact, and any nonzero distance outweighs err, which is below half an ulp.
+    b.position_at_end(round_bb)
+    whole = b.fptoui(product, i64, name="n")
+    half_diff = b.fsub(b.fsub(product, b.uitofp(whole, f64)), cf(0.5))
+    odd = b.trunc(whole, i1)
+    at_half = b.fcmp_ordered("==", half_diff, cf(0.0))
+    up = b.or_(b.fcmp_ordered(">", half_diff, cf(0.0)),
+               b.and_(at_half, b.or_(b.fcmp_ordered(">", error, cf(0.0)),
+                                     b.and_(b.fcmp_ordered("==", error, cf(0.0)), odd))))
+    rounded = b.add(whole, b.zext(up, i64))
+    # 999999.5 rounds to 1000000: one more digit before the point.
+    carried = b.icmp_unsigned("==", rounded, c64(1000000))
+    digits = b.select(carried, c64(100000), rounded)
+    final_exponent = b.select(carried, b.add(exponent, c32(1)), exponent, name="x_final")
+    fixed = b.and_(b.icmp_signed(">=", final_exponent, c32(-4)),
+                   b.icmp_signed("<", final_exponent, c32(6)))
+    point_digits = b.sub(c32(5), final_exponent)
+    b.cbranch(fixed, strip_bb, fallback_bb)
+
+    # Six significant digits, 5 - x of them after the point; drop trailing zeros.
+    b.position_at_end(strip_bb)
+    mant = b.phi(i64, name="m")
+    frac_len = b.phi(i32, name="frac_len")
+    mant.add_incoming(digits, round_bb)
+    frac_len.add_incoming(point_digits, round_bb)
+    trailing_zero = b.and_(b.icmp_signed(">", frac_len, c32(0)),
+                           b.icmp_unsigned("==", b.urem(mant, c64(10)), c64(0)))
+    b.cbranch(trailing_zero, strip_step_bb, emit_bb)
+
+    b.position_at_end(strip_step_bb)
+    mant.add_incoming(b.udiv(mant, c64(10)), strip_step_bb)
+    frac_len.add_incoming(b.sub(frac_len, c32(1)), strip_step_bb)
+    b.branch(strip_bb)
+
+    b.position_at_end(emit_bb)
+    pow10 = _emit_pow10_lookup(module, b, frac_len)
+    int_len = b.call(format_integer, [body, b.udiv(mant, pow10), ir.Constant(i1, 0)], name="int_len")
+    int_total = b.add(sign_len, int_len)
+    b.cbranch(b.icmp_signed(">", frac_len, c32(0)), frac_bb, done_bb)
+
+    b.position_at_end(frac_bb)
+    b.store(ir.Constant(i8, ord(".")), b.gep(body, [int_len]))
+    frac_total = b.add(b.add(int_total, c32(1)), frac_len)
+    fraction = b.urem(mant, pow10)
+    b.branch(frac_loop_bb)
+
+    # The fraction digits back to front, zero-padded to frac_len.
+    b.position_at_end(frac_loop_bb)
+    rest = b.phi(i64, name="rest")
+    at = b.phi(i32, name="at")
+    rest.add_incoming(fraction, frac_bb)
+    at.add_incoming(frac_total, frac_bb)
+    next_at = b.sub(at, c32(1))
+    digit = b.trunc(b.urem(rest, c64(10)), i8)
+    b.store(b.add(digit, ir.Constant(i8, ord("0"))), b.gep(dst, [next_at]))
+    rest.add_incoming(b.udiv(rest, c64(10)), frac_loop_bb)
+    at.add_incoming(next_at, frac_loop_bb)
+    b.cbranch(b.icmp_signed(">", next_at, b.add(int_total, c32(1))), frac_loop_bb, done_bb)
+
+    b.position_at_end(done_bb)
+    total = b.phi(i32, name="total")
+    total.add_incoming(zero_len, zero_bb)
+    total.add_incoming(int_total, emit_bb)
+    total.add_incoming(frac_total, frac_loop_bb)
+    b.ret(total)
+
+    b.position_at_end(fallback_bb)
+    b.ret(c32(-1))
+    return fn
+
+
+def _emit_pow10_lookup(module: ir.Module, builder: ir.IRBuilder, exponent: ir.Value) -> ir.Value:
+    """10^exponent as i64, for exponent in [0, 9], read from a constant table."""
+    i64 = ir.IntType(INT64_BIT_WIDTH)
+    table = module.globals.get(_POW10_TABLE_NAME)
+    if table is None:
+        table_ty = ir.ArrayType(i64, 10)
+        table = ir.GlobalVariable(module, table_ty, name=_POW10_TABLE_NAME)
+        table.linkage = "private"
+        table.global_constant = True
+        table.unnamed_addr = "unnamed_addr"
+        table.initializer = ir.Constant(table_ty, [10 ** k for k in range(10)])
+    zero = ir.Constant(ir.IntType(INT32_BIT_WIDTH), 0)
+    return builder.load(builder.gep(table, [zero, exponent]), name="pow10")
+
+
 class FormattingOperations:
     """Manages formatting operations and type conversions."""
 
@@ -41,69 +326,37 @@ class FormattingOperations:
 
     def emit_print_value(self, v: ir.Value, is_line: bool = False,
                          semantic_type=None) -> None:
-        """Generate printf call with appropriate format for value type."""
+        """Write one value to stdout, plus a newline when `is_line` (see runtime/output.py)."""
+        from sushi_lang.backend.runtime.output import emit_print_float, emit_print_string
+
         assert (
             self.codegen.builder is not None
             and self.codegen.runtime.libc_stdio.printf is not None
-            and self.fmt_i32 is not None
-            and self.fmt_str is not None
-            and self.fmt_f32 is not None
-            and self.fmt_f64 is not None
         )
 
         if self.codegen.types.is_string_type(v.type):
-            # Print the fat-pointer string in place with a bounded "%.*s": the precision
-            # arg is the byte size and the data pointer needs no null terminator. This
-            # avoids the heap C-string copy (emit_to_cstr) that was never freed (#141).
-            data_ptr = self.codegen.builder.extract_value(v, 0)
-            size = self.codegen.builder.extract_value(v, 1)
-            fmt_ptr = self._get_format_string("str_prec", "%.*s")
-            self.codegen.builder.call(self.codegen.runtime.libc_stdio.printf, [fmt_ptr, size, data_ptr])
-        elif isinstance(v.type, ir.FloatType):
-            fmt_ptr = self.codegen.utils.cstr_ptr(self.fmt_f32)
-            f64_val = self.codegen.builder.fpext(v, self.codegen.types.f64)
-            self.codegen.builder.call(self.codegen.runtime.libc_stdio.printf, [fmt_ptr, f64_val])
-        elif isinstance(v.type, ir.DoubleType):
-            fmt_ptr = self.codegen.utils.cstr_ptr(self.fmt_f64)
-            self.codegen.builder.call(self.codegen.runtime.libc_stdio.printf, [fmt_ptr, v])
+            # Written in place from the fat pointer: no null terminator needed and no heap
+            # C-string copy (#141).
+            emit_print_string(self.codegen, v, is_line)
+        elif isinstance(v.type, (ir.FloatType, ir.DoubleType)):
+            emit_print_float(self.codegen, v, is_line)
         else:
-            self._emit_print_integer(v, semantic_type)
-
-        if is_line:
-            # Emit the newline via a dedicated format-string global -- no heap copy (#141).
-            newline_fmt = self._get_format_string("newline", "\n")
-            self.codegen.builder.call(self.codegen.runtime.libc_stdio.printf, [newline_fmt])
+            self._emit_print_integer(v, semantic_type, is_line)
 
-    def _emit_print_integer(self, v: ir.Value, semantic_type=None) -> None:
+    def _emit_print_integer(self, v: ir.Value, semantic_type=None, is_line: bool = False) -> None:
         """Print an integer at its own width with signedness-aware formatting."""
         from sushi_lang.semantics.typesys import BuiltinType
         from sushi_lang.backend.expressions.type_utils import is_unsigned_type
+        from sushi_lang.backend.runtime.output import emit_print_integer
 
-        printf = self.codegen.runtime.libc_stdio.printf
-        builder = self.codegen.builder
-
-        width = v.type.width if isinstance(v.type, ir.IntType) else 32
-        is_bool = (width == 1 or semantic_type == BuiltinType.BOOL)
-        is_signed = not is_unsigned_type(semantic_type)
-
-        if is_bool or not isinstance(v.type, ir.IntType):
-            fmt_ptr = self._get_format_string("i32", FORMAT_STRINGS["i32"])
-            builder.call(printf, [fmt_ptr, self.codegen.utils.as_i32(v)])
-            return
-
-        if width < 32:
-            value = builder.sext(v, self.codegen.i32) if is_signed \
-                else builder.zext(v, self.codegen.i32)
-            name = "i32" if is_signed else "u32"
-        elif width == 32:
-            value = v
-            name = "i32" if is_signed else "u32"
-        else:
-            value = v
-            name = "i64" if is_signed else "u64"
-
-        fmt_ptr = self._get_format_string(name, FORMAT_STRINGS[name])
-        builder.call(printf, [fmt_ptr, value])
+        if not isinstance(v.type, ir.IntType):
+            v = self.codegen.utils.as_i32(v)
+        is_bool = (v.type.width == 1 or semantic_type == BuiltinType.BOOL)
+        if is_bool:
+            # Prints 1 or 0, whatever width the bool is carried in.
+            v = self.codegen.utils.as_i32(v)
+        is_signed = not is_bool and not is_unsigned_type(semantic_type)
+        emit_print_integer(self.codegen, v, is_signed, is_line)
 
     def emit_integer_to_string(self, int_value: ir.Value, is_signed: bool, bit_width: int) -> ir.Value:
         """Generate integer to string conversion using sprintf."""
@@ -148,6 +401,86 @@ class FormattingOperations:
 
         return self.codegen.runtime.strings.emit_cstr_to_fat_pointer(buffer, owned=1)
 
+    def emit_interpolation(self, pieces: list[FormatPiece]) -> ir.Value:
+        """Render `pieces` into one fresh owned string with a single allocation.
+
+        A first pass sums an upper bound of the output size: the exact size of each string
+        piece and the widest rendering of each number. The second pass copies the strings
+        and formats the numbers straight into the buffer; the result size is the number of
+        bytes actually written.
+        """
+        if self.codegen.builder is None:
+            raise_internal_error("CE0009")
+        if self.codegen.runtime.libc_strings.sprintf is None:
+            raise_internal_error("CE0013", name="sprintf")
+        builder = self.codegen.builder
+        i64 = ir.IntType(INT64_BIT_WIDTH)
+
+        reserve = 0
+        capacity = None
+        for piece in pieces:
+            if piece.kind == "string":
+                size = builder.zext(builder.extract_value(piece.value, 1), i64)
+                capacity = size if capacity is None else builder.add(capacity, size)
+            elif piece.kind == "int":
+                reserve += integer_format_width(piece.value.type.width, piece.is_signed)
+            else:
+                reserve += FLOAT_FORMAT_RESERVE
+        capacity = make_i64_const(reserve) if capacity is None \
+            else builder.add(capacity, make_i64_const(reserve))
+
+        buffer = emit_malloc(self.codegen, builder, capacity)
+        # If emitted inside a print/println argument, this buffer is a temporary to free
+        # after output (#141). No-op elsewhere.
+        self.codegen.register_string_temp(buffer)
+
+        memcpy_fn = self.codegen.module.declare_intrinsic(
+            'llvm.memcpy', [ir.PointerType(self.codegen.i8), ir.PointerType(self.codegen.i8), i64]
+        )
+        pos = ir.Constant(self.codegen.i32, 0)
+        for piece in pieces:
+            dst = builder.gep(buffer, [pos])
+            if piece.kind == "string":
+                size = builder.extract_value(piece.value, 1)
+                # i64-length memcpy with the zero-extended size (never the raw i32, see #149).
+                builder.call(memcpy_fn, [dst, builder.extract_value(piece.value, 0),
+                                         builder.zext(size, i64), FALSE_I1])
+                written = size
+            elif piece.kind == "int":
+                value = piece.value
+                if value.type.width < INT64_BIT_WIDTH:
+                    value = builder.sext(value, i64) if piece.is_signed else builder.zext(value, i64)
+                signed = ir.Constant(ir.IntType(1), 1 if piece.is_signed else 0)
+                written = builder.call(get_or_emit_format_integer(self.codegen), [dst, value, signed])
+            else:
+                value = piece.value
+                if isinstance(value.type, ir.FloatType):
+                    value = builder.fpext(value, self.codegen.types.f64)
+                written = self._emit_format_float(dst, value)
+            pos = builder.add(pos, written)
+
+        string_struct_type = self.codegen.types.string_struct
+        result = builder.insert_value(ir.Constant(string_struct_type, ir.Undefined), buffer, 0)
+        result = builder.insert_value(result, pos, 1)
+        return builder.insert_value(result, ir.Constant(self.codegen.i8, 1), 2)
+
+    def _emit_format_float(self, dst: ir.Value, value: ir.Value) -> ir.Value:
+        """Write an f64 to `dst` as "%g" does; returns the byte count.
+
+        `sushi_format_float` covers the common values; sprintf does the rest.
+        """
+        builder = self.codegen.builder
+        fast = builder.call(get_or_emit_format_float(self.codegen), [dst, value], name="float_len")
+        pre_block = builder.block
+        with builder.if_then(builder.icmp_signed("<", fast, ir.Constant(self.codegen.i32, 0))):
+            fmt_ptr = self.codegen.utils.cstr_ptr(self.fmt_f64)
+            slow = builder.call(self.codegen.runtime.libc_strings.sprintf, [dst, fmt_ptr, value])
+            slow_block = builder.block
+        written = builder.phi(self.codegen.i32, name="float_written")
+        written.add_incoming(fast, pre_block)
+        written.add_incoming(slow, slow_block)
+        return written
+
     def emit_bool_to_string(self, bool_value: ir.Value) -> ir.Value:
         """Generate bool to string conversion."""
         if self.codegen.builder is None:
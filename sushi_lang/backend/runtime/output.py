@@ -0,0 +1,229 @@
+"""Buffered standard output for `print` and `println`.
+
+Everything a program writes to stdout -- `print`, `println`, `stdout.write` -- goes
+through libc's `stdout` FILE, so its buffer is the one process-wide output buffer: libc
+keeps the writes in order and flushes it in `exit`, which every way out of a program
+goes through (returning from `main`, runtime errors, `Result` unwraps). `main` starts by
+giving that FILE a 64 KiB static buffer in the mode `--stdout-buffering` selects; see
+`emit_stdout_setup`. stderr stays unbuffered, so diagnostics are never held back.
+
+`print`/`println` skip printf's format parsing. A string is one fwrite of its bytes. A
+number is rendered into a stack buffer together with its newline and written by one
+fwrite: integers by `sushi_format_integer`, floats by `sushi_format_float`, which writes
+what "%g" would and hands the values it does not cover (exponent notation, inf, nan)
+back to printf. On Linux the writes use `fwrite_unlocked`: Sushi programs are
+single-threaded, so the stream lock is pure cost.
+"""
+from __future__ import annotations
+
+import typing
+
+from llvmlite import ir
+
+from sushi_lang.backend.constants import INT8_BIT_WIDTH, INT64_BIT_WIDTH
+from sushi_lang.backend.runtime.constants import FORMAT_STRINGS
+from sushi_lang.backend.runtime.formatting import (
+    FLOAT_FORMAT_RESERVE, get_or_emit_format_float, get_or_emit_format_integer,
+    integer_format_width,
+)
+from sushi_lang.internals.errors import raise_internal_error
+
+if typing.TYPE_CHECKING:
+    from sushi_lang.backend.codegen_llvm import LLVMCodegen
+
+
+STDOUT_BUFFERING_MODES = ("auto", "line", "full")
+STDOUT_BUFFER_SIZE = 1 << 16
+
+_STDOUT_BUFFER_NAME = "__sushi_stdout_buffer"
+_NEWLINE_NAME = "__sushi_newline"
+_PRINT_INTEGER_FN_NAME = "sushi_print_integer"
+_PRINT_FLOAT_FN_NAME = "sushi_print_float"
+_STDOUT_FD = 1
+
+# setvbuf modes; glibc and macOS agree on the values.
+_IOFBF = 0
+_IOLBF = 1
+
+
+def emit_stdout_setup(codegen: "LLVMCodegen") -> None:
+    """Emit the `setvbuf` call that installs stdout's buffer, at the start of C `main`.
+
+    `auto` line-buffers a terminal (output shows up as each line is finished) and fully
+    buffers anything else, such as a pipe or a file, so stdout reaches the OS in 64 KiB
+    writes. `line` and `full` force one mode. The buffer is a static array: glibc ignores
+    the size argument when setvbuf is handed NULL and keeps its own 4 KiB default.
+    """
+    builder = codegen.builder
+    if builder is None:
+        raise_internal_error("CE0009")
+    stdio = codegen.runtime.libc_stdio
+    i32 = codegen.i32
+
+    mode_name = getattr(codegen, "stdout_buffering", "auto")
+    if mode_name == "line":
+        mode = ir.Constant(i32, _IOLBF)
+    elif mode_name == "full":
+        mode = ir.Constant(i32, _IOFBF)
+    else:
+        on_tty = builder.icmp_signed("!=", builder.call(stdio.isatty, [ir.Constant(i32, _STDOUT_FD)]),
+                                     ir.Constant(i32, 0), name="stdout_is_tty")
+        mode = builder.select(on_tty, ir.Constant(i32, _IOLBF), ir.Constant(i32, _IOFBF),
+                              name="stdout_mode")
+
+    buf_ty = ir.ArrayType(ir.IntType(INT8_BIT_WIDTH), STDOUT_BUFFER_SIZE)
+    buf = codegen.module.globals.get(_STDOUT_BUFFER_NAME)
+    if buf is None:
+        buf = ir.GlobalVariable(codegen.module, buf_ty, name=_STDOUT_BUFFER_NAME)
+        buf.linkage = "internal"
+        buf.initializer = ir.Constant(buf_ty, None)
+        buf.align = 16
+    zero = ir.Constant(i32, 0)
+    stdout_ptr = builder.load(stdio.stdout_handle, name="stdout")
+    builder.call(stdio.setvbuf, [stdout_ptr, builder.gep(buf, [zero, zero]), mode,
+                                 ir.Constant(ir.IntType(INT64_BIT_WIDTH), STDOUT_BUFFER_SIZE)])
+
+
+def emit_print_string(codegen: "LLVMCodegen", string_value: ir.Value, newline: bool) -> None:
+    """Write a `{i8*, i32, i8}` string to stdout, followed by a newline for `println`."""
+    builder = codegen.builder
+    if builder is None:
+        raise_internal_error("CE0009")
+    i64 = ir.IntType(INT64_BIT_WIDTH)
+    data = builder.extract_value(string_value, 0)
+    size = builder.zext(builder.extract_value(string_value, 1), i64)
+    _emit_stdout_write(codegen, builder, data, size)
+    if newline:
+        zero = ir.Constant(codegen.i32, 0)
+        newline_ptr = builder.gep(_get_cstring(codegen.module, _NEWLINE_NAME, "\n"), [zero, zero])
+        _emit_stdout_write(codegen, builder, newline_ptr, ir.Constant(i64, 1))
+
+
+def emit_print_integer(codegen: "LLVMCodegen", value: ir.Value, is_signed: bool,
+                       newline: bool) -> None:
+    """Write an integer of any width up to 64 bits to stdout in decimal."""
+    builder = codegen.builder
+    if builder is None:
+        raise_internal_error("CE0009")
+    i1 = ir.IntType(1)
+    i64 = ir.IntType(INT64_BIT_WIDTH)
+    if value.type.width < INT64_BIT_WIDTH:
+        value = builder.sext(value, i64) if is_signed else builder.zext(value, i64)
+    builder.call(get_or_emit_print_integer(codegen),
+                 [value, ir.Constant(i1, int(is_signed)), ir.Constant(i1, int(newline))])
+
+
+def get_or_emit_print_integer(codegen: "LLVMCodegen") -> ir.Function:
+    """Get or emit the `void sushi_print_integer(i64 value, i1 signed, i1 newline)` helper.
+
+    Formats into a stack buffer with room for the widest value and a newline, which is
+    always stored and counted only when `newline` is set, and writes it in one fwrite.
+    """
+    module = codegen.module
+    existing = module.globals.get(_PRINT_INTEGER_FN_NAME)
+    if isinstance(existing, ir.Function):
+        return existing
+
+    i1 = ir.IntType(1)
+    i8 = ir.IntType(INT8_BIT_WIDTH)
+    i64 = ir.IntType(INT64_BIT_WIDTH)
+    format_integer = get_or_emit_format_integer(codegen)
+
+    fn = ir.Function(module, ir.FunctionType(ir.VoidType(), [i64, i1, i1]),
+                     name=_PRINT_INTEGER_FN_NAME)
+    fn.linkage = "internal"
+    value, signed, newline = fn.args
+    value.name, signed.name, newline.name = "value", "signed", "newline"
+
+    b = ir.IRBuilder(fn.append_basic_block("entry"))
+    width = max(integer_format_width(INT64_BIT_WIDTH, True),
+                integer_format_width(INT64_BIT_WIDTH, False))
+    buf = b.alloca(ir.ArrayType(i8, width + 1), name="digits")
+    zero = ir.Constant(codegen.i32, 0)
+    start = b.gep(buf, [zero, zero])
+    length = b.call(format_integer, [start, value, signed], name="len")
+    b.store(ir.Constant(i8, ord("\n")), b.gep(start, [length]))
+    total = b.add(b.zext(length, i64), b.zext(newline, i64), name="total")
+    _emit_stdout_write(codegen, b, start, total)
+    b.ret_void()
+    return fn
+
+
+def emit_print_float(codegen: "LLVMCodegen", value: ir.Value, newline: bool) -> None:
+    """Write an f32 or f64 to stdout as "%g" renders it."""
+    builder = codegen.builder
+    if builder is None:
+        raise_internal_error("CE0009")
+    if isinstance(value.type, ir.FloatType):
+        value = builder.fpext(value, ir.DoubleType())
+    builder.call(get_or_emit_print_float(codegen), [value, ir.Constant(ir.IntType(1), int(newline))])
+
+
+def get_or_emit_print_float(codegen: "LLVMCodegen") -> ir.Function:
+    """Get or emit the `void sushi_print_float(double value, i1 newline)` helper.
+
+    Like `sushi_print_integer`, over `sushi_format_float`; the values that helper leaves
+    to printf go to printf with "%g" or "%g\n".
+    """
+    module = codegen.module
+    existing = module.globals.get(_PRINT_FLOAT_FN_NAME)
+    if isinstance(existing, ir.Function):
+        return existing
+
+    i1 = ir.IntType(1)
+    i8 = ir.IntType(INT8_BIT_WIDTH)
+    i64 = ir.IntType(INT64_BIT_WIDTH)
+    f64 = ir.DoubleType()
+    i32 = codegen.i32
+    format_float = get_or_emit_format_float(codegen)
+
+    fn = ir.Function(module, ir.FunctionType(ir.VoidType(), [f64, i1]), name=_PRINT_FLOAT_FN_NAME)
+    fn.linkage = "internal"
+    value, newline = fn.args
+    value.name, newline.name = "value", "newline"
+
+    entry = fn.append_basic_block("entry")
+    write_bb = fn.append_basic_block("write")
+    printf_bb = fn.append_basic_block("printf")
+    b = ir.IRBuilder(entry)
+    buf = b.alloca(ir.ArrayType(i8, FLOAT_FORMAT_RESERVE + 1), name="digits")
+    zero = ir.Constant(i32, 0)
+    start = b.gep(buf, [zero, zero])
+    length = b.call(format_float, [start, value], name="len")
+    b.cbranch(b.icmp_signed(">=", length, zero), write_bb, printf_bb)
+
+    b.position_at_end(write_bb)
+    b.store(ir.Constant(i8, ord("\n")), b.gep(start, [length]))
+    total = b.add(b.zext(length, i64), b.zext(newline, i64), name="total")
+    _emit_stdout_write(codegen, b, start, total)
+    b.ret_void()
+
+    b.position_at_end(printf_bb)
+    fmt = FORMAT_STRINGS["f64"]
+    fmt_plain = _get_cstring(module, "__sushi_fmt_float", fmt)
+    fmt_line = _get_cstring(module, "__sushi_fmt_float_line", fmt + "\n")
+    fmt_ptr = b.select(newline, b.gep(fmt_line, [zero, zero]), b.gep(fmt_plain, [zero, zero]))
+    b.call(codegen.runtime.libc_stdio.printf, [fmt_ptr, value])
+    b.ret_void()
+    return fn
+
+
+def _emit_stdout_write(codegen: "LLVMCodegen", builder: ir.IRBuilder, data: ir.Value,
+                       size: ir.Value) -> None:
+    stdio = codegen.runtime.libc_stdio
+    stdout_ptr = builder.load(stdio.stdout_handle, name="stdout")
+    builder.call(stdio.fwrite_unlocked, [data, ir.Constant(size.type, 1), size, stdout_ptr])
+
+
+def _get_cstring(module: ir.Module, name: str, text: str) -> ir.GlobalVariable:
+    existing = module.globals.get(name)
+    if existing is not None:
+        return existing
+    data = text.encode("utf-8") + b"\0"
+    arr_ty = ir.ArrayType(ir.IntType(INT8_BIT_WIDTH), len(data))
+    gv = ir.GlobalVariable(module, arr_ty, name=name)
+    gv.linkage = "private"
+    gv.global_constant = True
+    gv.unnamed_addr = "unnamed_addr"
+    gv.initializer = ir.Constant(arr_ty, bytearray(data))
+    return gv
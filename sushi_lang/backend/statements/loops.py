@@ -87,98 +87,116 @@ def emit_foreach(codegen: 'LLVMCodegen', node: 'Foreach') -> None:
         _emit_array_foreach(codegen, node, iterator_slot, zero)
 
 
+# Hidden local owning the stdin.lines()/file.lines() getline buffer. It lives in a scope
+# around the whole loop, so fall-through, `break` and `return` all free it.
+_LINE_BUFFER_LOCAL = "__lines_buffer"
+
+
 def _emit_string_iterator_foreach(codegen: 'LLVMCodegen', node: 'Foreach', iterator_slot: 'ir.Value', zero: 'ir.Constant') -> None:
     """Emit foreach for string iterators (handles both stdin.lines() and array iterators)."""
     from llvmlite import ir
     from sushi_lang.backend import gep_utils
+    from sushi_lang.semantics.typesys import BuiltinType
 
     length_ptr = gep_utils.gep_struct_field(codegen, iterator_slot, 1, "length_ptr")
     length = codegen.builder.load(length_ptr, name="length")
     is_stdin_iter = codegen.builder.icmp_signed("==", length, ir.Constant(codegen.types.i32, -1))
 
+    # The buffer starts as an owned NULL ({null, 0, owned=1}), so the scope-exit free is
+    # a no-op on the array path and before the first line.
+    codegen.memory.push_scope()
+    string_struct_type = codegen.types.ll_type(BuiltinType.STRING)
+    empty_buffer = ir.Constant(string_struct_type, [
+        ir.Constant(codegen.i8.as_pointer(), None), ir.Constant(codegen.i32, 0),
+        ir.Constant(codegen.i8, 1),
+    ])
+    buffer_local = codegen.memory.create_local(
+        _LINE_BUFFER_LOCAL, string_struct_type, empty_buffer, BuiltinType.STRING)
+
     stdin_loop_bb = codegen.func.append_basic_block(name="foreach.stdin_loop")
     array_setup_bb = codegen.func.append_basic_block(name="foreach.array_setup")
     end_bb = codegen.func.append_basic_block(name="foreach.end")
 
     codegen.builder.cbranch(is_stdin_iter, stdin_loop_bb, array_setup_bb)
 
-    _emit_stdin_lines_foreach(codegen, node, iterator_slot, zero, stdin_loop_bb, end_bb)
+    _emit_stdin_lines_foreach(codegen, node, iterator_slot, buffer_local, stdin_loop_bb, end_bb)
 
     codegen.builder.position_at_end(array_setup_bb)
     _emit_array_foreach_body(codegen, node, iterator_slot, zero, length_ptr, end_bb)
 
+    codegen.memory.pop_scope()
+
 
 def _emit_stdin_lines_foreach(
     codegen: 'LLVMCodegen',
     node: 'Foreach',
     iterator_slot: 'ir.Value',
-    zero: 'ir.Constant',
+    buffer_local: 'ir.Value',
     stdin_loop_bb: 'ir.Block',
     end_bb: 'ir.Block'
 ) -> None:
-    """Emit foreach for stdin.lines() or file.lines() iterators."""
+    """Emit foreach for stdin.lines() or file.lines() iterators.
+
+    Each line is read into the loop's reusable getline buffer and bound as a borrowed view,
+    so a line of any length costs no allocation once the buffer has grown to fit it. The
+    loop ends at EOF only; a blank line is an ordinary (empty) item.
+    """
     from llvmlite import ir
-    from sushi_lang.semantics.ast import MethodCall, Name
-    from sushi_lang.sushi_stdlib.src.io.stdio.inline import _emit_readln as _emit_stdin_readln
-    from sushi_lang.sushi_stdlib.src.io.files.inline import _emit_readln as _emit_file_readln
-    from sushi_lang.sushi_stdlib.src.collections.strings_inline import emit_string_is_empty
+    from sushi_lang.sushi_stdlib.src.io.lines_inline import emit_line_length, emit_next_line
+    from sushi_lang.sushi_stdlib.src.collections.strings.common import build_string_struct
     from sushi_lang.backend import gep_utils
 
     codegen.builder.position_at_end(stdin_loop_bb)
-    stdin_cond_bb = codegen.func.append_basic_block(name="foreach.stdin_cond")
-    stdin_body_bb = codegen.func.append_basic_block(name="foreach.stdin_body")
 
-    codegen.builder.branch(stdin_cond_bb)
+    # The iterator's data field carries the FILE* of file.lines(), or NULL for stdin.lines().
+    data_ptr_ptr = gep_utils.gep_struct_field(codegen, iterator_slot, 2, "stream_ptr")
+    data_ptr = codegen.builder.load(data_ptr_ptr, name="stream")
+    data_ptr = codegen.builder.bitcast(data_ptr, codegen.i8.as_pointer())
 
-    codegen.builder.position_at_end(stdin_cond_bb)
-
-    # Get the FILE* from iterator's data_ptr field
-    # For file.lines(), data_ptr stores a pointer to the FILE* pointer
-    # For stdin.lines(), data_ptr is NULL
-    data_ptr_ptr = gep_utils.gep_struct_field(codegen, iterator_slot, 2, "file_ptr_ptr")
-    data_ptr = codegen.builder.load(data_ptr_ptr, name="file_ptr_ptr")
-
-    null_ptr = ir.Constant(codegen.i8.as_pointer().as_pointer(), None)
+    null_ptr = ir.Constant(codegen.i8.as_pointer(), None)
     is_stdin = codegen.builder.icmp_unsigned('==', data_ptr, null_ptr)
 
     use_stdin_bb = codegen.func.append_basic_block(name="foreach.use_stdin")
-    use_file_bb = codegen.func.append_basic_block(name="foreach.use_file")
-    check_empty_bb = codegen.func.append_basic_block(name="foreach.check_empty")
+    preheader_bb = codegen.func.append_basic_block(name="foreach.lines_preheader")
+    stdin_cond_bb = codegen.func.append_basic_block(name="foreach.stdin_cond")
+    stdin_body_bb = codegen.func.append_basic_block(name="foreach.stdin_body")
 
-    codegen.builder.cbranch(is_stdin, use_stdin_bb, use_file_bb)
+    file_bb = codegen.builder.block
+    codegen.builder.cbranch(is_stdin, use_stdin_bb, preheader_bb)
 
     codegen.builder.position_at_end(use_stdin_bb)
-    dummy_receiver = Name(id="stdin", loc=None)
-    dummy_call = MethodCall(receiver=dummy_receiver, method="readln", args=[], loc=None)
-    stdin_line_value = _emit_stdin_readln(codegen, dummy_call)
-    stdin_exit_bb = codegen.builder.block
-    codegen.builder.branch(check_empty_bb)
-
-    codegen.builder.position_at_end(use_file_bb)
-    file_ptr = codegen.builder.load(data_ptr, name="file_ptr")
-    dummy_file_receiver = Name(id="__file_handle", loc=None)
-    dummy_file_call = MethodCall(receiver=dummy_file_receiver, method="readln", args=[], loc=None)
-    file_line_value = _emit_file_readln(codegen, dummy_file_call, file_ptr)
-    file_exit_bb = codegen.builder.block
-    codegen.builder.branch(check_empty_bb)
-
-    codegen.builder.position_at_end(check_empty_bb)
-    from sushi_lang.semantics.typesys import BuiltinType
-    string_struct_type = codegen.types.ll_type(BuiltinType.STRING)
-    line_value = codegen.builder.phi(string_struct_type, name="line")
-    line_value.add_incoming(stdin_line_value, stdin_exit_bb)
-    line_value.add_incoming(file_line_value, file_exit_bb)
-
-    is_empty = emit_string_is_empty(codegen, line_value)
+    stdin_ptr = codegen.builder.load(codegen.runtime.libc_stdio.stdin_handle, name="stdin")
+    codegen.builder.branch(preheader_bb)
+
+    codegen.builder.position_at_end(preheader_bb)
+    stream = codegen.builder.phi(codegen.i8.as_pointer(), name="line_stream")
+    stream.add_incoming(stdin_ptr, use_stdin_bb)
+    stream.add_incoming(data_ptr, file_bb)
+    capacity_slot = codegen.memory.entry_alloca(ir.IntType(64), "lines_capacity")
+    codegen.builder.store(ir.Constant(ir.IntType(64), 0), capacity_slot)
+    codegen.builder.branch(stdin_cond_bb)
 
-    codegen.builder.cbranch(is_empty, end_bb, stdin_body_bb)
+    codegen.builder.position_at_end(stdin_cond_bb)
+    buffer_slot = gep_utils.gep_struct_field(codegen, buffer_local, 0, "lines_buffer_ptr")
+    bytes_read = emit_next_line(codegen, buffer_slot, capacity_slot, stream)
+    at_eof = codegen.builder.icmp_signed('<', bytes_read, ir.Constant(bytes_read.type, 0))
+    codegen.builder.cbranch(at_eof, end_bb, stdin_body_bb)
 
     codegen.builder.position_at_end(stdin_body_bb)
     codegen.loop_stack.append((stdin_cond_bb, end_bb, codegen.memory._scope_depth + 1))
     codegen.memory.push_scope()
 
+    # stdin.readln() has always stripped a CRLF ending, file.readln() only the LF.
+    data = codegen.builder.load(buffer_slot, name="line_data")
+    line_len = emit_line_length(codegen.builder, data, bytes_read, is_stdin)
+    line_value = build_string_struct(codegen.builder, codegen.types.string_struct,
+                                     data, line_len, owned=0)
+
+    # The line is a read-only BORROW of the loop's buffer, which the next read overwrites;
+    # like an array foreach item it is never freed by the item (#139, #147).
     element_ll_type = codegen.types.ll_type(node.item_type)
-    codegen.memory.create_local(node.item_name, element_ll_type, line_value, node.item_type)
+    codegen.memory.create_local(node.item_name, element_ll_type, line_value, node.item_type,
+                                register_cleanup=False)
 
     _emit_block(codegen, node.body)
 
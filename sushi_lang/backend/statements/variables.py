@@ -75,6 +75,11 @@ def emit_let(codegen: 'LLVMCodegen', stmt: 'Let') -> None:
             rhs, owns = bind(codegen, stmt.value, rhs, semantic_type)
             casted_rhs = codegen.utils.cast_for_param(rhs, ll_type)
             codegen.builder.store(casted_rhs, slot)
+            if stmt.known_callee is not None:
+                from sushi_lang.backend.runtime.closures import env_on_stack
+                codegen.memory.set_known_callee(slot, stmt.known_callee)
+                # Only ever called, so the value dies with the frame its environment is in.
+                owns = owns and not env_on_stack(codegen, stmt.value)
 
         if owns:
             codegen.memory.register_local_cleanup(stmt.name, semantic_type, slot)
@@ -138,6 +143,8 @@ def emit_rebind(codegen: 'LLVMCodegen', stmt: 'Rebind') -> None:
     if isinstance(dst, ir.IntType):
         casted_value = codegen.utils.cast_to_int_width(val, dst)
         codegen.builder.store(casted_value, slot)
+    elif isinstance(dst, (ir.FloatType, ir.DoubleType)):
+        codegen.builder.store(codegen.utils.cast_for_param(val, dst), slot)
     elif (isinstance(dst, ir.PointerType) and
           isinstance(dst.pointee, ir.IntType) and
           dst.pointee.width == 8):
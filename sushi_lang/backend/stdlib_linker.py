@@ -89,6 +89,8 @@ class StdlibLinker:
     # SOURCE_STDLIB_MODULES): it is merged as a compilation unit and monomorphized
     # inline, so like the generic-provider units it resolves to no .bc.
     _virtual_units = {
+        "bench",
+        "collections/hashed",
         "collections/hashmap",
         "collections/iter",
         "encoding/msgpack",
@@ -9,7 +9,7 @@ from sushi_lang.backend.constants.llvm_values import ZERO_I32, make_i32_const
 from sushi_lang.internals.errors import raise_internal_error
 from sushi_lang.backend.utils import require_builder
 from sushi_lang.sushi_stdlib.src.common import register_hash_emitter_factory, get_builtin_method
-from sushi_lang.backend.types.hash_utils import emit_fnv1a_init, emit_fnv1a_combine
+from sushi_lang.backend.types.hash_utils import emit_hash_init, emit_hash_combine, emit_string_hash
 
 
 def _emit_fixed_array_hash(array_type: ArrayType) -> Any:
@@ -24,7 +24,7 @@ def _emit_fixed_array_hash(array_type: ArrayType) -> Any:
         builder = codegen.builder
         u64 = ir.IntType(INT64_BIT_WIDTH)
 
-        hash_value = emit_fnv1a_init(codegen)
+        hash_value = emit_hash_init(codegen)
 
         if isinstance(receiver_value.type, ir.PointerType):
             array_ptr = receiver_value
@@ -41,10 +41,10 @@ def _emit_fixed_array_hash(array_type: ArrayType) -> Any:
 
             element_hash = _emit_element_hash(codegen, element_value, array_type.base_type)
 
-            hash_value = emit_fnv1a_combine(codegen, hash_value, element_hash)
+            hash_value = emit_hash_combine(codegen, hash_value, element_hash)
 
         length_u64 = ir.Constant(u64, array_type.size)
-        hash_value = emit_fnv1a_combine(codegen, hash_value, length_u64)
+        hash_value = emit_hash_combine(codegen, hash_value, length_u64)
 
         return hash_value
 
@@ -65,7 +65,7 @@ def _emit_dynamic_array_hash(array_type: DynamicArrayType) -> Any:
         u64 = ir.IntType(INT64_BIT_WIDTH)
 
         hash_value_alloca = builder.alloca(u64, name="hash_value")
-        initial_hash = emit_fnv1a_init(codegen)
+        initial_hash = emit_hash_init(codegen)
         builder.store(initial_hash, hash_value_alloca)
 
         if isinstance(receiver_value.type, ir.PointerType):
@@ -103,7 +103,7 @@ def _emit_dynamic_array_hash(array_type: DynamicArrayType) -> Any:
         element_hash = _emit_element_hash(codegen, element_value, array_type.base_type)
 
         current_hash = builder.load(hash_value_alloca)
-        new_hash = emit_fnv1a_combine(codegen, current_hash, element_hash)
+        new_hash = emit_hash_combine(codegen, current_hash, element_hash)
         builder.store(new_hash, hash_value_alloca)
 
         one_i32 = make_i32_const(1)
@@ -116,7 +116,7 @@ def _emit_dynamic_array_hash(array_type: DynamicArrayType) -> Any:
         final_hash = builder.load(hash_value_alloca)
 
         length_u64 = builder.zext(current_len, u64)
-        final_hash = emit_fnv1a_combine(codegen, final_hash, length_u64)
+        final_hash = emit_hash_combine(codegen, final_hash, length_u64)
 
         return final_hash
 
@@ -129,8 +129,7 @@ def _emit_element_hash(codegen: Any, element_value: ir.Value, element_type: Type
 
     if isinstance(element_type, BuiltinType):
         if element_type == BuiltinType.STRING:
-            from sushi_lang.backend.types.primitives.hashing import _emit_string_hash_fnv1a
-            return _emit_string_hash_fnv1a(codegen, element_value)
+            return emit_string_hash(codegen, element_value)
 
         import sushi_lang.backend.types.primitives.hashing  # noqa: F401
 
@@ -230,9 +230,9 @@ class TypeMapper:
         ])
         llvm_struct = ir.LiteralStructType([
             buckets_type,
-            self.i32,
-            self.i32,
-            self.i32,
+            self.i64,   # size
+            self.i64,   # capacity
+            self.i64,   # tombstones
         ])
 
         self.cache.cache_struct(struct_type.name, llvm_struct)
@@ -8,7 +8,7 @@ from sushi_lang.backend.constants import INT64_BIT_WIDTH
 from sushi_lang.internals.errors import raise_internal_error
 from sushi_lang.backend.utils import require_builder
 from sushi_lang.sushi_stdlib.src.common import register_hash_emitter_factory, register_clone_emitter_factory
-from sushi_lang.backend.types.hash_utils import emit_fnv1a_init, emit_fnv1a_combine
+from sushi_lang.backend.types.hash_utils import emit_hash_init, emit_hash_combine
 from sushi_lang.backend import enum_utils
 
 
@@ -36,8 +36,8 @@ def _emit_enum_hash(enum_type: Type) -> Any:
         tag = enum_utils.extract_enum_tag(codegen, enum_value, name="enum_tag")
         tag_u64 = builder.zext(tag, u64)
 
-        hash_value = emit_fnv1a_init(codegen)
-        hash_value = emit_fnv1a_combine(codegen, hash_value, tag_u64)
+        hash_value = emit_hash_init(codegen)
+        hash_value = emit_hash_combine(codegen, hash_value, tag_u64)
 
         # If all variants have no associated data, just return tag-based hash
         has_any_data = any(len(v.associated_types) > 0 for v in enum_type.variants)
@@ -113,7 +113,7 @@ def _emit_variant_data_hash(codegen: Any, enum_value: ir.Value, variant: Any, in
 
         value_hash = _emit_associated_value_hash(codegen, value, assoc_type)
 
-        hash_value = emit_fnv1a_combine(codegen, hash_value, value_hash)
+        hash_value = emit_hash_combine(codegen, hash_value, value_hash)
 
     return hash_value
 
@@ -1,7 +1,13 @@
-"""Shared utilities for hash function implementation."""
+"""Shared utilities for hash function implementation.
+
+Strings hash through one out-of-line routine, `__sushi_str_hash`, a wyhash-style hash
+that reads eight bytes per step and finishes with a 128-bit multiply. Composite hashes
+(struct fields, enum payloads, array elements) fold each part in with the same
+multiply-and-fold mix.
+"""
 
 import llvmlite.ir as ir
-from sushi_lang.backend.constants import INT64_BIT_WIDTH
+from sushi_lang.backend.constants import INT64_BIT_WIDTH, HASH_SECRET, HASH_SEED
 from typing import TYPE_CHECKING
 from sushi_lang.backend.utils import require_builder
 
@@ -9,25 +15,182 @@ if TYPE_CHECKING:
     from sushi_lang.backend.codegen_llvm import LLVMCodegen
 
 
-FNV1A_OFFSET_BASIS = 14695981039346656037  # FNV-1a offset basis (64-bit)
-FNV1A_PRIME = 1099511628211  # FNV-1a prime (64-bit)
+STRING_HASH_SYMBOL = "__sushi_str_hash"
+
+_u64 = ir.IntType(INT64_BIT_WIDTH)
+_u128 = ir.IntType(2 * INT64_BIT_WIDTH)
+
+
+def _secret(k: int) -> ir.Constant:
+    return ir.Constant(_u64, HASH_SECRET[k])
+
+
+def _emit_mum(builder: ir.IRBuilder, a: ir.Value, b: ir.Value) -> tuple[ir.Value, ir.Value]:
+    """The full 128-bit product of `a` and `b`, as its (low, high) 64-bit halves."""
+    product = builder.mul(builder.zext(a, _u128), builder.zext(b, _u128))
+    low = builder.trunc(product, _u64)
+    high = builder.trunc(builder.lshr(product, ir.Constant(_u128, INT64_BIT_WIDTH)), _u64)
+    return low, high
+
+
+def emit_hash_mix(builder: ir.IRBuilder, a: ir.Value, b: ir.Value) -> ir.Value:
+    """Emit `lo(a * b) ^ hi(a * b)`: one 64x64->128-bit multiply, folded back to 64 bits."""
+    low, high = _emit_mum(builder, a, b)
+    return builder.xor(low, high)
 
 
-def emit_fnv1a_combine(codegen: 'LLVMCodegen', current_hash: ir.Value, value_hash: ir.Value) -> ir.Value:
-    """Emit LLVM IR to combine a hash value using FNV-1a algorithm."""
+def emit_hash_combine(codegen: 'LLVMCodegen', current_hash: ir.Value, value_hash: ir.Value) -> ir.Value:
+    """Emit LLVM IR to fold `value_hash` into `current_hash`."""
     builder = require_builder(codegen)
-    builder = codegen.builder
-    u64 = ir.IntType(INT64_BIT_WIDTH)
+    return emit_hash_mix(builder,
+                         builder.xor(current_hash, _secret(0)),
+                         builder.xor(value_hash, _secret(1)))
+
+
+def emit_hash_init(codegen: 'LLVMCodegen') -> ir.Value:
+    """Emit LLVM IR for the state a composite hash starts from."""
+    return ir.Constant(_u64, HASH_SEED)
+
+
+def emit_string_hash(codegen: 'LLVMCodegen', string_value: ir.Value) -> ir.Value:
+    """Emit a call to `__sushi_str_hash` for a `{i8*, i32}` string value."""
+    builder = require_builder(codegen)
+    data = builder.extract_value(string_value, 0, name="str_ptr")
+    length = builder.zext(builder.extract_value(string_value, 1, name="str_len"), _u64)
+    return builder.call(get_or_emit_string_hash(codegen.module), [data, length], name="str_hash")
+
+
+def get_or_emit_string_hash(module: ir.Module) -> ir.Function:
+    """Get (or lazily emit) `u64 __sushi_str_hash(i8* data, u64 len)` in `module`.
+
+    The body is built with its own IRBuilder, so it can be emitted mid-emission of any
+    other function. It is `linkonce_odr` like the lifecycle functions: every module that
+    hashes a string carries a copy and the linker keeps one.
+
+    Inputs of up to 16 bytes are read as two overlapping pairs of 4-byte words (three
+    single bytes below 4), so there is no per-byte loop at all. Longer inputs run three
+    independent 16-byte lanes per 48-byte step, then one lane per remaining 16 bytes,
+    and finish on the last 16 bytes of the buffer. Words are read little-endian, as
+    unaligned loads, and never past `data + len`.
+    """
+    existing = module.globals.get(STRING_HASH_SYMBOL)
+    if isinstance(existing, ir.Function):
+        return existing
+
+    i8_ptr = ir.IntType(8).as_pointer()
+    fn = ir.Function(module, ir.FunctionType(_u64, [i8_ptr, _u64]), name=STRING_HASH_SYMBOL)
+    fn.linkage = "linkonce_odr"
+    fn.attributes.add("nounwind")
+    data, length = fn.args
+    data.name, length.name = "data", "len"
+
+    entry = fn.append_basic_block("entry")
+    short = fn.append_basic_block("short")
+    short_words = fn.append_basic_block("short_words")
+    short_nonempty = fn.append_basic_block("short_nonempty")
+    short_bytes = fn.append_basic_block("short_bytes")
+    long_ = fn.append_basic_block("long")
+    bulk = fn.append_basic_block("bulk")
+    bulk_done = fn.append_basic_block("bulk_done")
+    pairs = fn.append_basic_block("pairs")
+    pair = fn.append_basic_block("pair")
+    tail = fn.append_basic_block("tail")
+    finish = fn.append_basic_block("finish")
+    b = ir.IRBuilder(entry)
+
+    def const(value: int) -> ir.Constant:
+        return ir.Constant(_u64, value)
+
+    def load(offset: ir.Value, width: int) -> ir.Value:
+        ptr = b.bitcast(b.gep(data, [offset], inbounds=True), ir.IntType(width).as_pointer())
+        word = b.load(ptr, align=1)
+        return word if width == INT64_BIT_WIDTH else b.zext(word, _u64)
+
+    def lane(offset: ir.Value, secret: int, state: ir.Value) -> ir.Value:
+        """mix(word[offset] ^ secret, word[offset + 8] ^ state)"""
+        return emit_hash_mix(b, b.xor(load(offset, 64), _secret(secret)),
+                             b.xor(load(b.add(offset, const(8)), 64), state))
+
+    seed = const(HASH_SEED)
+    b.cbranch(b.icmp_unsigned('<=', length, const(16)), short, long_)
+
+    # 4..16 bytes: a = w32[0] << 32 | w32[q], b = w32[n-4] << 32 | w32[n-4-q], where
+    # q = (n / 8) * 4. The pairs overlap for n < 16 and cover every byte.
+    b.position_at_end(short)
+    b.cbranch(b.icmp_unsigned('>=', length, const(4)), short_words, short_nonempty)
+
+    b.position_at_end(short_words)
+    q = b.shl(b.lshr(length, const(3)), const(2))
+    last = b.sub(length, const(4))
+    words_a = b.or_(b.shl(load(const(0), 32), const(32)), load(q, 32))
+    words_b = b.or_(b.shl(load(last, 32), const(32)), load(b.sub(last, q), 32))
+    b.branch(finish)
+
+    # 1..3 bytes: the first, middle and last byte.
+    b.position_at_end(short_nonempty)
+    b.cbranch(b.icmp_unsigned('>', length, const(0)), short_bytes, finish)
+
+    b.position_at_end(short_bytes)
+    bytes_a = b.or_(b.or_(b.shl(load(const(0), 8), const(16)),
+                          b.shl(load(b.lshr(length, const(1)), 8), const(8))),
+                    load(b.sub(length, const(1)), 8))
+    b.branch(finish)
+
+    # More than 16 bytes: 48 at a time in three lanes while they last.
+    b.position_at_end(long_)
+    b.cbranch(b.icmp_unsigned('>=', length, const(48)), bulk, pairs)
+
+    b.position_at_end(bulk)
+    bulk_off = b.phi(_u64, name="bulk_off")
+    bulk_seed = b.phi(_u64, name="bulk_seed")
+    see1 = b.phi(_u64, name="see1")
+    see2 = b.phi(_u64, name="see2")
+    next_seed = lane(bulk_off, 1, bulk_seed)
+    next_see1 = lane(b.add(bulk_off, const(16)), 2, see1)
+    next_see2 = lane(b.add(bulk_off, const(32)), 3, see2)
+    next_off = b.add(bulk_off, const(48))
+    for phi, start, step in ((bulk_off, const(0), next_off), (bulk_seed, seed, next_seed),
+                             (see1, seed, next_see1), (see2, seed, next_see2)):
+        phi.add_incoming(start, long_)
+        phi.add_incoming(step, bulk)
+    b.cbranch(b.icmp_unsigned('>=', b.sub(length, next_off), const(48)), bulk, bulk_done)
 
-    xor_result = builder.xor(current_hash, value_hash)
+    b.position_at_end(bulk_done)
+    folded = b.xor(next_seed, b.xor(next_see1, next_see2))
+    b.branch(pairs)
 
-    prime = ir.Constant(u64, FNV1A_PRIME)
-    combined = builder.mul(xor_result, prime)
+    # Then 16 at a time while more than 16 remain.
+    b.position_at_end(pairs)
+    pair_off = b.phi(_u64, name="pair_off")
+    pair_seed = b.phi(_u64, name="pair_seed")
+    pair_off.add_incoming(const(0), long_)
+    pair_seed.add_incoming(seed, long_)
+    pair_off.add_incoming(next_off, bulk_done)
+    pair_seed.add_incoming(folded, bulk_done)
+    b.cbranch(b.icmp_unsigned('>', b.sub(length, pair_off), const(16)), pair, tail)
 
-    return combined
+    b.position_at_end(pair)
+    pair_off.add_incoming(b.add(pair_off, const(16)), pair)
+    pair_seed.add_incoming(lane(pair_off, 1, pair_seed), pair)
+    b.branch(pairs)
 
+    # The last 16 bytes of the buffer, overlapping what the lanes consumed.
+    b.position_at_end(tail)
+    tail_a = load(b.sub(length, const(16)), 64)
+    tail_b = load(b.sub(length, const(8)), 64)
+    b.branch(finish)
 
-def emit_fnv1a_init(codegen: 'LLVMCodegen') -> ir.Value:
-    """Emit LLVM IR to initialize FNV-1a hash with offset basis."""
-    u64 = ir.IntType(INT64_BIT_WIDTH)
-    return ir.Constant(u64, FNV1A_OFFSET_BASIS)
+    b.position_at_end(finish)
+    a_in = b.phi(_u64, name="a")
+    b_in = b.phi(_u64, name="b")
+    state = b.phi(_u64, name="seed")
+    for block, a_val, b_val, seed_val in ((short_words, words_a, words_b, seed),
+                                          (short_nonempty, const(0), const(0), seed),
+                                          (short_bytes, bytes_a, const(0), seed),
+                                          (tail, tail_a, tail_b, pair_seed)):
+        a_in.add_incoming(a_val, block)
+        b_in.add_incoming(b_val, block)
+        state.add_incoming(seed_val, block)
+    low, high = _emit_mum(b, b.xor(a_in, _secret(1)), b.xor(b_in, state))
+    b.ret(emit_hash_mix(b, b.xor(b.xor(low, _secret(0)), length), b.xor(high, _secret(1))))
+    return fn
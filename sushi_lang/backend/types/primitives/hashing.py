@@ -9,7 +9,7 @@ from sushi_lang.internals import errors as er
 from sushi_lang.internals.errors import raise_internal_error
 from sushi_lang.backend.utils import require_builder
 from sushi_lang.sushi_stdlib.src.common import register_builtin_method, BuiltinMethod
-from sushi_lang.backend.types.hash_utils import FNV1A_OFFSET_BASIS, emit_fnv1a_combine
+from sushi_lang.backend.types.hash_utils import emit_string_hash
 from sushi_lang.semantics.generics.type_display import display_type
 
 
@@ -75,7 +75,7 @@ def _emit_generic_hash(prim_type: BuiltinType) -> Any:
             return builder.zext(receiver_value, u64)
 
         elif prim_type == BuiltinType.STRING:
-            return _emit_string_hash_fnv1a(codegen, receiver_value)
+            return emit_string_hash(codegen, receiver_value)
 
         else:
             raise_internal_error("CE0076", type=prim_type)
@@ -83,56 +83,6 @@ def _emit_generic_hash(prim_type: BuiltinType) -> Any:
     return emitter
 
 
-def _emit_string_hash_fnv1a(codegen: Any, string_value: ir.Value) -> ir.Value:
-    """Emit LLVM IR for FNV-1a string hashing algorithm."""
-    builder = require_builder(codegen)
-    builder = codegen.builder
-    u64 = ir.IntType(INT64_BIT_WIDTH)
-
-    string_ptr = builder.extract_value(string_value, 0, name="str_ptr")
-    str_len_i32 = builder.extract_value(string_value, 1, name="str_len")
-    str_len_u64 = builder.zext(str_len_i32, u64)
-
-    hash_value = builder.alloca(u64, name="hash")
-    offset_basis = ir.Constant(u64, FNV1A_OFFSET_BASIS)
-    builder.store(offset_basis, hash_value)
-
-    counter = builder.alloca(u64, name="counter")
-    zero_u64 = ir.Constant(u64, 0)
-    builder.store(zero_u64, counter)
-
-    loop_header = builder.append_basic_block(name="hash_loop_header")
-    loop_body = builder.append_basic_block(name="hash_loop_body")
-    loop_exit = builder.append_basic_block(name="hash_loop_exit")
-
-    builder.branch(loop_header)
-
-    builder.position_at_end(loop_header)
-    current_counter = builder.load(counter)
-    cond = builder.icmp_unsigned('<', current_counter, str_len_u64)
-    builder.cbranch(cond, loop_body, loop_exit)
-
-    builder.position_at_end(loop_body)
-
-    byte_ptr = builder.gep(string_ptr, [current_counter], inbounds=True)
-    byte = builder.load(byte_ptr)
-    byte_u64 = builder.zext(byte, u64)
-
-    current_hash = builder.load(hash_value)
-    new_hash = emit_fnv1a_combine(codegen, current_hash, byte_u64)
-    builder.store(new_hash, hash_value)
-
-    one_u64 = ir.Constant(u64, 1)
-    next_counter = builder.add(current_counter, one_u64)
-    builder.store(next_counter, counter)
-
-    builder.branch(loop_header)
-
-    builder.position_at_end(loop_exit)
-    final_hash = builder.load(hash_value)
-    return final_hash
-
-
 primitive_types = [
     BuiltinType.I8, BuiltinType.I16, BuiltinType.I32, BuiltinType.I64,
     BuiltinType.U8, BuiltinType.U16, BuiltinType.U32, BuiltinType.U64,
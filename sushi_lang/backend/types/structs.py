@@ -7,7 +7,7 @@ import llvmlite.ir as ir
 from sushi_lang.internals.errors import raise_internal_error
 from sushi_lang.backend.utils import require_builder
 from sushi_lang.sushi_stdlib.src.common import register_hash_emitter_factory, register_clone_emitter_factory
-from sushi_lang.backend.types.hash_utils import emit_fnv1a_init, emit_fnv1a_combine
+from sushi_lang.backend.types.hash_utils import emit_hash_init, emit_hash_combine
 
 
 def _emit_struct_hash(prim_type: Type) -> Any:
@@ -26,7 +26,7 @@ def _emit_struct_hash(prim_type: Type) -> Any:
         builder = require_builder(codegen)
         builder = codegen.builder
 
-        hash_value = emit_fnv1a_init(codegen)
+        hash_value = emit_hash_init(codegen)
 
         for field_idx, (field_name, field_type) in enumerate(struct_type.fields):
             if isinstance(receiver_value.type, ir.PointerType):
@@ -38,7 +38,7 @@ def _emit_struct_hash(prim_type: Type) -> Any:
 
             field_hash = _emit_field_hash(codegen, field_value, field_type)
 
-            hash_value = emit_fnv1a_combine(codegen, hash_value, field_hash)
+            hash_value = emit_hash_combine(codegen, hash_value, field_hash)
 
         return hash_value
 
@@ -74,14 +74,14 @@ def _emit_field_hash(codegen: Any, field_value: ir.Value, field_type: Type) -> i
 
     elif isinstance(field_type, StructType):
 
-        nested_hash = emit_fnv1a_init(codegen)
+        nested_hash = emit_hash_init(codegen)
 
         for nested_idx, (nested_name, nested_type) in enumerate(field_type.fields):
             nested_field = builder.extract_value(field_value, nested_idx, name=f"nested_{nested_name}")
 
             nested_field_hash = _emit_field_hash(codegen, nested_field, nested_type)
 
-            nested_hash = emit_fnv1a_combine(codegen, nested_hash, nested_field_hash)
+            nested_hash = emit_hash_combine(codegen, nested_hash, nested_field_hash)
 
         return nested_hash
 
@@ -1,3 +1,16 @@
-from sushi_lang.compiler.cli import main
+def main(argv: list[str] | None = None) -> int:
+    """`sushic`: compile on the server `SUSHI_SERVER` names, or in this process.
+
+    The CLI is imported only when this process compiles, so forwarding to a warm
+    `sushic --server` costs no compiler import.
+    """
+    from sushi_lang.compiler.server import forward
+
+    rc = forward(argv)
+    if rc is not None:
+        return rc
+    from sushi_lang.compiler.cli import main as compile_main
+    return compile_main(argv)
+
 
 __all__ = ["main"]
@@ -0,0 +1,160 @@
+"""Per-unit semantic-analysis cache for incremental builds.
+
+The per-unit passes (scope, typecheck, lift, borrow) dominate a warm rebuild once
+codegen is cached. Their result for a unit is a function of the unit's own AST and of
+the whole-program context those passes read -- the symbol tables as they stand before
+the per-unit loop, plus the destroy-effect summary. Both go into the key, with the unit's
+source bytes for the positions the AST digest leaves out, so a hit is exactly the result
+the passes would have produced.
+
+Entries are pickles, and loading a pickle runs code, so they never live in the project's
+`__sushi_cache__/` (anyone who can write to a checkout could plant one). They go to a
+per-user directory instead, `~/.sushi/cache/analysis/` next to the parser tables, and
+are only read from a directory and file that this user owns and nobody else can write.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import stat
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from sushi_lang.compiler.fingerprint import _node_digest
+
+if TYPE_CHECKING:
+    from sushi_lang.compiler.cache import CacheManager
+    from sushi_lang.semantics.tables import SymbolTables
+    from sushi_lang.semantics.unit_analysis import UnitAnalysis
+    from sushi_lang.semantics.units import Unit
+
+
+ANALYSIS_DIR = "analysis"
+
+# Stamped ASTs nest deeply (every expression holds its resolved type); the default
+# recursion limit is too low for pickle to walk a large function body.
+_PICKLE_RECURSION_LIMIT = 20000
+
+
+def analysis_cache_dir() -> Optional[Path]:
+    """Where analysis entries live. None disables the analysis cache.
+
+    SUSHI_ANALYSIS_CACHE=off (or 0) disables it; any other value is the directory.
+    """
+    override = os.environ.get("SUSHI_ANALYSIS_CACHE")
+    if override is not None:
+        if override.lower() in ("", "0", "off"):
+            return None
+        return Path(override)
+    return Path.home() / ".sushi" / "cache" / ANALYSIS_DIR
+
+
+def _owned_privately(st: os.stat_result) -> bool:
+    """Is this this user's, and writable by nobody else?"""
+    return st.st_uid == os.getuid() and not stat.S_IMODE(st.st_mode) & 0o022
+
+
+def _private_cache_dir(path: Optional[Path]) -> Optional[Path]:
+    """`path`, created 0700 if missing, or None unless only this user can write to it."""
+    if path is None or not hasattr(os, "getuid"):
+        return None
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.stat(path)
+    except OSError:
+        return None
+    return path if stat.S_ISDIR(st.st_mode) and _owned_privately(st) else None
+
+
+class AnalysisCache:
+    """Looks up and stores `UnitAnalysis` results in this user's private analysis cache."""
+
+    def __init__(self, cache: CacheManager) -> None:
+        self.path = _private_cache_dir(analysis_cache_dir())
+        self._cache = cache
+        self._context_key: Optional[str] = None
+        self._unit_keys: dict[str, str] = {}
+
+    def begin(self, tables: SymbolTables, destroy_effects) -> None:
+        """Fix the whole-program context for this build, before any unit is analysed."""
+        hasher = hashlib.sha256()
+        hasher.update(self._cache.global_key.encode())
+        hasher.update(_node_digest(tables).encode())
+        hasher.update(_node_digest(destroy_effects).encode())
+        self._context_key = hasher.hexdigest()
+        self._unit_keys.clear()
+
+    def lookup(self, unit: Unit) -> Optional[UnitAnalysis]:
+        """The cached analysis for `unit`, or None. Call before the passes touch its AST."""
+        if self.path is None or self._context_key is None or unit.ast is None:
+            return None
+        hasher = hashlib.sha256()
+        hasher.update(self._context_key.encode())
+        # The directory is shared by every project; the stored diagnostics name the file.
+        hasher.update(f"UNIT:{unit.name}:{unit.file_path.resolve()}:".encode())
+        hasher.update(_node_digest(unit.ast).encode())
+        # The AST digest ignores positions, but the stored AST and diagnostics carry
+        # them: code that only moved must miss, or it replays stale line numbers.
+        hasher.update(b"SRC:")
+        hasher.update(_source_digest(unit.file_path).encode())
+        key = hasher.hexdigest()[:24]
+        self._unit_keys[unit.name] = key
+
+        try:
+            with open(self._entry_path(unit.name, key), "rb") as f:
+                if not _owned_privately(os.fstat(f.fileno())):
+                    return None
+                with _deep_recursion():
+                    return pickle.load(f)
+        except Exception:
+            # Missing, truncated or written by an incompatible compiler: a miss.
+            return None
+
+    def store(self, unit: Unit, analysis: UnitAnalysis) -> None:
+        """Persist `analysis` under the key `lookup` computed for `unit`. Best effort."""
+        key = self._unit_keys.get(unit.name)
+        if self.path is None or key is None:
+            return
+        try:
+            with _deep_recursion():
+                payload = pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL)
+            _publish(self._entry_path(unit.name, key), payload)
+        except Exception:
+            pass
+
+    def _entry_path(self, unit_name: str, key: str) -> Path:
+        assert self.path is not None
+        return self.path / f"{unit_name.replace('/', '_')}.{key}.pickle"
+
+
+def _publish(path: Path, payload: bytes) -> None:
+    """Write an entry atomically, readable and writable by this user only."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _source_digest(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+@contextmanager
+def _deep_recursion():
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, _PICKLE_RECURSION_LIMIT))
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(limit)
@@ -25,9 +25,12 @@ class CacheManager:
     """Manages the incremental compilation cache directory."""
 
     def __init__(self, project_root: Path, opt_level: str = "mem2reg",
-                 cache_dir: Optional[Path] = None) -> None:
+                 cache_dir: Optional[Path] = None, pipeline: str = "sushi",
+                 hashmap_layout: str = "linear") -> None:
         self.project_root = project_root
         self.opt_level = opt_level
+        self.pipeline = pipeline
+        self.hashmap_layout = hashmap_layout
         self.cache_path = cache_dir or (project_root / CACHE_DIR_NAME)
         self.units_path = self.cache_path / UNITS_DIR
         self.stdlib_path = self.cache_path / STDLIB_DIR
@@ -39,7 +42,8 @@ class CacheManager:
         """Digest of the settings every cached object depends on."""
         from sushi_lang.compiler.fingerprint import compute_compiler_source_fingerprint
         material = (
-            f"{compiler_version}|{self._target_triple}|{self.opt_level}"
+            f"{compiler_version}|{self._target_triple}|{self.opt_level}|{self.pipeline}"
+            f"|{self.hashmap_layout}"
             f"|{compute_compiler_source_fingerprint()}"
         )
         return hashlib.sha1(material.encode("utf-8")).hexdigest()[:_KEY_LEN]
@@ -69,6 +73,10 @@ class CacheManager:
         """Cached .o path for a library."""
         return self._object_path(self.libs_path, lib_name.replace("/", "_"), fingerprint)
 
+    def unit_bitcode_path(self, unit_name: str, fingerprint: str) -> Path:
+        """Cached unoptimized .bc path for a source unit (`--lto` builds)."""
+        return self._object_path(self.units_path, unit_name, fingerprint).with_suffix(".bc")
+
     def has_cached_unit(self, unit_name: str, fingerprint: str) -> bool:
         return self.unit_object_path(unit_name, fingerprint).exists()
 
@@ -78,9 +86,15 @@ class CacheManager:
     def has_cached_lib(self, lib_name: str, fingerprint: str) -> bool:
         return self.lib_object_path(lib_name, fingerprint).exists()
 
+    def has_cached_unit_bitcode(self, unit_name: str, fingerprint: str) -> bool:
+        return self.unit_bitcode_path(unit_name, fingerprint).exists()
+
     def store_unit_object(self, unit_name: str, obj_bytes: bytes, fingerprint: str) -> Path:
         return self._store(self.unit_object_path(unit_name, fingerprint), obj_bytes)
 
+    def store_unit_bitcode(self, unit_name: str, bitcode: bytes, fingerprint: str) -> Path:
+        return self._store(self.unit_bitcode_path(unit_name, fingerprint), bitcode)
+
     def store_stdlib_object(self, stdlib_unit: str, obj_bytes: bytes, fingerprint: str) -> Path:
         return self._store(self.stdlib_object_path(stdlib_unit, fingerprint), obj_bytes)
 
@@ -3,10 +3,12 @@ from __future__ import annotations
 
 import argparse
 import sys
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
+from sushi_lang.internals import timing
 from sushi_lang.internals.diagnostics import (
     InternalCompilerError,
     StdlibBuildError,
@@ -169,7 +171,16 @@ class Session:
     crash: Optional[BaseException] = None
 
 
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
 def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    from sushi_lang.backend.llvm_optimization import PIPELINES
+
     ap = argparse.ArgumentParser(prog="compiler", description="Language compiler")
 
     ap.add_argument("source", nargs='?', help="Path to source file (.sushi)")
@@ -188,6 +199,33 @@ def _parse_args(argv: list[str] | None) -> argparse.Namespace:
         default="mem2reg",
         help="Optimization level. 'mem2reg' promotes locals to SSA without a full pipeline.",
     )
+    ap.add_argument(
+        "--pipeline",
+        choices=PIPELINES,
+        default=None,
+        help="Pass pipeline behind --opt O1/O2/O3: 'sushi' (default) is the hand-assembled "
+             "pass list, 'llvm' is LLVM's default pipeline with inlining and vectorization.",
+    )
+    ap.add_argument(
+        "--lto",
+        action="store_true",
+        help="Link-time optimization: cache per-unit bitcode, then merge the whole "
+             "program and optimize it as one module at --opt (incremental builds)",
+    )
+    ap.add_argument(
+        "--hashmap-layout",
+        choices=["linear", "swiss"],
+        default="linear",
+        help="HashMap bucket layout: 'linear' probes entry by entry, 'swiss' keeps a "
+             "control byte and the hash per slot and probes 16 slots at a time.",
+    )
+    ap.add_argument(
+        "--stdout-buffering",
+        choices=["auto", "line", "full"],
+        default="auto",
+        help="stdout buffering: 'auto' flushes each line on a terminal and fills a 64 KiB "
+             "buffer otherwise, 'line' and 'full' force one mode.",
+    )
     ap.add_argument(
         "--no-verify",
         action="store_true",
@@ -223,6 +261,13 @@ def _parse_args(argv: list[str] | None) -> argparse.Namespace:
         action="store_true",
         help="Force full rebuild, ignoring cached object files",
     )
+    ap.add_argument(
+        "-j", "--jobs",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Compile cache-miss units in N parallel processes (incremental builds)",
+    )
     ap.add_argument(
         "--clean-cache",
         action="store_true",
@@ -233,15 +278,39 @@ def _parse_args(argv: list[str] | None) -> argparse.Namespace:
         metavar="PATH",
         help="Custom cache directory location (default: __sushi_cache__/)",
     )
-    return ap.parse_args(argv)
+    ap.add_argument(
+        "--timing-json",
+        metavar="PATH",
+        help="Write per-phase timings and counters as JSON to PATH ('-' for stdout)",
+    )
+    ap.add_argument(
+        "--server",
+        nargs="?",
+        const="",
+        metavar="SOCKET",
+        help="Run a warm compile server on the Unix socket SOCKET (default: $SUSHI_SERVER "
+             "or a per-user path); sushic forwards to it when SUSHI_SERVER is set",
+    )
+    args = ap.parse_args(argv)
+    if args.pipeline is not None and args.opt in ("none", "mem2reg"):
+        # Only O1-O3 run a pipeline; accepting it here would silently do nothing.
+        ap.error(f"--pipeline {args.pipeline} has no effect at --opt {args.opt}; "
+                 "it selects the O1/O2/O3 pipeline")
+    if args.pipeline is None:
+        args.pipeline = PIPELINES[0]
+    return args
 
 
 def _run(session: Session) -> int:
     """Everything the compiler does. Raises; never reports."""
-    from sushi_lang.compiler.loader import get_effective_cwd, check_duplicate_uses
-    from sushi_lang.compiler.pipeline import compile_multi_file
-    from sushi_lang.internals import errors as er
-    from sushi_lang.internals.parser import parse_to_ast
+    with timing.phase("import"):
+        from sushi_lang.compiler.loader import get_effective_cwd, check_duplicate_uses
+        from sushi_lang.compiler.pipeline import compile_multi_file
+        from sushi_lang.internals import errors as er
+        from sushi_lang.internals.parser import parse_to_ast
+        if timing.enabled():
+            # Charge the backend's import here, not to whichever pass first touches it.
+            import sushi_lang.backend.codegen_llvm  # noqa: F401
 
     args = session.args
 
@@ -344,16 +413,28 @@ def _flush(session: Session) -> None:
 
 def main(argv: list[str] | None = None) -> int:
     """Main compiler entry point."""
+    started = time.perf_counter()
     print_banner()
 
     args = _parse_args(argv)
 
+    collector = None
+    if args.timing_json:
+        collector = timing.enable(started)
+        collector.add("import", time.perf_counter() - started)
+
     if args.version:
         return 0
 
     if args.lib_info:
         return library_info_command(Path(args.lib_info))
 
+    if args.server is not None:
+        from sushi_lang.compiler import server
+        path = Path(args.server) if args.server else (
+            server.socket_path_from_env() or server.default_socket_path())
+        return server.serve(path)
+
     session = Session(args=args)
 
     try:
@@ -368,6 +449,16 @@ def main(argv: list[str] | None = None) -> int:
         rc = _report(session, _as_ice(exc))
 
     _flush(session)
+    if collector is not None:
+        from sushi_lang import __version__
+        timing.disable()
+        timing.write_report(
+            collector, args.timing_json,
+            compiler=__version__,
+            source=str(session.src_path) if session.src_path else args.source,
+            opt=args.opt,
+            exit_code=rc,
+        )
     return rc
 
 
@@ -0,0 +1,177 @@
+"""Content digests of files, re-hashed only when a file's stat changes.
+
+The freshness fingerprints hash whole files on every compile: all of the compiler's own
+sources for the cache key, the stdlib generators for the stdlib marker, and every
+stdlib `.bc` and imported `.slib` for the cache hits. On a networked filesystem that
+reading is a visible part of a no-op build. The index remembers, per absolute path,
+(size, mtime_ns, inode) -> SHA-256, in `~/.sushi/cache/digests/`, and reads a file
+again only when that stat tuple moves.
+
+Two rules keep a remembered digest honest:
+
+- A file changed within `_RACY_WINDOW_NS` of being hashed is not remembered: a second
+  write in the same timestamp tick would leave its stat unchanged. Its digest is still
+  used; it is simply recomputed next time, until the file has aged.
+- In a wheel install the distribution's `RECORD` already holds a SHA-256 for every
+  file it installed. A file whose size still matches its `RECORD` entry takes that
+  digest and is never read at all. That only holds for files nothing rewrites after
+  install: the stdlib bitcode under `sushi_stdlib/dist/` is rebuilt in place, often to
+  the same size, so it always goes through the stat index. An editable or source
+  checkout has no such records and goes through the stat index too.
+
+SUSHI_DIGEST_CACHE=off (or 0) keeps the index in memory only; any other value is the
+directory the index lives in.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Bumped on an incompatible change to the index file's shape.
+INDEX_VERSION = 1
+
+# Two seconds covers the coarsest timestamps in use (FAT, some network filesystems).
+_RACY_WINDOW_NS = 2_000_000_000
+
+_DISTRIBUTION = "sushi-lang"
+
+# Installed directories the compiler writes into (stdlib_builder rebuilds the bitcode
+# here), so their RECORD digests can go stale.
+_REWRITTEN_DIRS = (Path(__file__).resolve().parent.parent / "sushi_stdlib" / "dist",)
+
+
+def _index_dir() -> Optional[Path]:
+    """Where the index is stored. None keeps it in memory only."""
+    override = os.environ.get("SUSHI_DIGEST_CACHE")
+    if override is not None:
+        if override.lower() in ("", "0", "off"):
+            return None
+        return Path(override)
+    return Path.home() / ".sushi" / "cache" / "digests"
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of the file's bytes, as hex."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def record_digests(files: Iterable, locate,
+                   rewritten: Iterable[Path] = _REWRITTEN_DIRS) -> Dict[str, Tuple[int, str]]:
+    """Absolute path -> (size, hex SHA-256) for every `RECORD` entry that carries both.
+
+    `files` are `importlib.metadata` package paths; `locate` maps one to its installed
+    location. `RECORD` spells a digest as unpadded urlsafe base64. Entries under the
+    `rewritten` directories are left out.
+    """
+    rewritten = [Path(os.path.realpath(d)) for d in rewritten]
+    digests: Dict[str, Tuple[int, str]] = {}
+    for entry in files:
+        file_hash = getattr(entry, "hash", None)
+        if file_hash is None or file_hash.mode != "sha256" or entry.size is None:
+            continue
+        path = locate(entry)
+        if any(Path(os.path.realpath(path)).is_relative_to(d) for d in rewritten):
+            continue
+        raw = base64.urlsafe_b64decode(file_hash.value + "=" * (-len(file_hash.value) % 4))
+        digests[os.path.abspath(path)] = (int(entry.size), raw.hex())
+    return digests
+
+
+def _installed_digests() -> Dict[str, Tuple[int, str]]:
+    """The digests a wheel install recorded; empty for a checkout or an editable install."""
+    from importlib import metadata
+
+    try:
+        dist = metadata.distribution(_DISTRIBUTION)
+    except metadata.PackageNotFoundError:
+        return {}
+    return record_digests(dist.files or (), dist.locate_file)
+
+
+class DigestIndex:
+    """(size, mtime_ns, inode) -> digest, per absolute path, persisted as JSON."""
+
+    def __init__(self, store: Optional[Path],
+                 installed: Optional[Dict[str, Tuple[int, str]]] = None) -> None:
+        """Load the index at `store` (None: in memory only); a bad file is an empty index."""
+        self.store = store
+        self.installed = installed or {}
+        self._entries: Dict[str, List] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if store is not None:
+            try:
+                data = json.loads(store.read_text(encoding="utf-8"))
+                if data.get("version") == INDEX_VERSION:
+                    self._entries = data["entries"]
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+
+    def digest(self, path: str | os.PathLike[str]) -> Optional[str]:
+        """The hex SHA-256 of `path`'s content, or None if it cannot be read."""
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None
+        installed = self.installed.get(key)
+        if installed is not None and installed[0] == st.st_size:
+            return installed[1]
+        stamp = [st.st_size, st.st_mtime_ns, st.st_ino]
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[:3] == stamp:
+            return entry[3]
+        try:
+            digest = hash_file(Path(key))
+        except OSError:
+            return None
+        if time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+            with self._lock:
+                self._entries[key] = stamp + [digest]
+                self._dirty = True
+        return digest
+
+    def save(self) -> None:
+        """Publish the index atomically if it changed. Best effort: a read-only home is fine."""
+        with self._lock:
+            if not self._dirty or self.store is None:
+                return
+            # Forget files that are gone, or temporary paths would pile up forever.
+            self._entries = {key: entry for key, entry in self._entries.items()
+                             if os.path.exists(key)}
+            text = json.dumps({"version": INDEX_VERSION, "entries": self._entries})
+            self._dirty = False
+        tmp_path = self.store.with_name(
+            f"{self.store.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.store.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, self.store)
+        except OSError:
+            pass
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+
+_index: Optional[DigestIndex] = None
+
+
+def get_digest_index() -> DigestIndex:
+    """The process-wide index, loaded on first use."""
+    global _index
+    if _index is None:
+        store_dir = _index_dir()
+        store = store_dir / f"index-v{INDEX_VERSION}.json" if store_dir is not None else None
+        _index = DigestIndex(store, _installed_digests())
+    return _index
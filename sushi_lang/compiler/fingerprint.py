@@ -4,6 +4,9 @@ from __future__ import annotations
 import hashlib
 from typing import TYPE_CHECKING
 
+from sushi_lang.compiler.digest_index import get_digest_index
+from sushi_lang.internals import timing
+
 if TYPE_CHECKING:
     from sushi_lang.semantics.units import Unit, UnitManager
     from sushi_lang.semantics.ast import Program
@@ -11,8 +14,13 @@ if TYPE_CHECKING:
 
 def compute_unit_fingerprint(unit: Unit, unit_manager: UnitManager | None = None,
                              monomorphized_extensions: list | None = None,
-                             library_fingerprints: dict[str, str] | None = None) -> str:
-    """Compute a semantic fingerprint for a compilation unit."""
+                             library_fingerprints: dict[str, str] | None = None,
+                             stdout_buffering: str | None = None) -> str:
+    """Compute a semantic fingerprint for a compilation unit.
+
+    *stdout_buffering* is given for the unit defining main(), the one unit whose code the
+    `--stdout-buffering` mode changes.
+    """
     hasher = hashlib.sha256()
 
     if unit.file_path.exists():
@@ -71,36 +79,56 @@ def compute_unit_fingerprint(unit: Unit, unit_manager: UnitManager | None = None
         for lib_path in sorted(library_fingerprints):
             hasher.update(f"{lib_path}:{library_fingerprints[lib_path]}".encode())
 
+    # 7. The stdout buffering mode main()'s setvbuf call is emitted with.
+    if stdout_buffering is not None:
+        hasher.update(f"STDOUT_BUFFERING:{stdout_buffering}".encode())
+
     return hasher.hexdigest()
 
 
 def compute_stdlib_fingerprint(bc_paths: list) -> str:
     """Compute a fingerprint for stdlib bitcode files."""
+    index = get_digest_index()
     hasher = hashlib.sha256()
     hasher.update(b"STDLIB:")
-    for bc_path in sorted(str(p) for p in bc_paths):
-        from pathlib import Path
-        path = Path(bc_path)
-        if path.exists():
-            hasher.update(path.read_bytes())
+    with timing.phase("fingerprint"):
+        for bc_path in sorted(str(p) for p in bc_paths):
+            digest = index.digest(bc_path)
+            if digest is not None:
+                hasher.update(digest.encode())
+    index.save()
     return hasher.hexdigest()
 
 
+_stdlib_source_fingerprint: str | None = None
+
+
 def compute_stdlib_source_fingerprint() -> str:
-    """Compute a content fingerprint of the stdlib bitcode *generators*."""
+    """Compute a content fingerprint of the stdlib bitcode *generators*.
+
+    Memoized like the compiler's own: the generators are the code this process runs.
+    """
+    global _stdlib_source_fingerprint
+    if _stdlib_source_fingerprint is not None:
+        return _stdlib_source_fingerprint
+
     sushi_lang_dir = _sushi_lang_dir()
+    index = get_digest_index()
     hasher = hashlib.sha256()
     hasher.update(b"STDLIB_SRC:")
-    for path in _stdlib_generator_sources():
-        # A listed source that does not exist would be SILENTLY absent from the
-        # digest -- exactly how the primitives generator dropped out when it
-        # became a package. tests/unit/test_fingerprint.py pins the list.
-        if not path.exists():
-            continue
-        rel = path.resolve().relative_to(sushi_lang_dir)
-        hasher.update(f"{rel}:".encode())
-        hasher.update(path.read_bytes())
-    return hasher.hexdigest()
+    with timing.phase("fingerprint"):
+        for path in _stdlib_generator_sources():
+            # A listed source that does not exist would be SILENTLY absent from the
+            # digest -- exactly how the primitives generator dropped out when it
+            # became a package. tests/unit/test_fingerprint.py pins the list.
+            digest = index.digest(path)
+            if digest is None:
+                continue
+            rel = path.relative_to(sushi_lang_dir)
+            hasher.update(f"{rel}:{digest}".encode())
+    index.save()
+    _stdlib_source_fingerprint = hasher.hexdigest()
+    return _stdlib_source_fingerprint
 
 
 def _sushi_lang_dir():
@@ -124,12 +152,14 @@ def _stdlib_generator_sources() -> list:
 
 def compute_lib_fingerprint(slib_path) -> str:
     """Compute a fingerprint for a library .slib file."""
-    from pathlib import Path
+    index = get_digest_index()
     hasher = hashlib.sha256()
     hasher.update(b"LIB:")
-    path = Path(slib_path)
-    if path.exists():
-        hasher.update(path.read_bytes())
+    with timing.phase("fingerprint"):
+        digest = index.digest(slib_path)
+    if digest is not None:
+        hasher.update(digest.encode())
+    index.save()
     return hasher.hexdigest()
 
 
@@ -145,12 +175,15 @@ def compute_compiler_source_fingerprint() -> str:
     from pathlib import Path
 
     sushi_lang_dir = Path(__file__).resolve().parent.parent
+    index = get_digest_index()
     hasher = hashlib.sha256()
     hasher.update(b"COMPILER_SRC:")
-    for path in sorted(sushi_lang_dir.rglob("*.py"), key=str):
-        rel = path.resolve().relative_to(sushi_lang_dir)
-        hasher.update(f"{rel}:".encode())
-        hasher.update(path.read_bytes())
+    # Plain strings: Path.relative_to over ~600 files cost more than the stat index.
+    prefix = len(str(sushi_lang_dir)) + 1
+    with timing.phase("fingerprint"):
+        for path in sorted(map(str, sushi_lang_dir.rglob("*.py"))):
+            hasher.update(f"{path[prefix:]}:{index.digest(path)}".encode())
+    index.save()
     _compiler_source_fingerprint = hasher.hexdigest()
     return _compiler_source_fingerprint
 
@@ -158,6 +191,7 @@ def compute_compiler_source_fingerprint() -> str:
 def _node_digest(node) -> str:
     """Stable digest of an AST subtree, insensitive to source positions."""
     import dataclasses
+    import types
 
     hasher = hashlib.sha256()
     seen: set[int] = set()
@@ -189,6 +223,24 @@ def _node_digest(node) -> str:
                 hasher.update(f"{k}:".encode())
                 walk(value[k])
             hasher.update(b"}")
+        elif isinstance(value, (set, frozenset)):
+            # Iteration order follows the per-process string hash seed.
+            hasher.update(b"{")
+            for item in sorted(value, key=repr):
+                walk(item)
+                hasher.update(b",")
+            hasher.update(b"}")
+        elif isinstance(value, types.FunctionType):
+            # A callback's repr carries its address. Its code is covered by the compiler
+            # source fingerprint; what varies per program is what it closed over.
+            hasher.update(f"fn:{value.__module__}.{value.__qualname__}(".encode())
+            for cell in value.__closure__ or ():
+                try:
+                    walk(cell.cell_contents)
+                except ValueError:  # an empty cell
+                    pass
+                hasher.update(b",")
+            hasher.update(b")")
         else:
             hasher.update(repr(value).encode())
 
@@ -0,0 +1,121 @@
+"""Parallel per-unit code generation for incremental builds (`sushic -j N`)."""
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from sushi_lang.backend.codegen_llvm import LLVMCodegen
+    from sushi_lang.semantics.units import Unit
+
+
+@dataclass(frozen=True)
+class CodegenJob:
+    """One cache miss: a source unit, a stdlib unit or a library, to compile to an object.
+
+    Under `--lto` a unit job yields unoptimized bitcode instead, for the link-time merge.
+    """
+    kind: str  # "unit" | "stdlib" | "lib"
+    name: str
+    fingerprint: str
+
+
+@dataclass
+class CodegenContext:
+    """Everything a codegen job reads. Built once, after semantic analysis."""
+    analyzer: Any
+    compilation_order: list[Unit]
+    library_linker: Any
+    opt: str
+    verify: bool
+    pipeline: str = "sushi"
+    lto: bool = False
+    hashmap_layout: str = "linear"
+    stdout_buffering: str = "auto"
+
+    def make_codegen(self) -> LLVMCodegen:
+        """A codegen configured from the analyzer's tables, like the serial build's."""
+        from sushi_lang.backend.codegen_llvm import LLVMCodegen
+
+        analyzer = self.analyzer
+        cg = LLVMCodegen(struct_table=getattr(analyzer, 'structs', None),
+                         enum_table=getattr(analyzer, 'enums', None),
+                         func_table=getattr(analyzer, 'funcs', None),
+                         perk_impl_table=getattr(analyzer, 'perk_impls', None),
+                         const_table=getattr(analyzer, 'constants', None))
+        external_table = getattr(analyzer, 'externals', None)
+        if external_table is not None:
+            cg.external_table = external_table
+        cg.main_expects_args = analyzer.main_expects_args
+        cg.monomorphized_extensions = getattr(analyzer, 'monomorphized_extensions', [])
+        cg.library_linker = self.library_linker
+        cg.library_registry = getattr(analyzer, 'library_registry', None)
+        cg.library_perk_impls = getattr(analyzer, 'library_perk_impls', [])
+        cg.optimizer.pipeline = self.pipeline
+        cg.hashmap_layout = self.hashmap_layout
+        cg.stdout_buffering = self.stdout_buffering
+        return cg
+
+    def run(self, job: CodegenJob, cg: LLVMCodegen) -> bytes:
+        """Compile one job to object bytes (bitcode for an `--lto` unit)."""
+        if job.kind == "unit":
+            unit = next(u for u in self.compilation_order if u.name == job.name)
+            if self.lto:
+                return cg.compile_single_unit_to_bitcode(
+                    unit, self.compilation_order, verify=self.verify,
+                )
+            return cg.compile_single_unit_to_object(
+                unit, self.compilation_order, opt=self.opt, verify=self.verify,
+            )
+        if job.kind == "stdlib":
+            return cg.compile_stdlib_to_object(job.name, opt=self.opt)
+        if job.kind == "lib":
+            return cg.compile_library_to_object(job.name, self.library_linker, opt=self.opt)
+        raise ValueError(f"unknown codegen job kind: {job.kind!r}")
+
+
+# Workers are forked, so they inherit the context (analyzer tables, stamped ASTs) by
+# memory rather than by pickling it; only the job and the object bytes cross the pipe.
+_context: Optional[CodegenContext] = None
+_worker_codegen: Optional[LLVMCodegen] = None
+
+
+def _run_in_worker(job: CodegenJob) -> bytes:
+    global _worker_codegen
+    assert _context is not None, "codegen worker started without a context"
+    if _worker_codegen is None:
+        _worker_codegen = _context.make_codegen()
+    return _context.run(job, _worker_codegen)
+
+
+def _fork_context():
+    """The fork start method, or None where the platform has none (Windows)."""
+    try:
+        return multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+
+
+def run_codegen_jobs(context: CodegenContext, jobs: list[CodegenJob], max_workers: int,
+                     codegen: Optional[LLVMCodegen] = None) -> list[bytes]:
+    """Compile every job and return the object (or bitcode) bytes in job order.
+
+    Serial and parallel builds run the same `CodegenContext.run` per job, and a unit's
+    module depends only on the unit and the whole-program tables -- not on which units
+    the codegen compiled before it -- so the objects are byte-identical either way.
+    """
+    mp_context = _fork_context() if max_workers > 1 and len(jobs) > 1 else None
+    if mp_context is None:
+        cg = codegen or context.make_codegen()
+        return [context.run(job, cg) for job in jobs]
+
+    global _context
+    _context = context
+    try:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs)),
+                                 mp_context=mp_context) as pool:
+            return list(pool.map(_run_in_worker, jobs))
+    finally:
+        _context = None
@@ -9,6 +9,7 @@ from sushi_lang.compiler.loader import (
     get_effective_cwd,
     load_unit_recursively,
 )
+from sushi_lang.internals import timing
 from sushi_lang.internals.diagnostics import StdlibBuildError, SushiError
 from sushi_lang.internals.report import Reporter
 from sushi_lang.semantics.ast import Program
@@ -28,6 +29,22 @@ def _check_library_platform(metadata: dict, lib_path: str) -> None:
         raise LibraryError("CE3504", lib_platform=lib_platform, current_platform=host)
 
 
+def _check_library_hashmap_layout(metadata: dict, lib_path: str, layout: str) -> None:
+    """Reject a `.slib` whose compiled code uses another HashMap layout (CE3507).
+
+    Its functions read and write the consumer's HashMaps directly, so the two sides
+    must agree on the bucket buffer. A library from before the flag is linear.
+    """
+    from sushi_lang.backend.library_errors import LibraryError
+
+    lib_layout = metadata.get("hashmap_layout", "linear")
+    if lib_layout != layout:
+        raise LibraryError(
+            "CE3507", lib=lib_path,
+            reason=f"it was built with --hashmap-layout {lib_layout}, this program "
+                   f"with --hashmap-layout {layout}")
+
+
 def _inject_source_stdlib_units(unit_manager: UnitManager, reporter: Reporter) -> bool:
     """Merge bundled Sushi-source stdlib modules (e.g. <collections/iter>) as units."""
     from sushi_lang.internals.parser import parse_to_ast
@@ -45,8 +62,11 @@ def _inject_source_stdlib_units(unit_manager: UnitManager, reporter: Reporter) -
                     needed.add(use_stmt.path)
         return needed
 
+    # A source module's unit is named `<path>`, which no user unit can be: a program
+    # in bench.sushi is itself the unit `bench` and can still `use <bench>`.
     while True:
-        todo = _needed(list(unit_manager.units.values())) - set(unit_manager.units.keys())
+        todo = {path for path in _needed(list(unit_manager.units.values()))
+                if f"<{path}>" not in unit_manager.units}
         if not todo:
             return True
         for module_path in sorted(todo):
@@ -62,8 +82,8 @@ def _inject_source_stdlib_units(unit_manager: UnitManager, reporter: Reporter) -
             except SushiError as e:
                 e.filename = e.filename or str(src_path)
                 raise
-            unit_manager.units[module_path] = Unit(
-                name=module_path, file_path=src_path, ast=module_ast,
+            unit_manager.units[f"<{module_path}>"] = Unit(
+                name=f"<{module_path}>", file_path=src_path, ast=module_ast,
                 dependencies=[], public_symbols={},
             )
 
@@ -127,7 +147,8 @@ def compile_multi_file(main_ast: Program, src_path: Path, reporter: Reporter,
         # generator source changed, so we never link stale/absent .bc.
         from sushi_lang.backend.stdlib_builder import ensure_stdlib_built
         try:
-            ensure_stdlib_built()
+            with timing.phase("stdlib"):
+                ensure_stdlib_built()
         except SushiError:
             raise
         except Exception as e:
@@ -163,8 +184,10 @@ def compile_multi_file(main_ast: Program, src_path: Path, reporter: Reporter,
         for lib_path in sorted(library_imports):
             try:
                 slib_path = library_linker.resolve_library(lib_path)
-                metadata = LibraryFormat.read_metadata_only(slib_path)
+                metadata = LibraryFormat.load_metadata(slib_path)
                 _check_library_platform(metadata, lib_path)
+                _check_library_hashmap_layout(metadata, lib_path,
+                                              getattr(args, 'hashmap_layout', 'linear'))
                 library_linker.loaded_libraries[metadata["library_name"]] = metadata
 
                 formatted_path = " / ".join(lib_path.split('/'))
@@ -175,9 +198,23 @@ def compile_multi_file(main_ast: Program, src_path: Path, reporter: Reporter,
                 return 2
         print()
 
+    use_incremental = (
+        len(compilation_order) > 1
+        and not is_library
+        and not getattr(args, 'no_incremental', False)
+        and not getattr(args, 'dump_ll', False)
+    )
+
+    # An incremental build also reuses each unit's per-unit semantic analysis.
+    analysis_cache = None
+    if use_incremental:
+        from sushi_lang.compiler.analysis_cache import AnalysisCache
+        analysis_cache = AnalysisCache(_cache_manager(src_path, args))
+
     multi_file_analyzer = SemanticAnalyzer(reporter, filename=main_unit_name,
                                            unit_manager=unit_manager,
-                                           library_linker=library_linker)
+                                           library_linker=library_linker,
+                                           analysis_cache=analysis_cache)
     multi_file_analyzer.check(main_ast)
 
     # A library must not carry main(): --lib used to embed it into the .slib silently,
@@ -205,13 +242,6 @@ def compile_multi_file(main_ast: Program, src_path: Path, reporter: Reporter,
     if reporter.has_errors:
         return 2
 
-    use_incremental = (
-        len(compilation_order) > 1
-        and not is_library
-        and not getattr(args, 'no_incremental', False)
-        and not getattr(args, 'dump_ll', False)
-    )
-
     if use_incremental:
         return _compile_incremental(
             compilation_order, multi_file_analyzer, src_path, reporter, args,
@@ -223,6 +253,15 @@ def compile_multi_file(main_ast: Program, src_path: Path, reporter: Reporter,
     )
 
 
+def _cache_manager(src_path: Path, args):
+    from sushi_lang.compiler.cache import CacheManager
+
+    cache_dir = Path(args.cache_dir) if getattr(args, 'cache_dir', None) else None
+    return CacheManager(src_path.parent, opt_level=args.opt, cache_dir=cache_dir,
+                        pipeline=getattr(args, 'pipeline', 'sushi'),
+                        hashmap_layout=getattr(args, 'hashmap_layout', 'linear'))
+
+
 def _compile_monolithic(compilation_order, analyzer, src_path, reporter, args,
                         is_library, stdlib_units, library_imports, library_linker) -> int:
     """Original single-module compilation path."""
@@ -239,6 +278,9 @@ def _compile_monolithic(compilation_order, analyzer, src_path, reporter, args,
     external_table = getattr(analyzer, 'externals', None)
     if external_table is not None:
         cg.external_table = external_table
+    cg.optimizer.pipeline = getattr(args, 'pipeline', 'sushi')
+    cg.hashmap_layout = getattr(args, 'hashmap_layout', 'linear')
+    cg.stdout_buffering = getattr(args, 'stdout_buffering', 'auto')
 
     effective_cwd = get_effective_cwd()
     if args.out:
@@ -271,9 +313,11 @@ def _compile_monolithic(compilation_order, analyzer, src_path, reporter, args,
                                         debug=bool(args.dump_ll), opt=args.opt,
                                         verify=not args.no_verify,
                                         monomorphized_extensions=monomorphized_extensions,
-                                        exported_private_functions=closure_fn_names)
+                                        exported_private_functions=closure_fn_names,
+                                        keep_ir=bool(args.write_ll))
 
-        manifest_gen.generate(compilation_order, out_path, bitcode, templates=templates)
+        manifest_gen.generate(compilation_order, out_path, bitcode, templates=templates,
+                              hashmap_layout=cg.hashmap_layout)
 
         if args.write_ll:
             try:
@@ -292,7 +336,9 @@ def _compile_monolithic(compilation_order, analyzer, src_path, reporter, args,
                               main_expects_args=analyzer.main_expects_args,
                               monomorphized_extensions=monomorphized_extensions,
                               library_linker=library_linker,
-                              library_registry=analyzer.library_registry)
+                              library_registry=analyzer.library_registry,
+                              lto=bool(getattr(args, 'lto', False)),
+                              keep_ir=bool(args.write_ll))
 
         if args.write_ll:
             try:
@@ -313,13 +359,12 @@ def _compile_incremental(compilation_order, analyzer, src_path, reporter, args,
                          stdlib_units, library_imports, library_linker,
                          unit_manager) -> int:
     """Incremental compilation path: per-unit .o caching."""
-    from sushi_lang.backend.codegen_llvm import LLVMCodegen
-    from sushi_lang.compiler.cache import CacheManager
     from sushi_lang.compiler.fingerprint import (
         compute_unit_fingerprint,
         compute_stdlib_fingerprint,
         compute_lib_fingerprint,
     )
+    from sushi_lang.compiler.parallel import CodegenContext, CodegenJob, run_codegen_jobs
 
     effective_cwd = get_effective_cwd()
     if args.out:
@@ -329,31 +374,26 @@ def _compile_incremental(compilation_order, analyzer, src_path, reporter, args,
     else:
         out_path = effective_cwd / src_path.stem
 
-    cache_dir = Path(args.cache_dir) if getattr(args, 'cache_dir', None) else None
-    cache = CacheManager(src_path.parent, opt_level=args.opt, cache_dir=cache_dir)
-
+    cache = _cache_manager(src_path, args)
     cache.prepare()
 
     monomorphized_extensions = getattr(analyzer, 'monomorphized_extensions', [])
 
-    struct_table = getattr(analyzer, 'structs', None)
-    enum_table = getattr(analyzer, 'enums', None)
-    func_table = getattr(analyzer, 'funcs', None)
-    const_table = getattr(analyzer, 'constants', None)
-    perk_impl_table = getattr(analyzer, 'perk_impls', None)
-    cg = LLVMCodegen(struct_table=struct_table, enum_table=enum_table,
-                     func_table=func_table, perk_impl_table=perk_impl_table,
-                     const_table=const_table)
-    external_table = getattr(analyzer, 'externals', None)
-    if external_table is not None:
-        cg.external_table = external_table
-    cg.main_expects_args = analyzer.main_expects_args
-    cg.monomorphized_extensions = monomorphized_extensions
-    cg.library_linker = library_linker
-    cg.library_registry = getattr(analyzer, 'library_registry', None)
-    cg.library_perk_impls = getattr(analyzer, 'library_perk_impls', [])
+    context = CodegenContext(
+        analyzer=analyzer, compilation_order=compilation_order,
+        library_linker=library_linker, opt=args.opt, verify=not args.no_verify,
+        pipeline=getattr(args, 'pipeline', 'sushi'),
+        lto=bool(getattr(args, 'lto', False)),
+        hashmap_layout=getattr(args, 'hashmap_layout', 'linear'),
+        stdout_buffering=getattr(args, 'stdout_buffering', 'auto'),
+    )
+    cg = context.make_codegen()
+    lto = context.lto
 
-    obj_paths: list[Path] = []
+    # One slot per object to link, in link order. A cache hit fills its slot now; a
+    # miss becomes a CodegenJob and is filled once the jobs have run.
+    obj_paths: list[Path | None] = []
+    jobs: list[tuple[int, CodegenJob]] = []
     rebuilt = []
     cached = []
 
@@ -372,27 +412,31 @@ def _compile_incremental(compilation_order, analyzer, src_path, reporter, args,
             library_fingerprints[lib_path] = compute_lib_fingerprint(slib_path)
 
     for unit in compilation_order:
-        fp = compute_unit_fingerprint(
-            unit, unit_manager, monomorphized_extensions,
-            library_fingerprints=library_fingerprints,
-        )
+        # Only the unit defining main() emits the stdout setup, so only its key carries
+        # the buffering mode: changing the flag must not rebuild every other unit.
+        defines_main = unit.ast is not None and any(
+            func.name == "main" for func in unit.ast.functions)
+        with timing.phase("fingerprint"):
+            fp = compute_unit_fingerprint(
+                unit, unit_manager, monomorphized_extensions,
+                library_fingerprints=library_fingerprints,
+                stdout_buffering=context.stdout_buffering if defines_main else None,
+            )
 
-        if cache.has_cached_unit(unit.name, fp):
-            obj_path = cache.unit_object_path(unit.name, fp)
-            obj_paths.append(obj_path)
+        if lto and cache.has_cached_unit_bitcode(unit.name, fp):
+            obj_paths.append(cache.unit_bitcode_path(unit.name, fp))
+            cached.append(unit.name)
+        elif not lto and cache.has_cached_unit(unit.name, fp):
+            obj_paths.append(cache.unit_object_path(unit.name, fp))
             cached.append(unit.name)
-            print(f"  {unit.name:<30s} [cached]")
         else:
-            obj_bytes = cg.compile_single_unit_to_object(
-                unit, compilation_order,
-                opt=args.opt, verify=not args.no_verify,
-            )
-            obj_path = cache.store_unit_object(unit.name, obj_bytes, fp)
-            obj_paths.append(obj_path)
+            jobs.append((len(obj_paths), CodegenJob("unit", unit.name, fp)))
+            obj_paths.append(None)
             rebuilt.append(unit.name)
-            print(f"  {unit.name:<30s} [rebuilt]")
 
-    for stdlib_unit in sorted(stdlib_units):
+    # Under --lto the stdlib and library bitcode is merged at link time, not cached
+    # as objects: only the units' front half is per-unit work.
+    for stdlib_unit in ([] if lto else sorted(stdlib_units)):
         bc_paths = cg.stdlib._resolve_stdlib_unit(stdlib_unit)
         if not bc_paths:
             # Virtual/source stdlib unit (e.g. collections/hashmap, collections/iter):
@@ -403,11 +447,10 @@ def _compile_incremental(compilation_order, analyzer, src_path, reporter, args,
         if cache.has_cached_stdlib(stdlib_unit, fp):
             obj_paths.append(cache.stdlib_object_path(stdlib_unit, fp))
         else:
-            obj_bytes = cg.compile_stdlib_to_object(stdlib_unit, opt=args.opt)
-            obj_path = cache.store_stdlib_object(stdlib_unit, obj_bytes, fp)
-            obj_paths.append(obj_path)
+            jobs.append((len(obj_paths), CodegenJob("stdlib", stdlib_unit, fp)))
+            obj_paths.append(None)
 
-    if library_linker is not None:
+    if library_linker is not None and not lto:
         for lib_path in sorted(library_imports):
             slib_path = library_linker.resolve_library(lib_path)
             fp = library_fingerprints.get(lib_path) or compute_lib_fingerprint(slib_path)
@@ -415,14 +458,35 @@ def _compile_incremental(compilation_order, analyzer, src_path, reporter, args,
             if cache.has_cached_lib(lib_name, fp):
                 obj_paths.append(cache.lib_object_path(lib_name, fp))
             else:
-                obj_bytes = cg.compile_library_to_object(lib_path, library_linker, opt=args.opt)
-                obj_path = cache.store_lib_object(lib_name, obj_bytes, fp)
-                obj_paths.append(obj_path)
+                jobs.append((len(obj_paths), CodegenJob("lib", lib_path, fp)))
+                obj_paths.append(None)
+
+    objects = run_codegen_jobs(context, [job for _, job in jobs],
+                               max_workers=getattr(args, 'jobs', 1) or 1, codegen=cg)
+    for (slot, job), obj_bytes in zip(jobs, objects, strict=True):
+        if job.kind == "unit" and lto:
+            obj_paths[slot] = cache.store_unit_bitcode(job.name, obj_bytes, job.fingerprint)
+        elif job.kind == "unit":
+            obj_paths[slot] = cache.store_unit_object(job.name, obj_bytes, job.fingerprint)
+        elif job.kind == "stdlib":
+            obj_paths[slot] = cache.store_stdlib_object(job.name, obj_bytes, job.fingerprint)
+        else:
+            obj_paths[slot] = cache.store_lib_object(
+                job.name.replace("/", "_"), obj_bytes, job.fingerprint)
+
+    for unit in compilation_order:
+        status = "rebuilt" if unit.name in rebuilt else "cached"
+        print(f"  {unit.name:<30s} [{status}]")
 
     codegen_time = time.monotonic() - t0
 
     t1 = time.monotonic()
-    cg.link_object_files(obj_paths, out_path, cc="cc", debug=bool(getattr(args, 'dump_ll', False)))
+    if lto:
+        _link_lto(cg, obj_paths, stdlib_units, library_imports, library_linker,
+                  out_path, args)
+    else:
+        cg.link_object_files([p for p in obj_paths if p is not None], out_path, cc="cc",
+                             debug=bool(getattr(args, 'dump_ll', False)))
     link_time = time.monotonic() - t1
 
     total_units = len(compilation_order)
@@ -434,7 +498,7 @@ def _compile_incremental(compilation_order, analyzer, src_path, reporter, args,
         link_desc += f" + {stdlib_count} stdlib"
     if lib_count:
         link_desc += f" + {lib_count} libs"
-    print(f"Linking: {link_desc} in {link_time:.2f}s")
+    print(f"Linking: {link_desc}{' (lto)' if lto else ''} in {link_time:.2f}s")
 
     if args.write_ll:
         print("(note: --write-ll not supported in incremental mode)")
@@ -444,3 +508,21 @@ def _compile_incremental(compilation_order, analyzer, src_path, reporter, args,
     if reporter.has_warnings:
         return 1
     return 0
+
+
+def _link_lto(cg, bitcode_paths, stdlib_units, library_imports, library_linker,
+              out_path: Path, args) -> None:
+    """The `--lto` back half: one whole-program module, optimized, emitted and linked."""
+    obj_bytes = cg.compile_lto_object(
+        [p.read_bytes() for p in bitcode_paths],
+        sorted(stdlib_units), sorted(library_imports), library_linker,
+        opt=args.opt, verify=not args.no_verify,
+    )
+    obj_path = out_path.with_suffix(".o")
+    obj_path.write_bytes(obj_bytes)
+    try:
+        cg.link_object_files([obj_path], out_path, cc="cc",
+                             debug=bool(getattr(args, 'dump_ll', False)))
+    finally:
+        if not args.keep_object:
+            obj_path.unlink(missing_ok=True)
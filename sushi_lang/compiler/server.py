@@ -0,0 +1,436 @@
+"""`sushic --server`: a warm compiler that `sushic` forwards its command lines to.
+
+A one-shot `sushic` pays for Python startup, importing the compiler, building the
+parser, loading the stdlib registry, initializing LLVM and hashing the compiler's own
+sources before it reads a line of the program. The server pays that once. It listens
+on a Unix socket and FORKS a child per request, so each compile starts from the warm
+state and every piece of per-compile global state (the active generics, the unit
+caches, the timing collector) dies with the child. Nothing has to remember to reset it.
+
+The client is `sushic` itself. With `SUSHI_SERVER` set (to the socket path, or to `1`
+for the default path) it sends the server its arguments, working directory and
+environment, plus its stdin, stdout and stderr as file descriptors (`SCM_RIGHTS`). The
+child compiles with those descriptors as its own, so diagnostics, colours and the exit
+status are exactly those of a local compile. When no server answers, or the server
+declines the request, the client compiles in-process; a stale or missing server never
+changes a result. Nor does someone else's: the client only connects to a socket that
+it owns and that no other user could have put in its place.
+
+The protocol is one JSON line each way, then one more from the server:
+
+    client -> {"argv": [...], "cwd": "...", "env": {...}}   + fds 0, 1, 2
+    server -> {"pid": N}          the child that compiles it
+    server -> {"exit": rc}        once the child has flushed its output
+
+This module imports only the standard library at the top, so forwarding costs the
+client no compiler import.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SERVER_ENV = "SUSHI_SERVER"
+
+# Requests are a few KB (the environment dominates); the cap only bounds a bad client.
+_MAX_REQUEST = 1 << 20
+
+# How often an idle server wakes to reap finished children.
+_REAP_INTERVAL = 1.0
+
+# How long a client has to send its request. One accept thread serves everyone, so a
+# client that connects and then stalls must not hold it.
+_RECEIVE_TIMEOUT = 5.0
+
+
+def default_socket_path() -> Path:
+    """Per-user socket: under `$XDG_RUNTIME_DIR` when set, else in a 0700 directory of
+    the user's own under the temp directory (never loose in a shared /tmp)."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime) / f"sushic-{os.getuid()}.sock"
+    return Path(tempfile.gettempdir()) / f"sushic-{os.getuid()}" / "sushic.sock"
+
+
+def socket_path_from_env() -> Optional[Path]:
+    """The socket `SUSHI_SERVER` names, or None when forwarding is off."""
+    value = os.environ.get(SERVER_ENV, "")
+    if value.lower() in ("", "0", "off"):
+        return None
+    if value.lower() in ("1", "on"):
+        return default_socket_path()
+    return Path(value)
+
+
+def _private_dir(path: Path) -> bool:
+    """Can only this user (or root) put a socket in `path`?"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(st.st_mode) and st.st_uid in (0, os.getuid())
+            and not stat.S_IMODE(st.st_mode) & 0o022)
+
+
+def _trusted_socket(path: Path) -> bool:
+    """Is `path` this user's socket, reachable by this user alone?
+
+    The client hands the server its environment and its standard streams, so it only
+    talks to a socket another user could neither have planted nor swapped.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return (stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+            and not stat.S_IMODE(st.st_mode) & 0o077 and _private_dir(path.parent))
+
+
+# --------------------------------------------------------------------------- #
+# Client
+# --------------------------------------------------------------------------- #
+
+def forward(argv: Optional[List[str]] = None) -> Optional[int]:
+    """Compile on the server `SUSHI_SERVER` names and return the exit status.
+
+    None means "compile here": forwarding is off, no server is listening, the command
+    line starts a server itself, or the server declined the request.
+    """
+    path = socket_path_from_env()
+    if path is None or not hasattr(socket, "AF_UNIX"):
+        return None
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if "--server" in argv or not _trusted_socket(path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+
+    with sock, _standard_fds() as fds:
+        request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            socket.send_fds(sock, [json.dumps(request).encode("utf-8") + b"\n"], fds)
+        except OSError:
+            return None
+        reader = sock.makefile("rb")
+        started = _read_message(reader)
+        if started is None:
+            return None
+        return _await_exit(reader, started["pid"])
+
+
+def _await_exit(reader, pid: int) -> int:
+    """Wait for the child's exit status, passing a Ctrl-C on to it."""
+    while True:
+        try:
+            done = _read_message(reader)
+        except KeyboardInterrupt:
+            # The terminal interrupted this process, not the child compiling for it.
+            try:
+                os.kill(pid, signal.SIGINT)
+            except OSError:
+                return 130
+            continue
+        if done is None:
+            print("error: the compile server dropped the request", file=sys.stderr)
+            return 2
+        return int(done["exit"])
+
+
+class _standard_fds:
+    """Descriptors 0, 1 and 2, with /dev/null standing in for any that is closed."""
+
+    def __enter__(self) -> List[int]:
+        self._opened: List[int] = []
+        fds = []
+        for fd, mode in ((0, os.O_RDONLY), (1, os.O_WRONLY), (2, os.O_WRONLY)):
+            try:
+                os.fstat(fd)
+                fds.append(fd)
+            except OSError:
+                null = os.open(os.devnull, mode)
+                self._opened.append(null)
+                fds.append(null)
+        return fds
+
+    def __exit__(self, *exc) -> None:
+        for fd in self._opened:
+            os.close(fd)
+
+
+def _read_message(reader) -> Optional[Dict[str, Any]]:
+    """One JSON line, or None if the peer closed first."""
+    line = reader.readline(_MAX_REQUEST)
+    if not line.endswith(b"\n"):
+        return None
+    return json.loads(line)
+
+
+# --------------------------------------------------------------------------- #
+# Server
+# --------------------------------------------------------------------------- #
+
+def serve(path: Path) -> int:
+    """Warm up, then compile every request on `path` until interrupted."""
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"):
+        print("error: --server needs Unix sockets and fork()", file=sys.stderr)
+        return 2
+    if _is_listening(path):
+        print(f"error: a compile server is already listening on {path}", file=sys.stderr)
+        return 2
+
+    if path == default_socket_path():
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+    if not _private_dir(path.parent):
+        # Clients refuse a socket that other users could replace.
+        print(f"error: other users can write to {path.parent}; "
+              "put the socket in a private directory", file=sys.stderr)
+        return 2
+
+    _warm_up()
+    stamp = _source_stamp()
+
+    path.unlink(missing_ok=True)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)         # the socket is the owner's alone
+    try:
+        listener.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    listener.listen(64)
+    listener.settimeout(_REAP_INTERVAL)
+
+    signal.signal(signal.SIGTERM, _interrupt)
+    print(f"sushic: compile server listening on {path}")
+    print(f"sushic: export {SERVER_ENV}={path}")
+    sys.stdout.flush()
+
+    restart = False
+    try:
+        while True:
+            _reap_children()
+            try:
+                conn, _addr = listener.accept()
+            except socket.timeout:
+                continue
+            with conn:
+                conn.settimeout(_RECEIVE_TIMEOUT)
+                request, fds = _receive(conn)
+                try:
+                    if request is None:
+                        continue
+                    conn.settimeout(None)
+                    if _source_stamp() != stamp:
+                        # The compiler changed under the server. Decline (the client
+                        # compiles locally) and come back up on the new sources.
+                        restart = True
+                        break
+                    _fork_compile(conn, listener, request, fds)
+                finally:
+                    for fd in fds:
+                        os.close(fd)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        path.unlink(missing_ok=True)
+
+    if restart:
+        print("sushic: compiler sources changed; restarting the compile server")
+        sys.stdout.flush()
+        os.execv(sys.executable, sys.orig_argv)
+    return 0
+
+
+def _interrupt(_signum, _frame) -> None:
+    raise KeyboardInterrupt
+
+
+def _is_listening(path: Path) -> bool:
+    """Does a live server already own `path`? A leftover socket file does not count."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def _warm_up() -> None:
+    """Everything a compile pays before it reads the program, paid once."""
+    import sushi_lang.backend.codegen_llvm  # noqa: F401
+    import sushi_lang.semantics.semantic_analyzer  # noqa: F401
+    from sushi_lang.backend.llvm_optimization import warm_native_target
+    from sushi_lang.compiler import cli, pipeline  # noqa: F401
+    from sushi_lang.compiler.fingerprint import (
+        compute_compiler_source_fingerprint,
+        compute_stdlib_source_fingerprint,
+    )
+    from sushi_lang.internals.parser import parse_to_ast
+    from sushi_lang.semantics.stdlib_registry import get_stdlib_registry
+
+    # Parsing has no side effect beyond the parser cache, and it pulls in every module
+    # the AST builder imports lazily.
+    parse_to_ast(_WARM_UP_SOURCE)
+    get_stdlib_registry()
+    warm_native_target()
+    # Both are memoized for the process; a request only runs while `_source_stamp`
+    # still matches, so the memo can never describe other sources than the loaded ones.
+    compute_compiler_source_fingerprint()
+    compute_stdlib_source_fingerprint()
+
+
+_WARM_UP_SOURCE = """\
+struct Pair:
+    i32 a
+    string b
+
+fn main() i32:
+    let Pair p = Pair(1, "x")
+    foreach(c in p.b.bytes()):
+        println("{c} {p.a}")
+    return Result.Ok(0)
+"""
+
+
+def _source_stamp() -> Tuple[Tuple[str, int, int], ...]:
+    """(path, size, mtime) of every compiler source: the code the server has loaded."""
+    root = Path(__file__).resolve().parent.parent
+    stamp = []
+    for source in sorted(root.rglob("*.py")):
+        try:
+            st = source.stat()
+        except OSError:
+            continue
+        stamp.append((str(source), st.st_size, st.st_mtime_ns))
+    return tuple(stamp)
+
+
+def _receive(conn: socket.socket) -> Tuple[Optional[Dict[str, Any]], List[int]]:
+    """Read one request and the descriptors sent with it.
+
+    A client that stalls past `_RECEIVE_TIMEOUT` is declined like a malformed request.
+    """
+    try:
+        data, fds, _flags, _addr = socket.recv_fds(conn, 1 << 16, 3)
+    except OSError:
+        return None, []
+    try:
+        while data and not data.endswith(b"\n") and len(data) < _MAX_REQUEST:
+            chunk = conn.recv(1 << 16)
+            if not chunk:
+                break
+            data += chunk
+    except OSError:
+        return None, fds
+    if len(fds) != 3:
+        return None, fds
+    try:
+        return json.loads(data), fds
+    except ValueError:
+        return None, fds
+
+
+def _reap_children() -> None:
+    """Collect finished children so none lingers as a zombie."""
+    while True:
+        try:
+            pid, _status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def _fork_compile(conn: socket.socket, listener: socket.socket,
+                  request: Dict[str, Any], fds: List[int]) -> None:
+    """Compile `request` in a forked child; the server goes straight back to accepting."""
+    pid = os.fork()
+    if pid != 0:
+        return
+    # The child. It never returns into the server loop, whatever happens.
+    rc = 2
+    try:
+        listener.close()
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        _send(conn, {"pid": os.getpid()})
+        rc = _compile(request, fds)
+    except KeyboardInterrupt:
+        rc = 130
+    except BaseException:
+        # An internal error: report it on the client's stderr, as a local compile would.
+        _report_crash(fds)
+    finally:
+        try:
+            _send(conn, {"exit": rc})
+        finally:
+            os._exit(0)
+
+
+def _report_crash(fds: List[int]) -> None:
+    """Write the exception being handled to the client's stderr.
+
+    `main` reports a compiler crash itself; this is for a failure around it (a bad
+    request, a missing working directory), which would otherwise leave the client
+    with a bare exit status.
+    """
+    report = "error: the compile server failed\n" + traceback.format_exc()
+    try:
+        os.write(fds[2] if len(fds) > 2 else 2, report.encode("utf-8", "replace"))
+    except OSError:
+        pass
+
+
+def _send(conn: socket.socket, message: Dict[str, Any]) -> None:
+    conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _compile(request: Dict[str, Any], fds: List[int]) -> int:
+    """Become the client's process for one compile: its fds, cwd and environment."""
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+    sys.stdin = _text_stream(0, "r")
+    sys.stdout = _text_stream(1, "w")
+    sys.stderr = _text_stream(2, "w")
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+
+    from sushi_lang.compiler.cli import main
+    try:
+        rc = main(request["argv"])
+    except SystemExit as exit_:
+        # argparse reports a bad command line by exiting.
+        code = exit_.code
+        rc = code if isinstance(code, int) else (0 if code is None else 1)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return rc
+
+
+def _text_stream(fd: int, mode: str) -> io.TextIOWrapper:
+    """A fresh text stream over `fd`, buffered the way the interpreter would at startup."""
+    interactive = os.isatty(fd)
+    raw = io.FileIO(fd, mode, closefd=False)
+    if mode == "r":
+        return io.TextIOWrapper(io.BufferedReader(raw), encoding="utf-8")
+    return io.TextIOWrapper(io.BufferedWriter(raw), encoding="utf-8",
+                            line_buffering=interactive, write_through=fd == 2)
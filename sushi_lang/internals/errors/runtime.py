@@ -35,3 +35,17 @@ _add(ErrorMessage("RE2023", Severity.ERROR,
     "no match arm matched the value (expected {pattern})",
     Category.RUNTIME, "A nested pattern reached the end of its arms without matching. "
     "Exhaustiveness checking should make this unreachable."))
+
+# Whole-file loads
+_add(ErrorMessage("RE2024", Severity.ERROR,
+    "file too large to load as a string (over 2 GiB)",
+    Category.RUNTIME, "file.read() or file.mmap() met a file whose contents do not fit a "
+    "string's 32-bit size. Read it in pieces with read_bytes() or lines() instead."))
+
+# HashMap iteration
+_add(ErrorMessage("RE2025", Severity.ERROR,
+    "HashMap too large to iterate (over 2^29 buckets)",
+    Category.RUNTIME, "keys(), values() and entries() hand the table to an iterator whose "
+    "32-bit length also carries the HashMap marker bits, so it walks at most 2^29 buckets. "
+    "A larger map still supports get(), insert() and remove(); iterating it would skip "
+    "entries, so it traps instead."))
@@ -1,15 +1,20 @@
 """Lark parser setup and AST construction."""
 from __future__ import annotations
 
+import hashlib
+import os
 from pathlib import Path
 
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
+import lark
 from lark import Lark, UnexpectedInput
 from lark.exceptions import LarkError
 
+from sushi_lang.internals import timing
 from sushi_lang.internals.diagnostics import SushiError
 from sushi_lang.internals.parse_errors import lark_to_diagnostic
+from sushi_lang.internals import indenter
 from sushi_lang.internals.indenter import LangIndenter
 from sushi_lang.semantics.ast_builder import ASTBuilder
 
@@ -19,6 +24,74 @@ GRAMMAR_PATH = Path(__file__).parent.parent / "grammar.lark"
 # closes on a real `)`, so there is no `>>` ambiguity and no generic-type
 # postlexer to chain in front of it.
 
+_LARK_OPTIONS: dict[str, Any] = dict(
+    parser="lalr",
+    propagate_positions=True,
+    maybe_placeholders=False,
+    lexer="basic",
+)
+
+# One parser per start symbol per process. Building the LALR automaton for the
+# full grammar is the single largest fixed cost of a compile, and it used to be
+# paid once per parse_to_ast call: every file, every bundled source-stdlib
+# module, every library template record.
+_parsers: dict[str, Lark] = {}
+
+
+def _parser_cache_dir() -> Optional[Path]:
+    """Where serialized parser tables live. None disables the on-disk cache.
+
+    SUSHI_PARSER_CACHE=off (or 0) disables it; any other value is the directory.
+    """
+    override = os.environ.get("SUSHI_PARSER_CACHE")
+    if override is not None:
+        if override.lower() in ("", "0", "off"):
+            return None
+        return Path(override)
+    return Path.home() / ".sushi" / "cache" / "parser"
+
+
+def parser_cache_path(start: str = "start") -> Optional[Path]:
+    """Serialized-table path for `start`.
+
+    The name digests everything the tables depend on: the grammar, the Lark options and
+    the indenter (Lark leaves the postlexer out of its own cache check), plus the lark
+    version.
+    """
+    cache_dir = _parser_cache_dir()
+    if cache_dir is None:
+        return None
+    hasher = hashlib.sha256(GRAMMAR_PATH.read_bytes())
+    hasher.update(repr(sorted(_LARK_OPTIONS.items())).encode())
+    hasher.update(Path(indenter.__file__).read_bytes())
+    digest = hasher.hexdigest()[:16]
+    return cache_dir / f"grammar-{start}-{digest}-lark{lark.__version__}.pickle"
+
+
+def get_parser(start: str = "start") -> Lark:
+    """The process-wide LALR parser for `start`, loaded from disk when possible."""
+    parser = _parsers.get(start)
+    if parser is not None:
+        return parser
+
+    # Lark's own `cache=` loads the tables when the file is current, and otherwise
+    # builds them and rewrites it. A truncated or foreign file is a miss, and a
+    # read-only home just means no file is written.
+    cache: Union[bool, str] = False
+    cache_path = parser_cache_path(start)
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache = str(cache_path)
+        except OSError:
+            pass
+    # Lark.open raises GrammarError if grammar.lark itself is broken -- an ICE.
+    parser = Lark.open(str(GRAMMAR_PATH), start=start, postlex=LangIndenter(),
+                       cache=cache, **_LARK_OPTIONS)
+
+    _parsers[start] = parser
+    return parser
+
 
 def parse_error_hint(e: UnexpectedInput) -> Optional[str]:
     """Advice for a parse failure the grammar cannot phrase itself. None if none applies."""
@@ -36,17 +109,11 @@ def parse_error_hint(e: UnexpectedInput) -> Optional[str]:
 
 def parse_to_ast(src: str, dump_parse: bool = False):
     """Parse source code into an AST."""
-    kwargs: dict[str, Any] = dict(
-        parser="lalr",
-        propagate_positions=True,
-        maybe_placeholders=False,
-        postlex=LangIndenter(),
-        lexer="basic",
-    )
+    with timing.phase("parser-init"):
+        parser = get_parser()
     try:
-        # Lark.open raises GrammarError if grammar.lark itself is broken -- an ICE.
-        parser = Lark.open(str(GRAMMAR_PATH), **kwargs)
-        tree = parser.parse(src)
+        with timing.phase("parse"):
+            tree = parser.parse(src)
     except SushiError:
         raise
     except LarkError as e:
@@ -56,5 +123,6 @@ def parse_to_ast(src: str, dump_parse: bool = False):
     if dump_parse:
         print(tree.pretty())
 
-    ast_builder = ASTBuilder()
-    return ast_builder.build(tree), tree
+    with timing.phase("ast"):
+        ast = ASTBuilder().build(tree)
+    return ast, tree
@@ -0,0 +1,143 @@
+"""Per-phase compile timings and counters, for `sushic --timing-json`.
+
+There is ONE collector per process, and it is off unless the CLI turns it on. Off, a
+`phase()` is a `nullcontext` and `lap()` / `count()` return at once, so the hooks can
+stay in the pipeline permanently.
+
+Time is EXCLUSIVE: a phase that opens inside another (a library template parsed during
+`libraries`) is charged to itself and taken out of the enclosing one, so the phases of a
+report add up to the compile and never double count. Two ways to charge time:
+
+- `with phase("optimize"):` around a call, for work with a clear extent;
+- `lap("typecheck")` at the END of a stretch of straight-line code, which charges the
+  time since the previous lap. It lets `SemanticAnalyzer.check` name each pass with one
+  line instead of re-indenting it. `lap()` with no name restarts the stopwatch.
+
+A phase that runs in a `-j N` worker process is not seen here; its time lands in
+whatever phase was waiting for the worker.
+"""
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Bumped on an incompatible change to the report's shape.
+REPORT_VERSION = 1
+
+
+class TimingCollector:
+    """Accumulates exclusive seconds per named phase, and integer counters."""
+
+    def __init__(self, started: Optional[float] = None) -> None:
+        """Start the clock at `started` (a `perf_counter()` reading), or now."""
+        self.started = time.perf_counter() if started is None else started
+        self.phases: Dict[str, List[float]] = {}    # name -> [seconds, calls]
+        self.counters: Dict[str, int] = {}
+        # One [start, nested seconds] frame per open phase.
+        self._stack: List[List[float]] = []
+        self._lap_start = self.started
+        self._lap_nested = 0.0
+
+    def add(self, name: str, seconds: float) -> None:
+        """Charge `seconds` to `name`."""
+        entry = self.phases.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Charge the block's time, minus any phase nested in it, to `name`."""
+        frame = [time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            self.add(name, elapsed - frame[1])
+            if self._stack:
+                self._stack[-1][1] += elapsed
+            else:
+                self._lap_nested += elapsed
+
+    def lap(self, name: Optional[str] = None) -> None:
+        """Charge the time since the previous lap to `name`, minus the phases inside it."""
+        now = time.perf_counter()
+        if name is not None:
+            self.add(name, now - self._lap_start - self._lap_nested)
+        self._lap_start = now
+        self._lap_nested = 0.0
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add `n` to counter `name`."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self, **fields: Any) -> Dict[str, Any]:
+        """The JSON-ready report: `fields`, the phases in first-run order, the counters."""
+        total = time.perf_counter() - self.started
+        charged = sum(seconds for seconds, _calls in self.phases.values())
+        return {
+            "version": REPORT_VERSION,
+            **fields,
+            "total_ms": round(total * 1000.0, 3),
+            "phases": [
+                {"name": name, "duration_ms": round(seconds * 1000.0, 3), "calls": calls}
+                for name, (seconds, calls) in self.phases.items()
+            ],
+            # Interpreter startup before main() and whatever no phase names.
+            "unaccounted_ms": round(max(0.0, total - charged) * 1000.0, 3),
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+_collector: Optional[TimingCollector] = None
+
+
+def enable(started: Optional[float] = None) -> TimingCollector:
+    """Turn collection on with a fresh collector, and return it."""
+    global _collector
+    _collector = TimingCollector(started)
+    return _collector
+
+
+def disable() -> Optional[TimingCollector]:
+    """Turn collection off; returns the collector that was active, if any."""
+    global _collector
+    collector, _collector = _collector, None
+    return collector
+
+
+def enabled() -> bool:
+    """Is a collector active? Guards a counter that is costly to compute."""
+    return _collector is not None
+
+
+def phase(name: str):
+    """`TimingCollector.phase` on the active collector; a no-op context when off."""
+    if _collector is None:
+        return nullcontext()
+    return _collector.phase(name)
+
+
+def lap(name: Optional[str] = None) -> None:
+    """`TimingCollector.lap` on the active collector."""
+    if _collector is not None:
+        _collector.lap(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """`TimingCollector.count` on the active collector."""
+    if _collector is not None:
+        _collector.count(name, n)
+
+
+def write_report(collector: TimingCollector, destination: str, **fields: Any) -> None:
+    """Write the report as JSON to the path `destination`, or to stdout for "-"."""
+    text = json.dumps(collector.report(**fields), indent=2) + "\n"
+    if destination == "-":
+        print(text, end="")
+    else:
+        Path(destination).write_text(text, encoding="utf-8")
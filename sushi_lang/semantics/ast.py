@@ -219,6 +219,9 @@ class Let(Stmt):
     value: "Expr"
     name_span: Optional[Span] = None
     type_span: Optional[Span] = None
+    # Set by the lift pass when the binding is a function value that is only ever
+    # called: the function it holds, so the backend calls it directly.
+    known_callee: Optional[str] = None
 
 @dataclass
 class Rebind(Stmt):
@@ -422,6 +425,10 @@ class Lambda(Node):
     resolved_type: Optional[Type] = None
     expected_type: Optional[Type] = None
     env_struct: Optional[Type] = None
+    # Set by the lift pass when the value cannot outlive the statement that builds it
+    # (a borrowed call argument, or a binding that is only called): its environment
+    # may live on the stack.
+    non_escaping: bool = False
 
 
 @dataclass
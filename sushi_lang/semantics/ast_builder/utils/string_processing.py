@@ -1,7 +1,6 @@
 """String processing utilities for handling escape sequences and interpolation."""
 from __future__ import annotations
-from typing import List, Optional, Tuple, Union, TYPE_CHECKING
-from pathlib import Path
+from typing import List, Tuple, Union, TYPE_CHECKING
 from lark import Lark, Token
 
 if TYPE_CHECKING:
@@ -112,25 +111,10 @@ def parse_interpolated_string(raw_string: str, span: 'Span') -> Tuple[List[Union
     return parts, expr_spans
 
 
-_interpolation_parser: Optional[Lark] = None
-
-
 def get_interpolation_parser() -> Lark:
-    """Get or create a Lark parser for parsing interpolation expressions."""
-    global _interpolation_parser
-    if _interpolation_parser is None:
-        grammar_path = Path(__file__).parent.parent.parent.parent / "grammar.lark"
-        from sushi_lang.internals.indenter import LangIndenter
-        _interpolation_parser = Lark.open(
-            str(grammar_path),
-            start='expr',
-            parser='lalr',
-            propagate_positions=True,
-            maybe_placeholders=False,
-            postlex=LangIndenter(),
-            lexer='basic'
-        )
-    return _interpolation_parser
+    """The shared Lark parser for interpolation expressions (start symbol `expr`)."""
+    from sushi_lang.internals.parser import get_parser
+    return get_parser(start="expr")
 
 
 def apply_location_offset(node: object, base_span: 'Span', visited: set = None) -> None:
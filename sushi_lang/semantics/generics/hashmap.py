@@ -18,8 +18,8 @@ if TYPE_CHECKING:
 def is_builtin_hashmap_method(method_name: str) -> bool:
     """Check if a method name is a builtin HashMap<K, V> method."""
     return method_name in (
-        "new", "insert", "get", "contains_key", "remove",
-        "len", "is_empty", "tombstone_count", "rehash", "free", "destroy", "debug",
+        "new", "with_capacity", "insert", "get", "contains_key", "remove",
+        "len", "is_empty", "tombstone_count", "reserve", "rehash", "free", "destroy", "debug",
         "keys", "values", "entries", "clone"
     )
 
@@ -33,7 +33,7 @@ def validate_hashmap_method_with_validator(
     """Validate HashMap<K, V> method calls."""
     method = call.method
 
-    if method == "new":
+    if method in ("new", "with_capacity"):
         _validate_hashmap_new(call, hashmap_type, reporter, validator)
     elif method == "insert":
         _validate_hashmap_insert(call, hashmap_type, reporter, validator)
@@ -49,6 +49,8 @@ def validate_hashmap_method_with_validator(
         _validate_hashmap_is_empty(call, hashmap_type, reporter)
     elif method == "tombstone_count":
         _validate_hashmap_tombstone_count(call, hashmap_type, reporter)
+    elif method == "reserve":
+        _validate_hashmap_reserve(call, hashmap_type, reporter, validator)
     elif method == "rehash":
         _validate_hashmap_rehash(call, hashmap_type, reporter)
     elif method == "free":
@@ -112,8 +114,10 @@ def _validate_hashmap_new(
     reporter: Any,
     validator: Any
 ) -> None:
-    """Validate HashMap<K, V>.new() method call."""
-    if len(call.args) != 0:
+    """Validate HashMap<K, V>.new() and HashMap<K, V>.with_capacity(n) calls."""
+    if call.method == "with_capacity":
+        _validate_entry_count_arg(call, reporter, validator)
+    elif len(call.args) != 0:
         er.emit(reporter, er.ERR.CE2016, call.loc, method="new", expected=0, got=len(call.args))
 
     key_type, _ = parse_hashmap_types(hashmap_type, validator)
@@ -340,6 +344,30 @@ def _validate_hashmap_tombstone_count(
         er.emit(reporter, er.ERR.CE2016, call.loc, method="tombstone_count", expected=0, got=len(call.args))
 
 
+def _validate_hashmap_reserve(
+    call: MethodCall,
+    hashmap_type: StructType,
+    reporter: Any,
+    validator: Any
+) -> None:
+    """Validate HashMap<K, V>.reserve(n) method call."""
+    _validate_entry_count_arg(call, reporter, validator)
+
+
+def _validate_entry_count_arg(call: MethodCall, reporter: Any, validator: Any) -> None:
+    """`with_capacity(n)` and `reserve(n)` take one integer: a number of entries."""
+    if len(call.args) != 1:
+        er.emit(reporter, er.ERR.CE2016, call.loc, method=call.method, expected=1, got=len(call.args))
+        return
+
+    from sushi_lang.semantics.type_predicates import is_integer_type
+    validator.validate_expression(call.args[0])
+    arg_type = validator.infer_expression_type(call.args[0])
+    if arg_type is not None and not is_integer_type(arg_type):
+        er.emit(reporter, er.ERR.CE2006, call.args[0].loc,
+                index=1, expected="integer type", got=display_type(arg_type))
+
+
 def _validate_hashmap_rehash(
     call: MethodCall,
     hashmap_type: StructType,
@@ -420,9 +448,9 @@ def hashmap_generic_struct() -> 'GenericStructType':
         type_params=(TypeParameter(name="K"), TypeParameter(name="V")),
         fields=(
             ("buckets", DynamicArrayType(base_type=BuiltinType.I32)),
-            ("size", BuiltinType.I32),
-            ("capacity", BuiltinType.I32),
-            ("tombstones", BuiltinType.I32),
+            ("size", BuiltinType.I64),
+            ("capacity", BuiltinType.I64),
+            ("tombstones", BuiltinType.I64),
         ),
     )
 
@@ -164,7 +164,7 @@ class ExpressionScanner:
             if env_error:
                 self.instantiations.add(("Result", (BuiltinType.I32, env_error)))
             return
-        elif function_name == 'getenv':
+        elif function_name in {'getenv', 'next_line'}:
             self.instantiations.add(("Maybe", (BuiltinType.STRING,)))
             return
         elif function_name == 'file_size':
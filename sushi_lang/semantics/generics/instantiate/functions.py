@@ -224,6 +224,15 @@ class FunctionCollector:
         elif isinstance(ty, DynamicArrayType):
             self._collect_from_type(ty.base_type)
 
+        # `fn() -> Maybe@(i32)` may be the only place a program names Maybe<i32>.
+        from sushi_lang.semantics.typesys import FunctionType
+        if isinstance(ty, FunctionType):
+            for param_type in ty.param_types:
+                self._collect_from_type(param_type)
+            self._collect_from_type(ty.ok_type)
+            if ty.err_type is not None:
+                self._collect_from_type(ty.err_type)
+
         from sushi_lang.semantics.typesys import StructType
         if isinstance(ty, StructType):
             type_key = f"struct:{ty.name}"
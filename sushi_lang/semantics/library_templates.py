@@ -1,11 +1,24 @@
-"""Serialization codec for public generic templates shipped in .slib files."""
+"""Serialization codec for public generic templates shipped in .slib files.
+
+Every record carries its declaration's source slice. Since manifest version 5 the
+templates block also carries an `"ast"` section holding each slice already parsed, and a
+record names its tree by index (`record["ast"]`), so a consumer rebuilds the declaration
+without running the parser. A record without a tree, or a section this compiler cannot
+honour, is re-parsed from `"source"` as before.
+"""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+import dataclasses
+import enum
+import importlib
+import zlib
+from typing import TYPE_CHECKING, Any, List, Optional
+
+import msgpack
 
 if TYPE_CHECKING:
     from sushi_lang.semantics.ast import (
-        FuncDef, PerkDef, StructDef, EnumDef, ExtendWithDef,
+        FuncDef, PerkDef, StructDef, EnumDef, ExtendWithDef, Program,
     )
 
 
@@ -93,11 +106,10 @@ def serialize_generic_function(func: "FuncDef", source_text: str) -> dict:
     }
 
 
-def deserialize_generic_function(record: dict) -> "FuncDef":
-    """Reconstruct a ``FuncDef`` from a manifest record by re-parsing its source."""
-    from sushi_lang.internals.parser import parse_to_ast
-
-    program, _tree = parse_to_ast(record["source"])
+def deserialize_generic_function(record: dict,
+                                 decoder: Optional["TemplateASTDecoder"] = None) -> "FuncDef":
+    """Reconstruct a ``FuncDef`` from a manifest record (its AST, or its re-parsed source)."""
+    program = template_program(record, decoder)
 
     funcs = program.functions or []
     if len(funcs) != 1:
@@ -120,11 +132,10 @@ def serialize_generic_struct(struct: "StructDef", source_text: str) -> dict:
     }
 
 
-def deserialize_generic_struct(record: dict) -> "StructDef":
-    """Reconstruct a ``StructDef`` from a manifest record by re-parsing source."""
-    from sushi_lang.internals.parser import parse_to_ast
-
-    program, _tree = parse_to_ast(record["source"])
+def deserialize_generic_struct(record: dict,
+                               decoder: Optional["TemplateASTDecoder"] = None) -> "StructDef":
+    """Reconstruct a ``StructDef`` from a manifest record (its AST, or its re-parsed source)."""
+    program = template_program(record, decoder)
 
     structs = program.structs or []
     if len(structs) != 1:
@@ -147,11 +158,10 @@ def serialize_generic_enum(enum: "EnumDef", source_text: str) -> dict:
     }
 
 
-def deserialize_generic_enum(record: dict) -> "EnumDef":
-    """Reconstruct an ``EnumDef`` from a manifest record by re-parsing source."""
-    from sushi_lang.internals.parser import parse_to_ast
-
-    program, _tree = parse_to_ast(record["source"])
+def deserialize_generic_enum(record: dict,
+                             decoder: Optional["TemplateASTDecoder"] = None) -> "EnumDef":
+    """Reconstruct an ``EnumDef`` from a manifest record (its AST, or its re-parsed source)."""
+    program = template_program(record, decoder)
 
     enums = program.enums or []
     if len(enums) != 1:
@@ -186,11 +196,10 @@ def serialize_perk_impl(impl: "ExtendWithDef", source_text: str) -> dict:
     }
 
 
-def deserialize_perk_impl(record: dict) -> "ExtendWithDef":
-    """Reconstruct an ``ExtendWithDef`` from a manifest record by re-parsing."""
-    from sushi_lang.internals.parser import parse_to_ast
-
-    program, _tree = parse_to_ast(record["source"])
+def deserialize_perk_impl(record: dict,
+                          decoder: Optional["TemplateASTDecoder"] = None) -> "ExtendWithDef":
+    """Reconstruct an ``ExtendWithDef`` from a manifest record (its AST, or its re-parsed source)."""
+    program = template_program(record, decoder)
 
     impls = program.perk_impls or []
     if len(impls) != 1:
@@ -209,11 +218,10 @@ def serialize_perk(perk: "PerkDef", source_text: str) -> dict:
     }
 
 
-def deserialize_perk(record: dict) -> "PerkDef":
-    """Reconstruct a ``PerkDef`` from a manifest record by re-parsing its source."""
-    from sushi_lang.internals.parser import parse_to_ast
-
-    program, _tree = parse_to_ast(record["source"])
+def deserialize_perk(record: dict,
+                     decoder: Optional["TemplateASTDecoder"] = None) -> "PerkDef":
+    """Reconstruct a ``PerkDef`` from a manifest record (its AST, or its re-parsed source)."""
+    program = template_program(record, decoder)
 
     perks = program.perks or []
     if len(perks) != 1:
@@ -222,3 +230,191 @@ def deserialize_perk(record: dict) -> "PerkDef":
             f"{len(perks)} perks, expected exactly 1"
         )
     return perks[0]
+
+
+# --- Pre-parsed template ASTs ------------------------------------------------------
+
+# Bump when the encoding below changes shape. A change to the AST classes themselves needs
+# no bump: the section names every class and attribute its trees use, and a consumer whose
+# classes no longer match falls back to the source.
+AST_CODEC_VERSION = 1
+
+# The only modules whose classes an encoded AST may name. A .slib is a distributed file,
+# so decoding instantiates nothing outside them (and unlike pickle, runs no code).
+_AST_MODULES = {
+    "ast": "sushi_lang.semantics.ast",
+    "typesys": "sushi_lang.semantics.typesys",
+    "generics": "sushi_lang.semantics.generics.types",
+    "modes": "sushi_lang.semantics.param_modes",
+    "report": "sushi_lang.internals.report",
+}
+_AST_MODULE_ALIASES = {module: alias for alias, module in _AST_MODULES.items()}
+
+# An encoded value is a msgpack scalar, or an array tagged by its first element:
+# [_LIST, *items], [_TUPLE, *items], [_NODE, shape, *attribute values] for an object, and
+# [_NODE, shape, member name] for an enum member.
+_LIST, _TUPLE, _NODE = 0, 1, 2
+_SCALARS = (bool, int, float, str, type(None))
+_INT_RANGE = (-(1 << 63), 1 << 64)
+
+
+class _Unencodable(Exception):
+    """A value the AST codec cannot carry; the record ships its source only."""
+
+
+class TemplateASTEncoder:
+    """Encodes the parsed templates of one manifest into a single AST section.
+
+    The trees share one class table, and the section stores them as one compressed
+    msgpack array: template bodies repeat the same shapes, names and spans, which
+    compress far better together than record by record.
+    """
+
+    def __init__(self) -> None:
+        self._shape_ids: dict[tuple, int] = {}
+        self._shapes: list[list] = []
+        self._trees: list[Any] = []
+
+    def attach(self, record: dict) -> None:
+        """Parse ``record["source"]`` into the section and point ``record["ast"]`` at it."""
+        from sushi_lang.internals.parser import parse_to_ast
+
+        program, _tree = parse_to_ast(record["source"])
+        try:
+            tree = self._encode(program)
+            msgpack.packb(tree, use_bin_type=True)
+        except (_Unencodable, ValueError, TypeError):
+            return
+        record["ast"] = len(self._trees)
+        self._trees.append(tree)
+
+    def section(self) -> dict:
+        """The AST section: codec version, class table and the compressed trees."""
+        return {
+            "version": AST_CODEC_VERSION,
+            "classes": self._shapes,
+            "trees": zlib.compress(msgpack.packb(self._trees, use_bin_type=True)),
+        }
+
+    def _encode(self, value: Any) -> Any:
+        kind = type(value)
+        if kind in _SCALARS:
+            if kind is int and not _INT_RANGE[0] <= value < _INT_RANGE[1]:
+                raise _Unencodable(value)
+            return value
+        if kind is list or kind is tuple:
+            return [_LIST if kind is list else _TUPLE, *map(self._encode, value)]
+        if isinstance(value, enum.Enum):
+            return [_NODE, self._shape(kind, None), value.name]
+        attrs = getattr(value, "__dict__", None)
+        if attrs is None:
+            raise _Unencodable(kind)
+        return [_NODE, self._shape(kind, tuple(attrs)), *map(self._encode, attrs.values())]
+
+    def _shape(self, cls: type, names: Optional[tuple]) -> int:
+        key = (cls, names)
+        shape_id = self._shape_ids.get(key)
+        if shape_id is None:
+            alias = _AST_MODULE_ALIASES.get(cls.__module__)
+            if alias is None:
+                raise _Unencodable(cls)
+            shape_id = self._shape_ids[key] = len(self._shapes)
+            self._shapes.append([alias, cls.__qualname__, None if names is None else list(names)])
+        return shape_id
+
+
+class TemplateASTDecoder:
+    """Rebuilds the templates of one manifest from its AST section."""
+
+    def __init__(self, shapes: list[tuple[type, Optional[list]]], trees: list) -> None:
+        self._shapes = shapes
+        self._trees = trees
+
+    @classmethod
+    def for_templates(cls, templates: dict) -> Optional["TemplateASTDecoder"]:
+        """A decoder for ``templates``, or None when its AST section cannot be used here.
+
+        That is a manifest from before version 5, a codec version this compiler does not
+        speak, a damaged section, or a class table naming a class this compiler lacks or
+        whose fields it no longer carries. The caller then re-parses every record.
+        """
+        section = templates.get("ast")
+        if not isinstance(section, dict) or section.get("version") != AST_CODEC_VERSION:
+            return None
+        shapes = []
+        for entry in section.get("classes") or []:
+            shape = _resolve_shape(entry)
+            if shape is None:
+                return None
+            shapes.append(shape)
+        try:
+            trees = msgpack.unpackb(zlib.decompress(section["trees"]), raw=False)
+        except (KeyError, TypeError, ValueError, zlib.error):
+            return None
+        if not isinstance(trees, list):
+            return None
+        return cls(shapes, trees)
+
+    def program(self, index: int) -> "Program":
+        """A fresh ``Program`` for tree ``index`` (the passes mutate what they are given)."""
+        return self._decode(self._trees[index])
+
+    def _decode(self, value: Any) -> Any:
+        if type(value) is not list:
+            return value
+        tag = value[0]
+        if tag == _LIST:
+            return [self._decode(item) for item in value[1:]]
+        if tag == _TUPLE:
+            return tuple(self._decode(item) for item in value[1:])
+        node_cls, names = self._shapes[value[1]]
+        if names is None:
+            return node_cls[value[2]]
+        if len(value) - 2 != len(names):
+            raise ValueError(f"{node_cls.__name__}: expected {len(names)} attributes")
+        node = node_cls.__new__(node_cls)
+        node.__dict__.update(zip(names, map(self._decode, value[2:]), strict=True))
+        return node
+
+
+def _resolve_shape(entry: Any) -> Optional[tuple[type, Optional[list]]]:
+    """The (class, attribute names) a class-table entry names, or None if it cannot be used."""
+    if not isinstance(entry, list) or len(entry) != 3:
+        return None
+    alias, qualname, names = entry
+    module = _AST_MODULES.get(alias)
+    if module is None or not isinstance(qualname, str) or "." in qualname:
+        return None
+    cls = getattr(importlib.import_module(module), qualname, None)
+    if not isinstance(cls, type):
+        return None
+    if names is None:
+        return (cls, None) if issubclass(cls, enum.Enum) else None
+    if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+        return None
+    if dataclasses.is_dataclass(cls) and not {f.name for f in dataclasses.fields(cls)} <= set(names):
+        return None
+    return cls, names
+
+
+def template_program(record: dict, decoder: Optional[TemplateASTDecoder]) -> "Program":
+    """The parsed ``Program`` of one record's declaration.
+
+    Decoded from the manifest's AST section when it holds this record's tree and this
+    compiler can read it, re-parsed from the record's source otherwise.
+    """
+    from sushi_lang.semantics.ast import Program
+
+    index = record.get("ast")
+    if decoder is not None and type(index) is int:
+        try:
+            program = decoder.program(index)
+        except (LookupError, TypeError, ValueError):
+            program = None
+        if isinstance(program, Program):
+            return program
+
+    from sushi_lang.internals.parser import parse_to_ast
+
+    program, _tree = parse_to_ast(record["source"])
+    return program
@@ -14,7 +14,7 @@ from sushi_lang.semantics.error_reporter import PassErrorReporter
 from .consume import binds_a_bare_literal_string
 from .destroy_effects import compute_destroy_effects
 from .expressions import INERT_EXPRS, check_expr
-from .flow import FlowFacts
+from .flow import FlowFacts, FlowStates, VarFacts
 from .state import BorrowState, borrow_mode
 from .statements import check_block
 from .types import TypeQueries
@@ -61,7 +61,7 @@ class BorrowChecker:
         # Tells an enum constructor `Box.Full(a)` from a method call `xs.push(a)` -- both
         # are DotCall here, and only the former is an ownership sink (#134).
         self.enum_names: Set[str] = enum_names or set()
-        self.borrow_state: Dict[str, BorrowState] = {}
+        self.borrow_state: FlowStates = FlowStates()
         self.active_borrows: Set[str] = set()
         # One frame per open block; `check_block` pops it, which is what gives a
         # `let`-borrow a LEXICAL lifetime. `active_borrows` clears per statement.
@@ -113,7 +113,7 @@ class BorrowChecker:
                         self_span: Optional[Span] = None,
                         self_mode: Optional[str] = None) -> None:
         """Set up the state for one callable body and check it. THE entry point."""
-        self.borrow_state = {}
+        self.borrow_state = FlowStates()
         self.active_borrows = set()
         self._scope_binding_borrows = []
         # Conditional-move tracking (#414): `branch_depth` counts the if/match/loop
@@ -167,9 +167,11 @@ __all__ = [
     'BorrowChecker',
     'BorrowState',
     'FlowFacts',
+    'FlowStates',
     'INERT_EXPRS',
     'MUTATING_METHODS',
     'READONLY_RECEIVERS',
+    'VarFacts',
     'binds_a_bare_literal_string',
     'check_expr',
     'compute_destroy_effects',
@@ -1,57 +1,184 @@
-"""Path-sensitive facts and the branch / loop joins that carry them."""
+"""Path-sensitive facts and the branch / loop joins that carry them.
+
+The facts are SPARSE. `FlowStates` (the checker's `borrow_state`) journals the facts a
+variable had before each change to them, so a branch costs what its arms CHANGE, never
+the number of live variables: entering an arm takes a trail mark, leaving it reads back
+only the names written since the mark (`changed_since`), and going back to the entry
+state undoes exactly those writes (`rewind`). A function with thousands of locals and
+thousands of branches used to snapshot and restore every local at every arm.
+"""
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, NamedTuple, Optional
 
+from sushi_lang.internals.report import Span
 from sushi_lang.semantics.ast import Block, If, Match, Return
 
-from .state import BorrowState
+from .state import FLOW_FIELDS, BorrowState
+
+
+class VarFacts(NamedTuple):
+    """The facts about ONE variable that must survive a branch join or a loop back edge.
+
+    Field names are the `BorrowState` attributes they mirror (`FLOW_FIELDS`), so reading
+    and writing them is one loop and no fact can be read without being written back.
+    """
+    is_moved: bool = False
+    is_destroyed: bool = False
+    owns_no_heap: bool = False
+    invalidated_at: Optional[Span] = None
+    invalidated_by: tuple = ()
+
+    def __or__(self, other: "VarFacts") -> "VarFacts":
+        """Join two paths.
+
+        Which join rule a field takes is the whole design. `is_moved`, `is_destroyed` and
+        the invalidation are monotone and join by UNION, so a loop converges in two
+        passes. `owns_no_heap` GRANTS permission, so it joins by INTERSECTION --
+        believable after the join only if it held on every path; union would be unsound.
+        The first path's invalidation wins, and its span travels with it, or CE2412
+        renders with no location.
+        """
+        invalidated = self if self.invalidated_at is not None else other
+        return VarFacts(
+            is_moved=self.is_moved or other.is_moved,
+            is_destroyed=self.is_destroyed or other.is_destroyed,
+            owns_no_heap=self.owns_no_heap and other.owns_no_heap,
+            invalidated_at=invalidated.invalidated_at,
+            invalidated_by=invalidated.invalidated_by,
+        )
+
+
+BLANK = VarFacts()
+
+
+def facts_of(state: Optional[BorrowState]) -> VarFacts:
+    """What `state` currently believes; a missing binding believes nothing."""
+    if state is None:
+        return BLANK
+    return VarFacts(*(getattr(state, name) for name in FLOW_FIELDS))
+
 
-if TYPE_CHECKING:
-    from . import BorrowChecker
+def write_facts(state: BorrowState, facts: VarFacts) -> None:
+    """Make `state` believe exactly `facts`."""
+    for name, value in zip(FLOW_FIELDS, facts, strict=True):
+        setattr(state, name, value)
 
 
 @dataclass(frozen=True)
 class FlowFacts:
-    """The per-variable facts that must survive a branch join or a loop back edge.
-
-    Which join rule a field takes is the whole design. `moved`, `destroyed` and
-    `invalidation` are monotone and join by UNION, so a loop converges in two passes.
-    `owns_no_heap` GRANTS permission, so it joins by INTERSECTION -- believable after the
-    join only if it held on every path; union would be unsound. Because intersection has no
-    empty identity, paths go through `join()` over the surviving list, never a fold into a
-    blank `FlowFacts()`.
+    """One path through a branch, as the variables it changed and what they ended as.
+
+    A variable the path never wrote is absent and reads as the entry state, so a path
+    costs its writes. The empty `FlowFacts()` is the path that changed nothing -- an `if`
+    with no `else` falling through.
     """
-    moved: frozenset[str] = frozenset()
-    destroyed: frozenset[str] = frozenset()
-    owns_no_heap: frozenset[str] = frozenset()
-    # A tuple, not a frozenset: `Span` is an unfrozen dataclass and so unhashable. The
-    # span must travel with the flag, or CE2412 renders with no location.
-    invalidation: tuple = ()
-
-    def __or__(self, other: "FlowFacts") -> "FlowFacts":
-        """Join two paths. Union for the monotone facts, intersection for permission."""
-        seen = {name for name, _span, _by in self.invalidation}
-        merged = self.invalidation + tuple(
-            entry for entry in other.invalidation if entry[0] not in seen
-        )
-        return FlowFacts(
-            moved=self.moved | other.moved,
-            destroyed=self.destroyed | other.destroyed,
-            owns_no_heap=self.owns_no_heap & other.owns_no_heap,
-            invalidation=merged,
-        )
+    changes: Mapping[str, VarFacts] = field(default_factory=dict)
+
+    def get(self, name: str, entry: VarFacts) -> VarFacts:
+        """The path's facts for `name`, or `entry` if the path left it alone."""
+        return self.changes.get(name, entry)
+
 
-    @staticmethod
-    def join(paths: list["FlowFacts"]) -> "FlowFacts":
-        """Join every surviving path of a branch."""
+class FlowStates(Dict[str, BorrowState]):
+    """The checker's name -> `BorrowState` map, journalling every change to a flow fact.
+
+    The trail is copy-on-write: a fact is copied only when it is about to change, as
+    (name, facts before). Installing or removing a binding journals its name the same
+    way, because a join is keyed by name and a shadowing `let` changes what the name
+    means. A write to a `BorrowState` that is NOT the one its name maps to (a displaced
+    outer local) is not journalled, exactly as no join would have seen it.
+    """
+
+    def __init__(self) -> None:
+        """An empty map with an empty trail."""
+        super().__init__()
+        self._trail: list[tuple[str, VarFacts]] = []
+        # Every name that has held a non-blank fact since the function began: the only
+        # names a join over NO surviving path has to blank.
+        self._flagged: set[str] = set()
+        self._rewinding = False
+
+    def __setitem__(self, name: str, state: BorrowState) -> None:
+        """Install a binding, journalling what its name believed before."""
+        self._journal(name)
+        object.__setattr__(state, "_flow_states", self)
+        if facts_of(state) != BLANK:
+            self._flagged.add(name)
+        super().__setitem__(name, state)
+
+    def __delitem__(self, name: str) -> None:
+        """Remove a binding, journalling what its name believed."""
+        self._journal(name)
+        super().__delitem__(name)
+
+    def pop(self, name: str, *default):
+        """Remove a binding if present, journalling what its name believed."""
+        if name in self:
+            self._journal(name)
+        return super().pop(name, *default)
+
+    def before_change(self, state: BorrowState) -> None:
+        """A flow field of `state` is about to change (called by `BorrowState`)."""
+        if self.get(state.name) is state:
+            self._journal(state.name)
+            self._flagged.add(state.name)
+
+    def _journal(self, name: str) -> None:
+        """Copy `name`'s facts onto the trail before they change."""
+        if not self._rewinding:
+            self._trail.append((name, facts_of(self.get(name))))
+
+    def mark(self) -> int:
+        """A point to come back to: the current trail length."""
+        return len(self._trail)
+
+    def changed_since(self, mark: int) -> FlowFacts:
+        """The path since `mark`: every name written, with what it believes now."""
+        names = dict.fromkeys(name for name, _before in self._trail[mark:])
+        return FlowFacts({name: facts_of(self.get(name)) for name in names})
+
+    def rewind(self, mark: int) -> None:
+        """Undo every fact change since `mark`, newest first, and drop it from the trail.
+
+        Bindings installed since the mark stay installed, believing what their name did
+        at the mark; removing them is their scope's job, not the join's.
+        """
+        self._rewinding = True
+        try:
+            for name, before in reversed(self._trail[mark:]):
+                state = self.get(name)
+                if state is not None:
+                    write_facts(state, before)
+        finally:
+            self._rewinding = False
+        del self._trail[mark:]
+
+    def join(self, paths: list[FlowFacts]) -> None:
+        """Set every name any surviving path changed to the join over all of them.
+
+        Call it rewound to the branch entry: a path that left a name alone contributes
+        the entry facts, which is what the map holds then. With no surviving path the
+        code after the branch is unreachable and every fact is blank, as a join with no
+        identity must be.
+        """
         if not paths:
-            return FlowFacts()
-        result = paths[0]
-        for facts in paths[1:]:
-            result = result | facts
-        return result
+            for name in self._flagged:
+                state = self.get(name)
+                if state is not None:
+                    write_facts(state, BLANK)
+            return
+        names = dict.fromkeys(name for path in paths for name in path.changes)
+        for name in names:
+            state = self.get(name)
+            if state is None:
+                continue
+            entry = facts_of(state)
+            joined = paths[0].get(name, entry)
+            for path in paths[1:]:
+                joined = joined | path.get(name, entry)
+            write_facts(state, joined)
 
 
 def reinitialize(state: BorrowState) -> None:
@@ -85,27 +212,3 @@ def terminates(node) -> bool:
             return bool(arms) and all(terminates(arm.body) for arm in arms)
         case _:
             return False
-
-
-def snapshot_flow(checker: 'BorrowChecker') -> FlowFacts:
-    """Every path-sensitive fact (for branch and loop control-flow joins)."""
-    states = checker.borrow_state.items()
-    return FlowFacts(
-        moved=frozenset(n for n, s in states if s.is_moved),
-        destroyed=frozenset(n for n, s in states if s.is_destroyed),
-        owns_no_heap=frozenset(n for n, s in states if s.owns_no_heap),
-        invalidation=tuple((n, s.invalidated_at, s.invalidated_by)
-                           for n, s in states if s.invalidated_at is not None),
-    )
-
-
-def restore_flow(checker: 'BorrowChecker', facts: FlowFacts) -> None:
-    """Set every path-sensitive flag to exactly what `facts` says."""
-    invalidation = {name: (span, by) for name, span, by in facts.invalidation}
-    for name, state in checker.borrow_state.items():
-        state.is_moved = name in facts.moved
-        state.is_destroyed = name in facts.destroyed
-        state.owns_no_heap = name in facts.owns_no_heap
-        span, by = invalidation.get(name, (None, ()))
-        state.invalidated_at = span
-        state.invalidated_by = by
@@ -17,6 +17,10 @@ The two counters clear per statement. `binding_borrows` does not: it sits on the
 and lives to the end of the lexical scope, so `check_block` releases it, not
 `clear_borrows`.
 
+The five path-sensitive fields (`FLOW_FIELDS`) report every change to the `FlowStates`
+map that holds the state, which is what lets a branch join cost only what its arms
+changed. Write them as plain attributes; the journal is not optional.
+
 `owns_no_heap` is option B, on the BINDING rather than the type because
 `BuiltinType.STRING` is an enum member with nowhere to put a flag -- do not "fix" it with
 a string subtype. Re-derived on every rebind, never inherited.
@@ -30,6 +34,10 @@ from sushi_lang.semantics.typesys import BorrowMode, Type
 from sushi_lang.internals.report import Span
 
 
+# The facts a branch join or a loop back edge carries (flow.VarFacts mirrors them).
+FLOW_FIELDS = ("is_moved", "is_destroyed", "owns_no_heap", "invalidated_at", "invalidated_by")
+
+
 def borrow_mode(marker: Optional[str]) -> BorrowMode:
     """The `BorrowMode` a `peek` / `poke` source marker names."""
     return BorrowMode.POKE if marker == "poke" else BorrowMode.PEEK
@@ -61,6 +69,14 @@ class BorrowState:
     binding_borrows: list = field(default_factory=list)
     first_borrow_span: Optional[Span] = None
 
+    def __setattr__(self, name: str, value) -> None:
+        """Journal a flow-fact change with the map holding this state, then make it."""
+        if name in FLOW_FIELDS:
+            states = self.__dict__.get("_flow_states")
+            if states is not None and getattr(self, name) is not value:
+                states.before_change(self)
+        object.__setattr__(self, name, value)
+
     @property
     def is_borrowed(self) -> bool:
         """Returns True if variable has any active borrows."""
@@ -33,7 +33,7 @@ from .bindings import BindingScope, register_pattern_bindings, release_binding_b
 from .borrows import clear_borrows
 from .consume import bind, binds_a_bare_literal_string, consume, reconcile_closure_bind
 from .expressions import check_expr
-from .flow import FlowFacts, reinitialize, restore_flow, snapshot_flow, terminates
+from .flow import FlowFacts, reinitialize, terminates
 from .reads import root_owner
 from .state import BorrowState
 from .writes import check_owner_not_borrowed, reject_readonly_write
@@ -187,41 +187,44 @@ def _check_expr_stmt(checker: 'BorrowChecker', stmt: ExprStmt) -> None:
 
 def _check_if(checker: 'BorrowChecker', stmt: If) -> None:
     """Each arm starts from the pre-`if` state; the surviving paths JOIN."""
-    # Moved after the `if` iff moved on ANY path. Without the snapshot a move leaks into
+    # Moved after the `if` iff moved on ANY path. Without the rewind a move leaks into
     # sibling arms. Only the paths that REACH the code after the `if` contribute: an arm
     # ending in `return` leaves the function, so its move cannot reach a sibling arm or
     # the statements below (#287).
-    entry = snapshot_flow(checker)
+    flow = checker.borrow_state
+    entry = flow.mark()
     paths: list[FlowFacts] = []
     for cond_expr, arm_block in stmt.arms:
-        restore_flow(checker, entry)
+        flow.rewind(entry)
         check_expr(checker, cond_expr)
         clear_borrows(checker)
         with _branch(checker):
             check_block(checker, arm_block)
         if not terminates(arm_block):
-            paths.append(snapshot_flow(checker))
+            paths.append(flow.changed_since(entry))
     if stmt.else_block:
-        restore_flow(checker, entry)
+        flow.rewind(entry)
         with _branch(checker):
             check_block(checker, stmt.else_block)
         if not terminates(stmt.else_block):
-            paths.append(snapshot_flow(checker))
+            paths.append(flow.changed_since(entry))
     else:
-        paths.append(entry)
-    restore_flow(checker, FlowFacts.join(paths))
+        paths.append(FlowFacts())
+    flow.rewind(entry)
+    flow.join(paths)
 
 
 def _check_match(checker: 'BorrowChecker', stmt: Match) -> None:
-    """Match arms are EXCLUSIVE paths, so they take the same snapshot / restore / join."""
+    """Match arms are EXCLUSIVE paths, so they take the same mark / rewind / join."""
     check_expr(checker, stmt.scrutinee)
     clear_borrows(checker)
-    entry = snapshot_flow(checker)
+    flow = checker.borrow_state
+    entry = flow.mark()
     paths: list[FlowFacts] = []
     for arm in stmt.arms:
-        restore_flow(checker, entry)
+        flow.rewind(entry)
         # The scrutinee type gives each binding its var_type; the typecheck pass stamps it (CE0121
-        # guards that). The scope closes BEFORE the path snapshot, so the join sees the
+        # guards that). The scope closes BEFORE the path is read, so the join sees the
         # outer local's facts, never the binding's.
         with BindingScope(checker) as scope, _branch(checker):
             if isinstance(arm.pattern, Pattern):
@@ -234,10 +237,11 @@ def _check_match(checker: 'BorrowChecker', stmt: Match) -> None:
                 check_expr(checker, arm.body)
                 clear_borrows(checker)
         if not terminates(arm.body):
-            paths.append(snapshot_flow(checker))
+            paths.append(flow.changed_since(entry))
     # A `match` is exhaustive (the typecheck pass enforces it), so unlike an `if` with no else there
     # is no fall-through path to add: some arm always runs.
-    restore_flow(checker, FlowFacts.join(paths))
+    flow.rewind(entry)
+    flow.join(paths)
 
 
 def _check_foreach(checker: 'BorrowChecker', stmt: Foreach) -> None:
@@ -259,14 +263,18 @@ def _check_foreach(checker: 'BorrowChecker', stmt: Foreach) -> None:
 
 def check_loop_body(checker: 'BorrowChecker', body: Block) -> None:
     """Borrow-check a loop body to a fixed point so the back edge is honoured."""
-    entry = snapshot_flow(checker)
+    flow = checker.borrow_state
+    entry = flow.mark()
     prev_suppressed = checker.err.suppressed
     checker.err.suppressed = True
     with _branch(checker):
         check_block(checker, body)
     checker.err.suppressed = prev_suppressed
-    fixed_point = entry | snapshot_flow(checker)
-    restore_flow(checker, fixed_point)
+    # The back edge: the entry joined with one trip round the body.
+    first_trip = flow.changed_since(entry)
+    flow.rewind(entry)
+    flow.join([FlowFacts(), first_trip])
+    fixed_point = flow.mark()
     with _branch(checker):
         check_block(checker, body)
-    restore_flow(checker, fixed_point)
+    flow.rewind(fixed_point)
@@ -77,6 +77,20 @@ class StructCollector:
             self.structs.by_name["ProcessOutput"] = process_output
             self.known_types.add(process_output)
 
+        # spawn()'s handle. `id` names the child's state inside the stdlib; it is never
+        # reused, so a handle kept past wait() finds nothing rather than freed memory.
+        child_process = StructType(
+            name="ChildProcess",
+            fields=(
+                ("pid", BuiltinType.I32),
+                ("id", BuiltinType.I64),
+            ),
+        )
+        if "ChildProcess" not in self.structs.by_name:
+            self.structs.order.append("ChildProcess")
+            self.structs.by_name["ChildProcess"] = child_process
+            self.known_types.add(child_process)
+
     def _collect_struct_def(self, struct: StructDef) -> None:
         """Collect struct definition and create StructType or GenericStructType."""
         name = getattr(struct, "name", None)
@@ -1,12 +1,16 @@
 """Lambda-lifting pass: turn each lambda literal into a top-level function + env."""
 from __future__ import annotations
 import dataclasses
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from sushi_lang.semantics.ast import (
     Node, FuncDef, Lambda, Block, Return, Name, MemberAccess, Param, DotCall,
+    Call, MethodCall, Let,
 )
-from sushi_lang.semantics.typesys import StructType, ReferenceType, BorrowMode
+from sushi_lang.semantics.param_modes import (
+    CalleeKind, ParamMode, effective_modes, modes_for,
+)
+from sushi_lang.semantics.typesys import StructType, ReferenceType, BorrowMode, FunctionType
 
 ENV_PARAM_NAME = "__closure_env"
 
@@ -24,22 +28,22 @@ class LambdaLifter:
         for fn in list(self.program.functions):
             if getattr(fn, "type_params", None):
                 continue  # generic templates: their instantiations carry the lambdas
-            self._walk(fn.body)
+            self._lift_scope(fn.params, fn.body)
         # Extension and perk-impl bodies emit through the same statement paths
         # as a plain fn, so their lambdas lift the same way (#399).
         # program.generic_extensions stays unwalked: templates, like generic
         # fn templates -- their instantiation copies carry the lambdas and are
         # lifted in _check_monomorphized_extensions.
         for ext in list(self.program.extensions):
-            self._walk(ext.body)
+            self._lift_scope(ext.params, ext.body)
         for impl in list(self.program.perk_impls):
             for method in impl.methods:
-                self._walk(method.body)
+                self._lift_scope(method.params, method.body)
         if self.annotate is not None:
             for lifted in self._lifted:
                 self.annotate(lifted)
 
-    def lift_body(self, body) -> List[FuncDef]:
+    def lift_body(self, body, params=()) -> List[FuncDef]:
         """Lift one body and answer the FuncDefs this call produced (#399).
 
         The per-instantiation extension copies live in no unit AST, so the
@@ -47,18 +51,25 @@ class LambdaLifter:
         borrow-checks exactly what this call lifted.
         """
         before = len(self._lifted)
-        self._walk(body)
+        self._lift_scope(params, body)
         produced = self._lifted[before:]
         if self.annotate is not None:
             for lifted in produced:
                 self.annotate(lifted)
         return produced
 
+    def _lift_scope(self, params, body) -> None:
+        """Lift the lambdas of one function body, then find its only-called bindings."""
+        self._walk(body)
+        _mark_known_callees(params, body)
+
     def _walk(self, node) -> None:
         """Find and lift Lambda nodes anywhere under `node` (not into their bodies)."""
         if isinstance(node, Lambda):
             self._lift(node)
             return
+        if isinstance(node, (Call, MethodCall, DotCall)):
+            self._mark_borrowed_lambdas(node)
         # `If.arms` holds plain (cond, Block) tuples, so tuples walk too (#400).
         if isinstance(node, (list, tuple)):
             for item in node:
@@ -97,7 +108,7 @@ class LambdaLifter:
         cap_names = {c.name for c in captures}
         _rewrite_captures(body, cap_names)
 
-        self._walk(body)
+        self._lift_scope(lam.params, body)
 
         ok_type = lam.resolved_type.ok_type if lam.resolved_type is not None else lam.ret
         err_type = lam.resolved_type.err_type if lam.resolved_type is not None else lam.err_type
@@ -129,6 +140,77 @@ class LambdaLifter:
         lam.lifted_name = lifted_name
         lam.env_struct = env_struct
 
+    def _mark_borrowed_lambdas(self, call) -> None:
+        """A lambda written as a borrowed argument cannot outlive the call.
+
+        The callee may call it or `.clone()` it, and a clone copies the environment to
+        the heap. Moving, storing, capturing or returning a borrowed parameter is a
+        borrow error, so nothing else can keep it.
+        """
+        for arg, mode in zip(call.args, self._argument_modes(call), strict=False):
+            if (isinstance(arg, Lambda) and mode is ParamMode.BORROW
+                    and not getattr(arg, "nom_marked", False)):
+                arg.non_escaping = True
+
+    def _argument_modes(self, call) -> Tuple[ParamMode, ...]:
+        """The effective modes of `call`'s arguments, or () when the callee is not known here."""
+        fn_type = getattr(call, "callee_fn_type", None)
+        if isinstance(fn_type, FunctionType):
+            return effective_modes(fn_type.modes, CalleeKind.INDIRECT)
+        if not isinstance(call, Call):
+            return tuple(getattr(call, "callee_param_modes", None) or ())
+        if not isinstance(call.callee, Name):
+            return ()
+        sig = self.func_table.by_name.get(call.callee.id)
+        if sig is None:
+            return ()
+        params = list(sig.params)
+        if params and getattr(params[-1], "is_variadic", False):
+            params.pop()  # the trailing arguments are moved into the synthesized T[]
+        return modes_for(params, CalleeKind.FUNCTION)
+
+
+def _mark_known_callees(params, body) -> None:
+    """Stamp each `let f = <lambda>` whose `f` is only ever called, here, with its function.
+
+    Such a binding is never reassigned, borrowed, moved or captured, so the value a call
+    loads from it is always the lambda it was built from: the backend calls the lifted
+    function directly, and the environment cannot escape. Anything else said about `f`
+    in the body -- in any scope, shadowed or not -- leaves the binding alone.
+    """
+    lets: Dict[str, List[Let]] = {}
+    other_uses = {p.name for p in params}
+
+    def visit(node, as_callee: bool = False) -> None:
+        if isinstance(node, Lambda):
+            # Its body is its own scope, already lifted; a capture is a use of the name.
+            other_uses.update(c.name for c in node.captures or ())
+            return
+        if isinstance(node, Name):
+            if not as_callee:
+                other_uses.add(node.id)
+            return
+        if isinstance(node, (list, tuple)):
+            for item in node:
+                visit(item)
+            return
+        if not isinstance(node, Node):
+            return
+        if isinstance(node, Let):
+            lets.setdefault(node.name, []).append(node)
+        for f in dataclasses.fields(node):
+            visit(getattr(node, f.name),
+                  as_callee=isinstance(node, Call) and f.name == "callee")
+
+    visit(body)
+    for name, bindings in lets.items():
+        if len(bindings) != 1 or name in other_uses:
+            continue
+        let = bindings[0]
+        if isinstance(let.value, Lambda) and let.value.lifted_name is not None:
+            let.known_callee = let.value.lifted_name
+            let.value.non_escaping = True
+
 
 def _rewrite_captures(node, cap_names: set) -> None:
     """Replace `Name(cap)` reads with `MemberAccess(Name(env), cap)` in-place."""
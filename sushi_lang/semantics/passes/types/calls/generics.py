@@ -123,7 +123,7 @@ def resolve_generic_fn_reference(validator: 'TypeValidator', name: str, expected
         if tp_name not in type_param_map:
             return None
         type_args.append(resolve_unknown_type(
-            type_param_map[tp_name], validator.struct_table, validator.enum_table))
+            type_param_map[tp_name], validator.struct_table.by_name, validator.enum_table.by_name))
     type_args = tuple(type_args)
 
     mangled_name = mangle_function_name(name, type_args)
@@ -156,7 +156,7 @@ def _infer_type_args_from_call_site(
         if arg_type is None or isinstance(arg_type, UnknownType):
             return None
         resolved = resolve_unknown_type(
-            arg_type, validator.struct_table, validator.enum_table
+            arg_type, validator.struct_table.by_name, validator.enum_table.by_name
         )
         arg_types.append(resolved)
 
@@ -185,7 +185,7 @@ def _infer_type_args_from_call_site(
             if tp_name not in type_param_map:
                 return None
             resolved = resolve_unknown_type(
-                type_param_map[tp_name], validator.struct_table, validator.enum_table
+                type_param_map[tp_name], validator.struct_table.by_name, validator.enum_table.by_name
             )
             leading_args.append(resolved)
         return tuple(leading_args)
@@ -143,6 +143,9 @@ def validate_function_call(validator: 'TypeValidator', call: Call) -> None:
 
     callee_var_ty = validator.variable_types.get(function_name)
     if isinstance(callee_var_ty, FunctionType):
+        # Stamped here too, so the lift pass sees this local's modes and not those of a
+        # function it may shadow.
+        call.callee_fn_type = callee_var_ty
         validate_indirect_call(validator, call, callee_var_ty)
         return
 
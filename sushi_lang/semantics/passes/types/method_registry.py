@@ -224,7 +224,7 @@ class HashMapMethodInferrer:
                 if self.method_name in ("get", "remove"):
                     from sushi_lang.semantics.generics.maybe import ensure_maybe_type_in_table
                     return ensure_maybe_type_in_table(self.validator.enum_table, value_type, struct_table=self.validator.struct_table.by_name)
-                elif self.method_name == "clone":
+                elif self.method_name in ("clone", "with_capacity"):
                     # `.clone()` is the ONLY escape from CE2411 for a HashMap read, so it must
                     # exist for every HashMap. Returns the receiver's own type.
                     return self.receiver_type
@@ -232,7 +232,8 @@ class HashMapMethodInferrer:
                     return BuiltinType.BOOL
                 elif self.method_name in ("len", "tombstone_count"):
                     return BuiltinType.I32
-                elif self.method_name in ("new", "insert", "rehash", "debug", "free", "destroy"):
+                elif self.method_name in ("new", "insert", "reserve", "rehash", "debug", "free",
+                                          "destroy"):
                     return BuiltinType.BLANK
                 elif self.method_name == "keys":
                     from sushi_lang.semantics.typesys import IteratorType
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
 
+from sushi_lang.internals import timing
 from sushi_lang.internals.report import Reporter
 from sushi_lang.semantics.ast import Program, ExtendDef, ExtendWithDef
 from sushi_lang.semantics.passes.collect import CollectorPass, ConstantTable, StructTable, EnumTable, GenericEnumTable, GenericStructTable, PerkTable, PerkImplementationTable, FunctionTable, ExtensionTable, GenericExtensionTable, GenericFunctionTable
@@ -15,7 +16,9 @@ from sushi_lang.semantics.typesys import BuiltinType
 from sushi_lang.semantics.symbol_merger import SymbolTableMerger
 from sushi_lang.semantics.generics.extensions import monomorphize_all_extension_methods
 from sushi_lang.semantics.library_registry import LibraryRegistry
-from sushi_lang.semantics.library_templates import deserialize_perk_impl
+from sushi_lang.semantics.library_templates import (
+    TemplateASTDecoder, deserialize_perk_impl, template_program,
+)
 
 
 def enum_base_names(*tables) -> set[str]:
@@ -48,7 +51,7 @@ def _diagnostic_identity(diagnostic):
 class SemanticAnalyzer:
     """Semantic analysis coordinator that runs all semantic analysis passes."""
 
-    def __init__(self, reporter: Reporter, filename: str = "<input>", unit_manager: Optional[UnitManager] = None, library_linker: Optional[object] = None, library_registry: Optional['LibraryRegistry'] = None) -> None:
+    def __init__(self, reporter: Reporter, filename: str = "<input>", unit_manager: Optional[UnitManager] = None, library_linker: Optional[object] = None, library_registry: Optional['LibraryRegistry'] = None, analysis_cache: Optional[object] = None) -> None:
         self.reporter = reporter
         self.filename = filename
         self.unit_manager = unit_manager
@@ -56,6 +59,9 @@ class SemanticAnalyzer:
         # backend (Tier 4.1 layering invariant), so no tighter annotation is legal.
         self.library_linker = library_linker
         self.library_registry = library_registry
+        # A compiler AnalysisCache, held opaquely like library_linker. When set, a unit
+        # whose per-unit analysis is cached skips scope/typecheck/lift/borrow.
+        self.analysis_cache = analysis_cache
         self.constants: Optional[ConstantTable] = None
         self.structs: Optional[StructTable] = None
         self.enums: Optional[EnumTable] = None
@@ -95,11 +101,15 @@ class SemanticAnalyzer:
             lift          lambda lifting                         passes/lift.py
             borrow        borrow checking                        passes/borrow/
 
-        The last four run per unit, in one loop. `_check_monomorphized_extensions` repeats
-        those four for each instantiation of a generic-target extension.
+        The last four run per unit, in one loop; an incremental build replays a unit's
+        cached result instead (semantics/unit_analysis.py). `_check_monomorphized_extensions`
+        repeats those four for each instantiation of a generic-target extension.
 
         `passes/const_eval.py` is NOT a pass: the typecheck pass and the backend both call
         it as a helper.
+
+        Each pass ends with a `timing.lap` under its name, which is what `--timing-json`
+        reports; the per-unit four add up over the units.
         """
         self._check_multi_file()
 
@@ -111,6 +121,10 @@ class SemanticAnalyzer:
         compilation_order = self.unit_manager.get_compilation_order()
         if compilation_order is None:
             return  # Error already reported
+        timing.count("units", len(compilation_order))
+        timing.count("functions", sum(len(unit.ast.functions) + len(unit.ast.extensions)
+                                      for unit in compilation_order if unit.ast is not None))
+        timing.lap()
 
         collector = CollectorPass(self.reporter)
         from sushi_lang.semantics.tables import SymbolTables
@@ -146,6 +160,7 @@ class SemanticAnalyzer:
         self.generic_funcs = global_tables.generic_funcs
         self.externals = collector.externals
         global_tables.externals = collector.externals
+        timing.lap("collect")
 
         # FFI: validate external signatures (CE5003), emit CW5001, and enforce
         # the ptr unit gate (CE5009) per unit.
@@ -156,6 +171,7 @@ class SemanticAnalyzer:
             if unit.ast is not None:
                 validate_external_signatures(self.reporter, unit.ast)
                 validate_ptr_unit_gate(self.reporter, unit.ast)
+        timing.lap("externs")
 
         if self.library_linker is not None and self.library_registry is None:
             self._build_library_registry()
@@ -177,8 +193,10 @@ class SemanticAnalyzer:
             # before instantiate so the consumer's instantiations monomorphize locally.
             self._register_library_generic_structs()
             self._register_library_generic_enums()
+        timing.lap("libraries")
 
         self._check_main_function_args_multi_file(compilation_order)
+        timing.lap("entrypoint")
 
         from sushi_lang.semantics.generics.instantiate import InstantiationCollector
         instantiation_collector = InstantiationCollector(
@@ -199,6 +217,7 @@ class SemanticAnalyzer:
         )
         type_instantiations = instantiation_collector.instantiations
         func_instantiations = instantiation_collector.function_instantiations
+        timing.lap("instantiate")
 
         from sushi_lang.semantics.generics.monomorphize import Monomorphizer
         from sushi_lang.semantics.generics.constraints import ConstraintValidator
@@ -280,17 +299,24 @@ class SemanticAnalyzer:
             extension_fn_instantiations |= monomorphizer.collect_from_extension_body(extend_def)
         if extension_fn_instantiations:
             monomorphizer.monomorphize_all_functions(extension_fn_instantiations, compilation_order)
+        timing.count("monomorphized_functions", len(monomorphizer.monomorphized_functions))
+        timing.count("monomorphized_types", len(concrete_enums) + len(concrete_structs))
+        timing.count("monomorphized_extensions", len(concrete_extension_defs))
+        timing.lap("monomorphize")
 
         # resolve: AFTER monomorphization, so every struct/enum exists in the tables.
         from sushi_lang.semantics.passes.resolve import resolve_struct_field_types, resolve_enum_variant_types
         resolve_struct_field_types(self.structs, self.enums)
         resolve_enum_variant_types(self.structs, self.enums)
+        timing.lap("resolve")
 
         # finite-types: reject types that contain themselves by value (CE2095). Must precede
         # derive, whose topological sort would report a cycle as an internal error, and must
         # stop on failure -- every later pass assumes finitely-sized types.
         from sushi_lang.semantics.passes.finite_types import check_infinite_size_types
-        if check_infinite_size_types(self.structs, self.enums, self.reporter):
+        infinite = check_infinite_size_types(self.structs, self.enums, self.reporter)
+        timing.lap("finite-types")
+        if infinite:
             return
 
         # derive: AFTER type resolution, and structs/enums before arrays, which may
@@ -306,6 +332,7 @@ class SemanticAnalyzer:
         register_all_array_hashes(self.structs, self.enums)
 
         register_all_clones(self.structs, self.enums)
+        timing.lap("derive")
 
         for (_target_type_name, _method_name, _type_args), extend_def in concrete_extension_defs.items():
             self.monomorphized_extensions.append(extend_def)
@@ -322,6 +349,7 @@ class SemanticAnalyzer:
                 name_span=getattr(extend_def, "name_span", None),
             )
             self.extensions.add_method(extension_method)
+        timing.lap("monomorphize")
 
         # An extension method colliding with a BUILT-IN can never run, because all three
         # layers resolve the built-in first -- so it is CE2097 rather than silent dead code
@@ -334,6 +362,7 @@ class SemanticAnalyzer:
         # A perk impl is unaffected by construction: an ExtendWithDef never enters
         # ExtensionTable. It is the sanctioned way to replace a built-in.
         self._check_extension_shadows_builtin()
+        timing.lap("shadowing")
 
         # The per-unit passes run below: scope, typecheck, lift, borrow. Every unit is
         # analysed with the global context, because units reference each other, but each
@@ -351,11 +380,27 @@ class SemanticAnalyzer:
         # base name: a monomorphized generic enum is interned as "Result<i32, StdError>"
         # while its constructor is written `Result.Ok(...)`.
         enum_names = enum_base_names(self.enums, self.generic_enums)
+        timing.lap("effects")
+
+        from sushi_lang.semantics.unit_analysis import (
+            capture_unit_analysis, mark_tables, replay_unit_analysis,
+        )
+        if self.analysis_cache is not None:
+            self.analysis_cache.begin(self.tables, destroy_effects)
 
         for unit in compilation_order:
             if unit.ast is None:
                 continue
 
+            if self.analysis_cache is not None:
+                cached = self.analysis_cache.lookup(unit)
+                if cached is not None and replay_unit_analysis(cached, self.tables):
+                    unit.ast = cached.ast
+                    self.reporter.items.extend(cached.diagnostics)
+                    timing.lap("replay")
+                    continue
+                mark = mark_tables(self.tables, unit.ast)
+
             try:
                 unit_source = unit.file_path.read_text(encoding="utf-8")
             except Exception:
@@ -365,25 +410,37 @@ class SemanticAnalyzer:
 
             scope_analyzer = ScopeAnalyzer(unit_reporter, self.constants, self.structs, self.enums, self.generic_enums, self.generic_structs, external_table=self.externals)
             scope_analyzer.run(unit.ast)
+            timing.lap("scope")
 
             type_validator = TypeValidator(unit_reporter, self.tables, current_unit_name=unit.name, monomorphized_functions=monomorphizer.monomorphized_functions)
             type_validator.run(unit.ast)
+            timing.lap("typecheck")
 
             from sushi_lang.semantics.passes.lift import LambdaLifter
             LambdaLifter(self.structs, self.funcs, unit.ast,
                          annotate=type_validator._validate_function).run()
+            timing.lap("lift")
 
             # borrow. The enum names let the checker tell `Box.Full(a)` from a method call
             # -- both are DotCall here. BASE names only: the receiver is written bare.
             borrow_checker = BorrowChecker(unit_reporter, destroy_effects=destroy_effects,
                                            enum_names=enum_names, tables=self.tables)
             borrow_checker.run(unit.ast)
+            timing.lap("borrow")
+
+            # Captured NOW: the monomorphized-extension pass below lifts into the first
+            # unit's AST, and that is not part of this unit's own result.
+            if self.analysis_cache is not None and not unit_reporter.has_errors:
+                self.analysis_cache.store(
+                    unit, capture_unit_analysis(unit.ast, unit_reporter.items, self.tables, mark)
+                )
 
             self.reporter.items.extend(unit_reporter.items)
 
         if self.monomorphized_extensions:
             lift_target = next((u.ast for u in compilation_order if u.ast is not None), None)
             self._check_monomorphized_extensions(destroy_effects, enum_names, lift_target)
+            timing.lap("extension-instances")
 
     def _check_monomorphized_extensions(self, destroy_effects, enum_names,
                                         lift_target=None) -> None:
@@ -425,7 +482,8 @@ class SemanticAnalyzer:
         for extend_def in self.monomorphized_extensions:
             capture_scope._check_extension_method(extend_def)
             type_validator._validate_extension_method(extend_def)
-            lifted = lifter.lift_body(extend_def.body) if lifter is not None else []
+            lifted = (lifter.lift_body(extend_def.body, extend_def.params) if lifter is not None
+                      else [])
             for fn in lifted:
                 fn.is_public = True
             borrow_checker._check_extension(extend_def)
@@ -570,7 +628,6 @@ class SemanticAnalyzer:
             return
 
         import sushi_lang.internals.errors as er
-        from sushi_lang.internals.parser import parse_to_ast
         from sushi_lang.semantics.passes.collect import CollectorPass
 
         host_unit = next(
@@ -581,6 +638,7 @@ class SemanticAnalyzer:
 
         for lib_name, manifest in self.library_linker.loaded_libraries.items():
             templates = manifest.get("templates") or {}
+            decoder = TemplateASTDecoder.for_templates(templates)
             for record in templates.get("constants", []) or []:
                 const_name = record.get("name")
                 source = record.get("source")
@@ -594,7 +652,7 @@ class SemanticAnalyzer:
                             lib=lib_name, name=const_name)
                     continue
 
-                program, _tree = parse_to_ast(source)
+                program = template_program(record, decoder)
                 throwaway = Reporter(
                     source=source, filename=f"<const:{lib_name}:{const_name}>")
                 collected = CollectorPass(throwaway).run(program, unit_name=lib_name)
@@ -614,11 +672,11 @@ class SemanticAnalyzer:
         if perk_table is None or self.library_linker is None:
             return
 
-        from sushi_lang.internals.parser import parse_to_ast
         from sushi_lang.semantics.passes.collect import CollectorPass
 
         for lib_name, manifest in self.library_linker.loaded_libraries.items():
             templates = manifest.get("templates") or {}
+            decoder = TemplateASTDecoder.for_templates(templates)
             for record in templates.get("perks", []) or []:
                 perk_name = record.get("name")
                 if not perk_name or perk_name in perk_table.by_name:
@@ -628,10 +686,10 @@ class SemanticAnalyzer:
                 if not source:
                     continue
 
-                # Re-parse the self-contained perk source and run a throwaway
+                # Rebuild the self-contained perk declaration and run a throwaway
                 # collector so any diagnostics never pollute the consumer's
                 # reporter.
-                program, _tree = parse_to_ast(source)
+                program = template_program(record, decoder)
                 throwaway = Reporter(source=source, filename=f"<perk:{lib_name}:{perk_name}>")
                 collected = CollectorPass(throwaway).run(program, unit_name=lib_name)
                 template_perks = collected.perks
@@ -650,6 +708,7 @@ class SemanticAnalyzer:
 
         for _lib_name, manifest in self.library_linker.loaded_libraries.items():
             templates = manifest.get("templates") or {}
+            decoder = TemplateASTDecoder.for_templates(templates)
             for record in templates.get("perk_impls", []) or []:
                 type_name = record.get("type")
                 perk_name = record.get("perk")
@@ -672,9 +731,9 @@ class SemanticAnalyzer:
                     continue
 
                 try:
-                    impl = deserialize_perk_impl(record)
+                    impl = deserialize_perk_impl(record, decoder)
                 except Exception:
-                    # The snippet failed to re-parse; skip rather than crash the
+                    # The snippet failed to rebuild; skip rather than crash the
                     # consumer build (it can supply its own impl) -- but say so, or the
                     # user later gets "no such method" on a perk the library implements.
                     from sushi_lang.internals import errors as er
@@ -689,13 +748,13 @@ class SemanticAnalyzer:
         if self.generic_funcs is None or self.library_linker is None:
             return
 
-        from sushi_lang.internals.parser import parse_to_ast
         from sushi_lang.semantics.passes.collect import CollectorPass
 
         import sushi_lang.internals.errors as er
 
         for lib_name, manifest in self.library_linker.loaded_libraries.items():
             templates = manifest.get("templates") or {}
+            decoder = TemplateASTDecoder.for_templates(templates)
             for record in templates.get("generic_functions", []):
                 func_name = record["name"]
                 if func_name in self.generic_funcs.by_name:
@@ -713,10 +772,10 @@ class SemanticAnalyzer:
                 if not source:
                     continue
 
-                # Re-parse the self-contained template source and run a
-                # throwaway collector so any diagnostics from the library snippet
-                # never pollute the consumer's reporter.
-                program, _tree = parse_to_ast(source)
+                # Rebuild the self-contained template and run a throwaway
+                # collector so any diagnostics from the library snippet never
+                # pollute the consumer's reporter.
+                program = template_program(record, decoder)
                 throwaway = Reporter(source=source, filename=f"<template:{lib_name}:{func_name}>")
                 collected = CollectorPass(throwaway).run(program, unit_name=lib_name)
                 template_generic_funcs = collected.generic_funcs
@@ -747,11 +806,11 @@ class SemanticAnalyzer:
         if table is None or self.library_linker is None:
             return
 
-        from sushi_lang.internals.parser import parse_to_ast
         from sushi_lang.semantics.passes.collect import CollectorPass
 
         for lib_name, manifest in self.library_linker.loaded_libraries.items():
             templates = manifest.get("templates") or {}
+            decoder = TemplateASTDecoder.for_templates(templates)
             for record in templates.get(manifest_key, []):
                 type_name = record["name"]
                 if type_name in table.by_name:
@@ -761,7 +820,7 @@ class SemanticAnalyzer:
                 if not source:
                     continue
 
-                program, _tree = parse_to_ast(source)
+                program = template_program(record, decoder)
                 throwaway = Reporter(source=source, filename=f"<template:{lib_name}:{type_name}>")
                 collected = CollectorPass(throwaway).run(program, unit_name=lib_name)
                 template_table = getattr(collected, collected_attr)
@@ -17,8 +17,11 @@ if TYPE_CHECKING:
 _SRC_SUSHI_ROOT = Path(__file__).resolve().parent.parent / "sushi_stdlib" / "src_sushi"
 
 SOURCE_STDLIB_MODULES: Dict[str, Path] = {
+    "bench": _SRC_SUSHI_ROOT / "bench.sushi",
+    "collections/hashed": _SRC_SUSHI_ROOT / "collections" / "hashed.sushi",
     "collections/iter": _SRC_SUSHI_ROOT / "collections" / "iter.sushi",
     "encoding/msgpack": _SRC_SUSHI_ROOT / "encoding" / "msgpack.sushi",
+    "random": _SRC_SUSHI_ROOT / "random.sushi",
     "toolchain/slib": _SRC_SUSHI_ROOT / "toolchain" / "slib.sushi",
 }
 
@@ -56,7 +59,7 @@ class StdlibModule:
 # Stdlib functions whose last parameter is a native '...T' collecting variadic. Their
 # param spec's last entry is the collected DynamicArrayType(T); trailing call arguments
 # are collected (or a single `arr...` bloomed) into it, exactly like a user variadic.
-_VARIADIC_STDLIB = {("process", "run")}
+_VARIADIC_STDLIB = {("process", "run"), ("process", "run_input"), ("process", "spawn")}
 
 _param_specs_cache = None
 
@@ -66,7 +69,7 @@ def _get_param_specs():
     if _param_specs_cache is not None:
         return _param_specs_cache
 
-    from sushi_lang.semantics.typesys import BuiltinType, DynamicArrayType
+    from sushi_lang.semantics.typesys import BuiltinType, DynamicArrayType, StructType
     I32, I64, U64, F64, STRING = (
         BuiltinType.I32, BuiltinType.I64, BuiltinType.U64, BuiltinType.F64, BuiltinType.STRING
     )
@@ -77,6 +80,8 @@ def _get_param_specs():
     for fn in ("sleep", "msleep", "usleep"):
         specs[("time", fn)] = [I64]
     specs[("time", "nanosleep")] = [I64, I64]
+    for fn in ("now_ns", "monotonic_ns", "cpu_time_ns"):
+        specs[("time", fn)] = []
 
     specs[("env", "getenv")] = [STRING]
     specs[("env", "setenv")] = [STRING, STRING]
@@ -86,6 +91,13 @@ def _get_param_specs():
     specs[("process", "chdir")] = [STRING]
     specs[("process", "exit")] = [I32]
     specs[("process", "run")] = [STRING, STRING_ARRAY]
+    specs[("process", "run_input")] = [STRING, STRING, STRING_ARRAY]
+    specs[("process", "spawn")] = [STRING, STRING_ARRAY]
+    # Struct equality is by name, so the predefined ChildProcess matches without its fields.
+    CHILD = StructType(name="ChildProcess", fields=())
+    for fn in ("next_line", "close_stdin", "wait"):
+        specs[("process", fn)] = [CHILD]
+    specs[("process", "send")] = [CHILD, STRING]
 
     for fn in ("abs", "min", "max"):
         specs[("math", fn)] = None
@@ -200,9 +212,11 @@ class StdlibRegistry:
     ) -> None:
         """Discover functions using heuristic approach."""
         common_names = {
-            "time": ["sleep", "msleep", "usleep", "nanosleep"],
+            "time": ["sleep", "msleep", "usleep", "nanosleep",
+                     "now_ns", "monotonic_ns", "cpu_time_ns"],
             "env": ["getenv", "setenv"],
-            "process": ["getcwd", "chdir", "exit", "getpid", "getuid", "run"],
+            "process": ["getcwd", "chdir", "exit", "getpid", "getuid", "run", "run_input",
+                        "spawn", "next_line", "send", "close_stdin", "wait"],
             "math": [
                 "abs", "min", "max", "sqrt", "pow", "floor", "ceil", "round", "trunc",
                 "sin", "cos", "tan",
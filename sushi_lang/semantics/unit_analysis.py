@@ -0,0 +1,107 @@
+"""The per-unit result of scope, typecheck, lift and borrow, as the analysis cache stores it."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from sushi_lang.internals.report import Diagnostic
+    from sushi_lang.semantics.ast import Program
+    from sushi_lang.semantics.passes.collect import FuncSig
+    from sushi_lang.semantics.tables import SymbolTables
+    from sushi_lang.semantics.typesys import EnumType, StructType, Type
+
+
+@dataclass
+class UnitAnalysis:
+    """One unit after the per-unit passes: its stamped AST and what the passes left behind.
+
+    The passes are not pure over the AST. typecheck interns `Maybe@(T)` / `Result@(T, E)`
+    instances on demand, and lift registers an env struct and a function per lambda --
+    all into the WHOLE-PROGRAM tables, which codegen reads. Those additions ride along, in
+    table order, so a cache hit can put them back. So does the one write typecheck makes
+    to an EXISTING entry: a `Maybe@(T)` parameter resolved in the unit's own signature.
+    """
+    ast: Program
+    diagnostics: List[Diagnostic] = field(default_factory=list)
+    structs: List[Tuple[str, StructType]] = field(default_factory=list)
+    enums: List[Tuple[str, EnumType]] = field(default_factory=list)
+    funcs: List[Tuple[str, FuncSig]] = field(default_factory=list)
+    resolved_params: List[Tuple[str, int, Type]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class TableMark:
+    """The tables as a unit's passes found them: each `order`'s length, and the declared
+    parameter types of the unit's own signatures."""
+    structs: int
+    enums: int
+    funcs: int
+    param_types: Dict[str, Tuple[Type, ...]]
+
+
+def mark_tables(tables: SymbolTables, program: Program) -> TableMark:
+    param_types = {}
+    for fn in program.functions:
+        sig = tables.funcs.by_name.get(fn.name)
+        if sig is not None:
+            param_types[fn.name] = tuple(p.ty for p in sig.params)
+    return TableMark(len(tables.structs.order), len(tables.enums.order),
+                     len(tables.funcs.order), param_types)
+
+
+def capture_unit_analysis(program: Program, diagnostics: list, tables: SymbolTables,
+                          mark: TableMark) -> UnitAnalysis:
+    """Everything the per-unit passes added since `mark`."""
+    return UnitAnalysis(
+        ast=program,
+        diagnostics=list(diagnostics),
+        structs=[(name, tables.structs.by_name[name])
+                 for name in tables.structs.order[mark.structs:]],
+        enums=[(name, tables.enums.by_name[name])
+               for name in tables.enums.order[mark.enums:]],
+        funcs=[(name, tables.funcs.by_name[name])
+               for name in tables.funcs.order[mark.funcs:]],
+        resolved_params=[
+            (name, idx, param.ty)
+            for name, before in mark.param_types.items()
+            for idx, param in enumerate(tables.funcs.by_name[name].params)
+            if param.ty is not before[idx]
+        ],
+    )
+
+
+def replay_unit_analysis(analysis: UnitAnalysis, tables: SymbolTables) -> bool:
+    """Put a cached unit's table additions back. False (and no change) on a name clash.
+
+    A clash means another unit, analysed fresh in this build, took a name the cached
+    result relies on -- a lambda index, typically. Installing it anyway would alias the
+    two (#402), so the caller re-analyses the unit instead.
+    """
+    from sushi_lang.semantics.generics.hashing import register_enum_hash_method
+
+    for name, _struct in analysis.structs:
+        if name in tables.structs.by_name:
+            return False
+    for name, _sig in analysis.funcs:
+        if name in tables.funcs.by_name:
+            return False
+
+    for name, struct in analysis.structs:
+        tables.structs.by_name[name] = struct
+        tables.structs.order.append(name)
+    # An on-demand Maybe/Result another unit interned first is the same type by
+    # construction (same name, same payloads), so an existing entry simply stays.
+    for name, enum in analysis.enums:
+        if name in tables.enums.by_name:
+            continue
+        tables.enums.by_name[name] = enum
+        tables.enums.order.append(name)
+        register_enum_hash_method(enum)
+    for name, sig in analysis.funcs:
+        tables.funcs.by_name[name] = sig
+        tables.funcs.order.append(name)
+    # In place, as typecheck does it: another unit may already hold this FuncSig.
+    for name, idx, ty in analysis.resolved_params:
+        tables.funcs.by_name[name].params[idx].ty = ty
+    return True
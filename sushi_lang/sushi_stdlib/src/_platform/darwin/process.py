@@ -1,12 +1,16 @@
 """Platform-specific process control declarations for macOS."""
+from llvmlite import ir
 from sushi_lang.sushi_stdlib.src._platform.posix.process import (
     declare_getcwd,
     declare_chdir,
     declare_exit,
     declare_getpid,
     declare_getuid,
-    declare_tmpfile,
     declare_fileno,
+    declare_pipe,
+    declare_poll,
+    declare_fcntl,
+    declare_signal,
     declare_waitpid,
     declare_posix_spawnp,
     declare_posix_spawn_file_actions_init,
@@ -14,6 +18,32 @@ from sushi_lang.sushi_stdlib.src._platform.posix.process import (
     declare_posix_spawn_file_actions_destroy,
     get_environ,
 )
+from sushi_lang.sushi_stdlib.src.type_definitions import get_basic_types
+
+F_GETFL = 3
+F_SETFD = 2
+F_SETFL = 4
+FD_CLOEXEC = 1
+O_NONBLOCK = 0x0004
+
+POLLIN = 0x1
+POLLOUT = 0x4
+POLLERR = 0x8
+POLLHUP = 0x10
+
+SIGPIPE = 13
+
+EINTR = 4
+EAGAIN = 35
+
+
+def declare_errno_location(module: ir.Module) -> ir.Function:
+    """Declare __error: int *__error(void), the address of this thread's errno."""
+    if "__error" in module.globals:
+        return module.globals["__error"]
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    return ir.Function(module, ir.FunctionType(i32.as_pointer(), []), name="__error")
+
 
 __all__ = [
     "declare_getcwd",
@@ -21,8 +51,12 @@ __all__ = [
     "declare_exit",
     "declare_getpid",
     "declare_getuid",
-    "declare_tmpfile",
     "declare_fileno",
+    "declare_pipe",
+    "declare_poll",
+    "declare_fcntl",
+    "declare_signal",
+    "declare_errno_location",
     "declare_waitpid",
     "declare_posix_spawnp",
     "declare_posix_spawn_file_actions_init",
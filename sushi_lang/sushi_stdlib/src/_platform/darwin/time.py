@@ -1,8 +1,18 @@
 """Platform-specific time declarations for macOS."""
 from sushi_lang.sushi_stdlib.src._platform.posix.time import (
+    declare_clock_gettime,
     declare_nanosleep,
 )
 
+# clockid_t values for clock_gettime
+CLOCK_REALTIME = 0
+CLOCK_MONOTONIC = 6
+CLOCK_PROCESS_CPUTIME_ID = 12
+
 __all__ = [
+    "declare_clock_gettime",
     "declare_nanosleep",
+    "CLOCK_REALTIME",
+    "CLOCK_MONOTONIC",
+    "CLOCK_PROCESS_CPUTIME_ID",
 ]
@@ -1,6 +1,7 @@
 """Platform-specific file system declarations for Linux."""
 from sushi_lang.sushi_stdlib.src._platform.posix.files import (
     declare_stat,
+    declare_fstat,
     declare_access,
     declare_unlink,
     declare_rename,
@@ -10,6 +11,8 @@ from sushi_lang.sushi_stdlib.src._platform.posix.files import (
     declare_close,
     declare_mkdir,
     declare_rmdir,
+    declare_mmap,
+    declare_munmap,
 )
 
 O_RDONLY = 0
@@ -17,8 +20,18 @@ O_WRONLY = 1
 O_CREAT = 0x40
 O_TRUNC = 0x200
 
+# struct stat layout: the buffer stat()/fstat() fill, and where st_mode (u16) and
+# st_size (i64) sit in it.
+STAT_BUFFER_SIZE = 144
+STAT_MODE_OFFSET = 24
+STAT_SIZE_OFFSET = 48
+
+PROT_READ = 1
+MAP_PRIVATE = 2
+
 __all__ = [
     "declare_stat",
+    "declare_fstat",
     "declare_access",
     "declare_unlink",
     "declare_rename",
@@ -28,4 +41,6 @@ __all__ = [
     "declare_close",
     "declare_mkdir",
     "declare_rmdir",
+    "declare_mmap",
+    "declare_munmap",
 ]
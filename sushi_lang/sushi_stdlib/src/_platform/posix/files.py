@@ -14,6 +14,17 @@ def declare_stat(module: ir.Module) -> ir.Function:
         return ir.Function(module, func_type, name="stat")
 
 
+def declare_fstat(module: ir.Module) -> ir.Function:
+    """Declare POSIX fstat() syscall."""
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    func_type = ir.FunctionType(i32, [i32, i8_ptr])
+
+    try:
+        return module.get_global("fstat")
+    except KeyError:
+        return ir.Function(module, func_type, name="fstat")
+
+
 def declare_access(module: ir.Module) -> ir.Function:
     """Declare POSIX access() syscall."""
     i8, i8_ptr, i32, i64 = get_basic_types()
@@ -116,3 +127,25 @@ def declare_rmdir(module: ir.Module) -> ir.Function:
         return module.get_global("rmdir")
     except KeyError:
         return ir.Function(module, func_type, name="rmdir")
+
+
+def declare_mmap(module: ir.Module) -> ir.Function:
+    """Declare POSIX mmap(): `void *mmap(void *, size_t, int, int, int, off_t)`."""
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    func_type = ir.FunctionType(i8_ptr, [i8_ptr, i64, i32, i32, i32, i64])
+
+    try:
+        return module.get_global("mmap")
+    except KeyError:
+        return ir.Function(module, func_type, name="mmap")
+
+
+def declare_munmap(module: ir.Module) -> ir.Function:
+    """Declare POSIX munmap() syscall."""
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    func_type = ir.FunctionType(i32, [i8_ptr, i64])
+
+    try:
+        return module.get_global("munmap")
+    except KeyError:
+        return ir.Function(module, func_type, name="munmap")
@@ -61,23 +61,55 @@ def declare_getuid(module: ir.Module) -> ir.Function:
 
 
 # ==============================================================================
-# Subprocess spawning (used by run())
+# Subprocess spawning (used by run() and run_input())
 # ==============================================================================
 # These back the safe `run(cmd, args) -> Result<ProcessOutput, ProcessError>`
 # primitive. Implementation uses posix_spawnp (PATH-searched, no shell) with the
-# child's stdout/stderr redirected to tmpfile() handles via posix_spawn file
-# actions, then waitpid to collect the exit status. posix_spawnp reports an exec
-# failure (e.g. command not found -> ENOENT) directly in its return value on both
-# macOS (libSystem) and Linux (glibc/musl), so no self-pipe is needed.
+# child's stdin/stdout/stderr dup2'd onto pipes via posix_spawn file actions; the
+# parent drains the pipes in one poll() loop, then waitpid collects the exit status.
+# posix_spawnp reports an exec failure (e.g. command not found -> ENOENT) directly in
+# its return value on both macOS (libSystem) and Linux (glibc/musl), so no self-pipe
+# is needed.
 
 
-def declare_tmpfile(module: ir.Module) -> ir.Function:
-    """Declare tmpfile: FILE* tmpfile(void). Auto-unlinked on fclose."""
-    if "tmpfile" in module.globals:
-        return module.globals["tmpfile"]
+def declare_pipe(module: ir.Module) -> ir.Function:
+    """Declare pipe: int pipe(int fds[2])."""
+    if "pipe" in module.globals:
+        return module.globals["pipe"]
     i8, i8_ptr, i32, i64 = get_basic_types()
-    fn_ty = ir.FunctionType(i8_ptr, [])
-    return ir.Function(module, fn_ty, name="tmpfile")
+    fn_ty = ir.FunctionType(i32, [i32.as_pointer()])
+    return ir.Function(module, fn_ty, name="pipe")
+
+
+def declare_poll(module: ir.Module) -> ir.Function:
+    """Declare poll: int poll(struct pollfd *fds, nfds_t nfds, int timeout).
+
+    nfds_t is declared 64-bit: it is `unsigned long` on Linux, and macOS's `unsigned int`
+    reads the low half of the same register.
+    """
+    if "poll" in module.globals:
+        return module.globals["poll"]
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    fn_ty = ir.FunctionType(i32, [i8_ptr, i64, i32])
+    return ir.Function(module, fn_ty, name="poll")
+
+
+def declare_fcntl(module: ir.Module) -> ir.Function:
+    """Declare fcntl: int fcntl(int fd, int cmd, ...) -- variadic, as C declares it (#363)."""
+    if "fcntl" in module.globals:
+        return module.globals["fcntl"]
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    fn_ty = ir.FunctionType(i32, [i32, i32], var_arg=True)
+    return ir.Function(module, fn_ty, name="fcntl")
+
+
+def declare_signal(module: ir.Module) -> ir.Function:
+    """Declare signal: void (*signal(int sig, void (*handler)(int)))(int)."""
+    if "signal" in module.globals:
+        return module.globals["signal"]
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    fn_ty = ir.FunctionType(i8_ptr, [i32, i8_ptr])
+    return ir.Function(module, fn_ty, name="signal")
 
 
 def declare_fileno(module: ir.Module) -> ir.Function:
@@ -11,6 +11,7 @@ from sushi_lang.internals import errors as er
 
 from .intrinsics.utf8_count import emit_utf8_count_intrinsic
 from .intrinsics.utf8_byte_offset import emit_utf8_byte_offset_intrinsic
+from .intrinsics.substring_search import emit_substring_search_intrinsics
 from .intrinsics.char_ops import (
     emit_toupper_intrinsic,
     emit_tolower_intrinsic,
@@ -203,6 +204,7 @@ def generate_module_ir() -> ir.Module:
 
     emit_utf8_count_intrinsic(module)
     emit_utf8_byte_offset_intrinsic(module)
+    emit_substring_search_intrinsics(module)
     emit_toupper_intrinsic(module)
     emit_tolower_intrinsic(module)
     emit_isspace_intrinsic(module)
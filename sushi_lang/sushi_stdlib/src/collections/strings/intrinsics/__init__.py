@@ -29,6 +29,19 @@ def declare_utf8_byte_offset_intrinsic(module: ir.Module) -> ir.Function:
     return ir.Function(module, fn_ty, name=func_name)
 
 
+def declare_substring_search_intrinsic(module: ir.Module, reverse: bool = False) -> ir.Function:
+    """Declare the substring search intrinsic: first occurrence, or the last with `reverse`."""
+    func_name = "llvm_string_search_last" if reverse else "llvm_string_search"
+
+    if func_name in module.globals:
+        return module.globals[func_name]
+
+    i32 = ir.IntType(32)
+    i8_ptr = ir.IntType(8).as_pointer()
+    fn_ty = ir.FunctionType(i32, [i8_ptr, i32, i8_ptr, i32])
+    return ir.Function(module, fn_ty, name=func_name)
+
+
 def declare_toupper_intrinsic(module: ir.Module) -> ir.Function:
     """Declare the ASCII toupper intrinsic function."""
     func_name = "llvm_toupper"
@@ -0,0 +1,341 @@
+"""Substring Search Intrinsics
+
+One search engine behind `contains`, `find`, `find_last`, `count`, `replace` and `split`:
+
+- `i32 llvm_string_search(i8* hay, i32 hay_size, i8* needle, i32 needle_size)` returns the
+  byte offset of the first occurrence, or -1. A needle of up to SHORT_NEEDLE_MAX bytes is
+  found with memchr on its first byte and memcmp on the rest; a longer one with the
+  Crochemore-Perrin Two-Way algorithm, which is linear in the haystack whatever the input
+  and needs no table.
+- `i32 llvm_string_search_last(...)` returns the byte offset of the last occurrence: the
+  same Two-Way search, run over both strings back to front.
+
+An empty needle matches at offset 0 (first) or `hay_size` (last).
+"""
+
+from typing import Callable
+
+import llvmlite.ir as ir
+
+from sushi_lang.sushi_stdlib.src.libc_declarations import declare_memchr, declare_memcmp
+from . import declare_substring_search_intrinsic
+
+
+# Longest needle searched with memchr + memcmp. Its worst case is SHORT_NEEDLE_MAX
+# comparisons per haystack byte, which memchr's speed on real text more than repays.
+SHORT_NEEDLE_MAX = 8
+
+
+def emit_substring_search_intrinsics(module: ir.Module) -> None:
+    """Emit `llvm_string_search` and `llvm_string_search_last`."""
+    _emit_search(module, reverse=False)
+    _emit_search(module, reverse=True)
+
+
+def _emit_search(module: ir.Module, reverse: bool) -> ir.Function:
+    func = declare_substring_search_intrinsic(module, reverse)
+    if not func.is_declaration:
+        return func
+
+    i32 = ir.IntType(32)
+    hay, hay_size, needle, needle_size = func.args
+    hay.name, hay_size.name = "hay", "hay_size"
+    needle.name, needle_size.name = "needle", "needle_size"
+
+    entry_block = func.append_basic_block("entry")
+    size_check_block = func.append_basic_block("size_check")
+    two_way_block = func.append_basic_block("two_way")
+    not_found_block = func.append_basic_block("not_found")
+    empty_block = func.append_basic_block("empty_needle")
+
+    builder = ir.IRBuilder(entry_block)
+    is_empty = builder.icmp_signed("==", needle_size, ir.Constant(i32, 0), name="is_empty")
+    builder.cbranch(is_empty, empty_block, size_check_block)
+
+    builder.position_at_end(empty_block)
+    builder.ret(hay_size if reverse else ir.Constant(i32, 0))
+
+    builder.position_at_end(not_found_block)
+    builder.ret(ir.Constant(i32, -1))
+
+    builder.position_at_end(size_check_block)
+    too_long = builder.icmp_signed(">", needle_size, hay_size, name="too_long")
+    if reverse:
+        builder.cbranch(too_long, not_found_block, two_way_block)
+    else:
+        short_block = func.append_basic_block("short_needle")
+        length_check_block = func.append_basic_block("length_check")
+        builder.cbranch(too_long, not_found_block, length_check_block)
+
+        builder.position_at_end(length_check_block)
+        is_short = builder.icmp_signed("<=", needle_size, ir.Constant(i32, SHORT_NEEDLE_MAX), name="is_short")
+        builder.cbranch(is_short, short_block, two_way_block)
+
+        builder.position_at_end(short_block)
+        _emit_short_search(module, builder, func, not_found_block)
+
+    builder.position_at_end(two_way_block)
+    _TwoWay(builder, func, reverse, not_found_block).emit()
+
+    return func
+
+
+def _emit_short_search(module: ir.Module, builder: ir.IRBuilder, func: ir.Function,
+                       not_found_block: ir.Block) -> None:
+    """memchr to the next copy of the needle's first byte, memcmp for the rest."""
+    i32 = ir.IntType(32)
+    i64 = ir.IntType(64)
+    hay, hay_size, needle, needle_size = func.args
+
+    memchr = declare_memchr(module)
+    memcmp = declare_memcmp(module)
+
+    # Every match starts in hay[0 .. last_start].
+    last_start = builder.sub(hay_size, needle_size, name="last_start")
+    first_byte = builder.zext(builder.load(needle, name="first_byte"), i32, name="first_byte_i32")
+    rest_size = builder.zext(builder.sub(needle_size, ir.Constant(i32, 1)), i64, name="rest_size")
+    needle_rest = builder.gep(needle, [ir.Constant(i32, 1)], name="needle_rest")
+    hay_addr = builder.ptrtoint(hay, i64, name="hay_addr")
+    preheader = builder.block
+
+    scan_block = func.append_basic_block("short_scan")
+    verify_block = func.append_basic_block("short_verify")
+    next_block = func.append_basic_block("short_next")
+    found_block = func.append_basic_block("short_found")
+    builder.branch(scan_block)
+
+    builder.position_at_end(scan_block)
+    pos = builder.phi(i32, name="pos")
+    pos.add_incoming(ir.Constant(i32, 0), preheader)
+    span = builder.zext(builder.add(builder.sub(last_start, pos), ir.Constant(i32, 1)), i64, name="span")
+    hit = builder.call(memchr, [builder.gep(hay, [pos]), first_byte, span], name="hit")
+    no_hit = builder.icmp_unsigned("==", hit, ir.Constant(hit.type, None), name="no_hit")
+    builder.cbranch(no_hit, not_found_block, verify_block)
+
+    builder.position_at_end(verify_block)
+    offset = builder.trunc(builder.sub(builder.ptrtoint(hit, i64), hay_addr), i32, name="offset")
+    hit_rest = builder.gep(hit, [ir.Constant(i32, 1)], name="hit_rest")
+    cmp = builder.call(memcmp, [hit_rest, needle_rest, rest_size], name="cmp")
+    builder.cbranch(builder.icmp_signed("==", cmp, ir.Constant(i32, 0), name="rest_equal"),
+                    found_block, next_block)
+
+    builder.position_at_end(next_block)
+    next_pos = builder.add(offset, ir.Constant(i32, 1), name="next_pos")
+    pos.add_incoming(next_pos, next_block)
+    more = builder.icmp_signed("<=", next_pos, last_start, name="more")
+    builder.cbranch(more, scan_block, not_found_block)
+
+    builder.position_at_end(found_block)
+    builder.ret(offset)
+
+
+class _TwoWay:
+    """Emits the Two-Way search over `func`'s (hay, needle) arguments.
+
+    With `reverse`, logical index `i` reads byte `size - 1 - i`, so the search finds the
+    last occurrence; the result is turned back into a forward byte offset.
+    """
+
+    def __init__(self, builder: ir.IRBuilder, func: ir.Function, reverse: bool,
+                 not_found_block: ir.Block) -> None:
+        self.builder = builder
+        self.func = func
+        self.reverse = reverse
+        self.not_found_block = not_found_block
+        self.i32 = ir.IntType(32)
+        self.hay, self.hay_size, self.needle, self.needle_size = func.args
+        # Slots live in the entry block, where mem2reg promotes them.
+        self.entry_builder = ir.IRBuilder()
+        self.entry_builder.position_at_start(func.entry_basic_block)
+
+    def const(self, value: int) -> ir.Constant:
+        return ir.Constant(self.i32, value)
+
+    def slot(self, name: str, initial: ir.Value) -> ir.AllocaInstr:
+        slot = self.entry_builder.alloca(self.i32, name=name)
+        self.builder.store(initial, slot)
+        return slot
+
+    def needle_byte(self, index: ir.Value) -> ir.Value:
+        return self._byte(self.needle, self.needle_size, index, "x")
+
+    def hay_byte(self, index: ir.Value) -> ir.Value:
+        return self._byte(self.hay, self.hay_size, index, "y")
+
+    def _byte(self, data: ir.Value, size: ir.Value, index: ir.Value, name: str) -> ir.Value:
+        b = self.builder
+        if self.reverse:
+            index = b.sub(b.sub(size, self.const(1)), index, name=f"{name}_rev_index")
+        return b.load(b.gep(data, [index]), name=name)
+
+    def loop(self, name: str, cond: Callable[[], ir.Value], body: Callable[[], None]) -> None:
+        """`while (cond()) body()`; `body` may leave the loop by branching elsewhere."""
+        b = self.builder
+        cond_block = self.func.append_basic_block(f"{name}_cond")
+        body_block = self.func.append_basic_block(f"{name}_body")
+        end_block = self.func.append_basic_block(f"{name}_end")
+        b.branch(cond_block)
+
+        b.position_at_end(cond_block)
+        b.cbranch(cond(), body_block, end_block)
+
+        b.position_at_end(body_block)
+        body()
+        if b.block.terminator is None:
+            b.branch(cond_block)
+
+        b.position_at_end(end_block)
+
+    def and_then(self, name: str, first: Callable[[], ir.Value],
+                 second: Callable[[], ir.Value]) -> ir.Value:
+        """`first() && second()`, evaluating `second` only when `first` holds."""
+        b = self.builder
+        second_block = self.func.append_basic_block(f"{name}_rhs")
+        join_block = self.func.append_basic_block(f"{name}_join")
+        lhs = first()
+        lhs_block = b.block
+        b.cbranch(lhs, second_block, join_block)
+
+        b.position_at_end(second_block)
+        rhs = second()
+        rhs_block = b.block
+        b.branch(join_block)
+
+        b.position_at_end(join_block)
+        result = b.phi(ir.IntType(1), name=name)
+        result.add_incoming(ir.Constant(ir.IntType(1), 0), lhs_block)
+        result.add_incoming(rhs, rhs_block)
+        return result
+
+    def maximal_suffix(self, name: str, inverted: bool) -> tuple[ir.Value, ir.Value]:
+        """Start - 1 and period of the needle's maximal suffix, under `<` or its inverse."""
+        b = self.builder
+        m = self.needle_size
+        ms = self.slot(f"{name}_ms", self.const(-1))
+        j = self.slot(f"{name}_j", self.const(0))
+        k = self.slot(f"{name}_k", self.const(1))
+        p = self.slot(f"{name}_p", self.const(1))
+
+        def cond() -> ir.Value:
+            return b.icmp_signed("<", b.add(b.load(j), b.load(k)), m)
+
+        def body() -> None:
+            j_val, k_val, p_val, ms_val = b.load(j), b.load(k), b.load(p), b.load(ms)
+            a = self.needle_byte(b.add(j_val, k_val))
+            c = self.needle_byte(b.add(ms_val, k_val))
+            smaller = b.icmp_unsigned(">" if inverted else "<", a, c, name=f"{name}_smaller")
+            equal = b.icmp_unsigned("==", a, c, name=f"{name}_equal")
+
+            with b.if_else(smaller) as (then, otherwise):
+                with then:
+                    # The suffix continues to grow: skip the compared part.
+                    next_j = b.add(j_val, k_val)
+                    b.store(next_j, j)
+                    b.store(self.const(1), k)
+                    b.store(b.sub(next_j, ms_val), p)
+                with otherwise:
+                    with b.if_else(equal) as (same, larger):
+                        with same:
+                            # Advance through the current period, or restart one period on.
+                            at_period = b.icmp_signed("==", k_val, p_val)
+                            b.store(b.select(at_period, b.add(j_val, p_val), j_val), j)
+                            b.store(b.select(at_period, self.const(1), b.add(k_val, self.const(1))), k)
+                        with larger:
+                            # A new, larger suffix starts at j.
+                            b.store(j_val, ms)
+                            b.store(b.add(j_val, self.const(1)), j)
+                            b.store(self.const(1), k)
+                            b.store(self.const(1), p)
+
+        self.loop(name, cond, body)
+        return b.load(ms, name=f"{name}_start"), b.load(p, name=f"{name}_period")
+
+    def emit(self) -> None:
+        b = self.builder
+        m = self.needle_size
+        n = self.hay_size
+
+        # Critical factorization: the later of the two maximal suffixes.
+        ms1, p1 = self.maximal_suffix("suffix_lt", inverted=False)
+        ms2, p2 = self.maximal_suffix("suffix_gt", inverted=True)
+        use_first = b.icmp_signed(">", ms1, ms2, name="use_first")
+        suffix = b.add(b.select(use_first, ms1, ms2), self.const(1), name="suffix")
+        period = b.select(use_first, p1, p2, name="period")
+
+        # The needle is periodic when its prefix before the split recurs `period` on.
+        i = self.slot("i", self.const(0))
+        self.loop(
+            "periodic",
+            lambda: self.and_then(
+                "periodic_more",
+                lambda: b.icmp_signed("<", b.load(i), suffix),
+                lambda: b.icmp_unsigned(
+                    "==", self.needle_byte(b.load(i)), self.needle_byte(b.add(b.load(i), period))),
+            ),
+            lambda: b.store(b.add(b.load(i), self.const(1)), i),
+        )
+        periodic = b.icmp_signed(">=", b.load(i), suffix, name="periodic")
+
+        # A periodic needle shifts by its period and remembers the matched prefix; any
+        # other shifts past the longer half, which no shorter shift can match.
+        longer_half = b.select(b.icmp_signed(">", suffix, b.sub(m, suffix)), suffix, b.sub(m, suffix))
+        shift = b.select(periodic, period, b.add(longer_half, self.const(1)), name="shift")
+        memory_after = b.select(periodic, b.sub(m, period), self.const(0), name="memory_after")
+
+        memory = self.slot("memory", self.const(0))
+        pos = self.slot("pos", self.const(0))
+        last_start = b.sub(n, m, name="last_start")
+        found_block = self.func.append_basic_block("found")
+
+        def search_body() -> None:
+            j_val = b.load(pos)
+            mem_val = b.load(memory)
+            start = b.select(b.icmp_signed(">", suffix, mem_val), suffix, mem_val)
+            b.store(start, i)
+
+            # Right half, left to right.
+            self.loop(
+                "right",
+                lambda: self.and_then(
+                    "right_more",
+                    lambda: b.icmp_signed("<", b.load(i), m),
+                    lambda: b.icmp_unsigned(
+                        "==", self.needle_byte(b.load(i)), self.hay_byte(b.add(b.load(i), j_val))),
+                ),
+                lambda: b.store(b.add(b.load(i), self.const(1)), i),
+            )
+            right_matched = b.icmp_signed(">=", b.load(i), m, name="right_matched")
+
+            with b.if_else(right_matched) as (then, otherwise):
+                with then:
+                    # Left half, right to left, down to what the last shift remembered.
+                    b.store(b.sub(suffix, self.const(1)), i)
+                    self.loop(
+                        "left",
+                        lambda: self.and_then(
+                            "left_more",
+                            lambda: b.icmp_signed("<", mem_val, b.add(b.load(i), self.const(1))),
+                            lambda: b.icmp_unsigned(
+                                "==", self.needle_byte(b.load(i)), self.hay_byte(b.add(b.load(i), j_val))),
+                        ),
+                        lambda: b.store(b.sub(b.load(i), self.const(1)), i),
+                    )
+                    left_matched = b.icmp_signed("<", b.load(i), mem_val, name="left_matched")
+                    next_block = self.func.append_basic_block("left_mismatch")
+                    b.cbranch(left_matched, found_block, next_block)
+
+                    b.position_at_end(next_block)
+                    b.store(b.add(j_val, shift), pos)
+                    b.store(memory_after, memory)
+                with otherwise:
+                    b.store(b.add(j_val, b.add(b.sub(b.load(i), suffix), self.const(1))), pos)
+                    b.store(self.const(0), memory)
+
+        self.loop("search", lambda: b.icmp_signed("<=", b.load(pos), last_start), search_body)
+        b.branch(self.not_found_block)
+
+        b.position_at_end(found_block)
+        match = b.load(pos, name="match")
+        if self.reverse:
+            match = b.sub(b.sub(n, m), match, name="match_forward")
+        b.ret(match)
@@ -2,6 +2,8 @@
 
 import llvmlite.ir as ir
 from ..common import declare_malloc, declare_memcpy, build_string_struct
+from ..intrinsics import declare_substring_search_intrinsic
+from .search import emit_string_count
 from sushi_lang.sushi_stdlib.src.type_definitions import get_string_types
 
 
@@ -57,12 +59,13 @@ def emit_string_split(module: ir.Module) -> ir.Function:
             return func
 
     i8, i8_ptr, i32, i64, string_type = get_string_types()
-    i1 = ir.IntType(1)
     string_ptr = string_type.as_pointer()
     dyn_array_type = ir.LiteralStructType([i32, i32, string_ptr])  # {i32 len, i32 cap, string* data}
 
     malloc = declare_malloc(module)
     memcpy = declare_memcpy(module)
+    search = declare_substring_search_intrinsic(module)
+    string_count = emit_string_count(module)
 
     fn_ty = ir.FunctionType(dyn_array_type, [string_type, string_type])
     func = ir.Function(module, fn_ty, name=func_name)
@@ -72,15 +75,8 @@ def emit_string_split(module: ir.Module) -> ir.Function:
     entry_block = func.append_basic_block("entry")
     empty_delim_block = func.append_basic_block("empty_delim")
     normal_split_block = func.append_basic_block("normal_split")
-    count_loop_block = func.append_basic_block("count_loop")
-    count_check_block = func.append_basic_block("count_check")
-    count_match_block = func.append_basic_block("count_match")
-    count_continue_block = func.append_basic_block("count_continue")
-    count_done_block = func.append_basic_block("count_done")
     split_loop_block = func.append_basic_block("split_loop")
-    split_check_block = func.append_basic_block("split_check")
     split_match_block = func.append_basic_block("split_match")
-    split_continue_block = func.append_basic_block("split_continue")
     split_done_block = func.append_basic_block("split_done")
     return_block = func.append_basic_block("return")
 
@@ -106,174 +102,55 @@ def emit_string_split(module: ir.Module) -> ir.Function:
     result_empty = builder.insert_value(struct_empty_cap, array_data_empty_typed, 2, name="result_empty")
     builder.branch(return_block)
 
+    # One piece per delimiter, plus the tail.
     builder.position_at_end(normal_split_block)
-    count_ptr = builder.alloca(i32, name="count_ptr")
-    builder.store(ir.Constant(i32, 0), count_ptr)
-    pos_ptr = builder.alloca(i32, name="pos_ptr")
-    builder.store(ir.Constant(i32, 0), pos_ptr)
-    builder.branch(count_loop_block)
-
-    builder.position_at_end(count_loop_block)
-    pos = builder.load(pos_ptr, name="pos")
-    remaining = builder.sub(str_size, pos, name="remaining")
-    can_fit = builder.icmp_signed(">=", remaining, delim_size, name="can_fit")
-    builder.cbranch(can_fit, count_check_block, count_done_block)
-
-    builder.position_at_end(count_check_block)
-    match_ptr = builder.alloca(i1, name="match_ptr")
-    builder.store(ir.Constant(i1, 1), match_ptr)
-
-    cmp_idx_ptr = builder.alloca(i32, name="cmp_idx_ptr")
-    builder.store(ir.Constant(i32, 0), cmp_idx_ptr)
-
-    cmp_loop_block = func.append_basic_block("cmp_loop")
-    cmp_body_block = func.append_basic_block("cmp_body")
-    cmp_done_block = func.append_basic_block("cmp_done")
-
-    builder.branch(cmp_loop_block)
-
-    builder.position_at_end(cmp_loop_block)
-    cmp_idx = builder.load(cmp_idx_ptr, name="cmp_idx")
-    cmp_done = builder.icmp_signed("<", cmp_idx, delim_size, name="cmp_not_done")
-    builder.cbranch(cmp_done, cmp_body_block, cmp_done_block)
-
-    builder.position_at_end(cmp_body_block)
-    str_idx = builder.add(pos, cmp_idx, name="str_idx")
-    str_byte_ptr = builder.gep(str_data, [str_idx], name="str_byte_ptr")
-    str_byte = builder.load(str_byte_ptr, name="str_byte")
-    delim_byte_ptr = builder.gep(delim_data, [cmp_idx], name="delim_byte_ptr")
-    delim_byte = builder.load(delim_byte_ptr, name="delim_byte")
-    bytes_match = builder.icmp_signed("==", str_byte, delim_byte, name="bytes_match")
-
-    not_match = builder.select(bytes_match, ir.Constant(i1, 1), ir.Constant(i1, 0), name="not_match")
-    current_match = builder.load(match_ptr, name="current_match")
-    new_match = builder.and_(current_match, not_match, name="new_match")
-    builder.store(new_match, match_ptr)
-
-    next_cmp_idx = builder.add(cmp_idx, ir.Constant(i32, 1), name="next_cmp_idx")
-    builder.store(next_cmp_idx, cmp_idx_ptr)
-    builder.branch(cmp_loop_block)
-
-    builder.position_at_end(cmp_done_block)
-    final_match = builder.load(match_ptr, name="final_match")
-    builder.cbranch(final_match, count_match_block, count_continue_block)
-
-    builder.position_at_end(count_match_block)
-    count = builder.load(count_ptr, name="count")
-    new_count = builder.add(count, ir.Constant(i32, 1), name="new_count")
-    builder.store(new_count, count_ptr)
-    new_pos = builder.add(pos, delim_size, name="new_pos")
-    builder.store(new_pos, pos_ptr)
-    builder.branch(count_loop_block)
-
-    builder.position_at_end(count_continue_block)
-    next_pos = builder.add(pos, ir.Constant(i32, 1), name="next_pos")
-    builder.store(next_pos, pos_ptr)
-    builder.branch(count_loop_block)
-
-    builder.position_at_end(count_done_block)
-    final_count = builder.load(count_ptr, name="final_count")
+    final_count = builder.call(string_count, [func.args[0], func.args[1]], name="final_count")
     num_strings = builder.add(final_count, ir.Constant(i32, 1), name="num_strings")
 
     num_strings_i64 = builder.zext(num_strings, i64, name="num_strings_i64")
     array_bytes = builder.mul(num_strings_i64, string_size, name="array_bytes")
     array_data_raw = builder.call(malloc, [array_bytes], name="array_data_raw")
     array_data = builder.bitcast(array_data_raw, string_ptr, name="array_data")
-
-    builder.store(ir.Constant(i32, 0), pos_ptr)
-    array_idx_ptr = builder.alloca(i32, name="array_idx_ptr")
-    builder.store(ir.Constant(i32, 0), array_idx_ptr)
-    start_ptr = builder.alloca(i32, name="start_ptr")
-    builder.store(ir.Constant(i32, 0), start_ptr)
     builder.branch(split_loop_block)
 
+    # Each search resumes just past the previous delimiter; the piece before it is copied out.
     builder.position_at_end(split_loop_block)
-    pos2 = builder.load(pos_ptr, name="pos2")
-    remaining2 = builder.sub(str_size, pos2, name="remaining2")
-    can_fit2 = builder.icmp_signed(">=", remaining2, delim_size, name="can_fit2")
-    builder.cbranch(can_fit2, split_check_block, split_done_block)
-
-    builder.position_at_end(split_check_block)
-    match_ptr2 = builder.alloca(i1, name="match_ptr2")
-    builder.store(ir.Constant(i1, 1), match_ptr2)
-    cmp_idx_ptr2 = builder.alloca(i32, name="cmp_idx_ptr2")
-    builder.store(ir.Constant(i32, 0), cmp_idx_ptr2)
-
-    cmp_loop2_block = func.append_basic_block("cmp_loop2")
-    cmp_body2_block = func.append_basic_block("cmp_body2")
-    cmp_done2_block = func.append_basic_block("cmp_done2")
-
-    builder.branch(cmp_loop2_block)
-
-    builder.position_at_end(cmp_loop2_block)
-    cmp_idx2 = builder.load(cmp_idx_ptr2, name="cmp_idx2")
-    cmp_done2 = builder.icmp_signed("<", cmp_idx2, delim_size, name="cmp_not_done2")
-    builder.cbranch(cmp_done2, cmp_body2_block, cmp_done2_block)
-
-    builder.position_at_end(cmp_body2_block)
-    str_idx2 = builder.add(pos2, cmp_idx2, name="str_idx2")
-    str_byte_ptr2 = builder.gep(str_data, [str_idx2], name="str_byte_ptr2")
-    str_byte2 = builder.load(str_byte_ptr2, name="str_byte2")
-    delim_byte_ptr2 = builder.gep(delim_data, [cmp_idx2], name="delim_byte_ptr2")
-    delim_byte2 = builder.load(delim_byte_ptr2, name="delim_byte2")
-    bytes_match2 = builder.icmp_signed("==", str_byte2, delim_byte2, name="bytes_match2")
-
-    not_match2 = builder.select(bytes_match2, ir.Constant(i1, 1), ir.Constant(i1, 0), name="not_match2")
-    current_match2 = builder.load(match_ptr2, name="current_match2")
-    new_match2 = builder.and_(current_match2, not_match2, name="new_match2")
-    builder.store(new_match2, match_ptr2)
-
-    next_cmp_idx2 = builder.add(cmp_idx2, ir.Constant(i32, 1), name="next_cmp_idx2")
-    builder.store(next_cmp_idx2, cmp_idx_ptr2)
-    builder.branch(cmp_loop2_block)
-
-    builder.position_at_end(cmp_done2_block)
-    final_match2 = builder.load(match_ptr2, name="final_match2")
-    builder.cbranch(final_match2, split_match_block, split_continue_block)
+    start = builder.phi(i32, name="start")
+    array_idx = builder.phi(i32, name="array_idx")
+    start.add_incoming(ir.Constant(i32, 0), normal_split_block)
+    array_idx.add_incoming(ir.Constant(i32, 0), normal_split_block)
+    rest_data = builder.gep(str_data, [start], name="rest_data")
+    rest_size = builder.sub(str_size, start, name="rest_size")
+    offset = builder.call(search, [rest_data, rest_size, delim_data, delim_size], name="offset")
+    found = builder.icmp_signed(">=", offset, ir.Constant(i32, 0), name="found")
+    builder.cbranch(found, split_match_block, split_done_block)
 
-    builder.position_at_end(split_match_block)
-    start = builder.load(start_ptr, name="start")
-    substr_size = builder.sub(pos2, start, name="substr_size")
+    is_volatile = ir.Constant(ir.IntType(1), 0)
 
-    substr_size_i64 = builder.zext(substr_size, i64, name="substr_size_i64")
+    builder.position_at_end(split_match_block)
+    substr_size_i64 = builder.zext(offset, i64, name="substr_size_i64")
     substr_data_raw = builder.call(malloc, [substr_size_i64], name="substr_data_raw")
+    builder.call(memcpy, [substr_data_raw, rest_data, substr_size_i64, is_volatile])
 
-    start_ptr_gep = builder.gep(str_data, [start], name="start_ptr_gep")
-    is_volatile = ir.Constant(ir.IntType(1), 0)
-    builder.call(memcpy, [substr_data_raw, start_ptr_gep, builder.zext(substr_size, ir.IntType(64)), is_volatile])
-
-    substr_complete = build_string_struct(builder, string_type, substr_data_raw, substr_size, owned=1)
+    substr_complete = build_string_struct(builder, string_type, substr_data_raw, offset, owned=1)
 
-    array_idx = builder.load(array_idx_ptr, name="array_idx")
     array_elem_ptr = builder.gep(array_data, [array_idx], name="array_elem_ptr")
     builder.store(substr_complete, array_elem_ptr)
 
     next_array_idx = builder.add(array_idx, ir.Constant(i32, 1), name="next_array_idx")
-    builder.store(next_array_idx, array_idx_ptr)
-    new_pos2 = builder.add(pos2, delim_size, name="new_pos2")
-    builder.store(new_pos2, pos_ptr)
-    builder.store(new_pos2, start_ptr)
-    builder.branch(split_loop_block)
-
-    builder.position_at_end(split_continue_block)
-    next_pos2 = builder.add(pos2, ir.Constant(i32, 1), name="next_pos2")
-    builder.store(next_pos2, pos_ptr)
+    next_start = builder.add(builder.add(start, offset), delim_size, name="next_start")
+    start.add_incoming(next_start, split_match_block)
+    array_idx.add_incoming(next_array_idx, split_match_block)
     builder.branch(split_loop_block)
 
     builder.position_at_end(split_done_block)
-    final_start = builder.load(start_ptr, name="final_start")
-    final_substr_size = builder.sub(str_size, final_start, name="final_substr_size")
-
-    final_substr_size_i64 = builder.zext(final_substr_size, i64, name="final_substr_size_i64")
+    final_substr_size_i64 = builder.zext(rest_size, i64, name="final_substr_size_i64")
     final_substr_data_raw = builder.call(malloc, [final_substr_size_i64], name="final_substr_data_raw")
+    builder.call(memcpy, [final_substr_data_raw, rest_data, final_substr_size_i64, is_volatile])
 
-    final_start_ptr = builder.gep(str_data, [final_start], name="final_start_ptr")
-    builder.call(memcpy, [final_substr_data_raw, final_start_ptr, builder.zext(final_substr_size, ir.IntType(64)), is_volatile])
-
-    final_complete = build_string_struct(builder, string_type, final_substr_data_raw, final_substr_size, owned=1)
+    final_complete = build_string_struct(builder, string_type, final_substr_data_raw, rest_size, owned=1)
 
-    final_array_idx = builder.load(array_idx_ptr, name="final_array_idx")
-    final_array_elem_ptr = builder.gep(array_data, [final_array_idx], name="final_array_elem_ptr")
+    final_array_elem_ptr = builder.gep(array_data, [array_idx], name="final_array_elem_ptr")
     builder.store(final_complete, final_array_elem_ptr)
 
     undef_result = ir.Constant(dyn_array_type, ir.Undefined)
@@ -12,7 +12,7 @@ def generate_module_ir() -> ir.Module:
     """Generate standalone LLVM IR module for file methods."""
     from sushi_lang.sushi_stdlib.src.ir_common import create_stdlib_module
     from sushi_lang.sushi_stdlib.src.io.files.read import (
-        generate_read, generate_readln, generate_readch, generate_lines
+        generate_read, generate_mmap, generate_readln, generate_readch, generate_lines
     )
     from sushi_lang.sushi_stdlib.src.io.files.write import (
         generate_write, generate_writeln
@@ -31,6 +31,7 @@ def generate_module_ir() -> ir.Module:
     module = create_stdlib_module("io.files")
 
     generate_read(module)
+    generate_mmap(module)
     generate_readln(module)
     generate_readch(module)
     generate_lines(module)
@@ -59,6 +60,13 @@ def _validate_read(call: MethodCall, reporter: Any) -> None:
                name="file.read", expected=0, got=len(call.args))
 
 
+def _validate_mmap(call: MethodCall, reporter: Any) -> None:
+    """Validate mmap() method call on file."""
+    if call.args:
+        er.emit(reporter, er.ERR.CE2009, call.loc,
+               name="file.mmap", expected=0, got=len(call.args))
+
+
 def _validate_readln(call: MethodCall, reporter: Any) -> None:
     """Validate readln() method call on file."""
     if call.args:
@@ -190,7 +198,7 @@ def _validate_is_open(call: MethodCall, reporter: Any) -> None:
 def is_builtin_file_method(method_name: str) -> bool:
     """Check if a method name is a built-in file method."""
     return method_name in {
-        "read", "readln", "readch", "lines",
+        "read", "mmap", "readln", "readch", "lines",
         "write", "writeln",
         "read_bytes", "write_bytes",
         "seek", "tell",
@@ -204,6 +212,8 @@ def validate_builtin_file_method_with_validator(call: MethodCall, reporter: Any,
 
     if method_name == "read":
         _validate_read(call, reporter)
+    elif method_name == "mmap":
+        _validate_mmap(call, reporter)
     elif method_name == "readln":
         _validate_readln(call, reporter)
     elif method_name == "readch":
@@ -233,7 +243,7 @@ def validate_builtin_file_method_with_validator(call: MethodCall, reporter: Any,
 
 def get_builtin_file_method_return_type(method_name: str) -> Type | None:
     """Get the return type of a built-in file method."""
-    if method_name in {"read", "readln", "readch"}:
+    if method_name in {"read", "mmap", "readln", "readch"}:
         return BuiltinType.STRING
     elif method_name == "lines":
         return IteratorType(element_type=BuiltinType.STRING)
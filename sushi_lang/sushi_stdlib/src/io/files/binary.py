@@ -3,6 +3,7 @@
 import llvmlite.ir as ir
 from sushi_lang.sushi_stdlib.src.libc_declarations import declare_fread, declare_fwrite, declare_malloc
 from sushi_lang.sushi_stdlib.src.error_emission import emit_runtime_error
+from sushi_lang.sushi_stdlib.src.io.files.common import emit_remaining_size
 
 
 def generate_read_bytes(module: ir.Module) -> None:
@@ -29,7 +30,12 @@ def generate_read_bytes(module: ir.Module) -> None:
 
     array_slot = builder.alloca(array_struct_ty, name="read_bytes_array")
 
+    # A regular file never gives back more than what is left of it, so the buffer is
+    # sized to that rather than to a generous `count`.
     count_i64 = builder.zext(count_val, i64, name="count_i64")
+    is_regular, remaining = emit_remaining_size(module, builder, file_ptr)
+    clamped = builder.and_(is_regular, builder.icmp_unsigned('<', remaining, count_i64))
+    count_i64 = builder.select(clamped, remaining, count_i64, name="alloc_count")
     buffer = builder.call(malloc_fn, [count_i64])
 
     null_ptr = ir.Constant(i8_ptr, None)
@@ -55,7 +61,7 @@ def generate_read_bytes(module: ir.Module) -> None:
     builder.store(bytes_read_i32, len_ptr)
 
     cap_ptr = builder.gep(array_slot, [zero, ir.Constant(i32, 1)])
-    builder.store(count_val, cap_ptr)
+    builder.store(builder.trunc(count_i64, i32), cap_ptr)
 
     data_ptr = builder.gep(array_slot, [zero, ir.Constant(i32, 2)])
     builder.store(buffer, data_ptr)
@@ -2,10 +2,24 @@
 
 import llvmlite.ir as ir
 from sushi_lang.sushi_stdlib.src.libc_declarations import (
-    declare_malloc, declare_strlen, declare_fgetc,
-    declare_fgets, declare_realloc
+    declare_malloc, declare_free, declare_fgetc, declare_fread,
+    declare_ftell, declare_getline, declare_realloc
 )
-from sushi_lang.sushi_stdlib.src.string_helpers import cstr_to_fat_pointer
+from sushi_lang.sushi_stdlib.src.string_helpers import (
+    cstr_to_fat_pointer, cstr_to_fat_pointer_with_len
+)
+from sushi_lang.sushi_stdlib.src.type_definitions import get_basic_types
+from sushi_lang.sushi_stdlib.src._platform import get_platform_module
+from sushi_lang.sushi_stdlib.src.error_emission import emit_runtime_error
+
+S_IFMT = 0o170000
+S_IFREG = 0o100000
+
+# A string's size is an i32; a whole-file load past this is RE2024.
+STRING_SIZE_MAX = 0x7FFFFFFF
+
+# Starting buffer for a stream with no size to ask for (a pipe, a tty, a /proc file).
+READ_UNKNOWN_SIZE_HINT = 4096
 
 
 def allocate_and_read_line(
@@ -13,46 +27,51 @@ def allocate_and_read_line(
     builder: ir.IRBuilder,
     file_ptr: ir.Value
 ) -> ir.Value:
-    """Allocate buffer and read one line from file using fgets."""
+    """Read one line of any length from file using getline.
+
+    getline sizes the buffer to the line, which comes back as an owned string without its
+    '\n'. At EOF the buffer is freed and the result is an empty, unowned string.
+    """
     i8 = ir.IntType(8)
     i32 = ir.IntType(32)
     i64 = ir.IntType(64)
+    i8_ptr = i8.as_pointer()
 
-    fgets_fn = declare_fgets(module)
-    malloc_fn = declare_malloc(module)
-    strlen_fn = declare_strlen(module)
-
-    buffer_size_i64 = ir.Constant(i64, 1024)
-    buffer_size_i32 = ir.Constant(i32, 1024)
-    buffer = builder.call(malloc_fn, [buffer_size_i64])
-
-    builder.call(fgets_fn, [buffer, buffer_size_i32, file_ptr])
-
-    strlen_result = builder.call(strlen_fn, [buffer])
+    getline_fn = declare_getline(module)
+    free_fn = declare_free(module)
 
-    zero = ir.Constant(i32, 0)
-    has_chars = builder.icmp_signed('>', strlen_result, zero)
+    lineptr = builder.alloca(i8_ptr, name="lineptr")
+    capacity = builder.alloca(i64, name="capacity")
+    builder.store(ir.Constant(i8_ptr, None), lineptr)
+    builder.store(ir.Constant(i64, 0), capacity)
 
-    final_length = builder.alloca(i32, name="final_length")
-    builder.store(strlen_result, final_length)
+    bytes_read = builder.call(getline_fn, [lineptr, capacity, file_ptr], name="bytes_read")
+    is_eof = builder.icmp_signed('<', bytes_read, ir.Constant(i64, 0), name="is_eof")
 
-    with builder.if_then(has_chars):
-        one = ir.Constant(i32, 1)
-        last_index = builder.sub(strlen_result, one)
-        last_char_ptr = builder.gep(buffer, [last_index])
-        last_char = builder.load(last_char_ptr)
+    eof_block = builder.append_basic_block("readln_eof")
+    line_block = builder.append_basic_block("readln_line")
+    merge_block = builder.append_basic_block("readln_merge")
+    builder.cbranch(is_eof, eof_block, line_block)
 
-        newline = ir.Constant(i8, ord('\n'))
-        is_newline = builder.icmp_signed('==', last_char, newline)
+    # getline may allocate even when it reads nothing; free(NULL) is a no-op otherwise.
+    builder.position_at_end(eof_block)
+    builder.call(free_fn, [builder.load(lineptr)])
+    empty_line = cstr_to_fat_pointer_with_len(
+        builder, ir.Constant(i8_ptr, None), ir.Constant(i32, 0), owned=0)
+    builder.branch(merge_block)
 
-        with builder.if_then(is_newline):
-            null_char = ir.Constant(i8, 0)
-            builder.store(null_char, last_char_ptr)
-            builder.store(last_index, final_length)
+    builder.position_at_end(line_block)
+    from sushi_lang.sushi_stdlib.src.io.lines_inline import emit_line_length
+    data = builder.load(lineptr, name="line_data")
+    length = emit_line_length(builder, data, bytes_read, ir.Constant(ir.IntType(1), 0))
+    line = cstr_to_fat_pointer_with_len(builder, data, length, owned=1)
+    builder.branch(merge_block)
 
-    final_len_val = builder.load(final_length)
-    from sushi_lang.sushi_stdlib.src.string_helpers import cstr_to_fat_pointer_with_len
-    return cstr_to_fat_pointer_with_len(builder, buffer, final_len_val, owned=1)
+    builder.position_at_end(merge_block)
+    result = builder.phi(line.type, name="readln_result")
+    result.add_incoming(empty_line, eof_block)
+    result.add_incoming(line, line_block)
+    return result
 
 
 def allocate_and_read_char(
@@ -101,84 +120,135 @@ def allocate_and_read_char(
     return cstr_to_fat_pointer(module, builder, buffer, owned=1)
 
 
+def emit_file_stat(
+    module: ir.Module,
+    builder: ir.IRBuilder,
+    file_ptr: ir.Value
+) -> tuple[ir.Value, ir.Value, ir.Value]:
+    """fstat the stream's descriptor; returns (fd, is_regular, st_size).
+
+    A failed fstat reads as not regular, so callers fall back to streaming.
+    """
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    i16 = ir.IntType(16)
+    platform_files = get_platform_module('files')
+    fileno_fn = get_platform_module('process').declare_fileno(module)
+
+    fd = builder.call(fileno_fn, [file_ptr], name="fd")
+    stat_buffer = builder.alloca(ir.ArrayType(i8, platform_files.STAT_BUFFER_SIZE), name="stat_buffer")
+    stat_ptr = builder.bitcast(stat_buffer, i8_ptr, name="stat_ptr")
+    status = builder.call(platform_files.declare_fstat(module), [fd, stat_ptr], name="fstat_result")
+
+    mode_ptr = builder.gep(stat_ptr, [ir.Constant(i32, platform_files.STAT_MODE_OFFSET)])
+    mode = builder.load(builder.bitcast(mode_ptr, i16.as_pointer()), name="st_mode")
+    size_ptr = builder.gep(stat_ptr, [ir.Constant(i32, platform_files.STAT_SIZE_OFFSET)])
+    size = builder.load(builder.bitcast(size_ptr, i64.as_pointer()), name="st_size")
+
+    file_type = builder.and_(mode, ir.Constant(i16, S_IFMT), name="file_type")
+    is_regular = builder.and_(
+        builder.icmp_signed('==', status, ir.Constant(i32, 0)),
+        builder.icmp_unsigned('==', file_type, ir.Constant(i16, S_IFREG)),
+        name="is_regular")
+    return fd, is_regular, size
+
+
+def emit_remaining_size(
+    module: ir.Module,
+    builder: ir.IRBuilder,
+    file_ptr: ir.Value
+) -> tuple[ir.Value, ir.Value]:
+    """Bytes between the stream position and the end of a regular file.
+
+    Returns (is_regular, remaining); `remaining` is meaningless when the stream is not a
+    regular file, and clamps to 0 when the position is past the end.
+    """
+    i64 = ir.IntType(64)
+    _, is_regular, size = emit_file_stat(module, builder, file_ptr)
+    position = builder.call(declare_ftell(module), [file_ptr], name="position")
+    remaining = builder.sub(size, position, name="remaining")
+    past_end = builder.icmp_signed('<', remaining, ir.Constant(i64, 0))
+    remaining = builder.select(past_end, ir.Constant(i64, 0), remaining, name="remaining_clamped")
+    return is_regular, remaining
+
+
 def allocate_and_read_full_file(
     module: ir.Module,
     builder: ir.IRBuilder,
     file_ptr: ir.Value
 ) -> ir.Value:
-    """Allocate buffer and read entire file contents character by character."""
+    """Read the rest of the file into one owned string.
+
+    A regular file is sized up front with fstat, so its bytes arrive in one fread into one
+    exact allocation. Any other stream starts at READ_UNKNOWN_SIZE_HINT bytes and doubles.
+    The size is what fread returned, so embedded NUL bytes are kept.
+    """
     i8 = ir.IntType(8)
     i32 = ir.IntType(32)
     i64 = ir.IntType(64)
     i8_ptr = i8.as_pointer()
+    one = ir.Constant(i64, 1)
+    size_max = ir.Constant(i64, STRING_SIZE_MAX)
 
-    fgetc_fn = declare_fgetc(module)
     malloc_fn = declare_malloc(module)
     realloc_fn = declare_realloc(module)
+    fread_fn = declare_fread(module)
 
-    initial_size = 1024
-    capacity_ptr = builder.alloca(i32, name="read_capacity")
-    length_ptr = builder.alloca(i32, name="read_length")
-
-    initial_size_i64 = ir.Constant(i64, initial_size)
-    initial_size_i32 = ir.Constant(i32, initial_size)
-    buffer_ptr = builder.alloca(i8_ptr, name="read_buffer_ptr")
-    initial_buffer = builder.call(malloc_fn, [initial_size_i64])
-    builder.store(initial_buffer, buffer_ptr)
-    builder.store(initial_size_i32, capacity_ptr)
-    builder.store(ir.Constant(i32, 0), length_ptr)
-
-    loop_head = builder.append_basic_block("file_read_loop_head")
-    loop_body = builder.append_basic_block("file_read_loop_body")
-    loop_exit = builder.append_basic_block("file_read_loop_exit")
-
-    builder.branch(loop_head)
-
-    builder.position_at_end(loop_head)
-    ch = builder.call(fgetc_fn, [file_ptr])
-
-    eof_val = ir.Constant(i32, -1)
-    is_eof = builder.icmp_signed('==', ch, eof_val)
-    builder.cbranch(is_eof, loop_exit, loop_body)
-
-    builder.position_at_end(loop_body)
-    current_length = builder.load(length_ptr)
-    current_capacity = builder.load(capacity_ptr)
-    current_buffer = builder.load(buffer_ptr)
-
-    one = ir.Constant(i32, 1)
-    needed_capacity = builder.add(current_length, one)
-    needs_grow = builder.icmp_signed('>=', needed_capacity, current_capacity)
-
+    too_large_block = builder.append_basic_block("file_read_too_large")
+    no_memory_block = builder.append_basic_block("file_read_no_memory")
+    alloc_block = builder.append_basic_block("file_read_alloc")
+    loop_block = builder.append_basic_block("file_read_loop")
     grow_block = builder.append_basic_block("file_read_grow")
-    store_block = builder.append_basic_block("file_read_store")
-    builder.cbranch(needs_grow, grow_block, store_block)
+    grown_block = builder.append_basic_block("file_read_grown")
+    done_block = builder.append_basic_block("file_read_done")
+    finish_block = builder.append_basic_block("file_read_finish")
+
+    is_regular, remaining = emit_remaining_size(module, builder, file_ptr)
+    too_large = builder.and_(is_regular, builder.icmp_signed('>', remaining, size_max))
+    builder.cbranch(too_large, too_large_block, alloc_block)
+
+    builder.position_at_end(too_large_block)
+    emit_runtime_error(module, builder, "RE2024")
+
+    builder.position_at_end(no_memory_block)
+    emit_runtime_error(module, builder, "RE2021")
+
+    # One spare byte: the short read that proves EOF lands there, then the NUL does.
+    builder.position_at_end(alloc_block)
+    initial_capacity = builder.select(
+        is_regular, builder.add(remaining, one), ir.Constant(i64, READ_UNKNOWN_SIZE_HINT),
+        name="initial_capacity")
+    initial_buffer = builder.call(malloc_fn, [initial_capacity], name="read_buffer")
+    builder.cbranch(builder.icmp_unsigned('==', initial_buffer, ir.Constant(i8_ptr, None)),
+                    no_memory_block, loop_block)
+
+    builder.position_at_end(loop_block)
+    buffer = builder.phi(i8_ptr, name="buffer")
+    capacity = builder.phi(i64, name="capacity")
+    length = builder.phi(i64, name="length")
+    wanted = builder.sub(capacity, length, name="wanted")
+    got = builder.call(fread_fn, [builder.gep(buffer, [length]), one, wanted, file_ptr], name="got")
+    total = builder.add(length, got, name="total")
+    builder.cbranch(builder.icmp_unsigned('==', got, wanted), grow_block, done_block)
 
     builder.position_at_end(grow_block)
-    two = ir.Constant(i32, 2)
-    new_capacity = builder.mul(current_capacity, two)
-    new_capacity_i64 = builder.zext(new_capacity, i64, name="new_capacity_i64")
-    new_buffer = builder.call(realloc_fn, [current_buffer, new_capacity_i64])
-    builder.store(new_buffer, buffer_ptr)
-    builder.store(new_capacity, capacity_ptr)
-    builder.branch(store_block)
-
-    builder.position_at_end(store_block)
-    final_buffer = builder.load(buffer_ptr)
-    final_length = builder.load(length_ptr)
-    char_ptr = builder.gep(final_buffer, [final_length])
-    ch_i8 = builder.trunc(ch, i8)
-    builder.store(ch_i8, char_ptr)
-
-    new_length = builder.add(final_length, one)
-    builder.store(new_length, length_ptr)
-    builder.branch(loop_head)
-
-    builder.position_at_end(loop_exit)
-    final_buffer = builder.load(buffer_ptr)
-    final_length = builder.load(length_ptr)
-    null_ptr = builder.gep(final_buffer, [final_length])
-    null_char = ir.Constant(i8, 0)
-    builder.store(null_char, null_ptr)
-
-    return cstr_to_fat_pointer(module, builder, final_buffer, owned=1)
+    builder.cbranch(builder.icmp_signed('>', total, size_max), too_large_block, grown_block)
+
+    builder.position_at_end(grown_block)
+    grown_capacity = builder.mul(capacity, ir.Constant(i64, 2), name="grown_capacity")
+    grown_buffer = builder.call(realloc_fn, [buffer, grown_capacity], name="grown_buffer")
+    builder.cbranch(builder.icmp_unsigned('==', grown_buffer, ir.Constant(i8_ptr, None)),
+                    no_memory_block, loop_block)
+
+    buffer.add_incoming(initial_buffer, alloc_block)
+    buffer.add_incoming(grown_buffer, grown_block)
+    capacity.add_incoming(initial_capacity, alloc_block)
+    capacity.add_incoming(grown_capacity, grown_block)
+    length.add_incoming(ir.Constant(i64, 0), alloc_block)
+    length.add_incoming(total, grown_block)
+
+    builder.position_at_end(done_block)
+    builder.cbranch(builder.icmp_signed('>', total, size_max), too_large_block, finish_block)
+
+    builder.position_at_end(finish_block)
+    builder.store(ir.Constant(i8, 0), builder.gep(buffer, [total]))
+    return cstr_to_fat_pointer_with_len(builder, buffer, builder.trunc(total, i32), owned=1)
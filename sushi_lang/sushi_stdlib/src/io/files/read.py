@@ -2,11 +2,16 @@
 
 import llvmlite.ir as ir
 from sushi_lang.sushi_stdlib.src.io.files.common import (
+    STRING_SIZE_MAX,
     allocate_and_read_full_file,
     allocate_and_read_line,
-    allocate_and_read_char
+    allocate_and_read_char,
+    emit_file_stat,
 )
-from sushi_lang.sushi_stdlib.src.libc_declarations import declare_malloc
+from sushi_lang.sushi_stdlib.src._platform import get_platform_module
+from sushi_lang.sushi_stdlib.src.error_emission import emit_runtime_error
+from sushi_lang.sushi_stdlib.src.string_helpers import cstr_to_fat_pointer_with_len
+from sushi_lang.sushi_stdlib.src.type_definitions import STRING_OWNED_MAPPED
 
 
 def generate_read(module: ir.Module) -> None:
@@ -30,6 +35,67 @@ def generate_read(module: ir.Module) -> None:
     builder.ret(result)
 
 
+def generate_mmap(module: ir.Module) -> None:
+    """Generate IR for file.mmap() -> string
+
+    Maps the whole file read-only and returns it as a string view with owned =
+    STRING_OWNED_MAPPED, which the string destructor munmaps. A stream that cannot be
+    mapped -- not a regular file, an empty or /proc file (st_size 0), or a failed mmap --
+    falls back to read(). Must be generated after generate_read.
+    """
+    i8 = ir.IntType(8)
+    i32 = ir.IntType(32)
+    i64 = ir.IntType(64)
+    i8_ptr = i8.as_pointer()
+    string_struct_type = ir.LiteralStructType([i8_ptr, i32, ir.IntType(8)])  # {data, size, owned} (#145)
+
+    fn_ty = ir.FunctionType(string_struct_type, [i8_ptr])
+    fn = ir.Function(module, fn_ty, name="sushi_file_mmap")
+
+    bb = fn.append_basic_block("entry")
+    builder = ir.IRBuilder(bb)
+
+    file_ptr = fn.args[0]
+    file_ptr.name = "file_ptr"
+
+    platform_files = get_platform_module('files')
+    mmap_fn = platform_files.declare_mmap(module)
+
+    check_block = fn.append_basic_block("mmap_check_size")
+    too_large_block = fn.append_basic_block("mmap_too_large")
+    map_block = fn.append_basic_block("mmap_map")
+    mapped_block = fn.append_basic_block("mmap_mapped")
+    fallback_block = fn.append_basic_block("mmap_fallback")
+
+    fd, is_regular, size = emit_file_stat(module, builder, file_ptr)
+    mappable = builder.and_(is_regular, builder.icmp_signed('>', size, ir.Constant(i64, 0)))
+    builder.cbranch(mappable, check_block, fallback_block)
+
+    builder.position_at_end(check_block)
+    too_large = builder.icmp_signed('>', size, ir.Constant(i64, STRING_SIZE_MAX))
+    builder.cbranch(too_large, too_large_block, map_block)
+
+    builder.position_at_end(too_large_block)
+    emit_runtime_error(module, builder, "RE2024")
+
+    builder.position_at_end(map_block)
+    base = builder.call(mmap_fn, [
+        ir.Constant(i8_ptr, None), size,
+        ir.Constant(i32, platform_files.PROT_READ), ir.Constant(i32, platform_files.MAP_PRIVATE),
+        fd, ir.Constant(i64, 0)], name="base")
+    map_failed = builder.icmp_unsigned('==', base, ir.Constant(i64, -1).inttoptr(i8_ptr))
+    builder.cbranch(map_failed, fallback_block, mapped_block)
+
+    builder.position_at_end(mapped_block)
+    view = cstr_to_fat_pointer_with_len(
+        builder, base, builder.trunc(size, i32), owned=STRING_OWNED_MAPPED)
+    builder.ret(view)
+
+    builder.position_at_end(fallback_block)
+    read_fn = module.get_global("sushi_file_read")
+    builder.ret(builder.call(read_fn, [file_ptr], name="read_fallback"))
+
+
 def generate_readln(module: ir.Module) -> None:
     """Generate IR for file.readln() -> string"""
     i8 = ir.IntType(8)
@@ -74,10 +140,7 @@ def generate_readch(module: ir.Module) -> None:
 
 def generate_lines(module: ir.Module) -> None:
     """Generate IR for file.lines() -> Iterator<string>"""
-    malloc_fn = declare_malloc(module)
-
     i32 = ir.IntType(32)
-    i64 = ir.IntType(64)
     i8_ptr = ir.IntType(8).as_pointer()
     string_fat_ptr = ir.LiteralStructType([i8_ptr, i32, ir.IntType(8)])  # {data, size, owned} (#145)
 
@@ -92,32 +155,12 @@ def generate_lines(module: ir.Module) -> None:
     file_ptr = fn.args[0]
     file_ptr.name = "file_ptr"
 
-    iterator_slot = builder.alloca(iterator_struct_ty, name="file_lines_iter")
-
-    # For streaming file iterators, we need to store the FILE* pointer
-    # Create a "fake" fat pointer by storing FILE* in field 0 and 0 in field 1
-    # Allocate a fat pointer on the heap to store this
-    fat_ptr_size = ir.Constant(i64, 16)  # Size of {i8*, i32} = 8 + 4 (with padding)
-    file_ptr_storage = builder.call(malloc_fn, [fat_ptr_size], name="file_ptr_storage")
-    file_ptr_storage_typed = builder.bitcast(file_ptr_storage, string_fat_ptr.as_pointer(), name="file_ptr_ptr")
-
-    zero = ir.Constant(i32, 0)
-    one = ir.Constant(i32, 1)
-    field0_ptr = builder.gep(file_ptr_storage_typed, [zero, zero])
-    builder.store(file_ptr, field0_ptr)
-
-    field1_ptr = builder.gep(file_ptr_storage_typed, [zero, one])
-    builder.store(zero, field1_ptr)
-
-    index_ptr = builder.gep(iterator_slot, [zero, zero])
-    builder.store(zero, index_ptr)
-
-    length_ptr = builder.gep(iterator_slot, [zero, one])
-    builder.store(ir.Constant(i32, -1), length_ptr)
-
-    two = ir.Constant(i32, 2)
-    data_ptr_ptr = builder.gep(iterator_slot, [zero, two])
-    builder.store(file_ptr_storage_typed, data_ptr_ptr)
-
-    result = builder.load(iterator_slot)
+    # A streaming iterator: length -1, and the data field carries the FILE* itself (cast,
+    # never dereferenced as strings). stdin.lines() leaves it NULL. Nothing is allocated,
+    # so there is nothing for the iterator to free.
+    stream = builder.bitcast(file_ptr, string_fat_ptr.as_pointer(), name="stream")
+    result = ir.Constant(iterator_struct_ty, ir.Undefined)
+    result = builder.insert_value(result, ir.Constant(i32, 0), 0)
+    result = builder.insert_value(result, ir.Constant(i32, -1), 1)
+    result = builder.insert_value(result, stream, 2)
     builder.ret(result)
@@ -74,7 +74,7 @@ def _generate_stat_mode_check(module: ir.Module, sushi_name: str, s_iftype: int)
 
     null_term_path = func.args[0]
 
-    stat_buffer_type = ir.ArrayType(i8, 144)
+    stat_buffer_type = ir.ArrayType(i8, platform_files.STAT_BUFFER_SIZE)
     stat_buffer = builder.alloca(stat_buffer_type, name="stat_buffer")
     stat_buffer_ptr = builder.bitcast(stat_buffer, i8_ptr, name="stat_ptr")
 
@@ -93,8 +93,7 @@ def _generate_stat_mode_check(module: ir.Module, sushi_name: str, s_iftype: int)
 
     builder.position_at_end(success_bb)
 
-    platform = get_current_platform()
-    mode_offset = 4 if platform.is_darwin else 24
+    mode_offset = platform_files.STAT_MODE_OFFSET
 
     i16 = ir.IntType(16)
     i16_ptr = i16.as_pointer()
@@ -149,7 +148,7 @@ def generate_file_size(module: ir.Module) -> None:
 
     null_term_path = func.args[0]
 
-    stat_buffer_type = ir.ArrayType(i8, 144)
+    stat_buffer_type = ir.ArrayType(i8, platform_files.STAT_BUFFER_SIZE)
     stat_buffer = builder.alloca(stat_buffer_type, name="stat_buffer")
     stat_buffer_ptr = builder.bitcast(stat_buffer, i8_ptr, name="stat_ptr")
 
@@ -172,8 +171,7 @@ def generate_file_size(module: ir.Module) -> None:
 
     builder.position_at_end(success_bb)
 
-    platform = get_current_platform()
-    size_offset = 96 if platform.is_darwin else 48
+    size_offset = platform_files.STAT_SIZE_OFFSET
 
     i64_ptr = i64.as_pointer()
     i64_buffer_ptr = builder.bitcast(stat_buffer, i64_ptr)
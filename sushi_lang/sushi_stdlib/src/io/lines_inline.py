@@ -0,0 +1,44 @@
+"""Inline emission for the stdin.lines() / file.lines() foreach loop.
+
+The loop reads every line with `getline` into ONE buffer that getline grows and reuses,
+so a line of any length costs no allocation once the buffer fits it. The item is a
+borrowed view {data, size, owned=0} into that buffer: the checker already rejects a body
+that keeps a foreach item without `.clone()` (CE2411), so no view outlives its line.
+"""
+
+from typing import Any
+import llvmlite.ir as ir
+
+
+def emit_line_length(builder: ir.IRBuilder, data: ir.Value, bytes_read: ir.Value,
+                     strip_cr: ir.Value) -> ir.Value:
+    """Length of a `getline` line without its '\\n', and without a '\\r' before it when
+    `strip_cr` is set. `bytes_read` is getline's (positive) i64 result."""
+    i8 = ir.IntType(8)
+    i32 = ir.IntType(32)
+    one = ir.Constant(i32, 1)
+
+    size = builder.trunc(bytes_read, i32, name="line_read")
+    last = builder.load(builder.gep(data, [builder.sub(size, one)]), name="line_last")
+    has_lf = builder.icmp_unsigned('==', last, ir.Constant(i8, ord('\n')))
+    size = builder.sub(size, builder.zext(has_lf, i32), name="line_no_lf")
+
+    # Branch-free '\r' check: the index clamps to 0 on an empty line, which getline
+    # always backs with at least the '\n' it stripped.
+    nonempty = builder.icmp_signed('>', size, ir.Constant(i32, 0))
+    cr_index = builder.select(nonempty, builder.sub(size, one), ir.Constant(i32, 0))
+    cr = builder.load(builder.gep(data, [cr_index]), name="line_cr")
+    has_cr = builder.and_(builder.and_(strip_cr, has_lf), nonempty)
+    has_cr = builder.and_(has_cr, builder.icmp_unsigned('==', cr, ir.Constant(i8, ord('\r'))))
+    return builder.sub(size, builder.zext(has_cr, i32), name="line_len")
+
+
+def emit_next_line(codegen: Any, buffer_slot: ir.Value, capacity_slot: ir.Value,
+                   file_ptr: ir.Value) -> ir.Value:
+    """Read the next line into the loop's buffer; returns getline's i64 result (< 0 at EOF).
+
+    `buffer_slot` is the i8** field getline reallocates, `capacity_slot` its size_t.
+    """
+    assert codegen.runtime.libc_stdio.getline is not None
+    return codegen.builder.call(codegen.runtime.libc_stdio.getline,
+                                [buffer_slot, capacity_slot, file_ptr], name="bytes_read")
@@ -18,11 +18,13 @@ def generate_module_ir() -> ir.Module:
     )
     from sushi_lang.sushi_stdlib.src.io.stdio.stdout import (
         generate_stdout_write,
-        generate_stdout_write_bytes
+        generate_stdout_write_bytes,
+        generate_stdout_flush
     )
     from sushi_lang.sushi_stdlib.src.io.stdio.stderr import (
         generate_stderr_write,
-        generate_stderr_write_bytes
+        generate_stderr_write_bytes,
+        generate_stderr_flush
     )
     from sushi_lang.sushi_stdlib.src.io.stdio.iterators import (
         generate_stdin_lines
@@ -37,9 +39,11 @@ def generate_module_ir() -> ir.Module:
 
     generate_stdout_write(module)
     generate_stdout_write_bytes(module)
+    generate_stdout_flush(module)
 
     generate_stderr_write(module)
     generate_stderr_write_bytes(module)
+    generate_stderr_flush(module)
 
     return module
 
@@ -113,9 +117,16 @@ def _validate_write_bytes(call: MethodCall, stream_name: str, reporter: Any, val
                    index=1, expected="u8[]", got=display_type(arg_type))
 
 
+def _validate_flush(call: MethodCall, stream_name: str, reporter: Any) -> None:
+    """Validate flush() method call on stdout/stderr."""
+    if call.args:
+        er.emit(reporter, er.ERR.CE2009, call.loc,
+               name=f"{stream_name}.flush", expected=0, got=len(call.args))
+
+
 def is_builtin_stdio_method(method_name: str) -> bool:
     """Check if a method name is a built-in stdio method."""
-    return method_name in {"readln", "read", "lines", "write", "read_bytes", "write_bytes"}
+    return method_name in {"readln", "read", "lines", "write", "read_bytes", "write_bytes", "flush"}
 
 
 def validate_builtin_stdio_method_with_validator(call: MethodCall, stdio_type: BuiltinType,
@@ -140,6 +151,8 @@ def validate_builtin_stdio_method_with_validator(call: MethodCall, stdio_type: B
             _validate_write(call, "stdout", reporter, validator)
         elif method_name == "write_bytes":
             _validate_write_bytes(call, "stdout", reporter, validator)
+        elif method_name == "flush":
+            _validate_flush(call, "stdout", reporter)
         else:
             er.emit(reporter, er.ERR.CE2008, call.loc,
                    name=f"{display_type(stdio_type)}.{method_name}")
@@ -148,6 +161,8 @@ def validate_builtin_stdio_method_with_validator(call: MethodCall, stdio_type: B
             _validate_write(call, "stderr", reporter, validator)
         elif method_name == "write_bytes":
             _validate_write_bytes(call, "stderr", reporter, validator)
+        elif method_name == "flush":
+            _validate_flush(call, "stderr", reporter)
         else:
             er.emit(reporter, er.ERR.CE2008, call.loc,
                    name=f"{display_type(stdio_type)}.{method_name}")
@@ -163,6 +178,6 @@ def get_builtin_stdio_method_return_type(method_name: str, stdio_type: BuiltinTy
         return IteratorType(element_type=BuiltinType.STRING)
     elif method_name == "read_bytes":
         return DynamicArrayType(BuiltinType.U8)
-    elif method_name in {"write", "write_bytes"}:
+    elif method_name in {"write", "write_bytes", "flush"}:
         return BuiltinType.BLANK
     return None
@@ -1,7 +1,7 @@
 """stderr module - Standard error stream methods."""
 
 import llvmlite.ir as ir
-from sushi_lang.sushi_stdlib.src.libc_declarations import declare_fwrite
+from sushi_lang.sushi_stdlib.src.libc_declarations import declare_fflush, declare_fwrite
 from sushi_lang.sushi_stdlib.src.io.stdio.common import declare_stderr_handle
 
 
@@ -66,3 +66,21 @@ def generate_stderr_write_bytes(module: ir.Module) -> None:
 
     zero = ir.Constant(i32, 0)
     builder.ret(zero)
+
+
+def generate_stderr_flush(module: ir.Module) -> None:
+    """Generate IR for stderr.flush() -> ~."""
+    fflush_fn = declare_fflush(module)
+    stderr_handle = declare_stderr_handle(module)
+
+    i32 = ir.IntType(32)
+    func = ir.Function(module, ir.FunctionType(i32, []), name="sushi_stderr_flush")
+
+    block = func.append_basic_block(name="entry")
+    builder = ir.IRBuilder(block)
+
+    stderr_ptr = builder.load(stderr_handle, name="stderr")
+    builder.call(fflush_fn, [stderr_ptr])
+
+    zero = ir.Constant(i32, 0)
+    builder.ret(zero)
@@ -1,7 +1,7 @@
 """stdout module - Standard output stream methods."""
 
 import llvmlite.ir as ir
-from sushi_lang.sushi_stdlib.src.libc_declarations import declare_fwrite
+from sushi_lang.sushi_stdlib.src.libc_declarations import declare_fflush, declare_fwrite
 from sushi_lang.sushi_stdlib.src.io.stdio.common import declare_stdout_handle
 
 
@@ -66,3 +66,21 @@ def generate_stdout_write_bytes(module: ir.Module) -> None:
 
     zero = ir.Constant(i32, 0)
     builder.ret(zero)
+
+
+def generate_stdout_flush(module: ir.Module) -> None:
+    """Generate IR for stdout.flush() -> ~."""
+    fflush_fn = declare_fflush(module)
+    stdout_handle = declare_stdout_handle(module)
+
+    i32 = ir.IntType(32)
+    func = ir.Function(module, ir.FunctionType(i32, []), name="sushi_stdout_flush")
+
+    block = func.append_basic_block(name="entry")
+    builder = ir.IRBuilder(block)
+
+    stdout_ptr = builder.load(stdout_handle, name="stdout")
+    builder.call(fflush_fn, [stdout_ptr])
+
+    zero = ir.Constant(i32, 0)
+    builder.ret(zero)
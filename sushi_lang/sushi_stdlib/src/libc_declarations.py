@@ -47,6 +47,41 @@ def declare_memcpy(module: ir.Module) -> ir.Function:
     )
 
 
+def declare_memmove(module: ir.Module) -> ir.Function:
+    """Declare LLVM memmove intrinsic, for copies whose ranges may overlap."""
+    i8 = ir.IntType(8)
+    i64 = ir.IntType(64)
+
+    return module.declare_intrinsic(
+        'llvm.memmove',
+        [ir.PointerType(i8), ir.PointerType(i8), i64]
+    )
+
+
+def declare_memchr(module: ir.Module) -> ir.Function:
+    """Declare memchr: void* memchr(const void* s, int c, size_t n)"""
+    if "memchr" in module.globals:
+        return module.globals["memchr"]
+
+    i32 = ir.IntType(32)
+    i64 = ir.IntType(64)
+    i8_ptr = ir.IntType(8).as_pointer()
+    fn_ty = ir.FunctionType(i8_ptr, [i8_ptr, i32, i64])
+    return ir.Function(module, fn_ty, name="memchr")
+
+
+def declare_memcmp(module: ir.Module) -> ir.Function:
+    """Declare memcmp: int memcmp(const void* s1, const void* s2, size_t n)"""
+    if "memcmp" in module.globals:
+        return module.globals["memcmp"]
+
+    i32 = ir.IntType(32)
+    i64 = ir.IntType(64)
+    i8_ptr = ir.IntType(8).as_pointer()
+    fn_ty = ir.FunctionType(i32, [i8_ptr, i8_ptr, i64])
+    return ir.Function(module, fn_ty, name="memcmp")
+
+
 def declare_strlen(module: ir.Module) -> ir.Function:
     """Declare strlen as external (implementation emitted during final compilation)."""
     func_name = "llvm_strlen"
@@ -292,6 +327,17 @@ def declare_feof(module: ir.Module) -> ir.Function:
     return ir.Function(module, fn_ty, name="feof")
 
 
+def declare_fflush(module: ir.Module) -> ir.Function:
+    """Declare fflush: int fflush(FILE* stream)"""
+    if "fflush" in module.globals:
+        return module.globals["fflush"]
+
+    i32 = ir.IntType(32)
+    i8_ptr = ir.IntType(8).as_pointer()
+    fn_ty = ir.FunctionType(i32, [i8_ptr])
+    return ir.Function(module, fn_ty, name="fflush")
+
+
 def declare_exit(module: ir.Module) -> ir.Function:
     """Declare exit: void exit(int status)"""
     if "exit" in module.globals:
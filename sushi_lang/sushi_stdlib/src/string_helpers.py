@@ -69,7 +69,7 @@ def cstr_to_fat_pointer_with_len(
     undef_struct = ir.Constant(string_struct_type, ir.Undefined)
     struct_with_data = builder.insert_value(undef_struct, c_str, 0, name="str_with_data")
     struct_with_size = builder.insert_value(struct_with_data, length, 1, name="str_with_size")
-    struct_complete = builder.insert_value(struct_with_size, ir.Constant(i8, 1 if owned else 0), 2, name="str_complete")
+    struct_complete = builder.insert_value(struct_with_size, ir.Constant(i8, int(owned)), 2, name="str_complete")
 
     return struct_complete
 
@@ -9,6 +9,12 @@ from sushi_lang.sushi_stdlib.src.sys.process.functions import (
     generate_getpid,
     generate_getuid,
     generate_run,
+    generate_run_input,
+    generate_spawn,
+    generate_next_line,
+    generate_send,
+    generate_close_stdin,
+    generate_wait,
 )
 
 
@@ -19,6 +25,12 @@ PROCESS_FUNCTIONS = {
     'getpid',
     'getuid',
     'run',
+    'run_input',
+    'spawn',
+    'next_line',
+    'send',
+    'close_stdin',
+    'wait',
 }
 
 
@@ -37,8 +49,14 @@ def get_builtin_process_function_return_type(name: str):
     # shape getenv has always used for its Maybe<string>.
     if name == 'getcwd':
         return GenericTypeRef("Result", (BuiltinType.STRING, UnknownType("ProcessError")))
-    elif name == 'run':
+    elif name in ('run', 'run_input', 'wait'):
         return GenericTypeRef("Result", (UnknownType("ProcessOutput"), UnknownType("ProcessError")))
+    elif name == 'spawn':
+        return GenericTypeRef("Result", (UnknownType("ChildProcess"), UnknownType("ProcessError")))
+    elif name == 'next_line':
+        return GenericTypeRef("Maybe", (BuiltinType.STRING,))
+    elif name in ('send', 'close_stdin'):
+        return BuiltinType.BOOL
     elif name == 'chdir':
         return GenericTypeRef("Result", (BuiltinType.I32, UnknownType("ProcessError")))
     elif name == 'exit':
@@ -65,6 +83,30 @@ def validate_process_function_call(name: str, signature) -> None:
         if signature.params[0].param_type != BuiltinType.STRING:
             raise TypeError(f"run() first argument must be string, got {signature.params[0].param_type}")
 
+    elif name == 'run_input':
+        if len(signature.params) != 3:
+            raise TypeError(f"run_input() takes 3 arguments (string cmd, string input, string[] args), got {len(signature.params)}")
+        if signature.params[0].param_type != BuiltinType.STRING:
+            raise TypeError(f"run_input() first argument must be string, got {signature.params[0].param_type}")
+        if signature.params[1].param_type != BuiltinType.STRING:
+            raise TypeError(f"run_input() second argument must be string, got {signature.params[1].param_type}")
+
+    elif name == 'spawn':
+        if len(signature.params) != 2:
+            raise TypeError(f"spawn() takes 2 arguments (string cmd, string[] args), got {len(signature.params)}")
+        if signature.params[0].param_type != BuiltinType.STRING:
+            raise TypeError(f"spawn() first argument must be string, got {signature.params[0].param_type}")
+
+    elif name in ('next_line', 'close_stdin', 'wait'):
+        if len(signature.params) != 1:
+            raise TypeError(f"{name}() takes 1 argument (ChildProcess child), got {len(signature.params)}")
+
+    elif name == 'send':
+        if len(signature.params) != 2:
+            raise TypeError(f"send() takes 2 arguments (ChildProcess child, string data), got {len(signature.params)}")
+        if signature.params[1].param_type != BuiltinType.STRING:
+            raise TypeError(f"send() second argument must be string, got {signature.params[1].param_type}")
+
     elif name == 'chdir':
         if len(signature.params) != 1:
             raise TypeError(f"chdir() takes 1 argument (string path), got {len(signature.params)}")
@@ -99,5 +141,11 @@ def generate_module_ir() -> ir.Module:
     generate_getpid(module)
     generate_getuid(module)
     generate_run(module)
+    generate_run_input(module)
+    generate_spawn(module)
+    generate_next_line(module)
+    generate_send(module)
+    generate_close_stdin(module)
+    generate_wait(module)
 
     return module
@@ -2,13 +2,15 @@
 
 from llvmlite import ir
 from sushi_lang.sushi_stdlib.src.type_definitions import (
-    get_basic_types, get_string_type, get_result_type, get_unit_enum_type,
+    get_basic_types, get_string_type, get_result_type, get_maybe_type, get_unit_enum_type,
     get_process_output_type, get_process_output_result_type,
+    get_child_process_type, get_child_process_result_type,
 )
 from sushi_lang.sushi_stdlib.src.string_helpers import fat_pointer_to_cstr, cstr_to_fat_pointer_with_len
+from sushi_lang.sushi_stdlib.src.error_emission import emit_runtime_error
 from sushi_lang.sushi_stdlib.src.libc_declarations import (
-    declare_malloc, declare_free, declare_strlen,
-    declare_fread, declare_fseek, declare_ftell, declare_fclose,
+    declare_malloc, declare_free, declare_realloc, declare_strlen, declare_fflush,
+    declare_memchr, declare_memcpy, declare_memmove,
 )
 from sushi_lang.sushi_stdlib.src._platform import get_platform_module
 
@@ -17,6 +19,14 @@ _PE_SPAWN_FAILED = 0
 _PE_EXIT_FAILURE = 1
 _PE_SIGNAL_RECEIVED = 2
 
+# Index of each child stream in run()'s pollfd array, which is also its fd in the child.
+_STDIN = 0
+_STDOUT = 1
+_STDERR = 2
+
+# First size of each output capture buffer; it doubles as the child writes more.
+_CAPTURE_INITIAL_CAPACITY = 4096
+
 
 def get_process_error_type() -> ir.LiteralStructType:
     """Get the ProcessError enum LLVM type."""
@@ -175,93 +185,91 @@ def generate_getuid(module: ir.Module) -> None:
 
 def generate_run(module: ir.Module) -> None:
     """Generate run(string cmd, string[] args) -> Result<ProcessOutput, ProcessError>."""
+    _generate_run(module, "sushi_run", with_input=False)
+
+
+def generate_run_input(module: ir.Module) -> None:
+    """Generate run_input(string cmd, string input, string[] args) -> Result<ProcessOutput, ProcessError>."""
+    _generate_run(module, "sushi_run_input", with_input=True)
+
+
+def _ret_process_err(b: ir.IRBuilder, result_type: ir.Type, variant_tag: int) -> None:
+    """Return Result.Err(ProcessError.<variant_tag>) from the current function."""
+    i32 = ir.IntType(32)
+    err_type = get_process_error_type()
+    z = ir.Constant(i32, 0)
+    res = b.alloca(result_type)
+    b.store(ir.Constant(i32, 1), b.gep(res, [z, z]))               # Result tag = Err
+    ev = b.alloca(err_type)
+    b.store(ir.Constant(i32, variant_tag), b.gep(ev, [z, z]))       # ProcessError variant tag
+    # Zero the unit enum's [1 x i64] data word (#300 phase 2)
+    b.store(ir.Constant(err_type.elements[1], None), b.gep(ev, [z, ir.Constant(i32, 1)]))
+    data = b.bitcast(b.gep(res, [z, ir.Constant(i32, 1)]), err_type.as_pointer())
+    b.store(b.load(ev), data)
+    b.ret(b.load(res))
+
+
+def _check_alloc(module: ir.Module, func: ir.Function, b: ir.IRBuilder, ptr: ir.Value,
+                 label: str) -> None:
+    """Stop with RE2021 if `ptr` is null, leaving `b` on the success path.
+
+    Out of memory is RE2021, as in every other allocating stdlib function.
+    """
+    fail = func.append_basic_block(f"{label}_alloc_fail")
+    ok = func.append_basic_block(f"{label}_alloc_ok")
+    b.cbranch(b.icmp_unsigned('==', ptr, ir.Constant(ptr.type, None)), fail, ok)
+    b.position_at_end(fail)
+    emit_runtime_error(module, b, "RE2021")
+    b.position_at_end(ok)
+
+
+def _errno_is(module: ir.Module, b: ir.IRBuilder, *codes: int) -> ir.Value:
+    i32 = ir.IntType(32)
+    errno_fn = get_platform_module('process').declare_errno_location(module)
+    err = b.load(b.call(errno_fn, []))
+    hit = ir.Constant(ir.IntType(1), 0)
+    for code in codes:
+        hit = b.or_(hit, b.icmp_signed('==', err, ir.Constant(i32, code)))
+    return hit
+
+
+def _emit_spawnp(module: ir.Module, func: ir.Function, b: ir.IRBuilder, cmd_arg: ir.Value,
+                 args_arg: ir.Value, child_fds, pid_slot: ir.Value, check_alloc) -> ir.Value:
+    """Spawn `cmd` on PATH with `args`, and return posix_spawnp's result code.
+
+    Each `(fd, target)` of `child_fds` is dup2'd onto the child's `target` descriptor. The
+    argv built for the call is freed again before this returns, with `b` left after it.
+    """
     i8, i8_ptr, i32, i64 = get_basic_types()
     string_type = get_string_type()
-    out_type = get_process_output_type()                 # {i32, string, string}
-    err_type = get_process_error_type()                  # unit enum {i32, [1 x i64]}, 16 bytes
-    result_type = get_process_output_result_type()       # {i32, [5 x i64]} (aligned; matches compiler)
     argv_type = ir.LiteralStructType([i32, i32, string_type.as_pointer()])  # string[]
     char_pp = i8_ptr.as_pointer()
+    z = ir.Constant(i32, 0)
+    one_i32 = ir.Constant(i32, 1)
+    null_i8ptr = ir.Constant(i8_ptr, None)
 
     plat = get_platform_module('process')
-    tmpfile_fn = plat.declare_tmpfile(module)
-    fileno_fn = plat.declare_fileno(module)
-    waitpid_fn = plat.declare_waitpid(module)
     spawnp_fn = plat.declare_posix_spawnp(module)
     fa_init_fn = plat.declare_posix_spawn_file_actions_init(module)
     fa_dup2_fn = plat.declare_posix_spawn_file_actions_adddup2(module)
     fa_destroy_fn = plat.declare_posix_spawn_file_actions_destroy(module)
     environ_g = plat.get_environ(module)
-
+    fflush_fn = declare_fflush(module)
     malloc_fn = declare_malloc(module)
     free_fn = declare_free(module)
-    fread_fn = declare_fread(module)
-    fseek_fn = declare_fseek(module)
-    ftell_fn = declare_ftell(module)
-    fclose_fn = declare_fclose(module)
-
-    func = ir.Function(module, ir.FunctionType(result_type, [string_type, argv_type]), name="sushi_run")
-    cmd_arg, args_arg = func.args
-    cmd_arg.name = "cmd"
-    args_arg.name = "args"
-
-    z = ir.Constant(i32, 0)
-    one_i32 = ir.Constant(i32, 1)
-    null_i8ptr = ir.Constant(i8_ptr, None)
 
-    entry = func.append_basic_block("entry")
-    tmpfile_fail = func.append_basic_block("tmpfile_fail")
-    setup = func.append_basic_block("setup")
     argv_cond = func.append_basic_block("argv_cond")
     argv_body = func.append_basic_block("argv_body")
     argv_done = func.append_basic_block("argv_done")
     free_cond = func.append_basic_block("free_cond")
     free_body = func.append_basic_block("free_body")
     free_done = func.append_basic_block("free_done")
-    spawn_err = func.append_basic_block("spawn_err")
-    spawned = func.append_basic_block("spawned")
-    signaled = func.append_basic_block("signaled")
-    exited = func.append_basic_block("exited")
-
-    b = ir.IRBuilder(entry)
-
-    def emit_err(variant_tag: int) -> None:
-        res = b.alloca(result_type)
-        b.store(ir.Constant(i32, 1), b.gep(res, [z, z]))          # Result tag = Err
-        ev = b.alloca(err_type)
-        b.store(ir.Constant(i32, variant_tag), b.gep(ev, [z, z]))  # ProcessError variant tag
-        # Zero the unit enum's [1 x i64] data word (#300 phase 2)
-        b.store(ir.Constant(err_type.elements[1], None), b.gep(ev, [z, one_i32]))
-        data = b.bitcast(b.gep(res, [z, one_i32]), err_type.as_pointer())
-        b.store(b.load(ev), data)
-        b.ret(b.load(res))
-
-    def emit_read_all(f) -> ir.Value:
-        b.call(fseek_fn, [f, ir.Constant(i64, 0), ir.Constant(i32, 2)])   # SEEK_END
-        n64 = b.call(ftell_fn, [f])
-        b.call(fseek_fn, [f, ir.Constant(i64, 0), ir.Constant(i32, 0)])   # SEEK_SET (rewind)
-        buf = b.call(malloc_fn, [b.add(n64, ir.Constant(i64, 1))])
-        b.call(fread_fn, [buf, ir.Constant(i64, 1), n64, f])
-        b.store(ir.Constant(i8, 0), b.gep(buf, [n64]))                    # NUL terminate
-        return cstr_to_fat_pointer_with_len(b, buf, b.trunc(n64, i32), owned=1)
 
     args_slot = b.alloca(argv_type)
     i_slot = b.alloca(i32)
     j_slot = b.alloca(i32)
-    pid_slot = b.alloca(i32)
-    status_slot = b.alloca(i32)
     fa_buf = b.alloca(ir.ArrayType(i8, 128))          # opaque posix_spawn_file_actions_t (conservative size)
     b.store(args_arg, args_slot)
-    out_file = b.call(tmpfile_fn, [])
-    err_file = b.call(tmpfile_fn, [])
-    out_bad = b.icmp_unsigned('==', out_file, null_i8ptr)
-    err_bad = b.icmp_unsigned('==', err_file, null_i8ptr)
-    b.cbranch(b.or_(out_bad, err_bad), tmpfile_fail, setup)
-
-    b.position_at_end(tmpfile_fail)
-    emit_err(_PE_SPAWN_FAILED)
-
-    b.position_at_end(setup)
     cmd_cstr = fat_pointer_to_cstr(module, b, cmd_arg)
     arg_len = b.load(b.gep(args_slot, [z, z]))                    # args.len
     arg_data = b.load(b.gep(args_slot, [z, ir.Constant(i32, 2)]))  # args.data : string*
@@ -269,6 +277,7 @@ def generate_run(module: ir.Module) -> None:
     slots = b.add(argc, one_i32)                                  # + NULL terminator
     argv_bytes = b.mul(b.zext(slots, i64), ir.Constant(i64, 8))
     argv_raw = b.call(malloc_fn, [argv_bytes])
+    check_alloc(argv_raw, "argv")
     argv = b.bitcast(argv_raw, char_pp)
     b.store(cmd_cstr, b.gep(argv, [z]))                           # argv[0]
     b.store(z, i_slot)
@@ -290,9 +299,12 @@ def generate_run(module: ir.Module) -> None:
     b.store(null_i8ptr, b.gep(argv, [argc]))                      # argv[argc] = NULL
     fa = b.bitcast(fa_buf, i8_ptr)
     b.call(fa_init_fn, [fa])
-    b.call(fa_dup2_fn, [fa, b.call(fileno_fn, [out_file]), ir.Constant(i32, 1)])  # child stdout -> out_file
-    b.call(fa_dup2_fn, [fa, b.call(fileno_fn, [err_file]), ir.Constant(i32, 2)])  # child stderr -> err_file
+    for fd, target in child_fds:
+        b.call(fa_dup2_fn, [fa, fd, ir.Constant(i32, target)])
     envp = b.load(environ_g)
+    # Flush every stream first: stdout may be holding a whole buffer, and a prompt
+    # printed before a child that reads the inherited terminal has to be on screen.
+    b.call(fflush_fn, [ir.Constant(i8_ptr, None)])
     rc = b.call(spawnp_fn, [pid_slot, cmd_cstr, fa, null_i8ptr, argv, envp])
     b.call(fa_destroy_fn, [fa])
     b.store(z, j_slot)
@@ -310,14 +322,300 @@ def generate_run(module: ir.Module) -> None:
 
     b.position_at_end(free_done)
     b.call(free_fn, [argv_raw])
+    return rc
+
+
+def _generate_run(module: ir.Module, name: str, with_input: bool) -> None:
+    """Spawn a child with its stdout and stderr on pipes, and drain both while it runs.
+
+    One poll() loop services every pipe the moment it is ready, so a child that fills one
+    pipe while the parent waits on the other cannot deadlock, and nothing touches the
+    filesystem. With `with_input`, the child's stdin is a third, non-blocking pipe the
+    same loop feeds `input` into, then closes so the child sees EOF.
+    """
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    i16 = ir.IntType(16)
+    string_type = get_string_type()
+    out_type = get_process_output_type()                 # {i32, string, string}
+    result_type = get_process_output_result_type()       # {i32, [5 x i64]} (aligned; matches compiler)
+    argv_type = ir.LiteralStructType([i32, i32, string_type.as_pointer()])  # string[]
+    pollfd_type = ir.LiteralStructType([i32, i16, i16])  # struct pollfd {fd, events, revents}
+
+    plat = get_platform_module('process')
+    plat_files = get_platform_module('files')
+    pipe_fn = plat.declare_pipe(module)
+    poll_fn = plat.declare_poll(module)
+    fcntl_fn = plat.declare_fcntl(module)
+    waitpid_fn = plat.declare_waitpid(module)
+    read_fn = plat_files.declare_read(module)
+    write_fn = plat_files.declare_write(module)
+    close_fn = plat_files.declare_close(module)
+
+    malloc_fn = declare_malloc(module)
+    realloc_fn = declare_realloc(module)
+    free_fn = declare_free(module)
+
+    params = [string_type, string_type, argv_type] if with_input else [string_type, argv_type]
+    func = ir.Function(module, ir.FunctionType(result_type, params), name=name)
+    cmd_arg = func.args[0]
+    input_arg = func.args[1] if with_input else None
+    args_arg = func.args[-1]
+    cmd_arg.name = "cmd"
+    args_arg.name = "args"
+    if input_arg is not None:
+        input_arg.name = "input"
+
+    z = ir.Constant(i32, 0)
+    one_i32 = ir.Constant(i32, 1)
+    minus_one = ir.Constant(i32, -1)
+
+    entry = func.append_basic_block("entry")
+    pipe_fail = func.append_basic_block("pipe_fail")
+    setup = func.append_basic_block("setup")
+    spawn_err = func.append_basic_block("spawn_err")
+    spawned = func.append_basic_block("spawned")
+    poll_head = func.append_basic_block("poll_head")
+    poll_call = func.append_basic_block("poll_call")
+    poll_failed = func.append_basic_block("poll_failed")
+    poll_abandon = func.append_basic_block("poll_abandon")
+    poll_done = func.append_basic_block("poll_done")
+    signaled = func.append_basic_block("signaled")
+    exited = func.append_basic_block("exited")
+
+    b = ir.IRBuilder(entry)
+
+    def emit_err(variant_tag: int) -> None:
+        _ret_process_err(b, result_type, variant_tag)
+
+    def check_alloc(ptr: ir.Value, label: str) -> None:
+        _check_alloc(module, func, b, ptr, label)
+
+    def errno_is(*codes: int) -> ir.Value:
+        return _errno_is(module, b, *codes)
+
+    # Pipe fds: [read, write] per stream. STDOUT and STDERR are read by the parent, STDIN
+    # written; the parent's copies are marked close-on-exec so the child only keeps the
+    # ends posix_spawn dup2's onto 0/1/2.
+    streams = (_STDIN, _STDOUT, _STDERR) if with_input else (_STDOUT, _STDERR)
+    pipe_slots = {s: b.alloca(ir.ArrayType(i32, 2), name=f"pipe{s}") for s in streams}
+    pollfds = b.alloca(ir.ArrayType(pollfd_type, 3), name="pollfds")
+    for s in (_STDIN, _STDOUT, _STDERR):
+        b.store(minus_one, b.gep(pollfds, [z, ir.Constant(i32, s), z]))
+    for slot in pipe_slots.values():
+        b.store(ir.Constant(ir.ArrayType(i32, 2), [-1, -1]), slot)
+
+    def pipe_fd(stream: int, end: int) -> ir.Value:
+        return b.load(b.gep(pipe_slots[stream], [z, ir.Constant(i32, end)]))
+
+    def pollfd_field(stream: int, field: int) -> ir.Value:
+        return b.gep(pollfds, [z, ir.Constant(i32, stream), ir.Constant(i32, field)])
+
+    def close_pipes() -> None:
+        # close(-1) is a harmless EBADF, so every slot is closed unconditionally.
+        for s in streams:
+            b.call(close_fn, [pipe_fd(s, 0)])
+            b.call(close_fn, [pipe_fd(s, 1)])
+
+    failed = ir.Constant(ir.IntType(1), 0)
+    for s in streams:
+        rc = b.call(pipe_fn, [b.gep(pipe_slots[s], [z, z])])
+        failed = b.or_(failed, b.icmp_signed('!=', rc, z))
+    b.cbranch(failed, pipe_fail, setup)
+
+    b.position_at_end(pipe_fail)
+    close_pipes()
+    emit_err(_PE_SPAWN_FAILED)
+
+    b.position_at_end(setup)
+    for s in streams:
+        for end in (0, 1):
+            b.call(fcntl_fn, [pipe_fd(s, end), ir.Constant(i32, plat.F_SETFD),
+                              ir.Constant(i32, plat.FD_CLOEXEC)])
+    pid_slot = b.alloca(i32)
+    status_slot = b.alloca(i32)
+    child_fds = [(pipe_fd(_STDOUT, 1), 1), (pipe_fd(_STDERR, 1), 2)]   # child stdout/stderr -> pipes
+    if with_input:
+        child_fds.insert(0, (pipe_fd(_STDIN, 0), 0))                   # child stdin <- pipe
+    rc = _emit_spawnp(module, func, b, cmd_arg, args_arg, child_fds, pid_slot, check_alloc)
     b.cbranch(b.icmp_signed('==', rc, z), spawned, spawn_err)
 
     b.position_at_end(spawn_err)
-    b.call(fclose_fn, [out_file])
-    b.call(fclose_fn, [err_file])
+    close_pipes()
     emit_err(_PE_SPAWN_FAILED)
 
+    # The child holds its own ends now; closing the parent's copies is what lets a read
+    # see EOF when the child exits.
     b.position_at_end(spawned)
+    captures = {}
+    for s in (_STDOUT, _STDERR):
+        b.call(close_fn, [pipe_fd(s, 1)])
+        b.store(pipe_fd(s, 0), pollfd_field(s, 0))
+        b.store(ir.Constant(i16, plat.POLLIN), pollfd_field(s, 1))
+        buf_slot = b.alloca(i8_ptr, name=f"capture{s}_buf")
+        len_slot = b.alloca(i64, name=f"capture{s}_len")
+        cap_slot = b.alloca(i64, name=f"capture{s}_cap")
+        initial = ir.Constant(i64, _CAPTURE_INITIAL_CAPACITY)
+        buf = b.call(malloc_fn, [initial])
+        check_alloc(buf, f"capture{s}")
+        b.store(buf, buf_slot)
+        b.store(ir.Constant(i64, 0), len_slot)
+        b.store(initial, cap_slot)
+        captures[s] = (buf_slot, len_slot, cap_slot)
+
+    if with_input:
+        # Writing to a child that exited without reading raises SIGPIPE; ignore it for the
+        # loop (EPIPE just closes the pipe) and restore the caller's handler afterwards.
+        # The child was spawned before this, so it inherits the caller's disposition.
+        signal_fn = plat.declare_signal(module)
+        sig_ign = ir.Constant(i64, 1).inttoptr(i8_ptr)
+        old_handler = b.call(signal_fn, [ir.Constant(i32, plat.SIGPIPE), sig_ign])
+        b.call(close_fn, [pipe_fd(_STDIN, 0)])
+        stdin_fd = pipe_fd(_STDIN, 1)
+        flags = b.call(fcntl_fn, [stdin_fd, ir.Constant(i32, plat.F_GETFL)])
+        b.call(fcntl_fn, [stdin_fd, ir.Constant(i32, plat.F_SETFL),
+                          b.or_(flags, ir.Constant(i32, plat.O_NONBLOCK))])
+        input_size = b.zext(b.extract_value(input_arg, 1), i64, name="input_size")
+        input_data = b.extract_value(input_arg, 0, name="input_data")
+        written_slot = b.alloca(i64, name="input_written")
+        b.store(ir.Constant(i64, 0), written_slot)
+        # Nothing to send: close at once, so the child reads EOF rather than waiting.
+        has_input = b.icmp_signed('>', input_size, ir.Constant(i64, 0))
+        with b.if_else(has_input) as (then_keep, otherwise_close):
+            with then_keep:
+                b.store(stdin_fd, pollfd_field(_STDIN, 0))
+                b.store(ir.Constant(i16, plat.POLLOUT), pollfd_field(_STDIN, 1))
+            with otherwise_close:
+                b.call(close_fn, [stdin_fd])
+    b.branch(poll_head)
+
+    b.position_at_end(poll_head)
+    any_open = ir.Constant(ir.IntType(1), 0)
+    for s in (_STDIN, _STDOUT, _STDERR):
+        any_open = b.or_(any_open, b.icmp_signed('>=', b.load(pollfd_field(s, 0)), z))
+    b.cbranch(any_open, poll_call, poll_done)
+
+    b.position_at_end(poll_call)
+    pollfds_ptr = b.bitcast(pollfds, i8_ptr)
+    ready = b.call(poll_fn, [pollfds_ptr, ir.Constant(i64, 3), minus_one], name="ready")
+    service_blocks = [func.append_basic_block(f"service{s}") for s in (_STDOUT, _STDERR)]
+    if with_input:
+        service_blocks.append(func.append_basic_block("service_stdin"))
+    b.cbranch(b.icmp_signed('<', ready, z), poll_failed, service_blocks[0])
+
+    b.position_at_end(poll_failed)
+    b.cbranch(errno_is(plat.EINTR), poll_head, poll_abandon)
+
+    # poll() itself failed: close what is left so the child sees EOF/EPIPE and finishes.
+    b.position_at_end(poll_abandon)
+    for s in (_STDIN, _STDOUT, _STDERR):
+        b.call(close_fn, [b.load(pollfd_field(s, 0))])
+        b.store(minus_one, pollfd_field(s, 0))
+    b.branch(poll_done)
+
+    def stop_polling(stream: int, fd: ir.Value) -> None:
+        b.call(close_fn, [fd])
+        b.store(minus_one, pollfd_field(stream, 0))
+
+    def emit_service_read(stream: int, next_block: ir.Block) -> None:
+        buf_slot, len_slot, cap_slot = captures[stream]
+        grow = func.append_basic_block(f"capture{stream}_grow")
+        fill = func.append_basic_block(f"capture{stream}_read")
+        got_data = func.append_basic_block(f"capture{stream}_data")
+        got_end = func.append_basic_block(f"capture{stream}_end")
+        got_error = func.append_basic_block(f"capture{stream}_error")
+
+        fd = b.load(pollfd_field(stream, 0))
+        revents = b.zext(b.load(pollfd_field(stream, 2)), i32)
+        wake = ir.Constant(i32, plat.POLLIN | plat.POLLHUP | plat.POLLERR)
+        is_ready = b.and_(b.icmp_signed('>=', fd, z),
+                          b.icmp_unsigned('!=', b.and_(revents, wake), z))
+        check = func.append_basic_block(f"capture{stream}_check")
+        b.cbranch(is_ready, check, next_block)
+
+        # Keep one byte spare for the NUL the finished string ends with.
+        b.position_at_end(check)
+        length = b.load(len_slot)
+        capacity = b.load(cap_slot)
+        full = b.icmp_signed('<', b.sub(capacity, length), ir.Constant(i64, 2))
+        b.cbranch(full, grow, fill)
+
+        b.position_at_end(grow)
+        grown_capacity = b.mul(capacity, ir.Constant(i64, 2))
+        grown = b.call(realloc_fn, [b.load(buf_slot), grown_capacity])
+        check_alloc(grown, f"capture{stream}_grow")
+        b.store(grown, buf_slot)
+        b.store(grown_capacity, cap_slot)
+        b.branch(fill)
+
+        b.position_at_end(fill)
+        length = b.load(len_slot)
+        room = b.sub(b.sub(b.load(cap_slot), length), ir.Constant(i64, 1))
+        n = b.call(read_fn, [fd, b.gep(b.load(buf_slot), [length]), room], name="n")
+        sw = b.icmp_signed('>', n, ir.Constant(i64, 0))
+        is_end = b.icmp_signed('==', n, ir.Constant(i64, 0))
+        after_data = func.append_basic_block(f"capture{stream}_not_data")
+        b.cbranch(sw, got_data, after_data)
+
+        b.position_at_end(after_data)
+        b.cbranch(is_end, got_end, got_error)
+
+        b.position_at_end(got_data)
+        b.store(b.add(length, n), len_slot)
+        b.branch(next_block)
+
+        b.position_at_end(got_end)
+        stop_polling(stream, fd)
+        b.branch(next_block)
+
+        b.position_at_end(got_error)
+        with b.if_then(b.not_(errno_is(plat.EINTR, plat.EAGAIN))):
+            stop_polling(stream, fd)
+        b.branch(next_block)
+
+    def emit_service_write(next_block: ir.Block) -> None:
+        check = func.append_basic_block("stdin_write")
+        wrote = func.append_basic_block("stdin_wrote")
+        write_error = func.append_basic_block("stdin_error")
+
+        fd = b.load(pollfd_field(_STDIN, 0))
+        revents = b.zext(b.load(pollfd_field(_STDIN, 2)), i32)
+        wake = ir.Constant(i32, plat.POLLOUT | plat.POLLHUP | plat.POLLERR)
+        is_ready = b.and_(b.icmp_signed('>=', fd, z),
+                          b.icmp_unsigned('!=', b.and_(revents, wake), z))
+        b.cbranch(is_ready, check, next_block)
+
+        b.position_at_end(check)
+        written = b.load(written_slot)
+        n = b.call(write_fn, [fd, b.gep(input_data, [written]), b.sub(input_size, written)],
+                   name="n")
+        b.cbranch(b.icmp_signed('>=', n, ir.Constant(i64, 0)), wrote, write_error)
+
+        b.position_at_end(wrote)
+        written = b.add(written, n)
+        b.store(written, written_slot)
+        with b.if_then(b.icmp_signed('>=', written, input_size)):
+            stop_polling(_STDIN, fd)
+        b.branch(next_block)
+
+        # EPIPE: the child stopped reading. Anything but a retry ends the input.
+        b.position_at_end(write_error)
+        with b.if_then(b.not_(errno_is(plat.EINTR, plat.EAGAIN))):
+            stop_polling(_STDIN, fd)
+        b.branch(next_block)
+
+    b.position_at_end(service_blocks[0])
+    emit_service_read(_STDOUT, service_blocks[1])
+    b.position_at_end(service_blocks[1])
+    if with_input:
+        emit_service_read(_STDERR, service_blocks[2])
+        b.position_at_end(service_blocks[2])
+        emit_service_write(poll_head)
+    else:
+        emit_service_read(_STDERR, poll_head)
+
+    b.position_at_end(poll_done)
+    if with_input:
+        b.call(signal_fn, [ir.Constant(i32, plat.SIGPIPE), old_handler])
     b.call(waitpid_fn, [b.load(pid_slot), status_slot, z])
     status = b.load(status_slot)
     sig = b.and_(status, ir.Constant(i32, 0x7f))
@@ -328,16 +626,20 @@ def generate_run(module: ir.Module) -> None:
     b.cbranch(is_signaled, signaled, exited)
 
     b.position_at_end(signaled)
-    b.call(fclose_fn, [out_file])
-    b.call(fclose_fn, [err_file])
+    for buf_slot, _, _ in captures.values():
+        b.call(free_fn, [b.load(buf_slot)])
     emit_err(_PE_SIGNAL_RECEIVED)
 
     b.position_at_end(exited)
     exit_code = b.and_(b.lshr(status, ir.Constant(i32, 8)), ir.Constant(i32, 0xff))
-    stdout_str = emit_read_all(out_file)
-    stderr_str = emit_read_all(err_file)
-    b.call(fclose_fn, [out_file])
-    b.call(fclose_fn, [err_file])
+    texts = []
+    for s in (_STDOUT, _STDERR):
+        buf_slot, len_slot, _ = captures[s]
+        buf = b.load(buf_slot)
+        length = b.load(len_slot)
+        b.store(ir.Constant(i8, 0), b.gep(buf, [length]))                # NUL terminate
+        texts.append(cstr_to_fat_pointer_with_len(b, buf, b.trunc(length, i32), owned=1))
+    stdout_str, stderr_str = texts
 
     po = b.alloca(out_type)
     b.store(exit_code, b.gep(po, [z, z]))
@@ -350,3 +652,724 @@ def generate_run(module: ir.Module) -> None:
     ok_data = b.bitcast(b.gep(res, [z, one_i32]), out_type.as_pointer())
     b.store(po_val, ok_data)
     b.ret(b.load(res))
+
+
+# ==============================================================================
+# Child handles: spawn() / next_line() / send() / close_stdin() / wait()
+# ==============================================================================
+#
+# spawn() keeps each running child's pipes and output buffers in a heap state on a
+# module-level list, and hands back a ChildProcess {i32 pid, i64 id}. Every other call
+# looks the state up by `id`, so a handle that was already waited for finds nothing and
+# is harmless rather than a use-after-free. wait() is the explicit cleanup: it reaps the
+# child and frees its state.
+
+# Fields of the per-child state.
+_CHILD_ID = 0          # i64, never reused
+_CHILD_PID = 1         # i32
+_CHILD_FDS = 2         # [3 x i32], indexed by _STDIN/_STDOUT/_STDERR; -1 once closed
+_CHILD_CAPTURES = 3    # [2 x {i8* buf, i64 len, i64 cap}] for stdout and stderr
+_CHILD_CONSUMED = 4    # i64, stdout bytes next_line() has already handed out
+_CHILD_NEXT = 5        # i8*, the next state on the list
+
+
+def _child_state_types() -> tuple:
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    capture = ir.LiteralStructType([i8_ptr, i64, i64])
+    state = ir.LiteralStructType([
+        i64, i32, ir.ArrayType(i32, 3), ir.ArrayType(capture, 2), i64, i8_ptr,
+    ])
+    return capture, state
+
+
+def _child_globals(module: ir.Module) -> tuple:
+    """The list of live child states, and the last id spawn() handed out."""
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    if "sushi_process_children" in module.globals:
+        return module.globals["sushi_process_children"], module.globals["sushi_process_last_id"]
+    head = ir.GlobalVariable(module, i8_ptr, name="sushi_process_children")
+    head.linkage = 'internal'
+    head.initializer = ir.Constant(i8_ptr, None)
+    last_id = ir.GlobalVariable(module, i64, name="sushi_process_last_id")
+    last_id.linkage = 'internal'
+    last_id.initializer = ir.Constant(i64, 0)
+    return head, last_id
+
+
+def _child_field(b: ir.IRBuilder, state: ir.Value, *path: int) -> ir.Value:
+    i32 = ir.IntType(32)
+    return b.gep(state, [ir.Constant(i32, 0)] + [ir.Constant(i32, p) for p in path])
+
+
+def _declare_child_find(module: ir.Module) -> ir.Function:
+    """state* sushi_process_child_find(i64 id): the live state with `id`, or null."""
+    name = "sushi_process_child_find"
+    if name in module.globals:
+        return module.globals[name]
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    _, state_type = _child_state_types()
+    head, _ = _child_globals(module)
+
+    func = ir.Function(module, ir.FunctionType(state_type.as_pointer(), [i64]), name=name)
+    func.linkage = 'internal'
+    child_id = func.args[0]
+    child_id.name = "id"
+    entry = func.append_basic_block("entry")
+    walk = func.append_basic_block("walk")
+    check = func.append_basic_block("check")
+    advance = func.append_basic_block("advance")
+    found = func.append_basic_block("found")
+    missing = func.append_basic_block("missing")
+
+    b = ir.IRBuilder(entry)
+    cur_slot = b.alloca(i8_ptr, name="cur")
+    b.store(b.load(head), cur_slot)
+    b.branch(walk)
+
+    b.position_at_end(walk)
+    cur = b.load(cur_slot)
+    b.cbranch(b.icmp_unsigned('==', cur, ir.Constant(i8_ptr, None)), missing, check)
+
+    b.position_at_end(check)
+    state = b.bitcast(b.load(cur_slot), state_type.as_pointer())
+    is_it = b.icmp_signed('==', b.load(_child_field(b, state, _CHILD_ID)), child_id)
+    b.cbranch(is_it, found, advance)
+
+    b.position_at_end(advance)
+    b.store(b.load(_child_field(b, state, _CHILD_NEXT)), cur_slot)
+    b.branch(walk)
+
+    b.position_at_end(found)
+    b.ret(state)
+
+    b.position_at_end(missing)
+    b.ret(ir.Constant(state_type.as_pointer(), None))
+    return func
+
+
+def _declare_child_fill(module: ir.Module) -> ir.Function:
+    """void sushi_process_child_fill(i32* fd, capture* c): one read() from a ready pipe.
+
+    The data is appended to the capture, which doubles when less than two bytes are free:
+    one is always kept spare for the NUL the finished string ends with. End of file, or an
+    error other than a retry, closes the pipe and sets `*fd` to -1.
+    """
+    name = "sushi_process_child_fill"
+    if name in module.globals:
+        return module.globals[name]
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    capture_type, _ = _child_state_types()
+    plat = get_platform_module('process')
+    plat_files = get_platform_module('files')
+    read_fn = plat_files.declare_read(module)
+    close_fn = plat_files.declare_close(module)
+    realloc_fn = declare_realloc(module)
+
+    func = ir.Function(module, ir.FunctionType(ir.VoidType(), [i32.as_pointer(),
+                                                               capture_type.as_pointer()]),
+                       name=name)
+    func.linkage = 'internal'
+    fd_slot, capture = func.args
+    fd_slot.name = "fd"
+    capture.name = "capture"
+    entry = func.append_basic_block("entry")
+    grow = func.append_basic_block("grow")
+    fill = func.append_basic_block("fill")
+    got_data = func.append_basic_block("data")
+    not_data = func.append_basic_block("not_data")
+    got_end = func.append_basic_block("end")
+    got_error = func.append_basic_block("error")
+
+    b = ir.IRBuilder(entry)
+    buf_slot = _child_field(b, capture, 0)
+    len_slot = _child_field(b, capture, 1)
+    cap_slot = _child_field(b, capture, 2)
+    length = b.load(len_slot)
+    capacity = b.load(cap_slot)
+    b.cbranch(b.icmp_signed('<', b.sub(capacity, length), ir.Constant(i64, 2)), grow, fill)
+
+    b.position_at_end(grow)
+    grown_capacity = b.mul(capacity, ir.Constant(i64, 2))
+    grown = b.call(realloc_fn, [b.load(buf_slot), grown_capacity])
+    _check_alloc(module, func, b, grown, "capture")
+    b.store(grown, buf_slot)
+    b.store(grown_capacity, cap_slot)
+    b.branch(fill)
+
+    b.position_at_end(fill)
+    fd = b.load(fd_slot)
+    length = b.load(len_slot)
+    room = b.sub(b.sub(b.load(cap_slot), length), ir.Constant(i64, 1))
+    n = b.call(read_fn, [fd, b.gep(b.load(buf_slot), [length]), room], name="n")
+    b.cbranch(b.icmp_signed('>', n, ir.Constant(i64, 0)), got_data, not_data)
+
+    b.position_at_end(not_data)
+    b.cbranch(b.icmp_signed('==', n, ir.Constant(i64, 0)), got_end, got_error)
+
+    b.position_at_end(got_data)
+    b.store(b.add(length, n), len_slot)
+    b.ret_void()
+
+    b.position_at_end(got_end)
+    b.call(close_fn, [fd])
+    b.store(ir.Constant(i32, -1), fd_slot)
+    b.ret_void()
+
+    b.position_at_end(got_error)
+    with b.if_then(b.not_(_errno_is(module, b, plat.EINTR, plat.EAGAIN))):
+        b.call(close_fn, [fd])
+        b.store(ir.Constant(i32, -1), fd_slot)
+    b.ret_void()
+    return func
+
+
+def _declare_child_pump(module: ir.Module) -> ir.Function:
+    """void sushi_process_child_pump(state*, i8* data, i64 size, i64* written): one poll().
+
+    Waits until an open output pipe is readable or, while `*written < size`, stdin is
+    writable, then services everything that is ready: output into its capture, `data`
+    into stdin. The caller must have something open to wait on, or poll() never returns.
+    A failed poll() closes every pipe, so the child sees EOF/EPIPE and finishes.
+    """
+    name = "sushi_process_child_pump"
+    if name in module.globals:
+        return module.globals[name]
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    i16 = ir.IntType(16)
+    _, state_type = _child_state_types()
+    pollfd_type = ir.LiteralStructType([i32, i16, i16])  # struct pollfd {fd, events, revents}
+    plat = get_platform_module('process')
+    plat_files = get_platform_module('files')
+    poll_fn = plat.declare_poll(module)
+    write_fn = plat_files.declare_write(module)
+    close_fn = plat_files.declare_close(module)
+    fill_fn = _declare_child_fill(module)
+
+    func = ir.Function(module, ir.FunctionType(ir.VoidType(), [
+        state_type.as_pointer(), i8_ptr, i64, i64.as_pointer()]), name=name)
+    func.linkage = 'internal'
+    state, data, size, written_slot = func.args
+    state.name = "state"
+    data.name = "data"
+    size.name = "size"
+    written_slot.name = "written"
+    z = ir.Constant(i32, 0)
+    minus_one = ir.Constant(i32, -1)
+
+    entry = func.append_basic_block("entry")
+    failed = func.append_basic_block("poll_failed")
+    abandon = func.append_basic_block("poll_abandon")
+    service = func.append_basic_block("service")
+    done = func.append_basic_block("done")
+
+    b = ir.IRBuilder(entry)
+    pollfds = b.alloca(ir.ArrayType(pollfd_type, 3), name="pollfds")
+
+    def pollfd_field(stream: int, field: int) -> ir.Value:
+        return b.gep(pollfds, [z, ir.Constant(i32, stream), ir.Constant(i32, field)])
+
+    def fd_slot(stream: int) -> ir.Value:
+        return _child_field(b, state, _CHILD_FDS, stream)
+
+    stdin_fd = b.load(fd_slot(_STDIN))
+    want_write = b.icmp_signed('<', b.load(written_slot), size)
+    b.store(b.select(want_write, stdin_fd, minus_one), pollfd_field(_STDIN, 0))
+    b.store(ir.Constant(i16, plat.POLLOUT), pollfd_field(_STDIN, 1))
+    for s in (_STDOUT, _STDERR):
+        b.store(b.load(fd_slot(s)), pollfd_field(s, 0))
+        b.store(ir.Constant(i16, plat.POLLIN), pollfd_field(s, 1))
+    for s in (_STDIN, _STDOUT, _STDERR):
+        b.store(ir.Constant(i16, 0), pollfd_field(s, 2))
+    ready = b.call(poll_fn, [b.bitcast(pollfds, i8_ptr), ir.Constant(i64, 3), minus_one],
+                   name="ready")
+    b.cbranch(b.icmp_signed('<', ready, z), failed, service)
+
+    b.position_at_end(failed)
+    b.cbranch(_errno_is(module, b, plat.EINTR), done, abandon)
+
+    b.position_at_end(abandon)
+    for s in (_STDIN, _STDOUT, _STDERR):
+        b.call(close_fn, [b.load(fd_slot(s))])
+        b.store(minus_one, fd_slot(s))
+    b.branch(done)
+
+    def is_ready(stream: int, wake: int) -> ir.Value:
+        revents = b.zext(b.load(pollfd_field(stream, 2)), i32)
+        return b.and_(b.icmp_signed('>=', b.load(pollfd_field(stream, 0)), z),
+                      b.icmp_unsigned('!=', b.and_(revents, ir.Constant(i32, wake)), z))
+
+    b.position_at_end(service)
+    for s in (_STDOUT, _STDERR):
+        with b.if_then(is_ready(s, plat.POLLIN | plat.POLLHUP | plat.POLLERR)):
+            b.call(fill_fn, [fd_slot(s), _child_field(b, state, _CHILD_CAPTURES, s - 1)])
+    with b.if_then(is_ready(_STDIN, plat.POLLOUT | plat.POLLHUP | plat.POLLERR)):
+        fd = b.load(pollfd_field(_STDIN, 0))
+        written = b.load(written_slot)
+        n = b.call(write_fn, [fd, b.gep(data, [written]), b.sub(size, written)], name="n")
+        with b.if_else(b.icmp_signed('>=', n, ir.Constant(i64, 0))) as (then_wrote, otherwise):
+            with then_wrote:
+                b.store(b.add(written, n), written_slot)
+            # EPIPE: the child stopped reading. Anything but a retry ends its input.
+            with otherwise:
+                with b.if_then(b.not_(_errno_is(module, b, plat.EINTR, plat.EAGAIN))):
+                    b.call(close_fn, [fd])
+                    b.store(minus_one, fd_slot(_STDIN))
+    b.branch(done)
+
+    b.position_at_end(done)
+    b.ret_void()
+    return func
+
+
+def generate_spawn(module: ir.Module) -> None:
+    """Generate spawn(string cmd, string[] args) -> Result<ChildProcess, ProcessError>.
+
+    The child gets three pipes, as with run_input(), but spawn() returns as soon as it is
+    running: the pipes move into a state the other handle functions find by id.
+    """
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    string_type = get_string_type()
+    handle_type = get_child_process_type()
+    result_type = get_child_process_result_type()
+    argv_type = ir.LiteralStructType([i32, i32, string_type.as_pointer()])  # string[]
+    capture_type, state_type = _child_state_types()
+    head, last_id = _child_globals(module)
+
+    plat = get_platform_module('process')
+    plat_files = get_platform_module('files')
+    pipe_fn = plat.declare_pipe(module)
+    fcntl_fn = plat.declare_fcntl(module)
+    close_fn = plat_files.declare_close(module)
+    malloc_fn = declare_malloc(module)
+
+    func = ir.Function(module, ir.FunctionType(result_type, [string_type, argv_type]),
+                       name="sushi_spawn")
+    cmd_arg, args_arg = func.args
+    cmd_arg.name = "cmd"
+    args_arg.name = "args"
+    z = ir.Constant(i32, 0)
+
+    entry = func.append_basic_block("entry")
+    pipe_fail = func.append_basic_block("pipe_fail")
+    setup = func.append_basic_block("setup")
+    spawn_err = func.append_basic_block("spawn_err")
+    spawned = func.append_basic_block("spawned")
+
+    b = ir.IRBuilder(entry)
+    streams = (_STDIN, _STDOUT, _STDERR)
+    pipe_slots = {s: b.alloca(ir.ArrayType(i32, 2), name=f"pipe{s}") for s in streams}
+    for slot in pipe_slots.values():
+        b.store(ir.Constant(ir.ArrayType(i32, 2), [-1, -1]), slot)
+
+    def pipe_fd(stream: int, end: int) -> ir.Value:
+        return b.load(b.gep(pipe_slots[stream], [z, ir.Constant(i32, end)]))
+
+    def close_pipes() -> None:
+        for s in streams:
+            b.call(close_fn, [pipe_fd(s, 0)])
+            b.call(close_fn, [pipe_fd(s, 1)])
+
+    failed = ir.Constant(ir.IntType(1), 0)
+    for s in streams:
+        rc = b.call(pipe_fn, [b.gep(pipe_slots[s], [z, z])])
+        failed = b.or_(failed, b.icmp_signed('!=', rc, z))
+    b.cbranch(failed, pipe_fail, setup)
+
+    b.position_at_end(pipe_fail)
+    close_pipes()
+    _ret_process_err(b, result_type, _PE_SPAWN_FAILED)
+
+    b.position_at_end(setup)
+    for s in streams:
+        for end in (0, 1):
+            b.call(fcntl_fn, [pipe_fd(s, end), ir.Constant(i32, plat.F_SETFD),
+                              ir.Constant(i32, plat.FD_CLOEXEC)])
+    pid_slot = b.alloca(i32)
+    child_fds = [(pipe_fd(_STDIN, 0), 0), (pipe_fd(_STDOUT, 1), 1), (pipe_fd(_STDERR, 1), 2)]
+    rc = _emit_spawnp(module, func, b, cmd_arg, args_arg, child_fds, pid_slot,
+                      lambda ptr, label: _check_alloc(module, func, b, ptr, label))
+    b.cbranch(b.icmp_signed('==', rc, z), spawned, spawn_err)
+
+    b.position_at_end(spawn_err)
+    close_pipes()
+    _ret_process_err(b, result_type, _PE_SPAWN_FAILED)
+
+    # Only the parent's ends stay open; stdin is non-blocking so send() can keep reading
+    # the output pipes while a slow child drains it.
+    b.position_at_end(spawned)
+    b.call(close_fn, [pipe_fd(_STDIN, 0)])
+    b.call(close_fn, [pipe_fd(_STDOUT, 1)])
+    b.call(close_fn, [pipe_fd(_STDERR, 1)])
+    stdin_fd = pipe_fd(_STDIN, 1)
+    flags = b.call(fcntl_fn, [stdin_fd, ir.Constant(i32, plat.F_GETFL)])
+    b.call(fcntl_fn, [stdin_fd, ir.Constant(i32, plat.F_SETFL),
+                      b.or_(flags, ir.Constant(i32, plat.O_NONBLOCK))])
+
+    null_state = ir.Constant(state_type.as_pointer(), None)
+    state_size = b.ptrtoint(b.gep(null_state, [ir.Constant(i32, 1)]), i64)
+    state_raw = b.call(malloc_fn, [state_size])
+    _check_alloc(module, func, b, state_raw, "state")
+    state = b.bitcast(state_raw, state_type.as_pointer())
+    child_id = b.add(b.load(last_id), ir.Constant(i64, 1))
+    b.store(child_id, last_id)
+    pid = b.load(pid_slot)
+    b.store(child_id, _child_field(b, state, _CHILD_ID))
+    b.store(pid, _child_field(b, state, _CHILD_PID))
+    b.store(stdin_fd, _child_field(b, state, _CHILD_FDS, _STDIN))
+    b.store(pipe_fd(_STDOUT, 0), _child_field(b, state, _CHILD_FDS, _STDOUT))
+    b.store(pipe_fd(_STDERR, 0), _child_field(b, state, _CHILD_FDS, _STDERR))
+    initial = ir.Constant(i64, _CAPTURE_INITIAL_CAPACITY)
+    for s in (_STDOUT, _STDERR):
+        buf = b.call(malloc_fn, [initial])
+        _check_alloc(module, func, b, buf, f"capture{s}")
+        capture = ir.Constant(capture_type, ir.Undefined)
+        capture = b.insert_value(capture, buf, 0)
+        capture = b.insert_value(capture, ir.Constant(i64, 0), 1)
+        capture = b.insert_value(capture, initial, 2)
+        b.store(capture, _child_field(b, state, _CHILD_CAPTURES, s - 1))
+    b.store(ir.Constant(i64, 0), _child_field(b, state, _CHILD_CONSUMED))
+    b.store(b.load(head), _child_field(b, state, _CHILD_NEXT))
+    b.store(state_raw, head)
+
+    res = b.alloca(result_type)
+    b.store(z, b.gep(res, [z, z]))                                # Result tag = Ok
+    handle = b.insert_value(ir.Constant(handle_type, ir.Undefined), pid, 0)
+    handle = b.insert_value(handle, child_id, 1)
+    b.store(handle, b.bitcast(b.gep(res, [z, ir.Constant(i32, 1)]), handle_type.as_pointer()))
+    b.ret(b.load(res))
+
+
+def generate_next_line(module: ir.Module) -> None:
+    """Generate next_line(ChildProcess child) -> Maybe<string>.
+
+    Returns the child's next line of stdout without its newline, reading more only when
+    no whole line is buffered; a last line without a newline still comes back. None once
+    stdout is at its end, or for a handle that was already waited for. Whatever the child
+    writes to stderr meanwhile is kept for wait().
+    """
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    string_type = get_string_type()
+    maybe_type = get_maybe_type(string_type)
+    _, state_type = _child_state_types()
+    find_fn = _declare_child_find(module)
+    pump_fn = _declare_child_pump(module)
+    malloc_fn = declare_malloc(module)
+    memchr_fn = declare_memchr(module)
+    memcpy_fn = declare_memcpy(module)
+    memmove_fn = declare_memmove(module)
+    no = ir.Constant(ir.IntType(1), 0)
+
+    func = ir.Function(module, ir.FunctionType(maybe_type, [i64]), name="sushi_next_line")
+    child_id = func.args[0]
+    child_id.name = "id"
+
+    entry = func.append_basic_block("entry")
+    setup = func.append_basic_block("setup")
+    scan = func.append_basic_block("scan")
+    line = func.append_basic_block("line")
+    not_found = func.append_basic_block("not_found")
+    at_end = func.append_basic_block("at_end")
+    last_line = func.append_basic_block("last_line")
+    compact = func.append_basic_block("compact")
+    shift = func.append_basic_block("shift")
+    pump = func.append_basic_block("pump")
+    none = func.append_basic_block("none")
+
+    b = ir.IRBuilder(entry)
+    state = b.call(find_fn, [child_id], name="state")
+    b.cbranch(b.icmp_unsigned('==', state, ir.Constant(state.type, None)), none, setup)
+
+    b.position_at_end(setup)
+    capture = _child_field(b, state, _CHILD_CAPTURES, 0)
+    buf_slot = _child_field(b, capture, 0)
+    len_slot = _child_field(b, capture, 1)
+    consumed_slot = _child_field(b, state, _CHILD_CONSUMED)
+    # Bytes already searched for a newline, so a long line is not rescanned per read.
+    scanned_slot = b.alloca(i64, name="scanned")
+    b.store(b.load(consumed_slot), scanned_slot)
+    nothing_slot = b.alloca(i64, name="nothing_written")
+    b.store(ir.Constant(i64, 0), nothing_slot)
+    b.branch(scan)
+
+    def ret_line(start: ir.Value, end: ir.Value) -> None:
+        n = b.sub(end, start)
+        text = b.call(malloc_fn, [b.add(n, ir.Constant(i64, 1))])
+        _check_alloc(module, func, b, text, "line")
+        b.call(memcpy_fn, [text, b.gep(b.load(buf_slot), [start]), n, no])
+        b.store(ir.Constant(i8, 0), b.gep(text, [n]))
+        string = cstr_to_fat_pointer_with_len(b, text, b.trunc(n, i32), owned=1)
+        some = b.alloca(maybe_type)
+        b.store(ir.Constant(i32, 0), b.gep(some, [ir.Constant(i32, 0), ir.Constant(i32, 0)]))
+        data = b.gep(some, [ir.Constant(i32, 0), ir.Constant(i32, 1)])
+        b.store(string, b.bitcast(data, string_type.as_pointer()))
+        b.ret(b.load(some))
+
+    b.position_at_end(scan)
+    buf = b.load(buf_slot)
+    length = b.load(len_slot)
+    scanned = b.load(scanned_slot)
+    hit = b.call(memchr_fn, [b.gep(buf, [scanned]), ir.Constant(i32, ord("\n")),
+                             b.sub(length, scanned)], name="newline")
+    b.cbranch(b.icmp_unsigned('!=', hit, ir.Constant(i8_ptr, None)), line, not_found)
+
+    b.position_at_end(line)
+    end = b.sub(b.ptrtoint(hit, i64), b.ptrtoint(b.load(buf_slot), i64))
+    start = b.load(consumed_slot)
+    b.store(b.add(end, ir.Constant(i64, 1)), consumed_slot)
+    ret_line(start, end)
+
+    b.position_at_end(not_found)
+    b.store(length, scanned_slot)
+    stdout_fd = b.load(_child_field(b, state, _CHILD_FDS, _STDOUT))
+    b.cbranch(b.icmp_signed('<', stdout_fd, ir.Constant(i32, 0)), at_end, compact)
+
+    b.position_at_end(at_end)
+    start = b.load(consumed_slot)
+    b.cbranch(b.icmp_signed('<', start, length), last_line, none)
+
+    b.position_at_end(last_line)
+    b.store(length, consumed_slot)
+    ret_line(start, length)
+
+    # Drop the lines already handed out before reading more, so the buffer only ever
+    # grows to the longest line rather than the whole output.
+    b.position_at_end(compact)
+    start = b.load(consumed_slot)
+    b.cbranch(b.icmp_signed('>', start, ir.Constant(i64, 0)), shift, pump)
+
+    b.position_at_end(shift)
+    rest = b.sub(length, start)
+    b.call(memmove_fn, [buf, b.gep(buf, [start]), rest, no])
+    b.store(rest, len_slot)
+    b.store(ir.Constant(i64, 0), consumed_slot)
+    b.store(rest, scanned_slot)
+    b.branch(pump)
+
+    b.position_at_end(pump)
+    b.call(pump_fn, [state, ir.Constant(i8_ptr, None), ir.Constant(i64, 0), nothing_slot])
+    b.branch(scan)
+
+    b.position_at_end(none)
+    b.ret(b.insert_value(ir.Constant(maybe_type, ir.Undefined), ir.Constant(i32, 1), 0))
+
+
+def generate_send(module: ir.Module) -> None:
+    """Generate send(ChildProcess child, string data) -> bool.
+
+    Writes all of `data` to the child's stdin, reading its output pipes while it waits
+    so a child that answers as it reads cannot deadlock. False if stdin is closed, the
+    child stopped reading before everything was written, or the handle was waited for.
+    """
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    string_type = get_string_type()
+    find_fn = _declare_child_find(module)
+    pump_fn = _declare_child_pump(module)
+    plat = get_platform_module('process')
+    signal_fn = plat.declare_signal(module)
+
+    func = ir.Function(module, ir.FunctionType(i8, [i64, string_type]), name="sushi_send")
+    child_id, data_arg = func.args
+    child_id.name = "id"
+    data_arg.name = "data"
+
+    entry = func.append_basic_block("entry")
+    setup = func.append_basic_block("setup")
+    head = func.append_basic_block("head")
+    check_open = func.append_basic_block("check_open")
+    pump = func.append_basic_block("pump")
+    sent = func.append_basic_block("sent")
+    closed = func.append_basic_block("closed")
+    missing = func.append_basic_block("missing")
+
+    b = ir.IRBuilder(entry)
+    state = b.call(find_fn, [child_id], name="state")
+    b.cbranch(b.icmp_unsigned('==', state, ir.Constant(state.type, None)), missing, setup)
+
+    # A child that exits without reading raises SIGPIPE on the next write; ignore it
+    # while sending (EPIPE just closes stdin) and restore the caller's handler after.
+    b.position_at_end(setup)
+    sig_ign = ir.Constant(i64, 1).inttoptr(i8_ptr)
+    old_handler = b.call(signal_fn, [ir.Constant(i32, plat.SIGPIPE), sig_ign])
+    data = b.extract_value(data_arg, 0, name="data_ptr")
+    size = b.zext(b.extract_value(data_arg, 1), i64, name="size")
+    written_slot = b.alloca(i64, name="written")
+    b.store(ir.Constant(i64, 0), written_slot)
+    b.branch(head)
+
+    b.position_at_end(head)
+    b.cbranch(b.icmp_signed('>=', b.load(written_slot), size), sent, check_open)
+
+    b.position_at_end(check_open)
+    stdin_fd = b.load(_child_field(b, state, _CHILD_FDS, _STDIN))
+    b.cbranch(b.icmp_signed('<', stdin_fd, ir.Constant(i32, 0)), closed, pump)
+
+    b.position_at_end(pump)
+    b.call(pump_fn, [state, data, size, written_slot])
+    b.branch(head)
+
+    b.position_at_end(sent)
+    b.call(signal_fn, [ir.Constant(i32, plat.SIGPIPE), old_handler])
+    b.ret(ir.Constant(i8, 1))
+
+    b.position_at_end(closed)
+    b.call(signal_fn, [ir.Constant(i32, plat.SIGPIPE), old_handler])
+    b.ret(ir.Constant(i8, 0))
+
+    b.position_at_end(missing)
+    b.ret(ir.Constant(i8, 0))
+
+
+def generate_close_stdin(module: ir.Module) -> None:
+    """Generate close_stdin(ChildProcess child) -> bool: true if stdin was open."""
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    find_fn = _declare_child_find(module)
+    close_fn = get_platform_module('files').declare_close(module)
+
+    func = ir.Function(module, ir.FunctionType(i8, [i64]), name="sushi_close_stdin")
+    child_id = func.args[0]
+    child_id.name = "id"
+
+    entry = func.append_basic_block("entry")
+    check_open = func.append_basic_block("check_open")
+    do_close = func.append_basic_block("close")
+    nothing = func.append_basic_block("nothing")
+
+    b = ir.IRBuilder(entry)
+    state = b.call(find_fn, [child_id], name="state")
+    b.cbranch(b.icmp_unsigned('==', state, ir.Constant(state.type, None)), nothing, check_open)
+
+    b.position_at_end(check_open)
+    fd_slot = _child_field(b, state, _CHILD_FDS, _STDIN)
+    fd = b.load(fd_slot)
+    b.cbranch(b.icmp_signed('<', fd, ir.Constant(i32, 0)), nothing, do_close)
+
+    b.position_at_end(do_close)
+    b.call(close_fn, [fd])
+    b.store(ir.Constant(i32, -1), fd_slot)
+    b.ret(ir.Constant(i8, 1))
+
+    b.position_at_end(nothing)
+    b.ret(ir.Constant(i8, 0))
+
+
+def generate_wait(module: ir.Module) -> None:
+    """Generate wait(ChildProcess child) -> Result<ProcessOutput, ProcessError>.
+
+    Closes stdin, reads both pipes to their end, reaps the child and frees its state. The
+    ProcessOutput carries the exit code, the stdout next_line() has not returned, and all
+    of stderr. A handle that was already waited for is Err(SpawnFailed).
+    """
+    i8, i8_ptr, i32, i64 = get_basic_types()
+    out_type = get_process_output_type()
+    result_type = get_process_output_result_type()
+    _, state_type = _child_state_types()
+    head, _ = _child_globals(module)
+    find_fn = _declare_child_find(module)
+    pump_fn = _declare_child_pump(module)
+    plat = get_platform_module('process')
+    waitpid_fn = plat.declare_waitpid(module)
+    close_fn = get_platform_module('files').declare_close(module)
+    free_fn = declare_free(module)
+    memmove_fn = declare_memmove(module)
+    z = ir.Constant(i32, 0)
+    one_i32 = ir.Constant(i32, 1)
+
+    func = ir.Function(module, ir.FunctionType(result_type, [i64]), name="sushi_wait")
+    child_id = func.args[0]
+    child_id.name = "id"
+
+    entry = func.append_basic_block("entry")
+    setup = func.append_basic_block("setup")
+    drain = func.append_basic_block("drain")
+    pump = func.append_basic_block("pump")
+    reap = func.append_basic_block("reap")
+    unlink_walk = func.append_basic_block("unlink_walk")
+    unlink_advance = func.append_basic_block("unlink_advance")
+    unlinked = func.append_basic_block("unlinked")
+    signaled = func.append_basic_block("signaled")
+    exited = func.append_basic_block("exited")
+    missing = func.append_basic_block("missing")
+
+    b = ir.IRBuilder(entry)
+    state = b.call(find_fn, [child_id], name="state")
+    b.cbranch(b.icmp_unsigned('==', state, ir.Constant(state.type, None)), missing, setup)
+
+    b.position_at_end(setup)
+    stdin_slot = _child_field(b, state, _CHILD_FDS, _STDIN)
+    b.call(close_fn, [b.load(stdin_slot)])                # close(-1) is a harmless EBADF
+    b.store(ir.Constant(i32, -1), stdin_slot)
+    nothing_slot = b.alloca(i64, name="nothing_written")
+    b.store(ir.Constant(i64, 0), nothing_slot)
+    status_slot = b.alloca(i32, name="status")
+    link_slot = b.alloca(i8_ptr.as_pointer(), name="link")
+    b.branch(drain)
+
+    b.position_at_end(drain)
+    any_open = b.or_(
+        b.icmp_signed('>=', b.load(_child_field(b, state, _CHILD_FDS, _STDOUT)), z),
+        b.icmp_signed('>=', b.load(_child_field(b, state, _CHILD_FDS, _STDERR)), z))
+    b.cbranch(any_open, pump, reap)
+
+    b.position_at_end(pump)
+    b.call(pump_fn, [state, ir.Constant(i8_ptr, None), ir.Constant(i64, 0), nothing_slot])
+    b.branch(drain)
+
+    # Reap, then take the state off the list: walk the `next` links to the one naming it.
+    b.position_at_end(reap)
+    b.call(waitpid_fn, [b.load(_child_field(b, state, _CHILD_PID)), status_slot, z])
+    state_raw = b.bitcast(state, i8_ptr)
+    b.store(head, link_slot)
+    b.branch(unlink_walk)
+
+    b.position_at_end(unlink_walk)
+    link = b.load(link_slot)
+    b.cbranch(b.icmp_unsigned('==', b.load(link), state_raw), unlinked, unlink_advance)
+
+    b.position_at_end(unlink_advance)
+    cur = b.bitcast(b.load(link), state_type.as_pointer())
+    b.store(_child_field(b, cur, _CHILD_NEXT), link_slot)
+    b.branch(unlink_walk)
+
+    b.position_at_end(unlinked)
+    b.store(b.load(_child_field(b, state, _CHILD_NEXT)), link)
+    status = b.load(status_slot)
+    sig = b.and_(status, ir.Constant(i32, 0x7f))
+    is_signaled = b.and_(
+        b.icmp_signed('!=', sig, z),
+        b.icmp_signed('!=', sig, ir.Constant(i32, 0x7f)),
+    )
+    b.cbranch(is_signaled, signaled, exited)
+
+    b.position_at_end(signaled)
+    for s in (_STDOUT, _STDERR):
+        b.call(free_fn, [b.load(_child_field(b, state, _CHILD_CAPTURES, s - 1, 0))])
+    b.call(free_fn, [state_raw])
+    _ret_process_err(b, result_type, _PE_SIGNAL_RECEIVED)
+
+    # The captures become the strings; the spare byte fill() keeps holds each NUL.
+    b.position_at_end(exited)
+    exit_code = b.and_(b.lshr(status, ir.Constant(i32, 8)), ir.Constant(i32, 0xff))
+    out_buf = b.load(_child_field(b, state, _CHILD_CAPTURES, 0, 0))
+    consumed = b.load(_child_field(b, state, _CHILD_CONSUMED))
+    out_len = b.sub(b.load(_child_field(b, state, _CHILD_CAPTURES, 0, 1)), consumed)
+    b.call(memmove_fn, [out_buf, b.gep(out_buf, [consumed]), out_len,
+                        ir.Constant(ir.IntType(1), 0)])
+    err_buf = b.load(_child_field(b, state, _CHILD_CAPTURES, 1, 0))
+    err_len = b.load(_child_field(b, state, _CHILD_CAPTURES, 1, 1))
+    texts = []
+    for buf, length in ((out_buf, out_len), (err_buf, err_len)):
+        b.store(ir.Constant(i8, 0), b.gep(buf, [length]))
+        texts.append(cstr_to_fat_pointer_with_len(b, buf, b.trunc(length, i32), owned=1))
+    b.call(free_fn, [state_raw])
+
+    po = b.alloca(out_type)
+    b.store(exit_code, b.gep(po, [z, z]))
+    b.store(texts[0], b.gep(po, [z, one_i32]))
+    b.store(texts[1], b.gep(po, [z, ir.Constant(i32, 2)]))
+    res = b.alloca(result_type)
+    b.store(z, b.gep(res, [z, z]))                                # Result tag = Ok
+    b.store(b.load(po), b.bitcast(b.gep(res, [z, one_i32]), out_type.as_pointer()))
+    b.ret(b.load(res))
+
+    b.position_at_end(missing)
+    _ret_process_err(b, result_type, _PE_SPAWN_FAILED)
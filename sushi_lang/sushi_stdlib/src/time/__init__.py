@@ -14,6 +14,9 @@ def is_builtin_time_function(name: str) -> bool:
         'sleep',
         'msleep',
         'usleep',
+        'now_ns',
+        'monotonic_ns',
+        'cpu_time_ns',
     }
 
 
@@ -26,6 +29,9 @@ def get_builtin_time_function_return_type(name: str) -> Type:
         from sushi_lang.semantics.generics.types import GenericTypeRef
         return GenericTypeRef("Result", (BuiltinType('i32'), UnknownType("StdError")))
 
+    if name in {'now_ns', 'monotonic_ns', 'cpu_time_ns'}:
+        return BuiltinType.I64
+
     raise ValueError(f"Unknown time function: {name}")
 
 
@@ -53,10 +59,14 @@ def validate_time_function_call(name: str, signature: typing.Any) -> None:
         if param_type != BuiltinType('i64'):
             raise TypeError(f"{name} expects i64, got {param_type}")
 
+    elif name in {'now_ns', 'monotonic_ns', 'cpu_time_ns'}:
+        if len(signature.params) != 0:
+            raise TypeError(f"{name} expects 0 arguments, got {len(signature.params)}")
+
 
 def generate_module_ir() -> ir.Module:
     """Generate LLVM IR module for time functions."""
-    from sushi_lang.sushi_stdlib.src.time import sleep
+    from sushi_lang.sushi_stdlib.src.time import clock, sleep
     from sushi_lang.sushi_stdlib.src.ir_common import create_stdlib_module
 
     module = create_stdlib_module("time")
@@ -66,4 +76,8 @@ def generate_module_ir() -> ir.Module:
     sleep.generate_msleep(module)
     sleep.generate_usleep(module)
 
+    clock.generate_now_ns(module)
+    clock.generate_monotonic_ns(module)
+    clock.generate_cpu_time_ns(module)
+
     return module
@@ -0,0 +1,49 @@
+"""Clock function implementations for Sushi time module."""
+from __future__ import annotations
+from llvmlite import ir
+from sushi_lang.sushi_stdlib.src._platform import get_platform_module
+from sushi_lang.sushi_stdlib.src.type_definitions import get_basic_types, get_timespec_type
+
+_platform_time = get_platform_module('time')
+
+
+def _generate_clock_reader(module: ir.Module, name: str, clock_id: int) -> None:
+    """Generate `i64 name()`: clock_gettime(clock_id) as nanoseconds.
+
+    The timespec starts zeroed, so a clock the kernel refuses reads as 0 rather
+    than as stack garbage. The clocks used here cannot fail on Linux or macOS.
+    """
+    _, _, i32, i64 = get_basic_types()
+    timespec_type = get_timespec_type()
+
+    libc_clock_gettime = _platform_time.declare_clock_gettime(module)
+
+    func = ir.Function(module, ir.FunctionType(i64, []), name=name)
+
+    entry = func.append_basic_block("entry")
+    builder = ir.IRBuilder(entry)
+
+    ts = builder.alloca(timespec_type, name="ts")
+    builder.store(ir.Constant(timespec_type, None), ts)
+    builder.call(libc_clock_gettime, [ir.Constant(i32, clock_id), ts])
+
+    sec = builder.load(builder.gep(ts, [i32(0), i32(0)]), name="ts.tv_sec")
+    nsec = builder.load(builder.gep(ts, [i32(0), i32(1)]), name="ts.tv_nsec")
+
+    sec_nanos = builder.mul(sec, ir.Constant(i64, 1_000_000_000), name="sec_nanos")
+    builder.ret(builder.add(sec_nanos, nsec, name="nanos"))
+
+
+def generate_now_ns(module: ir.Module) -> None:
+    """Generate now_ns function: now_ns() -> i64, wall-clock nanoseconds since the Unix epoch"""
+    _generate_clock_reader(module, "sushi_now_ns", _platform_time.CLOCK_REALTIME)
+
+
+def generate_monotonic_ns(module: ir.Module) -> None:
+    """Generate monotonic_ns function: monotonic_ns() -> i64, nanoseconds on a clock that never goes back"""
+    _generate_clock_reader(module, "sushi_monotonic_ns", _platform_time.CLOCK_MONOTONIC)
+
+
+def generate_cpu_time_ns(module: ir.Module) -> None:
+    """Generate cpu_time_ns function: cpu_time_ns() -> i64, CPU time used by this process"""
+    _generate_clock_reader(module, "sushi_cpu_time_ns", _platform_time.CLOCK_PROCESS_CPUTIME_ID)
@@ -3,6 +3,9 @@
 import llvmlite.ir as ir
 from typing import Tuple
 
+# `owned` value of a `file.mmap()` view: the destructor munmaps it instead of freeing.
+STRING_OWNED_MAPPED = 2
+
 
 def get_basic_types() -> Tuple[ir.IntType, ir.PointerType, ir.IntType, ir.IntType]:
     """Get commonly used basic LLVM types."""
@@ -17,7 +20,7 @@ def get_string_type() -> ir.LiteralStructType:
     """The string fat pointer `{i8* data, i32 size, i8 owned}`.
 
     `owned` is a runtime discriminator: 1 = heap (RAII frees), 0 = literal or borrow (never
-    freed). LLVM sizeof stays 16, so this is byte-compatible with the old `{i8*, i32}`
+    freed), STRING_OWNED_MAPPED = read-only file mapping (RAII munmaps). LLVM sizeof stays 16, so this is byte-compatible with the old `{i8*, i32}`
     wherever a string embeds. Must stay in lockstep with backend
     mapping.py:_create_string_struct_type. See docs/design/string-representation.md.
     """
@@ -97,6 +100,18 @@ def get_process_output_result_type() -> ir.LiteralStructType:
     return ir.LiteralStructType([i32, ir.ArrayType(ir.IntType(64), _payload_word_count(data_bytes))])
 
 
+def get_child_process_type() -> ir.LiteralStructType:
+    """Get the ChildProcess struct VALUE type: { i32 pid, i64 id }."""
+    return ir.LiteralStructType([ir.IntType(32), ir.IntType(64)])
+
+
+def get_child_process_result_type() -> ir.LiteralStructType:
+    """Result<ChildProcess, ProcessError> LLVM layout: { i32 tag, [2 x i64] data }."""
+    i32 = ir.IntType(32)
+    # Aligned ChildProcess is 16 bytes: the i32 pid is padded to the i64 id's alignment.
+    return ir.LiteralStructType([i32, ir.ArrayType(ir.IntType(64), _payload_word_count(16))])
+
+
 def _payload_word_count(byte_size: int) -> int:
     """i64 words needed for `byte_size` payload bytes, minimum 1 (#300 phase 2)."""
     return max((byte_size + 7) // 8, 1)
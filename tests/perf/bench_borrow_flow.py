@@ -0,0 +1,108 @@
+"""Borrow-pass time over one generated function with thousands of locals and branches.
+
+Each size N generates a function that declares N owning locals and then branches N
+times, each arm moving one of them -- the shape of a big generated state machine. The
+program goes through the production semantic flow once, then the borrow pass alone is
+re-run and timed (median of N runs) on the analyzed AST, so parsing and typecheck stay
+out of the number. A pass whose branch joins scale with the live variables rather than
+with what the arms change shows up as the per-branch column growing with N:
+
+    uv run python tests/perf/bench_borrow_flow.py
+    uv run python tests/perf/bench_borrow_flow.py --sizes 1000 4000 --samples 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import perf_harness as ph
+
+from sushi_lang.internals.parser import parse_to_ast
+from sushi_lang.internals.report import Reporter
+from sushi_lang.semantics.generics.active_generics import reset_active_generics
+from sushi_lang.semantics.passes.borrow import BorrowChecker
+from sushi_lang.semantics.semantic_analyzer import SemanticAnalyzer
+from sushi_lang.semantics.stdlib_registry import get_stdlib_registry
+from sushi_lang.semantics.units import UnitManager
+
+
+def generate(size: int) -> str:
+    """A function with `size` owning locals and `size` if/else branches over them."""
+    lines = [
+        "fn eat(nom i32[] a) i32:",
+        "    return Result.Ok(a.len())",
+        "",
+        "fn machine(i32 state) i32:",
+        "    let i32 total = 0",
+    ]
+    lines += [f"    let i32[] v{k} = from([{k}])" for k in range(size)]
+    for k in range(size):
+        lines += [
+            f"    if (state == {k}):",
+            f"        total := total + eat(nom v{k}).realise(0)",
+            "    else:",
+            "        total := total + 1",
+        ]
+    lines += [
+        "    return Result.Ok(total)",
+        "",
+        "fn main() i32:",
+        "    return Result.Ok(machine(0).realise(0))",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _analyze(root: Path, src: str):
+    """Run the production semantic flow; returns (program, analyzer)."""
+    (root / "main.sushi").write_text(src, encoding="utf-8")
+    program, _tree = parse_to_ast(src)
+    reporter = Reporter(source=src, filename="main")
+    reset_active_generics()
+    get_stdlib_registry()
+    units = UnitManager(root_path=root, reporter=reporter)
+    units.load_unit("main", program)
+    units.build_global_symbol_table()
+    units.get_compilation_order()
+    analyzer = SemanticAnalyzer(reporter, filename="main", unit_manager=units)
+    analyzer.check(program)
+    if reporter.has_errors:
+        raise SystemExit("the generated program does not check:\n"
+                         + "\n".join(f"{item.code} {item.message}" for item in reporter.items))
+    return program, analyzer
+
+
+def _time_borrow_pass(program, analyzer, src: str, samples: int) -> float:
+    """Median milliseconds of one borrow-pass run over `program`."""
+    times: List[float] = []
+    for _ in range(samples):
+        checker = BorrowChecker(Reporter(source=src, filename="main"), tables=analyzer.tables)
+        start = time.perf_counter()
+        checker.run(program)
+        times.append((time.perf_counter() - start) * 1000.0)
+    return ph.median_ms(times)
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000],
+                    help="locals (and branches) per generated function")
+    ap.add_argument("--samples", type=int, default=5, help="runs per size (median)")
+    args = ap.parse_args(argv)
+
+    print(f"=== Borrow pass over one generated function ({ph.platform_key()}) ===")
+    print(f"{'locals':>8} {'branches':>9} {'borrow pass':>12} {'per branch':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            src = generate(size)
+            program, analyzer = _analyze(Path(tmp), src)
+            ms = _time_borrow_pass(program, analyzer, src, max(1, args.samples))
+            print(f"{size:>8} {size:>9} {ms:>10.1f}ms {ms * 1000.0 / size:>9.1f}us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
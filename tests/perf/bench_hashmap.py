@@ -0,0 +1,81 @@
+"""Runtime of HashMap insert/get/iterate/remove under each `--hashmap-layout`.
+
+Builds `programs/runtime_hashmap.sushi` once per layout at `--opt O2` (or `--level`),
+runs the two binaries alternately, and prints the median of each phase's CPU time,
+which the program measures itself. The binaries must print the same checksum. Like
+bench_pipelines.py this measures the GENERATED code, so it is a script rather than a
+pytest metric:
+
+    uv run python tests/perf/bench_hashmap.py
+    uv run python tests/perf/bench_hashmap.py --samples 9 --level O3
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import perf_harness as ph
+
+PROGRAM = Path(__file__).parent / "programs" / "runtime_hashmap.sushi"
+LAYOUTS = ("linear", "swiss")
+
+
+def _build(out: Path, level: str, layout: str) -> None:
+    cmd = ["sushic", str(PROGRAM), "-o", str(out), "--no-incremental",
+           "--opt", level, "--hashmap-layout", layout]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"{PROGRAM.name} failed to compile ({level}, {layout}):\n{proc.stderr}")
+
+
+def _run(binary: Path) -> Tuple[Dict[str, float], str]:
+    """The phase timings in ms, and the checksum line."""
+    proc = subprocess.run([str(binary)], capture_output=True, text=True, check=True)
+    phases: Dict[str, float] = {}
+    check = ""
+    for line in proc.stdout.splitlines():
+        name, _, value = line.partition(" ")
+        if name == "check":
+            check = line
+        else:
+            phases[name] = int(value) / 1000.0
+    return phases, check
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--samples", type=int, default=5, help="runs per binary (median)")
+    ap.add_argument("--level", default="O2", choices=["O1", "O2", "O3"])
+    args = ap.parse_args(argv)
+
+    runs: Dict[str, Dict[str, List[float]]] = {layout: {} for layout in LAYOUTS}
+    checks: Dict[str, str] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        binaries = {layout: Path(tmp) / f"runtime_hashmap.{layout}" for layout in LAYOUTS}
+        for layout, binary in binaries.items():
+            _build(binary, args.level, layout)
+        # Alternating, so drift on the machine hits both layouts alike.
+        for _ in range(max(1, args.samples)):
+            for layout, binary in binaries.items():
+                phases, checks[layout] = _run(binary)
+                for name, ms in phases.items():
+                    runs[layout].setdefault(name, []).append(ms)
+
+    if checks["linear"] != checks["swiss"]:
+        print("runtime_hashmap: the layouts' binaries disagree", file=sys.stderr)
+        return 1
+
+    timings = [
+        ph.LayoutTiming(name, ph.median_ms(runs["linear"][name]), ph.median_ms(runs["swiss"][name]))
+        for name in runs["linear"]
+    ]
+    print(ph.format_layout_table(timings, ph.platform_key()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Consumer compile time against a library that ships many generic templates.
+
+Each size N builds one `.slib` exporting N generic functions, N/4 generic structs and N/4
+generic enums, then compiles a small consumer that uses a handful of them. The consumer
+registers every template the library ships, whether it instantiates it or not, so this is
+what loading a large library's declarations costs. The script prints the median wall time
+of the consumer compile (`--no-incremental`) and the time its `parse` and `ast` phases
+took (`--timing-json`), which is where re-parsing template source shows up:
+
+    uv run python tests/perf/bench_library_load.py
+    uv run python tests/perf/bench_library_load.py --sizes 100 400 --samples 3
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import perf_harness as ph
+
+PARSE_PHASES = ("parser-init", "parse", "ast")
+
+CONSUMER = """\
+use <lib/biglib>
+
+fn main() i32:
+    let i32 a = pick0(3, 5).realise(0)
+    let Pair0@(i32) p = Pair0(a, 7)
+    let Slot0@(i32) s = Slot0.Full(p.second)
+    match s:
+        Slot0.Full(v) -> println(v)
+        Slot0.Empty -> println(0)
+    println(p.first)
+    return Result.Ok(0)
+"""
+
+
+def generate_library(size: int) -> str:
+    """`size` generic functions and `size // 4` each of generic structs and enums."""
+    lines: List[str] = []
+    for k in range(size):
+        lines += [
+            f"public fn pick{k}@(T)(T a, T b) T:",
+            "    let List@(T) xs = List.new()",
+            "    xs.push(a)",
+            "    xs.push(b)",
+            f"    if (xs.len() > {k % 3}):",
+            "        return Result.Ok(xs.get(0).realise(b))",
+            "    return Result.Ok(b)",
+            "",
+        ]
+    for k in range(max(1, size // 4)):
+        lines += [
+            f"struct Pair{k}@(T):",
+            "    T first",
+            "    T second",
+            "",
+            f"enum Slot{k}@(T):",
+            "    Empty",
+            "    Full(T)",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def _run(cmd: List[str], cwd: Path, env: dict) -> float:
+    """Run one sushic invocation; returns its wall time in ms."""
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    if proc.returncode != 0:
+        raise SystemExit(f"{' '.join(cmd)} failed:\n{proc.stdout}\n{proc.stderr}")
+    return elapsed
+
+
+def _consumer_compile(work: Path, env: dict) -> Tuple[float, float]:
+    """One consumer compile: (wall ms, parse + ast phase ms)."""
+    timing = work / "timing.json"
+    wall = _run(["sushic", "main.sushi", "-o", "main", "--no-incremental",
+                 "--timing-json", str(timing)], work, env)
+    phases = json.loads(timing.read_text(encoding="utf-8"))["phases"]
+    return wall, sum(p["duration_ms"] for p in phases if p["name"] in PARSE_PHASES)
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 400],
+                    help="generic functions the library exports")
+    ap.add_argument("--samples", type=int, default=5, help="consumer compiles per size (median)")
+    args = ap.parse_args(argv)
+
+    print(f"=== Library template loading ({ph.platform_key()}) ===")
+    print(f"{'fns':>6} {'slib':>10} {'compile':>10} {'parse':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            work = Path(tmp) / f"lib_{size}"
+            libs = work / "libs"
+            libs.mkdir(parents=True)
+            (work / "biglib.sushi").write_text(generate_library(size), encoding="utf-8")
+            (work / "main.sushi").write_text(CONSUMER, encoding="utf-8")
+            env = {**os.environ, "SUSHI_LIB_PATH": str(libs)}
+            _run(["sushic", "--lib", "biglib.sushi", "-o", str(libs / "biglib.slib")], work, env)
+
+            runs = [_consumer_compile(work, env) for _ in range(max(1, args.samples))]
+            slib_kb = (libs / "biglib.slib").stat().st_size / 1024.0
+            print(f"{size:>6} {slib_kb:>8.0f}KB {ph.median_ms([w for w, _ in runs]):>8.0f}ms "
+                  f"{ph.median_ms([s for _, s in runs]):>8.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
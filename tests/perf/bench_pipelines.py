@@ -0,0 +1,73 @@
+"""Runtime of the perf corpus under `--pipeline sushi` vs `--pipeline llvm`.
+
+Compiles every `programs/bench_*.sushi` at each requested `--opt` level with both
+pipelines, checks the two binaries print the same thing, and times each binary's
+execution (median of N runs). Unlike the perf harness this measures the GENERATED
+code, not the compiler, so it is a script rather than a pytest metric:
+
+    uv run python tests/perf/bench_pipelines.py
+    uv run python tests/perf/bench_pipelines.py --samples 9 --levels O3
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import bench_corpus
+import perf_harness as ph
+
+
+def _build(src: Path, out: Path, level: str, pipeline: str) -> None:
+    cmd = ["sushic", str(src), "-o", str(out), "--no-incremental",
+           "--opt", level, "--pipeline", pipeline]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"{src.name} failed to compile ({level}, {pipeline}):\n{proc.stderr}")
+
+
+def _time_runs(binary: Path, samples: int) -> Tuple[List[float], str]:
+    times: List[float] = []
+    stdout = ""
+    for _ in range(samples):
+        start = time.perf_counter()
+        proc = subprocess.run([str(binary)], capture_output=True, text=True)
+        times.append((time.perf_counter() - start) * 1000.0)
+        stdout = proc.stdout
+    return times, stdout
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--samples", type=int, default=5, help="runs per binary (median)")
+    ap.add_argument("--levels", nargs="+", default=["O2", "O3"], choices=["O1", "O2", "O3"])
+    args = ap.parse_args(argv)
+
+    timings: List[ph.PipelineTiming] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        for metric, src in bench_corpus.single_file_programs():
+            program = metric.split(":", 1)[1]
+            for level in args.levels:
+                medians = {}
+                outputs = {}
+                for pipeline in ("sushi", "llvm"):
+                    binary = work / f"{program}.{level}.{pipeline}"
+                    _build(src, binary, level, pipeline)
+                    times, outputs[pipeline] = _time_runs(binary, max(1, args.samples))
+                    medians[pipeline] = ph.median_ms(times)
+                if outputs["sushi"] != outputs["llvm"]:
+                    print(f"{program} ({level}): the pipelines' binaries disagree", file=sys.stderr)
+                    return 1
+                timings.append(ph.PipelineTiming(program, level, medians["sushi"], medians["llvm"]))
+
+    print(ph.format_pipeline_table(timings, ph.platform_key()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Runtime of printing millions of lines: integers, strings and floats.
+
+Builds `programs/runtime_print.sushi` once at `--opt O2` (or `--level`) and runs it for
+each kind of value, with stdout on /dev/null and on a pipe the script drains. Prints the
+median wall time of each run; stdout is fully buffered in both, so the difference is
+what the reader on the other end of the pipe costs:
+
+    uv run python tests/perf/bench_print.py
+    uv run python tests/perf/bench_print.py --samples 9 --level O3
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import perf_harness as ph
+
+PROGRAM = Path(__file__).parent / "programs" / "runtime_print.sushi"
+KINDS = ("ints", "strings", "floats")
+
+
+def _build(out: Path, level: str) -> None:
+    cmd = ["sushic", str(PROGRAM), "-o", str(out), "--no-incremental", "--opt", level]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"{PROGRAM.name} failed to compile ({level}):\n{proc.stderr}")
+
+
+def _run(binary: Path, kind: str, sink: str) -> float:
+    """Wall time in ms of one run with stdout on `sink` ("null" or "pipe")."""
+    start = time.perf_counter()
+    if sink == "null":
+        subprocess.run([str(binary), kind], stdout=subprocess.DEVNULL, check=True)
+    else:
+        proc = subprocess.Popen([str(binary), kind], stdout=subprocess.PIPE)
+        assert proc.stdout is not None
+        while proc.stdout.read(1 << 16):
+            pass
+        if proc.wait() != 0:
+            raise SystemExit(f"{binary.name} {kind} exited with {proc.returncode}")
+    return (time.perf_counter() - start) * 1000.0
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--samples", type=int, default=5, help="runs per kind and sink (median)")
+    ap.add_argument("--level", default="O2", choices=["O1", "O2", "O3"])
+    args = ap.parse_args(argv)
+
+    runs: Dict[Tuple[str, str], List[float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        binary = Path(tmp) / "runtime_print"
+        _build(binary, args.level)
+        for _ in range(max(1, args.samples)):
+            for kind in KINDS:
+                for sink in ("null", "pipe"):
+                    runs.setdefault((kind, sink), []).append(_run(binary, kind, sink))
+
+    print(f"=== println, 3M lines ({ph.platform_key()}, {args.level}) ===")
+    print(f"{'kind':>8} {'/dev/null':>10} {'pipe':>10}")
+    for kind in KINDS:
+        null_ms = ph.median_ms(runs[(kind, "null")])
+        pipe_ms = ph.median_ms(runs[(kind, "pipe")])
+        print(f"{kind:>8} {null_ms:>8.1f}ms {pipe_ms:>8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Compile time and binary size of a generated program full of List pushes and HashMap inserts.
+
+Each size N generates N functions, and every one of them makes 20 `push` calls on a
+`List@(i32)`, 10 on a `List@(f64)` and 10 `insert` calls on a `HashMap@(i32, i32)`. What
+each call site costs therefore shows up N * 40 times. The program is compiled with
+`--no-incremental` at each optimization level (median wall time of N runs), and the
+script prints the binary's size and the size of its LLVM IR:
+
+    uv run python tests/perf/bench_push_heavy.py
+    uv run python tests/perf/bench_push_heavy.py --sizes 50 200 --levels mem2reg O2 --samples 3
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import perf_harness as ph
+
+PUSHES_I32 = 20
+PUSHES_F64 = 10
+INSERTS = 10
+
+
+def generate(size: int) -> str:
+    """`size` functions that each grow two lists and a map, and a main that calls them all."""
+    lines = ["use <collections/hashmap>", ""]
+    for k in range(size):
+        lines += [
+            f"fn fill{k}(i32 seed) i32:",
+            "    let List@(i32) xs = List.new()",
+            "    let List@(f64) ys = List.new()",
+            "    let HashMap@(i32, i32) m = HashMap.new()",
+        ]
+        lines += [f"    xs.push(seed + {j})" for j in range(PUSHES_I32)]
+        lines += [f"    ys.push({j}.5)" for j in range(PUSHES_F64)]
+        lines += [f"    m.insert(seed + {j}, {j})" for j in range(INSERTS)]
+        lines += [
+            "    return Result.Ok(xs.len() + ys.len() + m.len())",
+            "",
+        ]
+    lines += ["fn main() i32:", "    let i32 total = 0"]
+    lines += [f"    total := total + fill{k}({k}).realise(0)" for k in range(size)]
+    lines += ["    println(total)", "    return Result.Ok(0)"]
+    return "\n".join(lines) + "\n"
+
+
+def _compile(src: Path, out: Path, level: str) -> float:
+    """One cold compile; returns its wall time in ms."""
+    cmd = ["sushic", str(src), "-o", str(out), "--no-incremental", "--opt", level, "--write-ll"]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    if proc.returncode != 0:
+        raise SystemExit(f"{src.name} failed to compile ({level}):\n{proc.stderr}")
+    return elapsed
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[50, 200],
+                    help="generated functions per program")
+    ap.add_argument("--levels", nargs="+", default=["mem2reg", "O2"],
+                    choices=["none", "mem2reg", "O1", "O2", "O3"])
+    ap.add_argument("--samples", type=int, default=5, help="compiles per size and level (median)")
+    args = ap.parse_args(argv)
+
+    print(f"=== Push-heavy program ({ph.platform_key()}) ===")
+    print(f"{'fns':>6} {'level':>8} {'compile':>10} {'binary':>10} {'IR':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            src = Path(tmp) / f"push_heavy_{size}.sushi"
+            src.write_text(generate(size), encoding="utf-8")
+            for level in args.levels:
+                out = Path(tmp) / f"push_heavy_{size}_{level}"
+                times = [_compile(src, out, level) for _ in range(max(1, args.samples))]
+                binary_kb = out.stat().st_size / 1024.0
+                ir_kb = out.with_suffix(".ll").stat().st_size / 1024.0
+                print(f"{size:>6} {level:>8} {ph.median_ms(times):>8.0f}ms "
+                      f"{binary_kb:>8.0f}KB {ir_kb:>8.0f}KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Runtime of HashMap lookups keyed on long URL strings, plain and with a cached hash.
+
+Builds `programs/runtime_string_keys.sushi` once at `--opt O2` (or `--level`), runs it
+N times and prints the median of each phase's CPU time, which the program measures
+itself. The `string_*` phases key a map on `string`, so every operation hashes the
+key; the `hashed_*` phases key one on `HashedStr` from `<collections/hashed>`, whose
+hash was computed when the key was built:
+
+    uv run python tests/perf/bench_string_keys.py
+    uv run python tests/perf/bench_string_keys.py --samples 9 --level O3
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import perf_harness as ph
+
+PROGRAM = Path(__file__).parent / "programs" / "runtime_string_keys.sushi"
+
+
+def _build(out: Path, level: str) -> None:
+    cmd = ["sushic", str(PROGRAM), "-o", str(out), "--no-incremental", "--opt", level]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"{PROGRAM.name} failed to compile ({level}):\n{proc.stderr}")
+
+
+def _run(binary: Path) -> Dict[str, float]:
+    """The phase timings in ms."""
+    proc = subprocess.run([str(binary)], capture_output=True, text=True, check=True)
+    phases: Dict[str, float] = {}
+    for line in proc.stdout.splitlines():
+        name, _, value = line.partition(" ")
+        if name != "check":
+            phases[name] = int(value) / 1000.0
+    return phases
+
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--samples", type=int, default=5, help="runs of the binary (median)")
+    ap.add_argument("--level", default="O2", choices=["O1", "O2", "O3"])
+    args = ap.parse_args(argv)
+
+    runs: Dict[str, List[float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        binary = Path(tmp) / "runtime_string_keys"
+        _build(binary, args.level)
+        for _ in range(max(1, args.samples)):
+            for name, ms in _run(binary).items():
+                runs.setdefault(name, []).append(ms)
+
+    print(f"=== String-keyed HashMap ({ph.platform_key()}, {args.level}) ===")
+    for name, samples in runs.items():
+        print(f"{name:>14} {ph.median_ms(samples):>8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,16 @@ BASELINE_VERSION = 1
 # more trust than a missed 25% regression costs signal.
 DEFAULT_TOLERANCE_PCT = 25.0
 
+# Per-pass metrics, read from `sushic --timing-json`, are named PASS_PREFIX + phase.
+# They exclude interpreter startup, so unlike wall time they are stable enough to gate.
+PASS_PREFIX = "pass:"
+
+# Phases that measure startup rather than compilation: recorded by nobody, gated never.
+STARTUP_PHASES = frozenset({"import", "parser-init", "llvm-init"})
+
+# A pass whose baseline is under this is all timer noise, and never gates.
+GATE_FLOOR_MS = 5.0
+
 
 def platform_key() -> str:
     """Return a stable ``<system>-<machine>`` key, e.g. ``darwin-arm64``."""
@@ -34,10 +44,15 @@ def median_ms(samples: List[float]) -> float:
 
 @dataclass
 class MetricResult:
-    """A measured metric: its name, median, and the raw samples behind it."""
+    """A measured metric: its name, median, and the raw samples behind it.
+
+    ``peak_rss_mb`` is the median of the compiler process's peak RSS over the same
+    samples, or None where the platform cannot report it. It is informational only.
+    """
     name: str
     median_ms: float
     samples: List[float]
+    peak_rss_mb: Optional[float] = None
 
 
 @dataclass
@@ -49,6 +64,7 @@ class Delta:
     delta_pct: Optional[float]        # None when no baseline
     tolerance_pct: float
     regressed: bool                   # current exceeds baseline * (1 + tol)
+    peak_rss_mb: Optional[float] = None  # carried from the MetricResult, never compared
 
     @property
     def has_baseline(self) -> bool:
@@ -65,7 +81,8 @@ def compare(
     for r in results:
         entry = baseline_metrics.get(r.name)
         if entry is None:
-            deltas.append(Delta(r.name, r.median_ms, None, None, default_tolerance_pct, False))
+            deltas.append(Delta(r.name, r.median_ms, None, None, default_tolerance_pct, False,
+                                r.peak_rss_mb))
             continue
         base_ms = float(entry["median_ms"])
         tol = float(entry.get("tolerance_pct", default_tolerance_pct))
@@ -74,7 +91,8 @@ def compare(
         else:
             delta_pct = 0.0
         regressed = r.median_ms > base_ms * (1.0 + tol / 100.0)
-        deltas.append(Delta(r.name, r.median_ms, base_ms, delta_pct, tol, regressed))
+        deltas.append(Delta(r.name, r.median_ms, base_ms, delta_pct, tol, regressed,
+                            r.peak_rss_mb))
     return deltas
 
 
@@ -82,12 +100,14 @@ def format_table(deltas: List[Delta], plat: str) -> str:
     """Render *deltas* as a fixed-width delta table for the captured pytest log."""
     lines = [
         f"=== Perf report ({plat}) ===",
-        f"{'metric':<34}{'current':>11}{'baseline':>11}{'delta':>9}{'tol':>6}  status",
+        f"{'metric':<34}{'current':>11}{'peak rss':>10}{'baseline':>11}{'delta':>9}{'tol':>6}"
+        f"  status",
     ]
     for d in deltas:
         cur = f"{d.current_ms:.1f}ms"
+        rss = f"{d.peak_rss_mb:.1f}MB" if d.peak_rss_mb is not None else "-"
         if not d.has_baseline:
-            lines.append(f"{d.name:<34}{cur:>11}{'-':>11}{'-':>9}{'-':>6}  no-baseline")
+            lines.append(f"{d.name:<34}{cur:>11}{rss:>10}{'-':>11}{'-':>9}{'-':>6}  no-baseline")
             continue
         base = f"{d.baseline_ms:.1f}ms"
         delta = f"{d.delta_pct:+.1f}%"
@@ -98,11 +118,113 @@ def format_table(deltas: List[Delta], plat: str) -> str:
             status = "ok (faster)"
         else:
             status = "ok"
-        lines.append(f"{d.name:<34}{cur:>11}{base:>11}{delta:>9}{tol:>6}  {status}")
-    lines.append("NOTE: report mode -- this harness never fails the build (P1-5 phase 1).")
+        lines.append(f"{d.name:<34}{cur:>11}{rss:>10}{base:>11}{delta:>9}{tol:>6}  {status}")
+    lines.append(f"NOTE: report mode for wall time; {PASS_PREFIX}* rows with a baseline of "
+                 f"{GATE_FLOOR_MS:.0f}ms or more gate the build (P1-5 phase 2).")
+    return "\n".join(lines)
+
+
+def pass_durations(report: dict) -> Dict[str, float]:
+    """The per-pass milliseconds of one `--timing-json` report, startup phases left out."""
+    return {
+        PASS_PREFIX + entry["name"]: float(entry["duration_ms"])
+        for entry in report.get("phases", [])
+        if entry["name"] not in STARTUP_PHASES
+    }
+
+
+def sum_pass_samples(per_program: List[List[Dict[str, float]]]) -> Dict[str, List[float]]:
+    """Sum per-pass samples across programs: one sample list per pass, over the corpus.
+
+    *per_program* holds, for each program, one `pass_durations` dict per sample. Sample
+    *i* of a pass is the sum of sample *i* over every program (a program that never ran
+    the pass adds 0), so the median is taken over whole-corpus samples.
+    """
+    names = dict.fromkeys(name for samples in per_program for sample in samples
+                          for name in sample)
+    count = min((len(samples) for samples in per_program), default=0)
+    return {
+        name: [sum(samples[i].get(name, 0.0) for samples in per_program)
+               for i in range(count)]
+        for name in names
+    }
+
+
+def gate_failures(deltas: List[Delta], floor_ms: float = GATE_FLOOR_MS) -> List[Delta]:
+    """The regressions that fail the build: `pass:` metrics with a baseline of *floor_ms*+."""
+    return [
+        d for d in deltas
+        if d.regressed and d.name.startswith(PASS_PREFIX)
+        and d.baseline_ms is not None and d.baseline_ms >= floor_ms
+    ]
+
+
+@dataclass
+class PipelineTiming:
+    """One program's median runtime at one --opt level, under both --pipeline settings."""
+    program: str
+    level: str
+    sushi_ms: float
+    llvm_ms: float
+
+    @property
+    def speedup(self) -> float:
+        """How many times faster the llvm pipeline's binary ran (>1 is faster)."""
+        if self.llvm_ms <= 0:
+            return float("inf")
+        return self.sushi_ms / self.llvm_ms
+
+
+def format_pipeline_table(timings: List[PipelineTiming], plat: str) -> str:
+    """Render *timings* as the fixed-width table bench_pipelines.py prints."""
+    lines = [
+        f"=== Runtime by --pipeline ({plat}) ===",
+        f"{'program':<22}{'opt':>5}{'sushi':>11}{'llvm':>11}{'speedup':>9}",
+    ]
+    for t in timings:
+        lines.append(
+            f"{t.program:<22}{t.level:>5}{t.sushi_ms:>9.1f}ms{t.llvm_ms:>9.1f}ms"
+            f"{t.speedup:>8.2f}x"
+        )
+    return "\n".join(lines)
+
+
+@dataclass
+class LayoutTiming:
+    """One HashMap operation's median cost under both --hashmap-layout settings."""
+    operation: str
+    linear_ms: float
+    swiss_ms: float
+
+    @property
+    def speedup(self) -> float:
+        """How many times faster the swiss layout ran the operation (>1 is faster)."""
+        if self.swiss_ms <= 0:
+            return float("inf")
+        return self.linear_ms / self.swiss_ms
+
+
+def format_layout_table(timings: List[LayoutTiming], plat: str) -> str:
+    """Render *timings* as the fixed-width table bench_hashmap.py prints."""
+    lines = [
+        f"=== HashMap operations by --hashmap-layout ({plat}) ===",
+        f"{'operation':<12}{'linear':>11}{'swiss':>11}{'speedup':>9}",
+    ]
+    for t in timings:
+        lines.append(
+            f"{t.operation:<12}{t.linear_ms:>9.1f}ms{t.swiss_ms:>9.1f}ms{t.speedup:>8.2f}x"
+        )
     return "\n".join(lines)
 
 
+def gated_metrics(baseline_metrics: Dict[str, dict], floor_ms: float = GATE_FLOOR_MS) -> List[str]:
+    """The `pass:` metrics *baseline_metrics* would gate: those with a baseline of *floor_ms*+."""
+    return sorted(
+        name for name, entry in baseline_metrics.items()
+        if name.startswith(PASS_PREFIX) and entry.get("median_ms", 0.0) >= floor_ms
+    )
+
+
 def load_baseline(path: Path, plat: str) -> Dict[str, dict]:
     """Return the ``metrics`` dict for *plat*, or ``{}`` if absent/missing."""
     if not path.exists():
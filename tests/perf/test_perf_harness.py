@@ -105,6 +105,61 @@ def test_format_table_marks_states():
     assert "report mode" in table
 
 
+def test_format_table_reports_peak_rss_when_measured():
+    deltas = ph.compare([ph.MetricResult("a", 10.0, [10.0], 171.25),
+                         ph.MetricResult("b", 10.0, [10.0])], {})
+    table = ph.format_table(deltas, "linux-x86_64")
+    row_a, row_b = table.splitlines()[2:4]
+    assert "171.2MB" in row_a
+    assert row_b.split()[:3] == ["b", "10.0ms", "-"]
+
+
+# pass_durations / sum_pass_samples / gate_failures
+
+def test_pass_durations_prefixes_and_drops_startup():
+    report = {"phases": [{"name": "import", "duration_ms": 140.0, "calls": 1},
+                         {"name": "typecheck", "duration_ms": 8.5, "calls": 2},
+                         {"name": "llvm-init", "duration_ms": 0.1, "calls": 1}]}
+    assert ph.pass_durations(report) == {"pass:typecheck": 8.5}
+
+
+def test_sum_pass_samples_sums_each_sample_across_programs():
+    per_program = [
+        [{"pass:parse": 1.0, "pass:link": 10.0}, {"pass:parse": 2.0, "pass:link": 12.0}],
+        [{"pass:parse": 3.0}, {"pass:parse": 4.0}],
+    ]
+    assert ph.sum_pass_samples(per_program) == {
+        "pass:parse": [4.0, 6.0],
+        "pass:link": [10.0, 12.0],
+    }
+
+
+def test_sum_pass_samples_stops_at_the_shortest_program():
+    per_program = [[{"pass:parse": 1.0}, {"pass:parse": 2.0}], [{"pass:parse": 3.0}]]
+    assert ph.sum_pass_samples(per_program) == {"pass:parse": [4.0]}
+
+
+def test_gate_failures_only_gates_pass_metrics_over_the_floor():
+    deltas = [
+        ph.Delta("pass:typecheck", 20.0, 10.0, 100.0, 25.0, True),
+        ph.Delta("pass:effects", 0.4, 0.1, 300.0, 25.0, True),       # under the floor
+        ph.Delta("cold_build:project", 900.0, 500.0, 80.0, 25.0, True),  # wall time
+        ph.Delta("pass:parse", 12.0, 10.0, 20.0, 25.0, False),
+        ph.Delta("pass:emit-ir", 50.0, None, None, 25.0, False),     # no baseline
+    ]
+    assert [d.name for d in ph.gate_failures(deltas)] == ["pass:typecheck"]
+
+
+def test_gated_metrics_lists_pass_baselines_over_the_floor():
+    baseline = {
+        "pass:typecheck": {"median_ms": 20.0},
+        "pass:effects": {"median_ms": 0.4},           # under the floor
+        "cold_build:project": {"median_ms": 900.0},   # wall time
+    }
+    assert ph.gated_metrics(baseline) == ["pass:typecheck"]
+    assert ph.gated_metrics({}) == []
+
+
 # load_baseline / save_baseline
 
 def test_load_missing_file_returns_empty(tmp_path):
@@ -136,3 +191,45 @@ def test_save_preserves_other_platforms(tmp_path):
     assert set(data["platforms"]) == {"darwin-arm64", "linux-x86_64"}
     assert data["platforms"]["darwin-arm64"]["metrics"]["a"]["median_ms"] == 1.0
     assert data["platforms"]["linux-x86_64"]["metrics"]["a"]["median_ms"] == 2.0
+
+
+# pipeline runtime comparison
+
+def test_pipeline_speedup_is_sushi_over_llvm():
+    t = ph.PipelineTiming("loops", "O3", sushi_ms=300.0, llvm_ms=100.0)
+    assert t.speedup == 3.0
+
+
+def test_pipeline_speedup_zero_llvm_time_does_not_divide_by_zero():
+    assert ph.PipelineTiming("loops", "O2", 1.0, 0.0).speedup == float("inf")
+
+
+def test_format_pipeline_table_lists_each_row():
+    table = ph.format_pipeline_table(
+        [ph.PipelineTiming("loops", "O2", 250.0, 100.0),
+         ph.PipelineTiming("match", "O3", 2.0, 2.0)],
+        "linux-x86_64",
+    )
+    assert "linux-x86_64" in table
+    assert "loops" in table and "2.50x" in table
+    assert "match" in table and "1.00x" in table
+
+
+# hashmap layout runtime comparison
+
+def test_layout_speedup_is_linear_over_swiss():
+    assert ph.LayoutTiming("get", linear_ms=30.0, swiss_ms=20.0).speedup == 1.5
+
+
+def test_layout_speedup_zero_swiss_time_does_not_divide_by_zero():
+    assert ph.LayoutTiming("get", 1.0, 0.0).speedup == float("inf")
+
+
+def test_format_layout_table_lists_each_operation():
+    table = ph.format_layout_table(
+        [ph.LayoutTiming("insert", 15.0, 10.0), ph.LayoutTiming("iterate", 2.0, 2.0)],
+        "linux-x86_64",
+    )
+    assert "linux-x86_64" in table
+    assert "insert" in table and "1.50x" in table
+    assert "iterate" in table and "1.00x" in table
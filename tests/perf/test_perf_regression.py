@@ -1,12 +1,21 @@
-"""Performance-regression harness -- REPORT MODE (P1-5, phase 1)."""
+"""Performance-regression harness (P1-5).
+
+Wall-time metrics are REPORT MODE (phase 1): they include interpreter startup and never
+fail. Every cold compile also writes `--timing-json`, and the per-pass sums over the
+corpus (`pass:<phase>`) GATE once the platform has a baseline for them (phase 2).
+"""
 from __future__ import annotations
 
+import json
 import os
 import shutil
+import statistics
 import subprocess
+import sys
+import tempfile
 import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pytest
 
@@ -23,27 +32,61 @@ def _samples() -> int:
         return 5
 
 
-def _timed_run(cmd: List[str], cwd: Path) -> Tuple[float, subprocess.CompletedProcess]:
-    """Run *cmd* in *cwd*, returning (elapsed_ms, completed_process)."""
-    start = time.perf_counter()
-    proc = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
-    elapsed_ms = (time.perf_counter() - start) * 1000.0
-    return elapsed_ms, proc
-
-
-def _measure(cmd: List[str], cwd: Path, samples: int,
-             reset=None) -> Tuple[List[float], subprocess.CompletedProcess]:
-    """Time *cmd* *samples* times. *reset* (optional) runs before each sample."""
+def _timed_run(cmd: List[str], cwd: Path) -> Tuple[float, Optional[float],
+                                                   subprocess.CompletedProcess]:
+    """Run *cmd* in *cwd*, returning (elapsed_ms, peak_rss_mb, completed_process).
+
+    The peak RSS is this one compile's high-water mark, from ``wait4`` on the child;
+    None where the platform has no ``os.wait4``.
+    """
+    if not hasattr(os, "wait4"):
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+        return (time.perf_counter() - start) * 1000.0, None, proc
+
+    # Output goes to files, not pipes: draining pipes would reap the child and lose
+    # its rusage.
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        child = subprocess.Popen(cmd, cwd=cwd, stdout=out, stderr=err)
+        _, status, usage = os.wait4(child.pid, 0)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        child.returncode = os.waitstatus_to_exitcode(status)
+        out.seek(0)
+        err.seek(0)
+        proc = subprocess.CompletedProcess(cmd, child.returncode,
+                                           out.read().decode(errors="replace"),
+                                           err.read().decode(errors="replace"))
+    return elapsed_ms, _maxrss_mb(usage.ru_maxrss), proc
+
+
+def _maxrss_mb(maxrss: int) -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return maxrss / (1024.0 * 1024.0) if sys.platform == "darwin" else maxrss / 1024.0
+
+
+def _measure(cmd: List[str], cwd: Path, samples: int, reset=None,
+             after=None) -> Tuple[List[float], Optional[float], subprocess.CompletedProcess]:
+    """Time *cmd* *samples* times. *reset* (optional) runs before each sample, *after*
+    (optional) after each one that succeeded.
+
+    Returns the times, the median peak RSS (MB, or None), and the last run.
+    """
     times: List[float] = []
+    rss: List[float] = []
     last = None
     for _ in range(samples):
         if reset is not None:
             reset()
-        elapsed, last = _timed_run(cmd, cwd)
+        elapsed, peak, last = _timed_run(cmd, cwd)
         times.append(elapsed)
+        if peak is not None:
+            rss.append(peak)
         if last.returncode != 0:
             break
-    return times, last
+        if after is not None:
+            after()
+    return times, (statistics.median(rss) if rss else None), last
 
 
 def test_perf_report(tmp_path, request):
@@ -53,18 +96,31 @@ def test_perf_report(tmp_path, request):
     samples = _samples()
     results: List[ph.MetricResult] = []
     failures: List[Tuple[str, str]] = []
+    # One list of per-sample pass durations per single-file program.
+    pass_samples: List[List[Dict[str, float]]] = []
 
     # -- single-file cold compiles ------------------------------------------ #
     for metric, src in bench_corpus.single_file_programs():
         work = tmp_path / metric.replace(":", "_")
         work.mkdir(parents=True, exist_ok=True)
         (work / src.name).write_text(src.read_text(encoding="utf-8"), encoding="utf-8")
-        cmd = ["sushic", src.name, "-o", "out", "--no-incremental"]
-        times, last = _measure(cmd, work, samples)
+        timing_json = work / "timing.json"
+        cmd = ["sushic", src.name, "-o", "out", "--no-incremental",
+               "--timing-json", timing_json.name]
+        program_passes: List[Dict[str, float]] = []
+        times, rss, last = _measure(
+            cmd, work, samples,
+            after=lambda program_passes=program_passes, timing_json=timing_json: program_passes.append(
+                ph.pass_durations(json.loads(timing_json.read_text(encoding="utf-8")))),
+        )
         if last.returncode != 0:
             failures.append((metric, last.stderr))
             continue
-        results.append(ph.MetricResult(metric, ph.median_ms(times), times))
+        results.append(ph.MetricResult(metric, ph.median_ms(times), times, rss))
+        pass_samples.append(program_passes)
+
+    for name, times in ph.sum_pass_samples(pass_samples).items():
+        results.append(ph.MetricResult(name, ph.median_ms(times), times))
 
     # -- multi-unit project: cold vs warm ----------------------------------- #
     proj = tmp_path / "project"
@@ -73,24 +129,28 @@ def test_perf_report(tmp_path, request):
     build = ["sushic", entry, "-o", "out"]
     cache_dir = proj / "__sushi_cache__"
 
-    cold_times, cold_last = _measure(
+    cold_times, cold_rss, cold_last = _measure(
         build, proj, samples, reset=lambda: shutil.rmtree(cache_dir, ignore_errors=True)
     )
     if cold_last.returncode != 0:
         failures.append(("cold_build:project", cold_last.stderr))
     else:
-        results.append(ph.MetricResult("cold_build:project", ph.median_ms(cold_times), cold_times))
+        results.append(ph.MetricResult("cold_build:project", ph.median_ms(cold_times),
+                                       cold_times, cold_rss))
 
         # Ensure a populated cache, then measure warm (no-source-change) rebuilds.
         _timed_run(build, proj)
-        warm_times, warm_last = _measure(build, proj, samples)
+        warm_times, warm_rss, warm_last = _measure(build, proj, samples)
         if warm_last.returncode != 0:
             failures.append(("warm_build:project", warm_last.stderr))
         else:
-            results.append(ph.MetricResult("warm_build:project", ph.median_ms(warm_times), warm_times))
+            results.append(ph.MetricResult("warm_build:project", ph.median_ms(warm_times),
+                                           warm_times, warm_rss))
 
     # -- baseline: compare (report) or refresh ------------------------------ #
     plat = ph.platform_key()
+    gated: List[ph.Delta] = []
+    baseline_metrics: Dict[str, dict] = {}
     if request.config.getoption("--update-baseline"):
         if results:
             ph.save_baseline(BASELINE_PATH, plat, results)
@@ -100,12 +160,22 @@ def test_perf_report(tmp_path, request):
         baseline_metrics = ph.load_baseline(BASELINE_PATH, plat)
         deltas = ph.compare(results, baseline_metrics)
         report = ph.format_table(deltas, plat)
+        gated = ph.gate_failures(deltas)
 
     # Surfaced via the pytest_terminal_summary hook (visible under -q).
     request.config._perf_report = report
 
-    # Report mode: timing never fails. The corpus must still COMPILE, though --
-    # a benchmark that stops building is a correctness regression worth failing.
+    # Wall time never fails. The corpus must still COMPILE, though -- a benchmark
+    # that stops building is a correctness regression worth failing.
     assert not failures, "perf corpus failed to compile:\n" + "\n".join(
         f"--- {name} ---\n{err}" for name, err in failures
     )
+    # Without a per-pass baseline for this platform there is nothing to gate. Say so as a
+    # skip rather than a pass, or a green run would read as "no regression".
+    if not request.config.getoption("--update-baseline") and not ph.gated_metrics(baseline_metrics):
+        pytest.skip(f"no per-pass baseline for {plat}, so nothing is gated; "
+                    f"record one with --update-baseline")
+    assert not gated, "per-pass compile time regressed past tolerance:\n" + "\n".join(
+        f"{d.name}: {d.baseline_ms:.1f}ms -> {d.current_ms:.1f}ms ({d.delta_pct:+.1f}%)"
+        for d in gated
+    )
@@ -7,6 +7,8 @@ import sys
 import json
 import os
 import shutil
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -94,6 +96,42 @@ def build_test_helpers(project_root: Path, verbose: bool = False) -> bool:
     return True
 
 
+@contextmanager
+def compile_server(project_root: Path, enabled: bool, verbose: bool = False):
+    """Run one warm `sushic --server` for the whole run, and point every sushic at it.
+
+    Each test's `./sushic` then forwards to the server instead of paying interpreter
+    startup and compiler import itself. A server that fails to come up only costs the
+    speed-up: sushic compiles locally whenever the socket does not answer.
+    """
+    if not enabled:
+        yield
+        return
+    sock_dir = Path(tempfile.mkdtemp(prefix="sushic-"))
+    sock = sock_dir / "server.sock"
+    server = subprocess.Popen(["./sushic", "--server", str(sock)], cwd=project_root,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while not sock.exists() and server.poll() is None and time.time() < deadline:
+        time.sleep(0.05)
+    if sock.exists():
+        os.environ["SUSHI_SERVER"] = str(sock)
+        if verbose:
+            print(f"Compile server listening on {sock}")
+    else:
+        print("Warning: the compile server did not start; compiling locally")
+    try:
+        yield
+    finally:
+        os.environ.pop("SUSHI_SERVER", None)
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        shutil.rmtree(sock_dir, ignore_errors=True)
+
+
 def purge_unit_caches(project_root: Path, verbose: bool = False) -> None:
     """Delete every tests/**/__sushi_cache__ before a run."""
     for cache in (project_root / "tests").rglob("__sushi_cache__"):
@@ -248,8 +286,16 @@ def main():
                        help="Skip building stdlib and test helpers")
     parser.add_argument("--leaks-only", action="store_true",
                        help="Run only the tests declaring EXPECT_NO_LEAKS (implies --enhanced)")
+    parser.add_argument("--server", action="store_true",
+                       help="Compile every test through one warm `sushic --server`")
 
     args = parser.parse_args()
+    with compile_server(Path(__file__).parent.parent, args.server, verbose=args.verbose):
+        return run(args)
+
+
+def run(args) -> int:
+    """Run the selected tests; `main` has parsed the command line."""
 
     # --enhanced enforces EXPECT_NO_LEAKS; --leaks-only just narrows the selection to
     # the annotated subset. The leak gate lives in the enhanced runner, which is the
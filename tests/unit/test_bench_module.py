@@ -0,0 +1,64 @@
+"""`use <bench>` from a program whose own unit is also named `bench`."""
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+
+# The program file is bench.sushi, so the main unit is `bench`; the bundled module
+# must still be merged rather than taken for the program itself.
+SRC = """\
+use <bench>
+
+fn run() ~:
+    let BenchResult r = bench("three", 1, 3, |~| 7 as i64)??
+    println("{r.name} {r.iters} {r.sink}")
+    return Result.Ok(~)
+
+fn main() i32:
+    run()
+    return Result.Ok(0)
+"""
+
+
+def test_program_named_bench_can_use_the_bench_module(tmp_path: Path):
+    (tmp_path / "bench.sushi").write_text(SRC, encoding="utf-8")
+    out = tmp_path / "out"
+    build = subprocess.run(
+        ["sushic", "bench.sushi", "-o", str(out)],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+    assert build.returncode == 0, build.stderr
+    run = subprocess.run([str(out)], capture_output=True, text=True)
+    assert run.returncode == 0
+    assert run.stdout == "three 3 28\n"
+
+
+# 99 * n overflows i32 above 21.7M iterations; the p99 rank must not.
+LARGE = """\
+use <bench>
+
+fn run() ~:
+    let BenchResult r = bench("large", 0, 22000000, |~| 1 as i64)??
+    println("{r.iters} {r.sink}")
+    if (r.min_ns <= r.median_ns and r.median_ns <= r.p99_ns):
+        println("ordered")
+    return Result.Ok(~)
+
+fn main() i32:
+    run()
+    return Result.Ok(0)
+"""
+
+
+def test_percentiles_of_a_large_run(tmp_path: Path):
+    (tmp_path / "main.sushi").write_text(LARGE, encoding="utf-8")
+    out = tmp_path / "out"
+    build = subprocess.run(
+        ["sushic", "main.sushi", "-o", str(out)],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+    assert build.returncode == 0, build.stderr
+    run = subprocess.run([str(out)], capture_output=True, text=True)
+    assert run.returncode == 0, run.stderr
+    assert run.stdout == "22000000 22000000\nordered\n"
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import pytest
 
-from sushi_lang.semantics.passes.borrow import BorrowState, FlowFacts
+from sushi_lang.semantics.passes.borrow import BorrowState, FlowFacts, FlowStates, VarFacts
 
 
 def _codes(reporter) -> list[str]:
@@ -14,62 +14,86 @@ def _codes(reporter) -> list[str]:
 
 def test_monotone_facts_join_by_union():
     """Moved / destroyed / invalidated on ANY path hold after the join (conservative)."""
-    left = FlowFacts(moved=frozenset({"a"}), destroyed=frozenset({"b"}))
-    right = FlowFacts(moved=frozenset({"c"}), destroyed=frozenset({"d"}))
-    joined = left | right
-    assert joined.moved == {"a", "c"}
-    assert joined.destroyed == {"b", "d"}
+    joined = VarFacts(is_moved=True) | VarFacts(is_destroyed=True)
+    assert joined.is_moved and joined.is_destroyed
 
 
 def test_permission_facts_join_by_intersection():
     """`owns_no_heap` GRANTS permission, so it survives only if it held on EVERY path."""
-    left = FlowFacts(owns_no_heap=frozenset({"a", "b"}))
-    right = FlowFacts(owns_no_heap=frozenset({"b", "c"}))
-    assert (left | right).owns_no_heap == {"b"}
-
-
-def test_join_of_no_surviving_paths_is_blank():
-    """Every arm terminated, so the code after the branch is unreachable."""
-    assert FlowFacts.join([]) == FlowFacts()
-
-
-def test_join_of_one_path_is_that_path():
-    """Folding into a blank identity would silently empty the intersection field."""
-    only = FlowFacts(moved=frozenset({"a"}), owns_no_heap=frozenset({"b"}))
-    assert FlowFacts.join([only]) == only
+    assert (VarFacts(owns_no_heap=True) | VarFacts(owns_no_heap=True)).owns_no_heap
+    assert not (VarFacts(owns_no_heap=True) | VarFacts()).owns_no_heap
 
 
 def test_invalidation_carries_its_span_through_a_join():
     """Restoring the flag without the span renders CE2412 with no location."""
-    left = FlowFacts(invalidation=(("v", "SPAN", ("c", "assign")),))
-    joined = left | FlowFacts()
-    assert joined.invalidation == (("v", "SPAN", ("c", "assign")),)
+    joined = VarFacts() | VarFacts(invalidated_at="SPAN", invalidated_by=("c", "assign"))
+    assert (joined.invalidated_at, joined.invalidated_by) == ("SPAN", ("c", "assign"))
 
 
-# Snapshot / restore must cover the SAME fields. A field in one and not the other
-# is exactly how a fact leaks across arms.
+def _states(*names: str) -> FlowStates:
+    states = FlowStates()
+    for name in names:
+        states[name] = BorrowState(name=name)
+    return states
 
-def test_every_flow_fact_field_is_restored():
-    """A fact that is snapshot but never restored leaks; the reverse silently drops it."""
-    import ast
-    import inspect
-    import textwrap
 
-    from sushi_lang.semantics.passes.borrow import flow
-
-    fields = set(FlowFacts.__dataclass_fields__)
-
-    def _mentioned(method) -> set[str]:
-        tree = ast.parse(textwrap.dedent(inspect.getsource(method)))
-        names = {node.arg for node in ast.walk(tree) if isinstance(node, ast.keyword)
-                 and node.arg}
-        names |= {node.attr for node in ast.walk(tree) if isinstance(node, ast.Attribute)}
-        return names & fields
-
-    snapshot = _mentioned(flow.snapshot_flow)
-    restore = _mentioned(flow.restore_flow)
-    assert snapshot == fields, f"snapshot_flow misses {sorted(fields - snapshot)}"
-    assert restore == fields, f"restore_flow misses {sorted(fields - restore)}"
+def test_join_of_no_surviving_paths_is_blank():
+    """Every arm terminated, so the code after the branch is unreachable."""
+    states = _states("a", "b")
+    states["a"].is_moved = True
+    states["b"].owns_no_heap = True
+    states.join([])
+    assert not states["a"].is_moved and not states["b"].owns_no_heap
+
+
+def test_a_path_that_left_a_variable_alone_contributes_the_entry_facts():
+    """Paths are sparse; an absent name is the entry state, not a blank one."""
+    states = _states("a")
+    states["a"].owns_no_heap = True
+    entry = states.mark()
+    states["a"].owns_no_heap = False
+    arm = states.changed_since(entry)
+    states.rewind(entry)
+    states.join([arm, FlowFacts()])
+    assert not states["a"].owns_no_heap
+    states["a"].owns_no_heap = True
+    states.join([FlowFacts(), FlowFacts()])
+    assert states["a"].owns_no_heap
+
+
+def test_a_path_records_only_what_it_changed():
+    """The cost of a branch is its writes, not the variables in scope."""
+    states = _states(*(f"v{k}" for k in range(1000)))
+    entry = states.mark()
+    states["v7"].is_moved = True
+    assert set(states.changed_since(entry).changes) == {"v7"}
+
+
+def test_rewind_undoes_every_flow_field():
+    """A field that is journalled but never rewound leaks into the sibling arm."""
+    from sushi_lang.semantics.passes.borrow.flow import facts_of
+    from sushi_lang.semantics.passes.borrow.state import FLOW_FIELDS
+
+    assert FLOW_FIELDS == VarFacts._fields
+    states = _states("x")
+    entry = states.mark()
+    set_facts = VarFacts(True, True, True, "SPAN", ("c", "assign"))
+    for name, value in zip(FLOW_FIELDS, set_facts, strict=True):
+        setattr(states["x"], name, value)
+    assert states.changed_since(entry).changes == {"x": set_facts}
+    states.rewind(entry)
+    assert facts_of(states["x"]) == VarFacts()
+    assert states.mark() == entry
+
+
+def test_rewind_keys_facts_by_name_across_a_shadowing_let():
+    """A `let` in an arm replaces the state; the name goes back to its entry facts."""
+    states = _states("x")
+    states["x"].is_moved = True
+    entry = states.mark()
+    states["x"] = BorrowState(name="x")
+    states.rewind(entry)
+    assert states["x"].is_moved
 
 
 # REBIND. A rebind re-initializes: every fact about the OLD value is stale.
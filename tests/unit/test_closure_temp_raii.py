@@ -23,11 +23,13 @@ CALLERS = {
     "qq": (
         "fn run() i32:\n"
         "    let i32 k = 7\n"
+        "    let List@(i32) ys = List.new()\n"
         "    return Result.Ok(apply({arg}, 10)??)\n"
     ),
     "realise": (
         "fn run() i32:\n"
         "    let i32 k = 7\n"
+        "    let List@(i32) ys = List.new()\n"
         "    let i32 v = apply({arg}, 10).realise(-1)\n"
         "    return Result.Ok(v)\n"
     ),
@@ -40,13 +42,18 @@ _MAIN = (
 )
 
 
-def _program(caller: str, nom: bool) -> str:
+# A PLAIN capture (`k`) and an owning one (`ys`, moved into the environment).
+PLAIN_BODY = "x + k"
+OWNING_BODY = "x + ys.len()"
+
+
+def _program(caller: str, nom: bool, body: str = PLAIN_BODY) -> str:
     marker = "nom " if nom else ""
     return (
         f"fn apply({marker}fn(i32) -> i32 f, i32 x) i32:\n"
         "    return Result.Ok(f(x)??)\n"
         "\n"
-        + CALLERS[caller].format(arg=f"{marker}|i32 x| x + k")
+        + CALLERS[caller].format(arg=f"{marker}|i32 x| {body}")
         + _MAIN
     )
 
@@ -54,7 +61,8 @@ def _program(caller: str, nom: bool) -> str:
 @pytest.mark.parametrize("caller", sorted(CALLERS))
 def test_a_borrow_parameter_leaves_the_env_with_the_caller(tmp_path, caller):
     """The flip: the caller mallocs the env, keeps it, and frees it on each exit path."""
-    mallocs, caller_drops, callee_drops = _counts(tmp_path, _program(caller, nom=False))
+    mallocs, caller_drops, callee_drops = _counts(
+        tmp_path, _program(caller, nom=False, body=OWNING_BODY))
     assert mallocs == 1, f"expected exactly one closure-env malloc, got {mallocs}"
     assert caller_drops >= 1, (
         f"the caller owns an inline-closure argument at a borrow parameter and must free "
@@ -66,6 +74,16 @@ def test_a_borrow_parameter_leaves_the_env_with_the_caller(tmp_path, caller):
     )
 
 
+@pytest.mark.parametrize("caller", sorted(CALLERS))
+def test_a_borrowed_plain_env_lives_in_the_callers_frame(tmp_path, caller):
+    """Escape analysis: an env that owns nothing and cannot outlive the call is not malloced."""
+    mallocs, caller_drops, callee_drops = _counts(tmp_path, _program(caller, nom=False))
+    assert mallocs == 0, f"a non-escaping plain env belongs on the stack, got {mallocs} mallocs"
+    assert (caller_drops, callee_drops) == (0, 0), (
+        "nothing may drop a stack environment; the drop thunk frees the buffer"
+    )
+
+
 @pytest.mark.parametrize("caller", sorted(CALLERS))
 def test_a_nom_parameter_takes_the_env_to_the_callee(tmp_path, caller):
     """The twin: `nom` transfers, so the drop moves to the callee and the caller emits none."""
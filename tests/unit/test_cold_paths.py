@@ -0,0 +1,68 @@
+"""A cold path is emitted once, out of line, with its own entry block."""
+from __future__ import annotations
+
+from llvmlite import binding as llvm, ir
+
+from sushi_lang.backend.codegen_llvm import LLVMCodegen
+from sushi_lang.backend.cold_paths import (
+    UNLIKELY_WEIGHTS, emit_unlikely_branch, get_or_emit_cold_function,
+)
+
+
+def _begin(cg: LLVMCodegen, name: str) -> ir.Function:
+    fn = ir.Function(cg.module, ir.FunctionType(ir.VoidType(), [cg.types.i32]), name=name)
+    cg.functions.helpers.begin_function(fn)
+    return fn
+
+
+def _emit_counter_body(cg: LLVMCodegen, fn: ir.Function) -> None:
+    slot = cg.memory.entry_alloca(cg.types.i32, "slot")
+    cg.builder.store(fn.args[0], slot)
+    cg.builder.ret_void()
+
+
+def _get_cold(cg: LLVMCodegen) -> ir.Function:
+    fn_ty = ir.FunctionType(ir.VoidType(), [cg.types.i32])
+    return get_or_emit_cold_function(cg, "__cold_probe", fn_ty,
+                                     lambda fn: _emit_counter_body(cg, fn))
+
+
+def test_the_body_gets_its_own_entry_alloca_and_the_caller_is_restored():
+    cg = LLVMCodegen()
+    caller = _begin(cg, "caller")
+    state = (cg.builder, cg.func, cg.entry_block, cg.alloca_builder, cg.entry_branch)
+
+    cold = _get_cold(cg)
+
+    assert (cg.builder, cg.func, cg.entry_block, cg.alloca_builder, cg.entry_branch) == state
+    assert [i.name for i in cold.blocks[0].instructions if isinstance(i, ir.AllocaInstr)] == ["slot"]
+    assert "slot" not in [i.name for i in caller.blocks[0].instructions], (
+        "the cold body's entry_alloca landed in the caller's entry block"
+    )
+    cg.builder.call(cold, [caller.args[0]])
+    cg.builder.ret_void()
+    llvm.parse_assembly(str(cg.module)).verify()
+
+
+def test_one_function_per_symbol_marked_cold_and_noinline():
+    cg = LLVMCodegen()
+    _begin(cg, "caller")
+    first = _get_cold(cg)
+    assert _get_cold(cg) is first
+    assert {"cold", "noinline"} <= set(first.attributes)
+    assert first.linkage == "linkonce_odr"
+
+
+def test_the_branch_into_a_cold_path_carries_unlikely_weights():
+    cg = LLVMCodegen()
+    caller = _begin(cg, "caller")
+    cold_block = caller.append_basic_block("cold")
+    hot_block = caller.append_basic_block("hot")
+    cond = cg.builder.icmp_signed("<", caller.args[0], ir.Constant(cg.types.i32, 0))
+    emit_unlikely_branch(cg.builder, cond, cold_block, hot_block)
+    for block in (cold_block, hot_block):
+        ir.IRBuilder(block).ret_void()
+
+    taken, not_taken = UNLIKELY_WEIGHTS
+    assert f'!"branch_weights", i32 {taken}, i32 {not_taken}' in str(cg.module)
+    llvm.parse_assembly(str(cg.module)).verify()
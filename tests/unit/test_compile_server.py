@@ -0,0 +1,161 @@
+"""`sushic --server`: a forwarded compile behaves exactly like a local one."""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from sushi_lang.compiler import server
+
+
+GENERIC_A = """\
+struct Box@(T):
+    T value
+
+fn main() i32:
+    let Box@(i32) b = Box(41)
+    println(b.value + 1)
+    return Result.Ok(0)
+"""
+
+# Same generic name, different shape: a leftover instantiation from the previous
+# compile would break this one.
+GENERIC_B = """\
+struct Box@(T):
+    T first
+    T second
+
+fn main() i32:
+    let Box@(string) b = Box("a", "b")
+    println("{b.first}{b.second}")
+    return Result.Ok(0)
+"""
+
+BAD = """\
+fn main() i32:
+    let i32 x = "s"
+    return Result.Ok(x)
+"""
+
+
+@pytest.fixture(scope="module")
+def sock(tmp_path_factory):
+    path = tmp_path_factory.mktemp("srv") / "s.sock"
+    proc = subprocess.Popen(["sushic", "--server", str(path)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while not path.exists() and proc.poll() is None and time.time() < deadline:
+        time.sleep(0.05)
+    assert path.exists(), "the compile server did not start"
+    yield path
+    proc.terminate()
+    proc.wait(timeout=10)
+    assert not path.exists()
+
+
+def _sushic(cwd: Path, *args: str, server_path=None) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env.pop(server.SERVER_ENV, None)
+    if server_path is not None:
+        env[server.SERVER_ENV] = str(server_path)
+    return subprocess.run(["sushic", *args], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+
+
+def _build_and_run(tmp_path: Path, src: str, server_path) -> str:
+    (tmp_path / "main.sushi").write_text(src, encoding="utf-8")
+    build = _sushic(tmp_path, "main.sushi", "-o", "out", server_path=server_path)
+    assert build.returncode == 0, build.stderr
+    return subprocess.run([str(tmp_path / "out")], capture_output=True, text=True).stdout
+
+
+def test_served_compiles_do_not_share_generic_state(tmp_path, sock):
+    assert _build_and_run(tmp_path, GENERIC_A, sock) == "42\n"
+    assert _build_and_run(tmp_path, GENERIC_B, sock) == "ab\n"
+    assert _build_and_run(tmp_path, GENERIC_A, sock) == "42\n"
+
+
+def test_served_diagnostics_match_local(tmp_path, sock):
+    (tmp_path / "bad.sushi").write_text(BAD, encoding="utf-8")
+    served = _sushic(tmp_path, "bad.sushi", "-o", "out", server_path=sock)
+    local = _sushic(tmp_path, "bad.sushi", "-o", "out")
+    assert served.returncode == local.returncode == 2
+    assert (served.stdout, served.stderr) == (local.stdout, local.stderr)
+    assert "CE2002" in served.stdout + served.stderr
+
+
+def test_served_compile_skips_startup(tmp_path, sock):
+    (tmp_path / "main.sushi").write_text(GENERIC_A, encoding="utf-8")
+    build = _sushic(tmp_path, "main.sushi", "-o", "out", "--timing-json", "t.json",
+                    server_path=sock)
+    assert build.returncode == 0, build.stderr
+    phases = {p["name"]: p["duration_ms"]
+              for p in json.loads((tmp_path / "t.json").read_text())["phases"]}
+    # A local compile spends 100ms+ importing the compiler; the server did it once.
+    assert phases["import"] < 50
+
+
+def test_no_server_compiles_locally(tmp_path):
+    assert _build_and_run(tmp_path, GENERIC_A, tmp_path / "nobody.sock") == "42\n"
+
+
+def test_forwarding_is_off_without_the_variable(monkeypatch):
+    monkeypatch.delenv(server.SERVER_ENV, raising=False)
+    assert server.socket_path_from_env() is None
+    assert server.forward(["main.sushi"]) is None
+    monkeypatch.setenv(server.SERVER_ENV, "1")
+    assert server.socket_path_from_env() == server.default_socket_path()
+
+
+def test_default_path_is_in_a_private_directory(monkeypatch):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    path = server.default_socket_path()
+    assert path.parent.name == f"sushic-{os.getuid()}"
+
+
+def test_client_refuses_a_socket_others_can_reach(tmp_path, sock, monkeypatch):
+    assert server._trusted_socket(sock)
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o1777)
+    planted = shared / "s.sock"
+    planted.symlink_to(sock)
+    assert not server._trusted_socket(planted)
+    monkeypatch.setenv(server.SERVER_ENV, str(planted))
+    assert server.forward(["--version"]) is None
+
+
+def test_a_stalled_client_does_not_hold_the_server(tmp_path, sock):
+    """A client that connects and never finishes its request is dropped after a short
+    receive timeout, and the server goes on serving."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent, \
+            socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as partial:
+        silent.connect(str(sock))
+        partial.connect(str(sock))
+        partial.sendall(b'{"argv": ["main.sushi"]')
+        for conn in (silent, partial):
+            conn.settimeout(server._RECEIVE_TIMEOUT * 3)
+            assert conn.recv(1) == b""
+    assert _build_and_run(tmp_path, GENERIC_A, sock) == "42\n"
+
+
+def test_server_failure_reaches_the_client_stderr(tmp_path, sock):
+    request = {"argv": ["main.sushi"], "cwd": str(tmp_path / "gone"), "env": {}}
+    err_r, err_w = os.pipe()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(str(sock))
+        with open(os.devnull, "rb") as null_in, open(os.devnull, "wb") as null_out:
+            socket.send_fds(conn, [json.dumps(request).encode() + b"\n"],
+                            [null_in.fileno(), null_out.fileno(), err_w])
+        os.close(err_w)
+        reader = conn.makefile("rb")
+        assert "pid" in json.loads(reader.readline())
+        assert json.loads(reader.readline()) == {"exit": 2}
+    with os.fdopen(err_r, "rb") as err:
+        report = err.read().decode()
+    assert "FileNotFoundError" in report
@@ -0,0 +1,152 @@
+"""The stat-keyed digest index behind the freshness fingerprints."""
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from sushi_lang.compiler import digest_index as di
+
+
+def _age(path, seconds=60):
+    """Move `path`'s mtime into the past, out of the racy window."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Count the files the index actually reads."""
+    seen = []
+    real = di.hash_file
+
+    def counting(path):
+        seen.append(str(path))
+        return real(path)
+
+    monkeypatch.setattr(di, "hash_file", counting)
+    return seen
+
+
+def test_digest_is_the_content_sha256(tmp_path):
+    f = tmp_path / "a.bc"
+    f.write_bytes(b"bitcode")
+    assert di.DigestIndex(None).digest(f) == hashlib.sha256(b"bitcode").hexdigest()
+    assert di.DigestIndex(None).digest(tmp_path / "missing") is None
+
+
+def test_unchanged_stat_is_not_read_again(tmp_path, reads):
+    f = tmp_path / "a.py"
+    f.write_text("x = 1\n")
+    _age(f)
+    index = di.DigestIndex(None)
+    first = index.digest(f)
+    assert index.digest(f) == first
+    assert reads == [str(f)]
+
+
+def test_changed_file_is_read_again(tmp_path, reads):
+    f = tmp_path / "a.py"
+    f.write_text("x = 1\n")
+    _age(f)
+    index = di.DigestIndex(None)
+    first = index.digest(f)
+    f.write_text("x = 22\n")
+    _age(f, 30)
+    assert index.digest(f) != first
+    assert len(reads) == 2
+
+
+def test_freshly_written_file_is_never_remembered(tmp_path, reads):
+    # A second write in the same timestamp tick would not move the stat.
+    f = tmp_path / "a.py"
+    f.write_text("x = 1\n")
+    index = di.DigestIndex(None)
+    index.digest(f)
+    index.digest(f)
+    assert len(reads) == 2
+
+
+def test_index_persists_across_processes(tmp_path, reads):
+    f = tmp_path / "lib.slib"
+    f.write_bytes(b"slib")
+    _age(f)
+    store = tmp_path / "cache" / "index.json"
+    first = di.DigestIndex(store)
+    digest = first.digest(f)
+    first.save()
+    assert di.DigestIndex(store).digest(f) == digest
+    assert reads == [str(f)]
+
+
+def test_save_forgets_deleted_files(tmp_path):
+    keep, gone = tmp_path / "keep", tmp_path / "gone"
+    for f in (keep, gone):
+        f.write_bytes(b"x")
+        _age(f)
+    store = tmp_path / "index.json"
+    index = di.DigestIndex(store)
+    index.digest(keep)
+    index.digest(gone)
+    gone.unlink()
+    index.save()
+    assert str(gone) not in store.read_text()
+    assert str(keep) in store.read_text()
+
+
+def test_a_corrupt_index_is_an_empty_one(tmp_path):
+    store = tmp_path / "index.json"
+    store.write_text("{not json")
+    f = tmp_path / "a"
+    f.write_bytes(b"a")
+    assert di.DigestIndex(store).digest(f) == hashlib.sha256(b"a").hexdigest()
+
+
+def test_installed_record_digest_skips_the_read(tmp_path, reads):
+    f = tmp_path / "cli.py"
+    f.write_bytes(b"print()\n")
+    raw = hashlib.sha256(b"print()\n").digest()
+    entry = SimpleNamespace(
+        hash=SimpleNamespace(mode="sha256",
+                             value=base64.urlsafe_b64encode(raw).rstrip(b"=").decode()),
+        size=f.stat().st_size,
+    )
+    installed = di.record_digests([entry], lambda _entry: f)
+    index = di.DigestIndex(None, installed)
+    assert index.digest(f) == raw.hex()
+    assert reads == []
+    # A file no longer the size RECORD says is read after all.
+    f.write_bytes(b"print(1)\n")
+    assert index.digest(f) == hashlib.sha256(b"print(1)\n").hexdigest()
+    assert reads == [str(f)]
+
+
+def test_rebuilt_stdlib_bitcode_never_takes_its_record_digest(tmp_path, reads):
+    """stdlib_builder rewrites dist/ in place, often to the same size."""
+    dist = tmp_path / "dist"
+    bc = dist / "linux" / "io.bc"
+    bc.parent.mkdir(parents=True)
+    bc.write_bytes(b"old!")
+    raw = hashlib.sha256(b"old!").digest()
+    entry = SimpleNamespace(
+        hash=SimpleNamespace(mode="sha256",
+                             value=base64.urlsafe_b64encode(raw).rstrip(b"=").decode()),
+        size=4,
+    )
+    assert di.record_digests([entry], lambda _entry: bc, rewritten=[dist]) == {}
+    assert str(bc) in di.record_digests([entry], lambda _entry: bc, rewritten=[])
+
+    bc.write_bytes(b"new!")
+    index = di.DigestIndex(None, di.record_digests([entry], lambda _entry: bc,
+                                                   rewritten=[dist]))
+    assert index.digest(bc) == hashlib.sha256(b"new!").hexdigest()
+    assert reads == [str(bc)]
+
+
+def test_stdlib_dist_is_a_rewritten_dir():
+    from sushi_lang.backend import stdlib_builder
+
+    assert stdlib_builder._DIST_DIR in di._REWRITTEN_DIRS
@@ -22,13 +22,15 @@ REFERENCE_PATTERNS = [
     re.compile(r"""AstBuilderICE\(\s*["'](C[EW]\d{4})["']"""),
     re.compile(r"""LibraryError\(\s*["'](C[EW]\d{4})["']"""),
     re.compile(r"""emit_runtime_error(?:_with_values)?\(\s*["'](RE\d{4})["']"""),
+    # The stdlib form: error_emission.emit_runtime_error(module, builder, code).
+    re.compile(r"""emit_runtime_error\(\s*module,\s*\w+,\s*["'](RE\d{4})["']"""),
 ]
 
 # The number of registered codes. Bumping this is a deliberate act: it is the
 # tripwire for silent loss when errors.py is split into a package.
 # 261: deleted 17 genuinely-dead speculative codes (CE0001/37/38/39/48/63/66/70/82/84/
 # 86/88/97/98, CE2022, CE3503, CE3506) that nothing emitted -- Tier 4.8 PR4 hygiene.
-REGISTRY_SIZE = 293  # Literal underscores: +CE6006 (a badly placed underscore in a numeric literal -- ONE code carrying the reason as a parameter, because the three cases share one rule and one fix. The grammar cannot phrase it: a terminal that simply fails to match reports the NEXT token, so `0x_FF` used to come back as "unexpected token 'x_FF'" and `1_` as "unexpected token '_'"). R1.1 msgpack: -CW2409 (re-borrowing as poke -- its only trigger was forwarding a whole poke parameter, the mandated composition idiom; the call-site borrow dies with the statement and CE2403/CE2407/CE2411 carry the safety, so the warning marked idiomatic code while guarding nothing. The first stdlib consumer, encoding/msgpack, fired it 40 times per importing program). #415 integer literal match arms: +CE2074 (an integer match needs a trailing `_` arm), +CE2075 (duplicate literal arm by VALUE -- 0x2a and 42 are the same arm), +CE2076 (arm kind does not fit the scrutinee: literal arm on an enum, or enum-pattern arm on an integer). #352 the sixth read-only receiver: +CE2429 (a write through an unbound chained get-out, keyed on SHAPE rather than on the state of a name -- the write landed on a temporary copy and was silently lost, #407). #398 try guard: +CE0131 (`??` in an extension/perk body -- a bare-value body has no error channel; emitted from the collect pass, so a template nobody instantiates cannot slip through). #393 extension-target constraint: +CE2098 (a partially-concrete extension target -- name every parameter, or make every argument concrete; rejecting it is what keeps a specificity-ordering rule from ever being needed). G-DIAG: +CE3007 (an executable with no main() -- the missing symbol used to reach the linker, so a condition in the user's own program was reported as a CE0000 ICE behind raw `cc` stderr, #251) and +CE3008 (the link step failed -- an environment condition, with the linker's own output carried as notes). Borrow by default: +CE2427 (the `nom` marker is written at both ends or at neither -- what keeps a consume visible at the call site) and +CE2428 (`nom` on an FFI extern parameter, which has no meaning: a C callee never receives a Sushi value). #344 the fifth read-only receiver: +CE2426 (a write through a `let`-borrow binding -- its own code rather than a widened CE2414, because the binding shares the owner's DATA and so the first escape is "write to the owner", not "clone and store back"). #327 receiver parameter: +CE2425 (a self receiver parameter outside its one valid position). #300 phase 1 reference bindings: +CE2423 (foreach iterable yields values, no address to bind), +CE2424 (match-pattern position waits on the enum payload alignment fix). #245 scope-dispatch totality: +CE0130 (internal backstop for a scope-checker node with no arm -- the CE0125 pattern applied to the scope pass). R6/R7 method parameters and hygiene: +CE2421 (a write through `self`, #326), +CE2422 (a write through a by-value method parameter -- the same rule one line over, but with an escape that exists today, so its own code), and -CE2402 (destroy while borrowed -- unreachable, since `.destroy()` is always a statement of its own and borrow counters are cleared per statement; CE2408/CE2412/CE2406 cover its intent), so +2 -1 from 277. R4 reference positions: +CE2415..CE2420 (struct field, enum payload, return type, nested reference, generic type argument, extension target -- one code per position, following the `ptr` and variadic precedents, because each carries its own rationale and each is lifted separately when its feature is designed). #253 binding write rejection: +CE2414. #252 let-borrow rejection: +CE2413. #242 let-borrow bindings: +CE2412 (borrow liveness, Rust's E0502). move/clone unification: +CE2411 +CE0129, -CW1003 (a borrow is a use). Tier 6.0: -CE4008 -CE4009 (unreachable, deleted) +CE4010; +CE2062 +CE6102; #134 +CE0127; #240 +CE2095 +CE0128; #248 +CE2096; #239 +CE2097
+REGISTRY_SIZE = 295  # HashMap iteration: +RE2025 (keys()/values()/entries() on a table past 2^29 buckets -- the iterator length field used to wrap and skip entries). Whole-file loads: +RE2024 (a file too large for a string's i32 size, from file.read()/file.mmap() -- the size used to wrap). Literal underscores: +CE6006 (a badly placed underscore in a numeric literal -- ONE code carrying the reason as a parameter, because the three cases share one rule and one fix. The grammar cannot phrase it: a terminal that simply fails to match reports the NEXT token, so `0x_FF` used to come back as "unexpected token 'x_FF'" and `1_` as "unexpected token '_'"). R1.1 msgpack: -CW2409 (re-borrowing as poke -- its only trigger was forwarding a whole poke parameter, the mandated composition idiom; the call-site borrow dies with the statement and CE2403/CE2407/CE2411 carry the safety, so the warning marked idiomatic code while guarding nothing. The first stdlib consumer, encoding/msgpack, fired it 40 times per importing program). #415 integer literal match arms: +CE2074 (an integer match needs a trailing `_` arm), +CE2075 (duplicate literal arm by VALUE -- 0x2a and 42 are the same arm), +CE2076 (arm kind does not fit the scrutinee: literal arm on an enum, or enum-pattern arm on an integer). #352 the sixth read-only receiver: +CE2429 (a write through an unbound chained get-out, keyed on SHAPE rather than on the state of a name -- the write landed on a temporary copy and was silently lost, #407). #398 try guard: +CE0131 (`??` in an extension/perk body -- a bare-value body has no error channel; emitted from the collect pass, so a template nobody instantiates cannot slip through). #393 extension-target constraint: +CE2098 (a partially-concrete extension target -- name every parameter, or make every argument concrete; rejecting it is what keeps a specificity-ordering rule from ever being needed). G-DIAG: +CE3007 (an executable with no main() -- the missing symbol used to reach the linker, so a condition in the user's own program was reported as a CE0000 ICE behind raw `cc` stderr, #251) and +CE3008 (the link step failed -- an environment condition, with the linker's own output carried as notes). Borrow by default: +CE2427 (the `nom` marker is written at both ends or at neither -- what keeps a consume visible at the call site) and +CE2428 (`nom` on an FFI extern parameter, which has no meaning: a C callee never receives a Sushi value). #344 the fifth read-only receiver: +CE2426 (a write through a `let`-borrow binding -- its own code rather than a widened CE2414, because the binding shares the owner's DATA and so the first escape is "write to the owner", not "clone and store back"). #327 receiver parameter: +CE2425 (a self receiver parameter outside its one valid position). #300 phase 1 reference bindings: +CE2423 (foreach iterable yields values, no address to bind), +CE2424 (match-pattern position waits on the enum payload alignment fix). #245 scope-dispatch totality: +CE0130 (internal backstop for a scope-checker node with no arm -- the CE0125 pattern applied to the scope pass). R6/R7 method parameters and hygiene: +CE2421 (a write through `self`, #326), +CE2422 (a write through a by-value method parameter -- the same rule one line over, but with an escape that exists today, so its own code), and -CE2402 (destroy while borrowed -- unreachable, since `.destroy()` is always a statement of its own and borrow counters are cleared per statement; CE2408/CE2412/CE2406 cover its intent), so +2 -1 from 277. R4 reference positions: +CE2415..CE2420 (struct field, enum payload, return type, nested reference, generic type argument, extension target -- one code per position, following the `ptr` and variadic precedents, because each carries its own rationale and each is lifted separately when its feature is designed). #253 binding write rejection: +CE2414. #252 let-borrow rejection: +CE2413. #242 let-borrow bindings: +CE2412 (borrow liveness, Rust's E0502). move/clone unification: +CE2411 +CE0129, -CW1003 (a borrow is a use). Tier 6.0: -CE4008 -CE4009 (unreachable, deleted) +CE4010; +CE2062 +CE6102; #134 +CE0127; #240 +CE2095 +CE0128; #248 +CE2096; #239 +CE2097
 
 # Codes whose numeric range does not match their category. SHRINK-ONLY: never add.
 # Renumbering would break EXPECT_ERROR_CODE headers and the docs, so these stay
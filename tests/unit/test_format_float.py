@@ -0,0 +1,70 @@
+"""`sushi_format_float` writes what "%g" writes, or declines with -1."""
+from __future__ import annotations
+
+import ctypes
+import random
+import struct
+from types import SimpleNamespace
+
+import pytest
+from llvmlite import binding as llvm, ir
+
+from sushi_lang.backend.runtime.formatting import FLOAT_FORMAT_RESERVE, get_or_emit_format_float
+
+
+@pytest.fixture(scope="module")
+def format_float():
+    llvm.initialize_native_target()
+    llvm.initialize_native_asmprinter()
+    module = ir.Module(name="format_float")
+    module.triple = llvm.get_process_triple()
+    get_or_emit_format_float(SimpleNamespace(module=module))
+    parsed = llvm.parse_assembly(str(module))
+    parsed.verify()
+    machine = llvm.Target.from_default_triple().create_target_machine()
+    engine = llvm.create_mcjit_compiler(parsed, machine)
+    engine.finalize_object()
+    fn_type = ctypes.CFUNCTYPE(ctypes.c_int32, ctypes.c_char_p, ctypes.c_double)
+    fn = fn_type(engine.get_function_address("sushi_format_float"))
+    buf = ctypes.create_string_buffer(FLOAT_FORMAT_RESERVE)
+
+    def render(value: float) -> str | None:
+        n = fn(buf, value)
+        return None if n < 0 else buf.raw[:n].decode()
+
+    yield render
+    del engine
+
+
+def test_fixed_notation_values_match_printf(format_float):
+    cases = [
+        (0.0, "0"), (-0.0, "-0"), (1.0, "1"), (0.1, "0.1"), (-2.5, "-2.5"), (1e-4, "0.0001"),
+        (100000.0, "100000"), (123456.5, "123456"), (123457.5, "123458"), (999999.4, "999999"),
+        (9.999995e-5, "0.0001"), (1 / 3, "0.333333"), (0.1 + 0.2, "0.3"), (12345.25, "12345.2"),
+    ]
+    for value, text in cases:
+        assert format_float(value) == text == "%g" % value
+
+
+def test_exponent_notation_and_non_finite_are_declined(format_float):
+    for value in (1e6, 999999.5, 1e20, 9.99994e-5, 1e-7, float("inf"), float("-inf"), float("nan")):
+        assert format_float(value) is None, value
+
+
+def test_random_values_match_printf(format_float):
+    # Magnitudes across the whole fixed range, short decimals, exact ties at the sixth
+    # significant digit, and arbitrary bit patterns.
+    rng = random.Random(23)
+    values = []
+    for _ in range(20000):
+        values.append(rng.choice((-1, 1)) * 10 ** rng.uniform(-5.5, 6.5))
+        values.append(round(rng.uniform(0, 1000), rng.randrange(4)))
+        values.append((rng.randrange(100000, 1000000) + 0.5) / 2 ** rng.randrange(20))
+        values.append(struct.unpack("<d", struct.pack("<Q", rng.getrandbits(64)))[0])
+    checked = 0
+    for value in values:
+        text = format_float(value)
+        if text is not None:
+            assert text == "%g" % value, repr(value)
+            checked += 1
+    assert checked > len(values) // 2
@@ -0,0 +1,95 @@
+"""`--hashmap-layout swiss` behaves exactly like the default linear layout."""
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from sushi_lang.backend.library_errors import LibraryError
+from sushi_lang.compiler.pipeline import _check_library_hashmap_layout
+
+
+# Grows through several resizes, leaves and reuses tombstones, rehashes in place, then
+# reads the map every way there is: get, contains_key, a clone, entries(), free().
+SRC = """\
+use <collections/hashmap>
+
+struct Point:
+    i32 x
+    i32 y
+
+fn main() i32:
+    let HashMap@(string, i32) m = HashMap.new()
+    let i32 i = 0
+    while (i < 3000):
+        m.insert("key{i}", i)
+        i := i + 1
+    i := 0
+    while (i < 3000):
+        if (i % 3 == 0):
+            m.remove("key{i}")
+        i := i + 1
+    let i32 tombs = m.tombstone_count()
+    let i32 sum = 0
+    i := 0
+    while (i < 3000):
+        sum := sum + m.get("key{i}").realise(-1)
+        i := i + 1
+    i := 0
+    while (i < 3000):
+        if (i % 6 == 0):
+            m.insert("key{i}", 1)
+        i := i + 1
+    m.insert("key1", 100)
+    m.rehash()
+    let HashMap@(string, i32) c = m.clone()
+    let i32 total = 0
+    foreach(e in c.entries()):
+        total := total + e.value
+    let bool has = c.contains_key("key6")
+    let bool gone = c.contains_key("key3")
+    println("{m.len()} {tombs} {m.tombstone_count()} {sum} {total} {has} {gone}")
+
+    let HashMap@(Point, i32) pts = HashMap.new()
+    i := 0
+    while (i < 500):
+        pts.insert(Point(i, i * 2), i)
+        i := i + 1
+    pts.remove(Point(7, 14))
+    println("{pts.len()} {pts.get(Point(9, 18)).realise(-1)} {pts.get(Point(7, 14)).realise(-1)}")
+
+    m.free()
+    m.insert("after", 5)
+    println(m.len())
+    return Result.Ok(0)
+"""
+
+EXPECTED = "2500 1000 0 2999000 3000599 1 0\n499 9 -1\n1\n"
+
+
+@pytest.mark.parametrize("opt", ["mem2reg", "O2"])
+def test_swiss_layout_matches_linear(tmp_path: Path, opt):
+    (tmp_path / "main.sushi").write_text(SRC, encoding="utf-8")
+    outputs = {}
+    for layout in ("linear", "swiss"):
+        out = tmp_path / f"out_{layout}"
+        build = subprocess.run(
+            ["sushic", "main.sushi", "-o", str(out), "--opt", opt, "--hashmap-layout", layout],
+            cwd=tmp_path, capture_output=True, text=True,
+        )
+        assert build.returncode == 0, build.stderr
+        outputs[layout] = subprocess.run([str(out)], capture_output=True, text=True).stdout
+    assert outputs["swiss"] == outputs["linear"] == EXPECTED
+
+
+def test_library_with_another_layout_is_rejected():
+    with pytest.raises(LibraryError) as exc:
+        _check_library_hashmap_layout({"hashmap_layout": "swiss"}, "somelib", "linear")
+    assert exc.value.code == "CE3507"
+
+
+def test_library_from_before_the_flag_is_linear():
+    _check_library_hashmap_layout({}, "lib", "linear")
+    with pytest.raises(LibraryError):
+        _check_library_hashmap_layout({}, "lib", "swiss")
@@ -1,6 +1,8 @@
 """End-to-end tests for incremental-compilation cache (P0-5)."""
 from __future__ import annotations
 
+import os
+import stat
 import subprocess
 from pathlib import Path
 
@@ -18,9 +20,15 @@ def _compile(project_dir: Path, extra_args: list[str] | None = None) -> subproce
         cwd=project_dir,
         capture_output=True,
         text=True,
+        env={**os.environ, "SUSHI_ANALYSIS_CACHE": str(_analysis_dir(project_dir))},
     )
 
 
+def _analysis_dir(project_dir: Path) -> Path:
+    """The private analysis cache each test project compiles against."""
+    return project_dir / ".analysis-cache"
+
+
 def _rebuilt(stdout: str) -> set[str]:
     """Return the set of unit names that were reported as ``[rebuilt]``."""
     result = set()
@@ -253,3 +261,214 @@ def test_no_incremental_flag_forces_full_rebuild(tmp_path):
     # When --no-incremental is set, the pipeline falls back to monolithic mode
     # which does not print [cached]/[rebuilt] per-unit.  Verify: no [cached] lines.
     assert _cached(second.stdout) == set()
+
+
+# Scenario 9 — Parallel codegen (-j N) is byte-identical to the serial build
+
+def test_parallel_codegen_matches_serial_build(tmp_path):
+    """`-j 4` compiles the cache misses in worker processes; every object and the
+    linked binary must match the serial build byte for byte."""
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    for project_dir in (serial_dir, parallel_dir):
+        _make_project(project_dir)
+
+    serial = _compile(serial_dir)
+    parallel = _compile(parallel_dir, ["-j", "4"])
+    assert serial.returncode == 0, serial.stderr
+    assert parallel.returncode == 0, parallel.stderr
+    assert _rebuilt(parallel.stdout) == {"main", "helpers/helper"}
+
+    def objects(project_dir: Path) -> dict[str, bytes]:
+        cache = project_dir / "__sushi_cache__"
+        return {str(p.relative_to(cache)): p.read_bytes() for p in cache.rglob("*.o")}
+
+    assert objects(serial_dir) == objects(parallel_dir)
+    assert (serial_dir / "out").read_bytes() == (parallel_dir / "out").read_bytes()
+
+    # The parallel build's objects are ordinary cache entries.
+    again = _compile(parallel_dir, ["-j", "4"])
+    assert again.returncode == 0
+    assert _cached(again.stdout) == {"main", "helpers/helper"}
+
+
+# Scenario 10 — Per-unit semantic analysis is cached in a private per-user directory
+
+def _make_closure_project(project_dir: Path) -> None:
+    """Two units that each lift a lambda into the shared function table (#402)."""
+    _write(project_dir / "helpers" / "helper.sushi", """\
+public fn helper_apply() i32:
+    let i32 a = 100
+    let fn(i32) -> i32 f = |i32 x| x + a
+    return Result.Ok(f(1).realise(0))
+""")
+    _write(project_dir / "main.sushi", """\
+use "helpers/helper"
+
+fn main() i32:
+    let i32 two = 2
+    let fn(i32) -> i32 g = |i32 x| x * two
+    let i32 a = helper_apply().realise(0)
+    let i32 b = g(3).realise(0)
+    println("{a} {b}")
+    return Result.Ok(0)
+""")
+
+
+def _analysis_entries(project_dir: Path, unit: str) -> dict[str, int]:
+    """Cached analysis entries for *unit*: file name -> mtime."""
+    analysis = _analysis_dir(project_dir)
+    prefix = unit.replace("/", "_") + "."
+    return {p.name: p.stat().st_mtime_ns for p in analysis.glob(prefix + "*.pickle")}
+
+
+def _run_out(project_dir: Path) -> str:
+    return subprocess.run([str(project_dir / "out")], capture_output=True, text=True).stdout
+
+
+def test_unit_analysis_is_reused_and_replays_lifted_lambdas(tmp_path):
+    """A unit whose source and context are unchanged skips the per-unit passes; the
+    lambdas it lifted come back into the tables, without colliding with a fresh unit's."""
+    _make_closure_project(tmp_path)
+    first = _compile(tmp_path)
+    assert first.returncode == 0, first.stderr
+    assert _run_out(tmp_path) == "101 6\n"
+    helper_entries = _analysis_entries(tmp_path, "helpers/helper")
+    assert len(helper_entries) == 1
+    assert len(_analysis_entries(tmp_path, "main")) == 1
+
+    # Body edit in main: main is re-analysed, the helper's analysis is reused as is.
+    main = tmp_path / "main.sushi"
+    main.write_text(main.read_text().replace("g(3)", "g(4)"), encoding="utf-8")
+    second = _compile(tmp_path)
+    assert second.returncode == 0, second.stderr
+    assert _run_out(tmp_path) == "101 8\n"
+    assert _analysis_entries(tmp_path, "helpers/helper") == helper_entries
+    assert len(_analysis_entries(tmp_path, "main")) == 2
+
+    # main is analysed first, so a second lambda in it now takes the name the helper's
+    # cached lambda was lifted under. That entry must be re-analysed, not installed
+    # over main's.
+    main.write_text(main.read_text().replace(
+        "    let i32 b = g(4).realise(0)",
+        "    let fn(i32) -> i32 h = |i32 x| x + 1\n"
+        "    let i32 b = h(g(4).realise(0)).realise(0)",
+    ), encoding="utf-8")
+    third = _compile(tmp_path)
+    assert third.returncode == 0, third.stderr
+    assert _run_out(tmp_path) == "101 9\n"
+    assert len(_analysis_entries(tmp_path, "helpers/helper")) == 1
+
+
+def test_analysis_entries_stay_out_of_the_project_and_must_be_private(tmp_path):
+    """Entries are pickles: they are written 0600 outside `__sushi_cache__`, and one
+    that another user could have written is never loaded."""
+    _make_closure_project(tmp_path)
+    assert _compile(tmp_path).returncode == 0
+    assert not (tmp_path / "__sushi_cache__" / "analysis").exists()
+    assert stat.S_IMODE(_analysis_dir(tmp_path).stat().st_mode) == 0o700
+    (name, mtime), = _analysis_entries(tmp_path, "helpers/helper").items()
+    entry = _analysis_dir(tmp_path) / name
+    assert stat.S_IMODE(entry.stat().st_mode) == 0o600
+
+    # A world-writable entry is a miss: the unit is analysed again and the entry
+    # replaced by a private one.
+    entry.chmod(0o666)
+    assert _compile(tmp_path).returncode == 0
+    assert entry.stat().st_mtime_ns != mtime
+    assert stat.S_IMODE(entry.stat().st_mode) == 0o600
+
+    # A group-writable directory is not used at all.
+    _analysis_dir(tmp_path).chmod(0o770)
+    main = tmp_path / "main.sushi"
+    main.write_text(main.read_text().replace("g(3)", "g(4)"), encoding="utf-8")
+    assert _compile(tmp_path).returncode == 0
+    assert _run_out(tmp_path) == "101 8\n"
+    assert len(_analysis_entries(tmp_path, "main")) == 1
+
+
+# Scenario 11 — The pass pipeline is a global parameter too
+
+def test_pipeline_change_invalidates_entire_cache(tmp_path):
+    """`--pipeline llvm` names different objects than the hand-assembled pipeline."""
+    _make_project(tmp_path)
+    first = _compile(tmp_path, ["--opt", "O2"])
+    assert first.returncode == 0, first.stderr
+
+    second = _compile(tmp_path, ["--opt", "O2", "--pipeline", "llvm"])
+    assert second.returncode == 0, second.stderr
+    assert _rebuilt(second.stdout) == {"main", "helpers/helper"}
+    assert _cached(second.stdout) == set()
+
+
+def test_stdout_buffering_change_rebuilds_only_main(tmp_path):
+    """Only main()'s unit emits the stdout setup, so only it is keyed on the mode."""
+    _make_project(tmp_path)
+    first = _compile(tmp_path, ["--stdout-buffering", "full"])
+    assert first.returncode == 0, first.stderr
+
+    second = _compile(tmp_path, ["--stdout-buffering", "line"])
+    assert second.returncode == 0, second.stderr
+    assert _rebuilt(second.stdout) == {"main"}
+    assert _cached(second.stdout) == {"helpers/helper"}
+
+
+# Scenario 12 — --lto caches unit bitcode and optimizes the merged program
+
+def test_lto_caches_unit_bitcode_and_links_whole_program(tmp_path):
+    """Units are cached as .bc; the merged module, stdlib included, links and runs."""
+    main, helper = _make_project(tmp_path)
+    _write(main, """\
+use <math>
+use "helpers/helper"
+
+fn main() i32:
+    let i32 r = doubled(21).realise(0)
+    println("{r} {sqrt(16.0)}")
+    return Result.Ok(0)
+""")
+    args = ["--lto", "--opt", "O2", "--pipeline", "llvm"]
+    cold = _compile(tmp_path, args)
+    assert cold.returncode == 0, cold.stderr
+    assert _rebuilt(cold.stdout) == {"main", "helpers/helper"}
+    units_dir = tmp_path / "__sushi_cache__" / "units"
+    assert list(units_dir.rglob("*.bc")) and not list(units_dir.rglob("*.o"))
+    assert not (tmp_path / "out.o").exists()
+    run = subprocess.run([str(tmp_path / "out")], capture_output=True, text=True)
+    assert run.stdout == "42 4\n"
+
+    text = helper.read_text(encoding="utf-8")
+    helper.write_text(text.replace("x * 2", "x * 3"), encoding="utf-8")
+    warm = _compile(tmp_path, args)
+    assert warm.returncode == 0, warm.stderr
+    assert _rebuilt(warm.stdout) == {"helpers/helper"}
+    assert _cached(warm.stdout) == {"main"}
+    run = subprocess.run([str(tmp_path / "out")], capture_output=True, text=True)
+    assert run.stdout == "63 4\n"
+
+
+def test_moved_code_is_reanalysed_for_its_new_positions(tmp_path):
+    """The AST digest ignores positions; a unit whose code only moved must not replay
+    diagnostics at the old line numbers."""
+    helper = tmp_path / "helpers" / "helper.sushi"
+    _write(helper, """\
+public fn helper_apply() i32:
+    let i32 unused = 1
+    return Result.Ok(1)
+""")
+    _write(tmp_path / "main.sushi", """\
+use "helpers/helper"
+
+fn main() i32:
+    println(helper_apply().realise(0))
+    return Result.Ok(0)
+""")
+    first = _compile(tmp_path)
+    assert first.returncode == 1, first.stderr  # warnings only
+    assert "helper.sushi:2:5: warning [CW1001]" in first.stderr
+
+    helper.write_text("# moved down a line\n" + helper.read_text(), encoding="utf-8")
+    second = _compile(tmp_path)
+    assert second.returncode == 1, second.stderr
+    assert "helper.sushi:3:5: warning [CW1001]" in second.stderr
+    assert len(_analysis_entries(tmp_path, "helpers/helper")) == 2
@@ -0,0 +1,111 @@
+"""The lift pass's escape analysis: which lambdas may keep their environment on the stack."""
+from __future__ import annotations
+
+import dataclasses
+
+from sushi_lang.semantics.ast import Lambda, Let, Node
+
+
+def _find(node, kind) -> list:
+    """Every `kind` node under `node`, lambda bodies included."""
+    found = []
+    if isinstance(node, kind):
+        found.append(node)
+    if isinstance(node, (list, tuple)):
+        for item in node:
+            found.extend(_find(item, kind))
+    elif isinstance(node, Node):
+        for f in dataclasses.fields(node):
+            found.extend(_find(getattr(node, f.name), kind))
+    return found
+
+
+def _run_lambdas(analysis) -> list[Lambda]:
+    run = next(fn for fn in analysis.program.functions if fn.name == "run")
+    return _find(run.body, Lambda)
+
+
+def _lets(analysis) -> dict:
+    run = next(fn for fn in analysis.program.functions if fn.name == "run")
+    return {let.name: let for let in _find(run.body, Let)}
+
+
+_ARGUMENTS = """\
+fn borrow(fn(i32) -> i32 f) i32:
+    return Result.Ok(f(1)??)
+
+fn take(nom fn(i32) -> i32 f) i32:
+    return Result.Ok(f(1)??)
+
+fn run() i32:
+    let i32 k = 2
+    let i32 a = borrow(|i32 x| x + k)??
+    let i32 b = take(nom |i32 x| x * k)??
+    return Result.Ok(a + b)
+
+fn main() i32:
+    println(run().realise(-1))
+    return Result.Ok(0)
+"""
+
+
+def test_a_borrowed_argument_does_not_escape(analyze_program):
+    analysis = analyze_program(_ARGUMENTS)
+    assert not analysis.reporter.has_errors
+    borrowed, taken = _run_lambdas(analysis)
+    assert borrowed.non_escaping
+    assert not taken.non_escaping, "a `nom` parameter owns the closure and may keep it"
+
+
+_SHADOWED = """\
+fn apply(fn(i32) -> i32 f) i32:
+    return Result.Ok(f(1)??)
+
+fn take(nom fn(i32) -> i32 f) i32:
+    return Result.Ok(f(2)??)
+
+fn run() i32:
+    let i32 k = 2
+    let fn(nom fn(i32) -> i32) -> i32 apply = take
+    return Result.Ok(apply(nom |i32 x| x + k)??)
+
+fn main() i32:
+    println(run().realise(-1))
+    return Result.Ok(0)
+"""
+
+
+def test_a_local_shadowing_a_function_brings_its_own_modes(analyze_program):
+    analysis = analyze_program(_SHADOWED)
+    assert not analysis.reporter.has_errors
+    argument = _run_lambdas(analysis)[-1]
+    assert not argument.non_escaping
+
+
+_BINDINGS = """\
+fn run() i32:
+    let i32 k = 2
+    let fn(i32) -> i32 called = |i32 x| x + k
+    let fn(i32) -> i32 rebound = |i32 x| x - k
+    rebound := |i32 x| x * k
+    let fn(i32) -> i32 captured = |i32 x| x + 1
+    let fn(i32) -> i32 outer = |i32 x| captured(x)??
+    return Result.Ok(called(1)?? + rebound(1)?? + outer(1)??)
+
+fn main() i32:
+    println(run().realise(-1))
+    return Result.Ok(0)
+"""
+
+
+def test_only_a_binding_that_is_only_called_is_known(analyze_program):
+    analysis = analyze_program(_BINDINGS)
+    assert not analysis.reporter.has_errors
+    lets = _lets(analysis)
+    assert lets["called"].known_callee == lets["called"].value.lifted_name
+    assert lets["called"].value.non_escaping
+    for name in ("rebound", "captured"):
+        assert lets[name].known_callee is None, name
+        assert not lets[name].value.non_escaping, name
+    # `outer` is only called; what its body does with `captured` is its own scope.
+    assert lets["outer"].known_callee is not None
@@ -0,0 +1,168 @@
+"""The pre-parsed AST section of a .slib manifest, and the per-process metadata cache."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import msgpack
+import pytest
+
+import sushi_lang.internals.parser as parser
+from sushi_lang.backend.library_format import LibraryFormat
+from sushi_lang.backend.library_manifest import LibraryManifestGenerator
+from sushi_lang.internals.parser import parse_to_ast
+from sushi_lang.internals.report import Reporter
+from sushi_lang.semantics.library_templates import TemplateASTDecoder, template_program
+from sushi_lang.semantics.passes.collect import (
+    EnumTable, GenericFunctionTable, PerkTable, StructTable,
+)
+from sushi_lang.semantics.semantic_analyzer import SemanticAnalyzer
+from sushi_lang.semantics.units import Unit
+
+LIB_SRC = """\
+perk Ord:
+    fn gt(i32 other) bool
+
+public fn max@(T: Ord)(T a, T b) T:
+    if (a > b):
+        return Result.Ok(a)
+    return Result.Ok(b)
+
+public fn pair@(T)(nom T a) List@(T):
+    let List@(T) xs = List.new()
+    xs.push(a)
+    return Result.Ok(xs)
+
+struct Box@(T):
+    T value
+
+enum Opt@(T):
+    Nope
+    Yep(T)
+
+extend i32 with Ord:
+    fn gt(i32 other) bool:
+        return self > other
+"""
+
+RECORD_KINDS = ("generic_functions", "generic_structs", "generic_enums", "perks", "perk_impls")
+
+
+def _templates(tmp_path) -> dict:
+    """The templates block of LIB_SRC, as a consumer reads it back out of the .slib."""
+    file_path = tmp_path / "lib.sushi"
+    file_path.write_text(LIB_SRC, encoding="utf-8")
+    program, _tree = parse_to_ast(LIB_SRC)
+    unit = Unit(name="lib", file_path=file_path, ast=program,
+                dependencies=[], public_symbols={})
+    analyzer = SimpleNamespace(reporter=Reporter(source="", filename="lib"),
+                               structs=StructTable(), enums=EnumTable())
+    templates = LibraryManifestGenerator(analyzer)._extract_templates([unit])
+    return msgpack.unpackb(msgpack.packb(templates, use_bin_type=True), raw=False)
+
+
+def _records(templates: dict) -> list[dict]:
+    return [record for kind in RECORD_KINDS for record in templates[kind]]
+
+
+def _analyzer(templates: dict) -> SemanticAnalyzer:
+    manifest = {"library_name": "lib", "templates": templates}
+    linker = SimpleNamespace(loaded_libraries={"lib": manifest})
+    analyzer = SemanticAnalyzer(Reporter(source="", filename="consumer"),
+                                filename="consumer", library_linker=linker)
+    analyzer.generic_funcs = GenericFunctionTable()
+    return analyzer
+
+
+def _forbid_parsing(monkeypatch) -> None:
+    def parse(*_args, **_kwargs):
+        raise AssertionError("a template was re-parsed from source")
+    monkeypatch.setattr(parser, "parse_to_ast", parse)
+
+
+def test_every_record_decodes_to_the_ast_its_source_parses_to(tmp_path):
+    templates = _templates(tmp_path)
+    assert templates["version"] == 5
+    decoder = TemplateASTDecoder.for_templates(templates)
+    assert decoder is not None
+
+    records = _records(templates)
+    assert len(records) == 6
+    for record in records:
+        assert isinstance(record["ast"], int)
+        assert decoder.program(record["ast"]) == parse_to_ast(record["source"])[0]
+
+
+def test_each_decode_returns_fresh_nodes(tmp_path):
+    templates = _templates(tmp_path)
+    decoder = TemplateASTDecoder.for_templates(templates)
+    index = templates["generic_functions"][0]["ast"]
+
+    first, second = decoder.program(index), decoder.program(index)
+    assert first == second
+    assert first is not second
+    assert first.functions[0].body is not second.functions[0].body
+
+
+def test_registration_reads_the_section_without_parsing(tmp_path, monkeypatch):
+    analyzer = _analyzer(_templates(tmp_path))
+    _forbid_parsing(monkeypatch)
+    perks = PerkTable()
+
+    analyzer._register_library_generic_functions()
+    analyzer._seed_library_perks(perks)
+
+    assert {"max", "pair"} <= set(analyzer.generic_funcs.by_name)
+    assert analyzer.generic_funcs.by_name["max"].is_library_template is True
+    assert "Ord" in perks.by_name
+
+
+def test_a_manifest_without_the_section_falls_back_to_the_source(tmp_path):
+    templates = _templates(tmp_path)
+    del templates["ast"]
+    templates["version"] = 4
+    assert TemplateASTDecoder.for_templates(templates) is None
+
+    analyzer = _analyzer(templates)
+    analyzer._register_library_generic_functions()
+    gfd = analyzer.generic_funcs.by_name["max"]
+    assert [p.name for p in gfd.params] == ["a", "b"]
+    assert len(gfd.body.statements) == 2
+
+
+@pytest.mark.parametrize("damage", [
+    lambda section: section.update(version=section["version"] + 1),
+    lambda section: section["classes"].append(["os", "system", []]),
+    lambda section: section["classes"].append(["ast", "FuncDef", ["name"]]),
+    lambda section: section.update(trees=b"not zlib"),
+])
+def test_a_section_this_compiler_cannot_honour_is_ignored(tmp_path, damage):
+    templates = _templates(tmp_path)
+    damage(templates["ast"])
+    assert TemplateASTDecoder.for_templates(templates) is None
+
+
+def test_a_damaged_tree_falls_back_to_the_source(tmp_path):
+    templates = _templates(tmp_path)
+    decoder = TemplateASTDecoder.for_templates(templates)
+    record = dict(templates["generic_functions"][0], ast=10_000)
+
+    program = template_program(record, decoder)
+    assert program == parse_to_ast(record["source"])[0]
+
+
+def test_metadata_is_decoded_once_per_process_until_the_file_changes(tmp_path, monkeypatch):
+    slib = tmp_path / "lib.slib"
+    LibraryFormat.write(slib, {"library_name": "lib", "rev": 1}, b"BC-one")
+
+    first = LibraryFormat.load_metadata(slib)
+    decodes = []
+    real = LibraryFormat.read_metadata_only
+    monkeypatch.setattr(LibraryFormat, "read_metadata_only",
+                        staticmethod(lambda path: decodes.append(path) or real(path)))
+    assert LibraryFormat.load_metadata(tmp_path / "." / "lib.slib") is first
+    assert decodes == []
+
+    LibraryFormat.write(slib, {"library_name": "lib", "rev": 2, "pad": "x"}, b"BC-two")
+    assert LibraryFormat.load_metadata(slib)["rev"] == 2
+    assert len(decodes) == 1
+    assert LibraryFormat.read_bitcode(slib) == LibraryFormat.read(slib)[1] == b"BC-two"
@@ -0,0 +1,102 @@
+"""`--pipeline llvm` runs LLVM's default O-level pipeline, inliner included."""
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+from llvmlite import binding as llvm
+
+from sushi_lang.backend.llvm_optimization import PIPELINES, LLVMOptimizer
+from sushi_lang.compiler.cli import _parse_args
+
+
+# A Sushi-shaped wrapper: an internal helper returning {tag, value}, unwrapped by its caller.
+IR = r"""
+define internal {i32, i32} @square(i32 %x) {
+  %sq = mul i32 %x, %x
+  %r0 = insertvalue {i32, i32} {i32 0, i32 undef}, i32 %sq, 1
+  ret {i32, i32} %r0
+}
+
+define i32 @sum_squares(i32 %n) {
+entry:
+  br label %loop
+loop:
+  %i = phi i32 [0, %entry], [%next, %loop]
+  %acc = phi i32 [0, %entry], [%acc.next, %loop]
+  %res = call {i32, i32} @square(i32 %i)
+  %v = extractvalue {i32, i32} %res, 1
+  %acc.next = add i32 %acc, %v
+  %next = add i32 %i, 1
+  %done = icmp eq i32 %next, %n
+  br i1 %done, label %exit, label %loop
+exit:
+  ret i32 %acc.next
+}
+"""
+
+
+def _calls_square(ir_text: str) -> bool:
+    return any("call" in line and "@square(" in line for line in ir_text.splitlines())
+
+
+def _optimized(pipeline: str, level: str) -> str:
+    optimizer = LLVMOptimizer(codegen=None)
+    optimizer.pipeline = pipeline
+    llmod = llvm.parse_assembly(IR)
+    optimizer.ensure_target(llmod)
+    optimizer.optimize(llmod, level)
+    llmod.verify()
+    return str(llmod)
+
+
+@pytest.mark.parametrize("level", ["O2", "O3"])
+def test_llvm_pipeline_inlines_the_wrapper(level):
+    assert not _calls_square(_optimized("llvm", level))
+
+
+def test_sushi_pipeline_keeps_the_call():
+    """The hand-assembled list has no inliner -- the gap `--pipeline llvm` closes."""
+    assert _calls_square(_optimized("sushi", "O3"))
+
+
+SRC = """\
+fn square(i32 x) i32:
+    return Result.Ok(x * x)
+
+fn main() i32:
+    let i32 total = 0
+    foreach(i in 0..100):
+        total := total + square(i).realise(0)
+    println(total)
+    return Result.Ok(0)
+"""
+
+
+@pytest.mark.parametrize("level", ["O1", "O2", "O3"])
+def test_llvm_pipeline_binary_matches_sushi_pipeline(tmp_path: Path, level):
+    (tmp_path / "main.sushi").write_text(SRC, encoding="utf-8")
+    outputs = {}
+    for pipeline in ("sushi", "llvm"):
+        out = tmp_path / f"out_{pipeline}"
+        build = subprocess.run(
+            ["sushic", "main.sushi", "-o", str(out), "--opt", level, "--pipeline", pipeline],
+            cwd=tmp_path, capture_output=True, text=True,
+        )
+        assert build.returncode == 0, build.stderr
+        outputs[pipeline] = subprocess.run([str(out)], capture_output=True, text=True).stdout
+    assert outputs["llvm"] == outputs["sushi"] == "328350\n"
+
+
+@pytest.mark.parametrize("level", ["none", "mem2reg"])
+def test_pipeline_without_an_o_level_is_rejected(level):
+    """Only O1-O3 run a pipeline; naming one at another level would silently do nothing."""
+    args = ["--pipeline", "llvm"] if level == "mem2reg" else ["--opt", level, "--pipeline", "sushi"]
+    with pytest.raises(SystemExit) as exit_:
+        _parse_args(["main.sushi", *args])
+    assert exit_.value.code == 2
+
+
+def test_pipeline_defaults_to_the_first_choice():
+    assert _parse_args(["main.sushi", "--opt", "O2"]).pipeline == PIPELINES[0] == "sushi"
@@ -0,0 +1,78 @@
+"""The LALR parser is built once per process and its tables are cached on disk."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from sushi_lang.internals import parser as parser_mod
+from sushi_lang.internals.parser import get_parser, parse_to_ast, parser_cache_path
+
+
+SRC = 'fn main() i32:\n    let i32 x = 1\n    println("{x + 1}")\n    return Result.Ok(0)\n'
+
+
+@pytest.fixture
+def fresh_parsers(monkeypatch, tmp_path):
+    """An empty in-process parser table and a private on-disk cache directory."""
+    monkeypatch.setattr(parser_mod, "_parsers", {})
+    monkeypatch.setenv("SUSHI_PARSER_CACHE", str(tmp_path / "parser"))
+    return tmp_path / "parser"
+
+
+def test_parser_is_built_once_per_process(fresh_parsers):
+    assert get_parser() is get_parser()
+    assert get_parser("expr") is not get_parser()
+
+
+def test_cache_key_names_grammar_digest_and_lark_version(fresh_parsers):
+    import lark
+
+    path = parser_cache_path("start")
+    assert path.parent == fresh_parsers
+    assert f"lark{lark.__version__}" in path.name
+    assert path.name.startswith("grammar-start-")
+
+
+def test_cache_key_covers_lark_options_and_the_indenter(fresh_parsers, monkeypatch, tmp_path):
+    """Tables built under other options or another postlexer must not load."""
+    path = parser_cache_path("start")
+    options = parser_mod._LARK_OPTIONS
+
+    monkeypatch.setattr(parser_mod, "_LARK_OPTIONS", {**options, "maybe_placeholders": True})
+    assert parser_cache_path("start") != path
+    monkeypatch.setattr(parser_mod, "_LARK_OPTIONS", options)
+    assert parser_cache_path("start") == path
+
+    edited = tmp_path / "indenter.py"
+    edited.write_bytes(open(parser_mod.indenter.__file__, "rb").read() + b"\n# edited\n")
+    monkeypatch.setattr(parser_mod, "indenter", SimpleNamespace(__file__=str(edited)))
+    assert parser_cache_path("start") != path
+
+
+def test_first_build_writes_tables_and_a_reload_parses_identically(fresh_parsers, monkeypatch):
+    built = get_parser().parse(SRC)
+    assert parser_cache_path("start").exists()
+
+    monkeypatch.setattr(parser_mod, "_parsers", {})
+    reloaded = get_parser()
+    assert reloaded.source_path == "<deserialized>"
+    assert reloaded.parse(SRC) == built
+
+
+def test_unreadable_cache_file_is_a_miss_and_is_rewritten(fresh_parsers):
+    path = parser_cache_path("start")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a pickle")
+
+    program, _tree = parse_to_ast(SRC)
+    assert program.functions[0].name == "main"
+    assert path.read_bytes() != b"not a pickle"
+
+
+def test_cache_can_be_disabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(parser_mod, "_parsers", {})
+    monkeypatch.setenv("SUSHI_PARSER_CACHE", "off")
+    assert parser_cache_path() is None
+    program, _tree = parse_to_ast(SRC)
+    assert program.functions[0].name == "main"
@@ -1,6 +1,7 @@
 """Guard: the stdlib's ProcessOutput Result layout must match the compiler's sizing."""
 from sushi_lang.sushi_stdlib.src.type_definitions import (
     _process_output_size_bytes,
+    get_child_process_result_type,
     get_process_output_result_type,
 )
 from sushi_lang.backend.types.core.sizing import TypeSizing
@@ -54,3 +55,69 @@ def test_result_data_array_holds_process_output():
     assert data_array.element.width == 64
     assert data_array.count * 8 >= _process_output_size_bytes()
     assert data_array.count == (_process_output_size_bytes() + 7) // 8
+
+
+def test_result_data_array_holds_child_process():
+    # spawn()'s Result<ChildProcess, ProcessError> must hold the aligned {i32 pid, i64 id}.
+    struct_table = StructTable()
+    struct_table.by_name["ChildProcess"] = StructType(
+        name="ChildProcess",
+        fields=(("pid", BuiltinType.I32), ("id", BuiltinType.I64)),
+    )
+    sizer = TypeSizing(struct_table, EnumTable())
+    compiler_size = sizer.get_type_size_bytes(struct_table.by_name["ChildProcess"])
+
+    data_array = get_child_process_result_type().elements[1]
+    assert data_array.count == (compiler_size + 7) // 8
+
+
+def _unchecked_allocations(module):
+    from llvmlite import ir
+
+    unchecked = []
+    for func in module.functions:
+        if func.is_declaration:
+            continue
+        instrs = [i for block in func.blocks for i in block.instructions]
+        allocs = [i for i in instrs if isinstance(i, ir.CallInstr)
+                  and i.callee.name in ("malloc", "realloc") and not i.name.startswith("cstr")]
+        compared = {id(op) for i in instrs if isinstance(i, ir.CompareInstr) for op in i.operands}
+        unchecked += [(func.name, a) for a in allocs if id(a) not in compared]
+    return unchecked
+
+
+def test_child_handles_check_every_allocation():
+    # spawn()'s state and captures, next_line()'s lines and the capture growth in the
+    # shared read helper all stop with RE2021 on NULL, as run() does.
+    from llvmlite import ir
+
+    from sushi_lang.sushi_stdlib.src.sys.process import functions
+
+    module = ir.Module(name="process")
+    for generate in (functions.generate_spawn, functions.generate_next_line,
+                     functions.generate_send, functions.generate_close_stdin,
+                     functions.generate_wait):
+        generate(module)
+    assert "sushi_process_child_fill" in module.globals
+    assert _unchecked_allocations(module) == []
+
+
+def test_run_checks_every_allocation():
+    # run()/run_input()'s own argv and capture buffers are compared with NULL (RE2021);
+    # the C strings come from the shared fat_pointer_to_cstr helper.
+    from llvmlite import ir
+
+    from sushi_lang.sushi_stdlib.src.sys.process.functions import generate_run, generate_run_input
+
+    module = ir.Module(name="process")
+    generate_run(module)
+    generate_run_input(module)
+    for func in module.functions:
+        if func.is_declaration:
+            continue
+        instrs = [i for block in func.blocks for i in block.instructions]
+        allocs = [i for i in instrs if isinstance(i, ir.CallInstr)
+                  and i.callee.name in ("malloc", "realloc") and not i.name.startswith("cstr")]
+        compared = {id(op) for i in instrs if isinstance(i, ir.CompareInstr) for op in i.operands}
+        assert allocs, func.name
+        assert all(id(a) in compared for a in allocs), func.name
@@ -0,0 +1,136 @@
+"""`Rng` from `<random>` draws exactly what a Python xoshiro256** model does."""
+from __future__ import annotations
+
+import struct
+import subprocess
+from pathlib import Path
+
+import pytest
+
+MASK = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _mix(x: int) -> int:
+    z = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK
+    return z ^ (z >> 31)
+
+
+def _rotl(x: int, k: int) -> int:
+    return ((x << k) | (x >> (64 - k))) & MASK
+
+
+class Model:
+    """xoshiro256** seeded with splitmix64, as `seeded_rng` builds it."""
+
+    def __init__(self, seed: int):
+        self.s = [_mix((seed + GOLDEN * k) & MASK) for k in (1, 2, 3, 4)]
+
+    def next_u64(self) -> int:
+        s = self.s
+        result = (_rotl((s[1] * 5) & MASK, 7) * 9) & MASK
+        t = (s[1] << 17) & MASK
+        s[2] ^= s[0]
+        s[3] ^= s[1]
+        s[1] ^= s[2]
+        s[0] ^= s[3]
+        s[2] ^= t
+        s[3] = _rotl(s[3], 45)
+        return result
+
+    def next_f64_bits(self) -> int:
+        return struct.unpack("<Q", struct.pack("<d", (self.next_u64() >> 11) * 2.0 ** -53))[0]
+
+    def range(self, lo: int, hi: int) -> int:
+        if hi <= lo:
+            return lo
+        span = hi - lo
+        mask = (1 << (span - 1).bit_length()) - 1
+        while True:
+            draw = self.next_u64() & mask
+            if draw < span:
+                return lo + draw
+
+    def fill(self, n: int) -> list[int]:
+        out, word = [], 0
+        for i in range(n):
+            if i % 8 == 0:
+                word = self.next_u64()
+            out.append(word & 0xFF)
+            word >>= 8
+        return out
+
+
+RANGES = [(0, 1), (0, 2), (0, 3), (-5, 5), (0, 1000), (7, 7), (9, 3), (0, 1 << 40),
+          (-(1 << 62), 1 << 62), (-(1 << 63), (1 << 63) - 1)]
+
+SRC = """\
+use <random>
+
+fn run() ~:
+    let Rng r = seeded_rng(SEED as u64)??
+    let i32 i = 0
+    while (i < 40):
+        println(r.next_u64())
+        i := i + 1
+    i := 0
+    while (i < 10):
+        println(r.next_f64().to_bits())
+        i := i + 1
+RANGES
+    let u8[] buf = new()
+    i := 0
+    while (i < 21):
+        buf.push(0 as u8)
+        i := i + 1
+    r.fill(poke buf)
+    i := 0
+    while (i < buf.len()):
+        println(buf[i])
+        i := i + 1
+    r.seed(SEED as u64)
+    println(r.next_u64())
+    return Result.Ok(~)
+
+fn main() i32:
+    run()
+    return Result.Ok(0)
+"""
+
+
+def _literal(v: int) -> str:
+    # -2^63 has no positive i64 literal to negate.
+    if v == -(1 << 63):
+        return "((-9223372036854775807 as i64) - (1 as i64))"
+    return f"({v} as i64)"
+
+
+def _expected(seed: int) -> list[int]:
+    m = Model(seed)
+    out = [m.next_u64() for _ in range(40)]
+    out += [m.next_f64_bits() for _ in range(10)]
+    for lo, hi in RANGES:
+        out += [m.range(lo, hi) for _ in range(6)]
+    out += m.fill(21)
+    out.append(Model(seed).next_u64())
+    return out
+
+
+@pytest.mark.parametrize("seed", [0, 42, MASK])
+def test_draws_match_the_reference_model(tmp_path: Path, seed):
+    ranges = "\n".join(
+        f"    i := 0\n    while (i < 6):\n        println(r.range({_literal(lo)}, {_literal(hi)}))\n"
+        f"        i := i + 1"
+        for lo, hi in RANGES
+    )
+    src = SRC.replace("SEED", str(seed)).replace("RANGES", ranges)
+    (tmp_path / "main.sushi").write_text(src, encoding="utf-8")
+    out = tmp_path / "out"
+    build = subprocess.run(["sushic", "main.sushi", "-o", str(out)],
+                           cwd=tmp_path, capture_output=True, text=True)
+    assert build.returncode == 0, build.stderr
+    run = subprocess.run([str(out)], capture_output=True, text=True)
+    assert run.returncode == 0
+    assert [int(line) for line in run.stdout.split()] == _expected(seed)
+
@@ -0,0 +1,47 @@
+"""`--stdout-buffering`: when stdout reaches the OS relative to unbuffered stderr."""
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+# stderr is unbuffered, so with both streams on one pipe its lines mark where stdout's
+# buffer had been flushed: by a newline (line mode), stdout.flush(), a spawn, or exit.
+SRC = """\
+use <io/stdio>
+use <sys/process>
+
+fn main() i32:
+    println("one")
+    stderr.write("two\\n")
+    stdout.write("three\\n")
+    stdout.flush()
+    stderr.write("four\\n")
+    println("five")
+    if (run("true").is_ok()):
+        stderr.write("six\\n")
+    println(7)
+    println(8.5)
+    stderr.write("nine\\n")
+    return Result.Ok(0)
+"""
+
+LINE = "one\ntwo\nthree\nfour\nfive\nsix\n7\n8.5\nnine\n"
+FULL = "two\none\nthree\nfour\nfive\nsix\nnine\n7\n8.5\n"
+
+
+@pytest.mark.parametrize("mode, expected", [("line", LINE), ("full", FULL), ("auto", FULL)])
+def test_flush_points_per_mode(tmp_path: Path, mode, expected):
+    (tmp_path / "main.sushi").write_text(SRC, encoding="utf-8")
+    out = tmp_path / "out"
+    build = subprocess.run(
+        ["sushic", "main.sushi", "-o", str(out), "--stdout-buffering", mode],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+    assert build.returncode == 0, build.stderr
+    # `auto` on a pipe is full buffering.
+    run = subprocess.run([str(out)], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    assert run.returncode == 0
+    assert run.stdout == expected
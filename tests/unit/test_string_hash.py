@@ -0,0 +1,108 @@
+"""`__sushi_str_hash` agrees with a reference model at every length, and is emitted once."""
+from __future__ import annotations
+
+import ctypes
+import random
+import struct
+
+import pytest
+from llvmlite import binding as llvm, ir
+
+from sushi_lang.backend.constants import HASH_SECRET, HASH_SEED
+from sushi_lang.backend.types.hash_utils import STRING_HASH_SYMBOL, get_or_emit_string_hash
+
+MASK = (1 << 64) - 1
+
+
+def _mix(a: int, b: int) -> int:
+    product = a * b
+    return (product & MASK) ^ (product >> 64)
+
+
+def reference_hash(data: bytes) -> int:
+    """The hash `__sushi_str_hash` computes, spelled out in Python."""
+    s0, s1, s2, s3 = HASH_SECRET
+    n, seed = len(data), HASH_SEED
+
+    def r8(i: int) -> int:
+        return struct.unpack_from("<Q", data, i)[0]
+
+    def r4(i: int) -> int:
+        return struct.unpack_from("<I", data, i)[0]
+
+    if n <= 16:
+        if n >= 4:
+            q = (n >> 3) << 2
+            a = (r4(0) << 32) | r4(q)
+            b = (r4(n - 4) << 32) | r4(n - 4 - q)
+        elif n > 0:
+            a, b = (data[0] << 16) | (data[n >> 1] << 8) | data[n - 1], 0
+        else:
+            a = b = 0
+    else:
+        off = 0
+        if n >= 48:
+            see1 = see2 = seed
+            while n - off >= 48:
+                seed = _mix(r8(off) ^ s1, r8(off + 8) ^ seed)
+                see1 = _mix(r8(off + 16) ^ s2, r8(off + 24) ^ see1)
+                see2 = _mix(r8(off + 32) ^ s3, r8(off + 40) ^ see2)
+                off += 48
+            seed ^= see1 ^ see2
+        while n - off > 16:
+            seed = _mix(r8(off) ^ s1, r8(off + 8) ^ seed)
+            off += 16
+        a, b = r8(n - 16), r8(n - 8)
+
+    product = (a ^ s1) * (b ^ seed)
+    return _mix((product & MASK) ^ s0 ^ n, (product >> 64) ^ s1)
+
+
+@pytest.fixture(scope="module")
+def str_hash():
+    llvm.initialize_native_target()
+    llvm.initialize_native_asmprinter()
+    module = ir.Module(name="str_hash")
+    module.triple = llvm.get_process_triple()
+    get_or_emit_string_hash(module)
+    parsed = llvm.parse_assembly(str(module))
+    parsed.verify()
+    machine = llvm.Target.from_default_triple().create_target_machine()
+    engine = llvm.create_mcjit_compiler(parsed, machine)
+    engine.finalize_object()
+    fn_type = ctypes.CFUNCTYPE(ctypes.c_uint64, ctypes.c_char_p, ctypes.c_uint64)
+    yield fn_type(engine.get_function_address(STRING_HASH_SYMBOL))
+    del engine
+
+
+def test_every_length_through_three_bulk_steps_matches_the_reference(str_hash):
+    # 0..3 bytes, 4..16, one or more 16-byte pairs, and 48-byte bulk steps with and
+    # without a pair and a tail after them.
+    rng = random.Random(22)
+    for n in range(0, 170):
+        data = bytes(rng.randrange(256) for _ in range(n))
+        assert str_hash(data, n) == reference_hash(data), f"length {n}"
+
+
+def test_reads_stay_within_the_buffer(str_hash):
+    # A 16-byte prefix of a longer buffer hashes as the 16 bytes alone: the tail read
+    # ends at data + len, not past it.
+    data = b"0123456789abcdef-and-more"
+    assert str_hash(data, 16) == reference_hash(data[:16])
+
+
+def test_a_single_changed_byte_changes_the_hash(str_hash):
+    base = b"https://example.com/a/rather/long/path?with=query"
+    seen = {str_hash(base, len(base))}
+    for i in range(len(base)):
+        flipped = base[:i] + bytes([base[i] ^ 1]) + base[i + 1:]
+        seen.add(str_hash(flipped, len(flipped)))
+    assert len(seen) == len(base) + 1
+
+
+def test_emitted_once_per_module_as_linkonce_odr():
+    module = ir.Module(name="once")
+    first = get_or_emit_string_hash(module)
+    assert get_or_emit_string_hash(module) is first
+    assert first.linkage == "linkonce_odr"
+    assert str(module).count(f'define linkonce_odr i64 @"{STRING_HASH_SYMBOL}"') == 1
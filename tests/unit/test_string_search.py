@@ -0,0 +1,71 @@
+"""The substring search engine agrees with Python's on every string method built on it."""
+from __future__ import annotations
+
+import random
+import subprocess
+from pathlib import Path
+
+from sushi_lang.sushi_stdlib.src.collections.strings.intrinsics.substring_search import (
+    SHORT_NEEDLE_MAX,
+)
+
+
+# Periodic needles, needles straddling the memchr / Two-Way cut-off, overlapping matches,
+# matches at either end, and a needle longer than its haystack.
+FIXED_CASES = [
+    ("", ""), ("abc", ""), ("", "a"), ("a", "a"), ("ab", "abc"),
+    ("aaaa", "aa"), ("abababab", "abab"), ("banana", "ana"),
+    ("mississippi", "issi"), ("mississippi", "ssippi"),
+    ("a,b,,c,", ","), ("one--two--three", "--"),
+    ("aaaaaaaaaaaaaaaaaaaaab", "aaaaaaaaab"), ("xyzxyzxyzxyzxyz", "zxyzxyzxy"),
+    ("abcabcabcabd", "abcabcabd"), ("b" + "a" * 40, "a" * SHORT_NEEDLE_MAX),
+    ("b" + "a" * 40, "a" * (SHORT_NEEDLE_MAX + 1)), ("a" * 40 + "b", "a" * 12 + "b"),
+]
+
+
+def _cases() -> list[tuple[str, str]]:
+    rng = random.Random(7)
+    cases = list(FIXED_CASES)
+    for _ in range(300):
+        alphabet = rng.choice(["a", "ab", "abc", "abcd"])
+        hay = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        needle = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 14)))
+        if hay and rng.random() < 0.3:
+            start = rng.randrange(len(hay))
+            needle = hay[start:start + rng.randint(1, 20)]
+        cases.append((hay, needle))
+    return cases
+
+
+def _expected(hay: str, needle: str) -> str:
+    count = hay.count(needle) if needle else 0
+    replaced = hay.replace(needle, "<>") if needle else hay
+    pieces = len(hay.split(needle)) if needle else 1
+    contains = "true" if needle in hay else "false"
+    return f"{hay.find(needle)} {hay.rfind(needle)} {count} {contains} [{replaced}] {pieces}"
+
+
+def test_search_methods_match_python(tmp_path: Path):
+    cases = _cases()
+    lines = ["use <collections/strings>", "", "fn main() i32:"]
+    for k, (hay, needle) in enumerate(cases):
+        lines += [
+            f'    let string h{k} = "{hay}"',
+            f'    let string n{k} = "{needle}"',
+            f'    let string r{k} = h{k}.replace(n{k}, "<>")',
+            f'    let string[] p{k} = h{k}.split(n{k})',
+            f'    println("{{h{k}.find(n{k}).realise(-1)}} {{h{k}.find_last(n{k}).realise(-1)}} '
+            f'{{h{k}.count(n{k})}} {{h{k}.contains(n{k})}} [{{r{k}}}] {{p{k}.len()}}")',
+        ]
+    lines.append("    return Result.Ok(0)")
+    (tmp_path / "main.sushi").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    out = tmp_path / "out"
+    build = subprocess.run(
+        ["sushic", "main.sushi", "-o", str(out), "--opt", "O2"],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+    assert build.returncode == 0, build.stderr
+    run = subprocess.run([str(out)], capture_output=True, text=True)
+    assert run.returncode == 0
+    assert run.stdout.splitlines() == [_expected(h, n) for h, n in cases]
@@ -0,0 +1,88 @@
+"""`sushic --timing-json`: exclusive per-phase timings and compile counters."""
+from __future__ import annotations
+
+import json
+import subprocess
+import time
+from pathlib import Path
+
+from sushi_lang.internals import timing
+
+
+def _durations(collector: timing.TimingCollector) -> dict:
+    return {p["name"]: p["duration_ms"] for p in collector.report()["phases"]}
+
+
+def test_nested_phase_is_taken_out_of_its_parent():
+    collector = timing.TimingCollector()
+    with collector.phase("outer"):
+        time.sleep(0.02)
+        with collector.phase("inner"):
+            time.sleep(0.03)
+    ms = _durations(collector)
+    assert 15 <= ms["outer"] < 28
+    assert ms["inner"] >= 25
+
+
+def test_lap_charges_straight_line_time_minus_phases_inside_it():
+    collector = timing.TimingCollector()
+    collector.lap()
+    time.sleep(0.01)
+    with collector.phase("parse"):
+        time.sleep(0.03)
+    collector.lap("check")
+    ms = _durations(collector)
+    assert 5 <= ms["check"] < 25
+    assert ms["parse"] >= 25
+
+
+def test_report_counts_calls_and_sums_counters():
+    collector = timing.TimingCollector()
+    for _ in range(3):
+        with collector.phase("verify"):
+            pass
+    collector.count("units")
+    collector.count("units", 2)
+    report = collector.report(exit_code=0)
+    assert report["version"] == timing.REPORT_VERSION
+    assert report["exit_code"] == 0
+    assert report["phases"][0]["calls"] == 3
+    assert report["counters"] == {"units": 3}
+
+
+def test_hooks_are_no_ops_when_disabled():
+    timing.disable()
+    assert not timing.enabled()
+    with timing.phase("parse"):
+        timing.lap("check")
+        timing.count("units")
+
+
+SRC = """\
+fn twice(i32 x) i32:
+    return Result.Ok(x * 2)
+
+fn main() i32:
+    println(twice(21).realise(0))
+    return Result.Ok(0)
+"""
+
+
+def test_sushic_writes_the_report(tmp_path: Path):
+    (tmp_path / "main.sushi").write_text(SRC, encoding="utf-8")
+    build = subprocess.run(
+        ["sushic", "main.sushi", "-o", "out", "--no-incremental", "--timing-json", "t.json"],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+    assert build.returncode == 0, build.stderr
+    report = json.loads((tmp_path / "t.json").read_text(encoding="utf-8"))
+    names = [p["name"] for p in report["phases"]]
+    for name in ("import", "parse", "ast", "collect", "typecheck", "borrow", "emit-ir",
+                 "parse-assembly", "optimize", "emit-object", "link"):
+        assert name in names
+    assert report["exit_code"] == 0
+    assert report["counters"]["units"] == 1
+    assert report["counters"]["functions"] == 2
+    assert report["counters"]["ir_instructions"] > 0
+    charged = sum(p["duration_ms"] for p in report["phases"])
+    assert charged + report["unaccounted_ms"] <= report["total_ms"] + 1.0